@@ -0,0 +1,14 @@
+from ninja import Schema
+from datetime import date
+from accounts.api.schemas.account import BalanceDecimal
+
+
+class StatementCycleOut(Schema):
+    statement_start: date
+    statement_end: date
+    statement_due: date
+    statement_pay_day: date
+    credits: BalanceDecimal
+    debits: BalanceDecimal
+    closing_balance: BalanceDecimal
+    closed: bool
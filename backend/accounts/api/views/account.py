@@ -1,11 +1,12 @@
 from ninja import Router, Query
+from ninja.decorators import decorate_view
 from django.db import IntegrityError
-from django.core.cache import cache
 from ninja.errors import HttpError
 from accounts.models import Account, AccountFavorite, Reward
 from transactions.models import Transaction
 from accounts.api.schemas.investment_return import InvestmentReturnOut
-from accounts.services import calculate_investment_return
+from accounts.api.schemas.statement_cycle import StatementCycleOut
+from accounts.services import calculate_investment_return, list_statement_cycles
 from accounts.api.schemas.account import (
     AccountIn,
     AccountOut,
@@ -18,17 +19,16 @@ from typing import List
 from utils.apply_patch import apply_patch
 from accounts.services import (
     get_account_financials,
+    favorite_balance_summaries,
     AccountNotFound,
     list_accounts_with_financials,
 )
 from accounts.mappers import domain_account_to_schema
+from core.cache import store, versions
 from core.cache.keys import account_financials as account_financials_key
+from core.etag import account_scope, conditional
 import logging
 from administration.api.dependencies.auth import FullAccessAuth
-from transactions.services import get_account_transactions_and_balances
-from utils.dates import get_todays_date_timezone_adjusted
-from dateutil.relativedelta import relativedelta
-from datetime import timedelta
 
 api_logger = logging.getLogger("api")
 db_logger = logging.getLogger("db")
@@ -87,6 +87,11 @@ def create_account(request, payload: AccountIn):
 
 
 @account_router.get("/get/{account_id}", response=AccountOut)
+@decorate_view(
+    conditional(
+        versions.REFERENCE, versions.model("accounts"), scope=account_scope("account_id")
+    )
+)
 def get_account(request, account_id: int):
     """
     The function `get_account` retrieves the account by id
@@ -112,6 +117,7 @@ def get_account(request, account_id: int):
 
 
 @account_router.get("/list", response=List[AccountOut])
+@decorate_view(conditional(versions.REFERENCE, "accounts", versions.model("accounts")))
 def list_accounts(request, query: AccountQuery = Query(...)):
     """
     The function `list_accounts` retrieves a list of accounts,
@@ -221,7 +227,7 @@ def toggle_favorite(request, account_id: int):
             is_fav = False
         else:
             is_fav = True
-        cache.delete(f"{account_financials_key(account_id)}:{user.pk}")
+        store.delete(f"{account_financials_key(account_id)}:{user.pk}")
         api_logger.info(f"Account favorite toggled : {account.account_name} -> {is_fav} (user {user.pk})")
         return {"is_favorite": is_fav}
     except HttpError:
@@ -275,65 +281,14 @@ def delete_account(request, account_id: int):
 
 
 @account_router.get("/favorite-balances", response=List[FavoriteBalanceSummary])
+@decorate_view(conditional(versions.REFERENCE, "accounts", versions.model("accounts")))
 def get_favorite_balances(request):
     """
     Returns current balance and projected 1st-of-next-month balance
     for all active favorite accounts.
     """
     try:
-        user = _safe_user(request)
-        if not user:
-            return []
-
-        today = get_todays_date_timezone_adjusted()
-        first_of_next_month = today.replace(day=1) + relativedelta(months=1)
-        # Query through the 2nd so transactions dated ON the 1st are included
-        # (the service filter is transaction_date__lt=end_date)
-        end_date = first_of_next_month + timedelta(days=1)
-
-        favorite_ids = AccountFavorite.objects.filter(user=user).values_list("account_id", flat=True)
-        accounts = Account.objects.filter(id__in=favorite_ids, active=True).select_related(
-            "account_type", "bank"
-        )
-
-        result = []
-        for account in accounts:
-            try:
-                financials = get_account_financials(account.id, today)
-                current_balance = financials.balance
-            except Exception:
-                current_balance = None
-
-            try:
-                transactions, previous_balance = get_account_transactions_and_balances(
-                    end_date=end_date,
-                    account_id=account.id,
-                    totals_only=True,
-                    forecast=True,
-                    start_date=today,
-                )
-                projected_balance = previous_balance
-                for t in transactions:
-                    pt = t["pretty_total"] if isinstance(t, dict) else t.pretty_total
-                    if pt is not None:
-                        projected_balance += pt
-            except Exception as e:
-                error_logger.exception(f"Projected balance error for account {account.id}: {e}")
-                projected_balance = None
-
-            result.append(
-                FavoriteBalanceSummary(
-                    id=account.id,
-                    account_name=account.account_name,
-                    account_type_id=account.account_type_id,
-                    account_type_color=account.account_type.color,
-                    account_type_slug=account.account_type.slug,
-                    logo_url=account.bank.logo_url if account.bank else None,
-                    balance=current_balance,
-                    projected_balance=projected_balance,
-                )
-            )
-
+        result = favorite_balance_summaries(_safe_user(request))
         api_logger.debug("Favorite balances retrieved")
         return result
     except Exception as e:
@@ -342,6 +297,7 @@ def get_favorite_balances(request):
 
 
 @account_router.get("/{account_id}/investment-return", response=InvestmentReturnOut)
+@decorate_view(conditional(versions.REFERENCE, scope=account_scope("account_id")))
 def get_investment_return(request, account_id: int):
     """
     Returns Modified Dietz annualised return for an investment account.
@@ -364,3 +320,17 @@ def get_investment_return(request, account_id: int):
     except Exception as e:
         error_logger.exception(str(e))
         raise HttpError(500, f"Record retrieval error: {str(e)}")
+
+
+@account_router.get("/{account_id}/statements", response=List[StatementCycleOut])
+@decorate_view(conditional(versions.REFERENCE, scope=account_scope("account_id")))
+def get_statements(request, account_id: int):
+    """
+    Returns the statement cycles of a credit card account, newest first.
+    Closed cycles keep the totals they had when their due date passed.
+    """
+    try:
+        return list_statement_cycles(account_id)
+    except Exception as e:
+        error_logger.exception(str(e))
+        raise HttpError(500, f"Record retrieval error: {str(e)}")
@@ -1,8 +1,12 @@
+from typing import Literal
 from ninja import Router
+from ninja.decorators import decorate_view
 from ninja.errors import HttpError
 from accounts.api.schemas.forecast import ForecastOut
 from accounts.services import get_account_forecast
 from accounts.mappers import domain_forecast_to_schema
+from core.cache import versions
+from core.etag import account_scope, conditional
 import logging
 
 api_logger = logging.getLogger("api")
@@ -12,8 +16,13 @@ forecast_router = Router(tags=["Account Forecasts"])
 
 
 @forecast_router.get("/get/{account_id}", response=ForecastOut)
+@decorate_view(conditional(versions.REFERENCE, scope=account_scope("account_id")))
 def get_forecast(
-    request, account_id: int, start_interval: int, end_interval: int
+    request,
+    account_id: int,
+    start_interval: int,
+    end_interval: int,
+    resolution: Literal["day", "week", "month"] = "day",
 ):
     """
     The function `get_forecast` retrieves the forecast data for the account id
@@ -23,6 +32,8 @@ def get_forecast(
         account_id (int): The id of the account to retrieve forecast data.
         start_interval (int): the number of days before today to start forecast.
         end_interval (int): the number of days after today to end forecast.
+        resolution (str): day, week or month; coarser resolutions keep the
+            closing balance of each period.
 
     Returns:
         ForecastOut: the forecast object
@@ -32,7 +43,7 @@ def get_forecast(
     """
     try:
         domain_forecast = get_account_forecast(
-            account_id, start_interval, end_interval
+            account_id, start_interval, end_interval, resolution
         )
         api_logger.debug("Forecast retrieved")
         return domain_forecast_to_schema(domain_forecast)
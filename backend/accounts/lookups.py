@@ -0,0 +1,17 @@
+from accounts.models import Account
+from core.cache.memo import memoize
+
+
+@memoize("account")
+def get_account(account_id: int) -> Account:
+    """
+    Returns the Account for account_id, raising Account.DoesNotExist if absent.
+    Memoized per request/task; callers must treat the instance as read-only.
+    """
+    return Account.objects.get(id=account_id)
+
+
+@memoize("account_has_children")
+def has_child_accounts(account_id: int) -> bool:
+    """Returns whether account_id is a parent account. Memoized per request/task."""
+    return Account.objects.filter(parent_account_id=account_id).exists()
@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-19 18:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0021_add_account_favorite'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatementCycle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('statement_start', models.DateField()),
+                ('statement_end', models.DateField()),
+                ('statement_due', models.DateField()),
+                ('statement_pay_day', models.DateField()),
+                ('credits', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('debits', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('closing_balance', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('closed', models.BooleanField(default=False)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statement_cycles', to='accounts.account')),
+            ],
+            options={
+                'ordering': ['account', 'statement_start'],
+                'unique_together': {('account', 'statement_start')},
+            },
+        ),
+    ]
@@ -256,3 +256,40 @@ class Reward(models.Model):
 
     def __str__(self):
         return f"{self.reward_date} : {self.reward_account.account_name} (${self.reward_amount})"
+
+
+class StatementCycle(models.Model):
+    """
+    Model representing one statement period of a credit card account.
+
+    Fields:
+    - account (ForeignKey): The credit card account
+    - statement_start (Date): The day the period opens after (exclusive)
+    - statement_end (Date): The day the statement closes (inclusive)
+    - statement_due (Date): The payment due date of the statement
+    - statement_pay_day (Date): The day the payment is scheduled
+    - credits (DecimalField): Total of the period's real credits
+    - debits (DecimalField): Total of the period's real debits
+    - closing_balance (DecimalField): The account balance at statement_end
+    - closed (Boolean): Set once the due date has passed; a closed cycle is
+    never re-aggregated
+    """
+
+    account = models.ForeignKey(
+        Account, on_delete=models.CASCADE, related_name="statement_cycles"
+    )
+    statement_start = models.DateField()
+    statement_end = models.DateField()
+    statement_due = models.DateField()
+    statement_pay_day = models.DateField()
+    credits = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    debits = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    closing_balance = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    closed = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ("account", "statement_start")
+        ordering = ["account", "statement_start"]
+
+    def __str__(self):
+        return f"{self.account.account_name} : {self.statement_start} - {self.statement_end}"
@@ -3,7 +3,18 @@ from accounts.services.account_financials import (
     AccountNotFound as AccountNotFound,
     list_accounts_with_financials as list_accounts_with_financials,
 )
+from accounts.services.account_financials import (
+    alist_accounts_with_financials as alist_accounts_with_financials,
+)
+from accounts.services.favorite_balances import (
+    favorite_balance_summaries as favorite_balance_summaries,
+    afavorite_balance_summaries as afavorite_balance_summaries,
+)
 from accounts.services.forecast import get_account_forecast as get_account_forecast
 from accounts.services.investment_performance import (
     calculate_investment_return as calculate_investment_return,
 )
+from accounts.services.statement_cycles import (
+    list_statement_cycles as list_statement_cycles,
+    sync_statement_cycles as sync_statement_cycles,
+)
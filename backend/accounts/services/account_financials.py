@@ -1,5 +1,10 @@
 from datetime import date
-from accounts.models import Account, AccountFavorite, Reward
+from functools import partial
+from accounts.models import Account, AccountFavorite, Reward, StatementCycle
+from accounts.lookups import get_account, has_child_accounts
+from core.aio import gather_limited, run_sync
+from core.cache.helpers import cached
+from core.cache.memo import memoize
 from utils.dates import get_todays_date_timezone_adjusted
 from dateutil.relativedelta import relativedelta
 from decimal import Decimal
@@ -16,7 +21,6 @@ from transactions.services import (
 )
 from accounts.dto import DomainAccount, DomainBank, DomainAccountType
 from core.dto.utils import dto_from_model
-from django.core.cache import cache
 from core.cache.keys import account_financials
 from accounts.api.schemas.account import (
     AccountQuery,
@@ -27,43 +31,62 @@ class AccountNotFound(Exception):
     pass
 
 
+def _user_pk(user):
+    return user.pk if user and isinstance(getattr(user, "pk", None), int) else None
+
+
+def _financials_key(account_id: int, today: date | None = None, user=None) -> str:
+    # Cache key is per-user since is_favorite is per-user
+    return f"{account_financials(account_id)}:{_user_pk(user)}"
+
+
+@memoize("account_financials")
+@cached(_financials_key, ttl=60 * 60)
 def get_account_financials(account_id: int, today: date | None = None, user=None):
     """
     Returns a DomainAccount with all calculated financial fields, served from cache when available.
 
-    Due and statement dates are computed relative to today: if the day-of-month hasn't
-    passed yet this month, the date lands this month; otherwise it rolls to next month.
+    Due and statement dates of credit card accounts are the next ones of their stored
+    statement cycles. Otherwise they are computed relative to today: if the day-of-month
+    hasn't passed yet this month, the date lands this month; otherwise it rolls to next month.
     Parent accounts sum cleared and pending balances across all children instead of
     querying their own (empty) transaction set.
     """
-    # Cache key is per-user since is_favorite is per-user
-    user_pk = user.pk if user and isinstance(getattr(user, "pk", None), int) else None
-    key = f"{account_financials(account_id)}:{user_pk}"
-    data = cache.get(key)
-    if data:
-        return data
-
+    user_pk = _user_pk(user)
     today = today or get_todays_date_timezone_adjusted()
 
-    qs = Account.objects.filter(id=account_id)
-    if not qs.exists():
+    try:
+        account = get_account(account_id)
+    except Account.DoesNotExist:
         raise AccountNotFound()
 
-    account = qs.first()
-
-    # Calcuate due/statement dates
-    due_date = (
-        today.replace(day=1) + relativedelta(day=account.due_day)
-        if account.due_day > today.day
-        else today.replace(day=1) + relativedelta(months=1, day=account.due_day)
-    )
-
-    statement_date = (
-        today.replace(day=1) + relativedelta(day=account.statement_day)
-        if account.statement_day > today.day
-        else today.replace(day=1)
-        + relativedelta(months=1, day=account.statement_day)
-    )
+    # Next statement close and due date come from the persisted cycles;
+    # accounts without them fall back to the day-of-month arithmetic
+    due_date = statement_date = None
+    if account.account_type.slug == "credit-card":
+        for statement_end, statement_due in (
+            StatementCycle.objects.filter(account_id=account_id, statement_due__gt=today)
+            .order_by("statement_start")
+            .values_list("statement_end", "statement_due")[:2]
+        ):
+            due_date = due_date or statement_due
+            if statement_date is None and statement_end > today:
+                statement_date = statement_end
+
+    if due_date is None:
+        due_date = (
+            today.replace(day=1) + relativedelta(day=account.due_day)
+            if account.due_day > today.day
+            else today.replace(day=1) + relativedelta(months=1, day=account.due_day)
+        )
+
+    if statement_date is None:
+        statement_date = (
+            today.replace(day=1) + relativedelta(day=account.statement_day)
+            if account.statement_day > today.day
+            else today.replace(day=1)
+            + relativedelta(months=1, day=account.statement_day)
+        )
 
     # Get rewards amount for account
     rewards_total_object = (
@@ -78,7 +101,7 @@ def get_account_financials(account_id: int, today: date | None = None, user=None
     )
 
     # For parent accounts, sum balances across all children
-    is_parent = account.child_accounts.exists()
+    is_parent = has_child_accounts(account_id)
     if is_parent:
         child_ids = list(account.child_accounts.values_list('id', flat=True))
         cleared_balance = sum(get_account_cleared_balance(cid) for cid in child_ids)
@@ -126,7 +149,6 @@ def get_account_financials(account_id: int, today: date | None = None, user=None
         interest_child_account_id=account.interest_child_account_id,
     )
 
-    cache.set(key, financials, timeout=60 * 60)
     return financials
 
 
@@ -216,9 +238,7 @@ def last_year_six_month_reward_amounts(account_id: int):
     return oldest_to_newest
 
 
-def list_accounts_with_financials(query: AccountQuery, user=None) -> list[DomainAccount]:
-    account_list = []
-
+def _account_list_queryset(query: AccountQuery):
     qs = Account.objects.all()
 
     if not query.inactive:
@@ -230,10 +250,29 @@ def list_accounts_with_financials(query: AccountQuery, user=None) -> list[Domain
     if query.account_type is not None and query.account_type == 0:
         qs = qs.filter(active=False)
 
-    qs = qs.order_by("account_type__id", "bank__bank_name", "account_name")
+    return qs.order_by("account_type__id", "bank__bank_name", "account_name")
+
+
+def list_accounts_with_financials(query: AccountQuery, user=None) -> list[DomainAccount]:
+    account_list = []
 
-    for account in qs:
+    for account in _account_list_queryset(query):
         result = get_account_financials(account.id, user=user)
         account_list.append(result)
 
     return account_list
+
+
+async def alist_accounts_with_financials(query: AccountQuery, user=None) -> list[DomainAccount]:
+    """
+    Async list_accounts_with_financials: each account's financials are
+    computed concurrently, up to the async read concurrency.
+    """
+    account_ids = [
+        account_id
+        async for account_id in _account_list_queryset(query).values_list("id", flat=True)
+    ]
+    return await gather_limited(
+        partial(run_sync, get_account_financials, account_id, user=user)
+        for account_id in account_ids
+    )
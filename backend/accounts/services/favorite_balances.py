@@ -0,0 +1,62 @@
+from datetime import timedelta
+from typing import List
+
+from dateutil.relativedelta import relativedelta
+
+from accounts.api.schemas.account import FavoriteBalanceSummary
+from accounts.models import Account, AccountFavorite
+from core.aio import run_sync
+from transactions.services.projected_balances import get_projected_balances
+from utils.dates import get_todays_date_timezone_adjusted
+import logging
+
+error_logger = logging.getLogger("error")
+
+
+def favorite_balance_summaries(user) -> List[FavoriteBalanceSummary]:
+    """
+    Returns current balance and projected 1st-of-next-month balance for the
+    user's active favorite accounts. The balances are projected together in
+    one grouped pass.
+    """
+    if not user:
+        return []
+
+    today = get_todays_date_timezone_adjusted()
+    first_of_next_month = today.replace(day=1) + relativedelta(months=1)
+    # Query through the 2nd so transactions dated ON the 1st are included
+    # (the service filter is transaction_date__lt=end_date)
+    end_date = first_of_next_month + timedelta(days=1)
+
+    favorite_ids = AccountFavorite.objects.filter(user=user).values_list("account_id", flat=True)
+    accounts = Account.objects.filter(id__in=favorite_ids, active=True).select_related(
+        "account_type", "bank"
+    )
+
+    try:
+        balances = get_projected_balances([a.id for a in accounts], end_date)
+    except Exception as e:
+        error_logger.exception(f"Favorite balances error: {e}")
+        balances = {}
+
+    result = []
+    for account in accounts:
+        balance = balances.get(account.id)
+        result.append(
+            FavoriteBalanceSummary(
+                id=account.id,
+                account_name=account.account_name,
+                account_type_id=account.account_type_id,
+                account_type_color=account.account_type.color,
+                account_type_slug=account.account_type.slug,
+                logo_url=account.bank.logo_url if account.bank else None,
+                balance=balance.balance if balance else None,
+                projected_balance=balance.projected_balance if balance else None,
+            )
+        )
+    return result
+
+
+async def afavorite_balance_summaries(user) -> List[FavoriteBalanceSummary]:
+    """Async favorite_balance_summaries, run off the event loop."""
+    return await run_sync(favorite_balance_summaries, user)
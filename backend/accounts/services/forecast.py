@@ -1,10 +1,5 @@
-from datetime import datetime
-from utils.dates import (
-    get_dates_in_range,
-    get_forecast_end_date,
-    get_forecast_start_date,
-)
-from transactions.services import get_account_transactions_and_balances
+from utils.dates import get_forecast_end_date, get_forecast_start_date
+from accounts.services.forecast_series import get_forecast_series
 from accounts.dto import (
     DomainForecast,
     DomainDatasetObject,
@@ -14,31 +9,18 @@ from accounts.dto import (
 
 
 def get_account_forecast(
-    account_id: int, start_interval: int, end_interval: int
+    account_id: int, start_interval: int, end_interval: int, resolution: str = "day"
 ) -> DomainForecast:
-    labels = get_dates_in_range(start_interval, end_interval)
     start_date = get_forecast_start_date(start_interval)
     end_date = get_forecast_end_date(end_interval)
 
-    transactions_list, previous_balance = get_account_transactions_and_balances(
-        end_date, account_id, True, True, start_date, False
+    # Sliced from the account's precomputed daily series; weekly and monthly
+    # resolutions keep one point per period.
+    points = get_forecast_series(account_id, start_date, end_date).points(
+        start_date, end_date, resolution
     )
-
-    data = []
-    daily_total = previous_balance
-
-    for label_date in labels:
-        parsed_date = datetime.strptime(label_date, "%b %d, %y")
-        formatted_date = parsed_date.strftime("%Y-%m-%d")
-        transactions_today = [
-            t for t in transactions_list
-            if str(t["transaction_date"] if isinstance(t, dict) else t.transaction_date) == formatted_date
-        ]
-        if transactions_today:
-            last = transactions_today[-1]
-            daily_total = last["balance"] if isinstance(last, dict) else last.balance
-        previous_balance = daily_total
-        data.append(daily_total)
+    labels = [day.strftime("%b %d, %y") for day, _ in points]
+    data = [balance for _, balance in points]
 
     fill = DomainFillObject(
         target=DomainTargetObject(value=0),
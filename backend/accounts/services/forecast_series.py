@@ -0,0 +1,157 @@
+"""
+Precomputed daily balance series behind the account forecast chart.
+
+The forecast register of an account only changes when its transactions do or
+when a forecast task rewrites its reminder and forecast rows, yet the chart
+asks for a different window on every pan and zoom. Instead of rebuilding the
+register per request, one series per account holds the end-of-day balance of
+every day from HISTORY_DAYS before to HORIZON_DAYS after the day it was built,
+as int64 cents msgpack-encoded and zlib-compressed. Any window inside it, at
+daily, weekly or monthly resolution, is a slice of that array.
+
+The series lives under the account's combined transactions key, so every
+change that drops the register drops it too, and the forecast tasks write a
+fresh one as soon as they finish. A series built on an earlier day, or a
+window reaching past it, is rebuilt from the register as before.
+"""
+import zlib
+from array import array
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+import msgpack
+from core.cache import store
+
+from core.cache.keys import account_forecast_series
+from transactions.services import get_account_transactions_and_balances
+from utils.dates import get_todays_date_timezone_adjusted
+
+FORMAT_VERSION = 1
+COMPRESSION_LEVEL = 1
+SERIES_TIMEOUT = 60 * 60 * 24
+HISTORY_DAYS = 365
+HORIZON_DAYS = 365
+
+
+@dataclass
+class BalanceSeries:
+    """End-of-day balances in cents, one per day from start."""
+
+    built: date
+    start: date
+    cents: array
+
+    @property
+    def end(self) -> date:
+        return self.start + timedelta(days=len(self.cents) - 1)
+
+    def covers(self, start: date, end: date) -> bool:
+        return self.start <= start and end <= self.end
+
+    def points(self, start: date, end: date, resolution: str = "day") -> List[tuple]:
+        """
+        (day, balance) pairs for start..end inclusive. Weekly and monthly
+        views keep the last day of each week or month inside the window.
+        """
+        offset = (start - self.start).days
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        values = self.cents[offset:offset + len(days)]
+        if resolution != "day":
+            keep = []
+            for i, day in enumerate(days):
+                last = i == len(days) - 1
+                if last or _bucket(day, resolution) != _bucket(days[i + 1], resolution):
+                    keep.append(i)
+            days = [days[i] for i in keep]
+            values = [values[i] for i in keep]
+        return [(day, Decimal(value).scaleb(-2)) for day, value in zip(days, values)]
+
+
+def _bucket(day: date, resolution: str) -> tuple:
+    if resolution == "week":
+        return day.isocalendar()[:2]
+    return (day.year, day.month)
+
+
+def build_series(account_id: int, start: date, end: date, today: date) -> BalanceSeries:
+    """
+    Reads the account's forecast register once and records the balance at
+    the close of each day from start to end, carrying it over days without
+    transactions.
+    """
+    transactions, previous_balance = get_account_transactions_and_balances(
+        end + timedelta(days=1), account_id, True, True, start, False
+    )
+    closing = {}
+    for transaction in transactions:
+        closing[transaction.transaction_date] = transaction.balance
+
+    cents = array("q")
+    balance = previous_balance
+    for i in range((end - start).days + 1):
+        balance = closing.get(start + timedelta(days=i), balance)
+        cents.append(int(Decimal(balance) * 100))
+    return BalanceSeries(built=today, start=start, cents=cents)
+
+
+def encode_series(series: BalanceSeries) -> bytes:
+    entry = {
+        "version": FORMAT_VERSION,
+        "built": series.built.toordinal(),
+        "start": series.start.toordinal(),
+        "cents": series.cents.tobytes(),
+    }
+    return zlib.compress(msgpack.packb(entry, use_bin_type=True), COMPRESSION_LEVEL)
+
+
+def decode_series(blob: bytes) -> Optional[BalanceSeries]:
+    try:
+        entry = msgpack.unpackb(zlib.decompress(blob), raw=False)
+    except (zlib.error, ValueError, msgpack.UnpackException):
+        return None
+    if entry.get("version") != FORMAT_VERSION:
+        return None
+    cents = array("q")
+    cents.frombytes(entry["cents"])
+    return BalanceSeries(
+        built=date.fromordinal(entry["built"]),
+        start=date.fromordinal(entry["start"]),
+        cents=cents,
+    )
+
+
+def rebuild_forecast_series(account_ids: Iterable[int]) -> None:
+    """Builds and stores the full series of each account, replacing any cached one."""
+    today = get_todays_date_timezone_adjusted()
+    start = today - timedelta(days=HISTORY_DAYS)
+    end = today + timedelta(days=HORIZON_DAYS)
+    for account_id in dict.fromkeys(i for i in account_ids if i is not None):
+        series = build_series(account_id, start, end, today)
+        store.set(
+            account_forecast_series(account_id),
+            encode_series(series),
+            timeout=SERIES_TIMEOUT,
+        )
+
+
+def get_forecast_series(account_id: int, start: date, end: date) -> BalanceSeries:
+    """
+    Returns a series covering start..end, from the cache when today's series
+    covers the window. Windows wider than the cached span are built directly
+    and not cached.
+    """
+    today = get_todays_date_timezone_adjusted()
+    full_start = today - timedelta(days=HISTORY_DAYS)
+    full_end = today + timedelta(days=HORIZON_DAYS)
+    if not (full_start <= start and end <= full_end):
+        return build_series(account_id, start, end, today)
+
+    key = account_forecast_series(account_id)
+    blob = store.get(key)
+    series = decode_series(blob) if blob else None
+    if series is None or series.built != today or not series.covers(start, end):
+        series = build_series(account_id, full_start, full_end, today)
+        store.set(key, encode_series(series), timeout=SERIES_TIMEOUT)
+    return series
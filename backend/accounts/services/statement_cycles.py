@@ -0,0 +1,291 @@
+"""
+Persisted statement cycles of credit card accounts.
+
+`sync_statement_cycles` keeps an account's StatementCycle rows in step with
+its statement settings and its transactions:
+
+- The cycles from the forecast anchor (the statement day of the month before
+  today, where update_cc_forecast_cache has always started) through the
+  forecast end are the open chain. Open rows whose dates no longer match the
+  account's settings are replaced.
+- A cycle closes once its due date has passed, or once the anchor moves past
+  it. It is aggregated one last time and never again, so a closed cycle keeps
+  its totals even when a transaction is later written into its dates.
+- The open cycles are aggregated together from one query that sums the
+  account's real transactions per day, instead of one aggregate per cycle.
+- The first sync of an account backfills closed cycles back to its earliest
+  transaction, so the statement history starts complete.
+"""
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Sequence, Tuple
+
+from dateutil.relativedelta import relativedelta
+from django.db.models import Case, DecimalField, F, Min, Q, QuerySet, Sum, When
+
+from accounts.models import Account, StatementCycle
+from transactions.api.dependencies.transaction_utilities import (
+    annotate_transaction_total,
+)
+from transactions.models import Transaction
+from utils.dates import get_todays_date_timezone_adjusted, increment_date
+
+# Upper bound on the cycles a first sync backfills.
+MAX_HISTORY_CYCLES = 120
+
+CycleDates = Tuple[date, date, date, date]
+
+
+def forecast_anchor(today: date, statement_day: int) -> date:
+    """Start of the first forecast cycle: the statement day one month before today."""
+    return today - relativedelta(months=1) + relativedelta(day=statement_day)
+
+
+def _on_or_after(start: date, day: int) -> date:
+    candidate = start + relativedelta(day=day)
+    if candidate < start:
+        candidate = start + relativedelta(months=1, day=day)
+    return candidate
+
+
+def _boundary(anchor: date, period: str, length: int, statement_day: int) -> date:
+    """anchor moved by length periods, back on the statement day for monthly and yearly cycles."""
+    moved = increment_date(anchor, period, length)
+    if period in ("m", "y"):
+        moved += relativedelta(day=statement_day)
+    return moved
+
+
+def cycle_dates(
+    anchor: date,
+    through: date,
+    period: str,
+    length: int,
+    statement_day: int,
+    due_day: int,
+    pay_day: int,
+    back: int = 0,
+) -> List[CycleDates]:
+    """
+    (start, end, due, pay day) of each cycle from `back` cycles before anchor
+    while the cycle starts on or before through.
+
+    The due and pay dates of the anchor's cycle land on their day of the month
+    on or after its statement end; every other cycle's are as many months
+    away as the cycle is from the anchor. Every date is computed from the
+    anchor rather than from the cycle before it, so a statement day that a
+    short month clamps (the 29th to the 31st) does not drift.
+    """
+    first_end = _boundary(anchor, period, length, statement_day)
+    first_due = _on_or_after(first_end, due_day)
+    first_pay_day = _on_or_after(first_end, pay_day)
+
+    cycles = []
+    index = -back
+    statement_start = _boundary(anchor, period, index * length, statement_day)
+    while statement_start <= through:
+        statement_end = _boundary(anchor, period, (index + 1) * length, statement_day)
+        cycles.append((
+            statement_start,
+            statement_end,
+            first_due + relativedelta(months=index, day=due_day),
+            first_pay_day + relativedelta(months=index, day=pay_day),
+        ))
+        statement_start = statement_end
+        index += 1
+    return cycles
+
+
+def _daily_totals(transactions: QuerySet, start: date, end: date):
+    """(date, credits, debits) of each day in (start, end], from one grouped query."""
+    decimal = DecimalField(max_digits=12, decimal_places=2)
+    rows = (
+        transactions.filter(transaction_date__gt=start, transaction_date__lte=end)
+        .values("transaction_date")
+        .annotate(
+            credits=Sum(Case(When(pretty_total__gt=0, then=F("pretty_total")), output_field=decimal)),
+            debits=Sum(Case(When(pretty_total__lt=0, then=F("pretty_total")), output_field=decimal)),
+        )
+        .order_by("transaction_date")
+    )
+    return [
+        (row["transaction_date"], row["credits"] or Decimal(0), row["debits"] or Decimal(0))
+        for row in rows
+    ]
+
+
+def cycle_totals(
+    transactions: QuerySet, spans: Sequence[Tuple[date, date]]
+) -> List[Tuple[Decimal, Decimal]]:
+    """
+    (credits, debits) of transactions, annotated with pretty_total, dated
+    within each (start, end] span.
+    """
+    if not spans:
+        return []
+    days = _daily_totals(
+        transactions,
+        min(start for start, _ in spans),
+        max(end for _, end in spans),
+    )
+    dates = [day for day, _, _ in days]
+    totals = []
+    for start, end in spans:
+        credits = debits = Decimal(0)
+        for _, day_credits, day_debits in days[bisect_right(dates, start):bisect_right(dates, end)]:
+            credits += day_credits
+            debits += day_debits
+        totals.append((credits, debits))
+    return totals
+
+
+def account_transactions(account: Account) -> QuerySet[Transaction]:
+    """The account's non-archived transactions, annotated with pretty_total."""
+    return annotate_transaction_total(
+        Transaction.objects.filter(
+            Q(source_account_id=account.id) | Q(destination_account_id=account.id)
+        ).exclude(status__slug="archived"),
+        account.id,
+    )
+
+
+def _history_dates(account: Account, anchor: date, transactions: QuerySet) -> List[CycleDates]:
+    """The closed cycles before anchor back to the one holding the earliest transaction."""
+    earliest = transactions.aggregate(earliest=Min("transaction_date"))["earliest"]
+    if earliest is None or earliest > anchor:
+        return []
+    period, length = account.statement_cycle_period, account.statement_cycle_length
+    back = 1
+    while (
+        back < MAX_HISTORY_CYCLES
+        and _boundary(anchor, period, -back * length, account.statement_day) >= earliest
+    ):
+        back += 1
+    # The last history cycle ends on the anchor, where the forecast cycles start
+    return cycle_dates(
+        anchor,
+        anchor - relativedelta(days=1),
+        period,
+        length,
+        account.statement_day,
+        account.due_day,
+        account.pay_day,
+        back=back,
+    )
+
+
+def _aggregate(cycles: List[StatementCycle], transactions: QuerySet, opening: Decimal):
+    """Sets credits, debits and closing_balance of cycles from one grouped query."""
+    first_start = min(cycle.statement_start for cycle in cycles)
+    opening += (
+        transactions.filter(transaction_date__lte=first_start)
+        .aggregate(sum=Sum("pretty_total"))["sum"]
+        or Decimal(0)
+    )
+    days = _daily_totals(transactions, first_start, max(cycle.statement_end for cycle in cycles))
+    dates = [day for day, _, _ in days]
+    running = [opening]
+    for _, credits, debits in days:
+        running.append(running[-1] + credits + debits)
+
+    for cycle in cycles:
+        cycle.credits = cycle.debits = Decimal(0)
+        for _, credits, debits in days[
+            bisect_right(dates, cycle.statement_start):bisect_right(dates, cycle.statement_end)
+        ]:
+            cycle.credits += credits
+            cycle.debits += debits
+        cycle.closing_balance = running[bisect_right(dates, cycle.statement_end)]
+
+
+def sync_statement_cycles(
+    account: Account,
+    through: Optional[date] = None,
+    today: Optional[date] = None,
+) -> List[StatementCycle]:
+    """
+    Brings the statement cycles of a credit card account up to date and
+    returns the cycles from the forecast anchor through `through` (a year from
+    today by default), oldest first.
+    """
+    today = today or get_todays_date_timezone_adjusted()
+    through = through or today + relativedelta(years=1)
+    anchor = forecast_anchor(today, account.statement_day)
+    transactions = account_transactions(account)
+
+    stored = {
+        cycle.statement_start: cycle
+        for cycle in StatementCycle.objects.filter(account=account)
+    }
+    expected = cycle_dates(
+        anchor,
+        through,
+        account.statement_cycle_period,
+        account.statement_cycle_length,
+        account.statement_day,
+        account.due_day,
+        account.pay_day,
+    )
+    if not stored:
+        expected = _history_dates(account, anchor, transactions) + expected
+
+    cycles, pending, new, replaced = [], [], [], []
+    for start, end, due, pay_day in expected:
+        cycle = stored.pop(start, None)
+        if cycle is not None and not cycle.closed and (
+            cycle.statement_end,
+            cycle.statement_due,
+            cycle.statement_pay_day,
+        ) != (end, due, pay_day):
+            # The account's statement settings changed
+            replaced.append(cycle.id)
+            cycle = None
+        if cycle is None:
+            cycle = StatementCycle(
+                account=account,
+                statement_start=start,
+                statement_end=end,
+                statement_due=due,
+                statement_pay_day=pay_day,
+            )
+            new.append(cycle)
+        if not cycle.closed:
+            pending.append(cycle)
+        cycles.append(cycle)
+
+    # Open rows off the chain either fell behind the anchor, and close now,
+    # or belong to settings that no longer apply
+    for cycle in stored.values():
+        if cycle.closed:
+            continue
+        if cycle.statement_start < anchor:
+            pending.append(cycle)
+        else:
+            replaced.append(cycle.id)
+
+    if pending:
+        _aggregate(pending, transactions, account.archive_balance + account.opening_balance)
+        for cycle in pending:
+            cycle.closed = cycle.statement_start < anchor or cycle.statement_due < today
+
+    if replaced:
+        StatementCycle.objects.filter(id__in=replaced).delete()
+    existing = [cycle for cycle in pending if cycle.pk is not None]
+    if existing:
+        StatementCycle.objects.bulk_update(
+            existing, ["credits", "debits", "closing_balance", "closed"]
+        )
+    if new:
+        # A sync running at the same time may have stored the same cycles
+        # already; they hold the same dates, so its rows are kept.
+        StatementCycle.objects.bulk_create(new, ignore_conflicts=True)
+
+    return [cycle for cycle in cycles if cycle.statement_start >= anchor]
+
+
+def list_statement_cycles(account_id: int) -> List[StatementCycle]:
+    """Stored statement cycles of an account, newest first."""
+    return list(
+        StatementCycle.objects.filter(account_id=account_id).order_by("-statement_start")
+    )
@@ -13,6 +13,7 @@ from core.cache.keys import (
     account_all,
 )
 from core.broadcast import broadcast_invalidate
+from core.cache import reference
 
 
 @receiver(post_save, sender=Account)
@@ -37,7 +38,14 @@ def update_cache_on_save(sender, instance, **kwargs):
     if instance.parent_account_id:
         delete_pattern(account_financials(instance.parent_account_id))
         delete_pattern(account_combined_transactions(instance.parent_account_id))
-    broadcast_invalidate(["accounts", "account_forecast", "tag_graph", "retirement_forecast"])
+    if getattr(instance, "_name_changed", True):
+        reference.invalidate(reference.ACCOUNT)
+    if getattr(instance, "_parent_changed", True):
+        reference.invalidate(reference.ACCOUNT_PARENT)
+    broadcast_invalidate(
+        ["accounts", "account_forecast", "tag_graph", "retirement_forecast"],
+        account_ids=[instance.id, instance.parent_account_id],
+    )
 
 
 @receiver(post_delete, sender=Account)
@@ -49,7 +57,11 @@ def update_cache_on_delete(sender, instance, **kwargs):
         Q(source_account_id=instance.id) | Q(destination_account_id=instance.id)
     ).delete()
     delete_pattern(account_all(instance.id))
-    broadcast_invalidate(["accounts", "account_forecast", "tag_graph", "retirement_forecast"])
+    reference.invalidate(reference.ACCOUNT, reference.ACCOUNT_PARENT)
+    broadcast_invalidate(
+        ["accounts", "account_forecast", "tag_graph", "retirement_forecast"],
+        account_ids=[instance.id, instance.parent_account_id],
+    )
 
 
 @receiver(pre_save, sender=Account)
@@ -58,8 +70,13 @@ def detect_relevant_changes(sender, instance, **kwargs):
 
     if not instance.pk:
         instance._should_update_cache = True
+        instance._name_changed = True
+        instance._parent_changed = True
         return
 
+    instance._name_changed = instance.tracker.has_changed("account_name")
+    instance._parent_changed = instance.tracker.has_changed("parent_account_id")
+
     relevant = {
         "annual_rate",
         "opening_balance",
@@ -0,0 +1,48 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from accounts.models import StatementCycle
+
+
+AUTH = {"Authorization": "Bearer test-api-key"}
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+def test_statements_newest_first(api_client, test_credit_card_account):
+    StatementCycle.objects.filter(account=test_credit_card_account).delete()
+    for month, closed in ((4, True), (5, False)):
+        StatementCycle.objects.create(
+            account=test_credit_card_account,
+            statement_start=date(2026, month, 15),
+            statement_end=date(2026, month + 1, 15),
+            statement_due=date(2026, month + 2, 15),
+            statement_pay_day=date(2026, month + 2, 15),
+            credits=Decimal("10.00"),
+            debits=Decimal("-40.00"),
+            closing_balance=Decimal("500.00"),
+            closed=closed,
+        )
+
+    response = api_client.get(
+        f"/accounts/{test_credit_card_account.id}/statements",
+        headers=AUTH,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [cycle["statement_start"] for cycle in data] == ["2026-05-15", "2026-04-15"]
+    assert [cycle["closed"] for cycle in data] == [False, True]
+    assert Decimal(data[0]["debits"]) == Decimal("-40.00")
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+def test_statements_empty_for_account_without_cycles(api_client, test_checking_account):
+    response = api_client.get(
+        f"/accounts/{test_checking_account.id}/statements",
+        headers=AUTH,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == []
@@ -1,5 +1,7 @@
 import pytest
+from datetime import date
 from decimal import Decimal
+from accounts.models import StatementCycle
 from accounts.services import get_account_financials, list_accounts_with_financials, AccountNotFound
 from accounts.dto import DomainAccount
 from accounts.api.schemas.account import AccountQuery
@@ -32,6 +34,30 @@ def test_get_account_financials_includes_computed_dates(test_checking_account):
     assert result.statement_date is not None
 
 
+@pytest.mark.django_db
+@pytest.mark.service
+def test_get_account_financials_takes_credit_card_dates_from_statement_cycles(
+    test_credit_card_account,
+):
+    StatementCycle.objects.filter(account=test_credit_card_account).delete()
+    for start, end, due in (
+        (date(2026, 5, 15), date(2026, 6, 15), date(2026, 6, 18)),
+        (date(2026, 6, 15), date(2026, 7, 15), date(2026, 7, 18)),
+    ):
+        StatementCycle.objects.create(
+            account=test_credit_card_account,
+            statement_start=start,
+            statement_end=end,
+            statement_due=due,
+            statement_pay_day=due,
+        )
+
+    result = get_account_financials(test_credit_card_account.id, today=date(2026, 6, 17))
+
+    assert result.due_date == date(2026, 6, 18)
+    assert result.statement_date == date(2026, 7, 15)
+
+
 @pytest.mark.django_db
 @pytest.mark.service
 def test_list_accounts_with_financials_active_only(
@@ -0,0 +1,147 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Account
+from accounts.services import get_account_forecast
+from accounts.services.forecast_series import (
+    HORIZON_DAYS,
+    get_forecast_series,
+    rebuild_forecast_series,
+)
+from transactions.models import ReminderCacheTransaction, Transaction
+from transactions.services import get_account_transactions_and_balances
+from transactions.tasks import update_reminder_cache
+from utils.dates import get_todays_date_timezone_adjusted
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+TODAY = get_todays_date_timezone_adjusted()
+
+
+@pytest.fixture
+def account(
+    test_checking_account,
+    test_reminder,
+    test_pending_transaction_status,
+    test_cleared_transaction_status,
+    test_income_transaction_type,
+    test_expense_transaction_type,
+):
+    for days, amount, status, kind in [
+        (-20, 1000, test_cleared_transaction_status, test_income_transaction_type),
+        (-20, -30, test_cleared_transaction_status, test_expense_transaction_type),
+        (-3, -45, test_pending_transaction_status, test_expense_transaction_type),
+        (9, -120, test_pending_transaction_status, test_expense_transaction_type),
+    ]:
+        Transaction.objects.create(
+            transaction_date=TODAY + timedelta(days=days),
+            total_amount=amount,
+            status=status,
+            transaction_type=kind,
+            source_account=test_checking_account,
+        )
+    ReminderCacheTransaction.objects.create(
+        transaction_date=TODAY + timedelta(days=30),
+        total_amount=500,
+        status=test_pending_transaction_status,
+        transaction_type=test_income_transaction_type,
+        source_account=test_checking_account,
+        reminder=test_reminder,
+    )
+    return test_checking_account
+
+
+def _register_balances(account_id, start, end):
+    # The per-request computation the series replaces.
+    transactions, balance = get_account_transactions_and_balances(
+        end + timedelta(days=1), account_id, True, True, start, False
+    )
+    balances = []
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        today = [t for t in transactions if t.transaction_date == day]
+        if today:
+            balance = today[-1].balance
+        balances.append(balance)
+    return balances
+
+
+def test_series_matches_register(account):
+    start, end = TODAY - timedelta(days=25), TODAY + timedelta(days=40)
+
+    points = get_forecast_series(account.id, start, end).points(start, end)
+
+    assert [balance for _, balance in points] == _register_balances(account.id, start, end)
+    assert points[-1][1] == Decimal("55.55") + Decimal("555.55") + 1000 - 30 - 45 - 120 + 500
+
+
+def test_pans_and_zooms_do_not_query(account):
+    get_account_forecast(account.id, 7, 7)
+
+    with CaptureQueriesContext(connection) as queries:
+        for start_interval, end_interval in [(30, 30), (0, 90), (365, HORIZON_DAYS)]:
+            get_account_forecast(account.id, start_interval, end_interval)
+
+    assert len(queries) == 0
+
+
+@pytest.mark.parametrize("resolution", ["week", "month"])
+def test_downsampled_views_keep_period_closing_balances(account, resolution):
+    daily = get_account_forecast(account.id, 60, 120)
+    coarse = get_account_forecast(account.id, 60, 120, resolution)
+
+    closing = dict(zip(daily.labels, daily.datasets[0].data))
+    assert len(coarse.labels) < len(daily.labels) / 4
+    assert coarse.labels[-1] == daily.labels[-1]
+    for label, balance in zip(coarse.labels, coarse.datasets[0].data):
+        assert closing[label] == balance
+
+
+def test_rebuild_replaces_cached_series(account, test_pending_transaction_status, test_expense_transaction_type):
+    before = get_account_forecast(account.id, 0, 20).datasets[0].data[-1]
+    Transaction.objects.create(
+        transaction_date=TODAY + timedelta(days=2),
+        total_amount=-200,
+        status=test_pending_transaction_status,
+        transaction_type=test_expense_transaction_type,
+        source_account=account,
+    )
+
+    rebuild_forecast_series([account.id])
+
+    assert get_account_forecast(account.id, 0, 20).datasets[0].data[-1] == before - 200
+
+
+def test_child_reminder_change_rebuilds_parent_series(
+    bank,
+    checking_account_type,
+    test_checking_account,
+    test_reminder,
+    test_pending_transaction_status,
+    test_income_transaction_type,
+):
+    parent = Account.objects.create(
+        account_name="Parent",
+        account_type=checking_account_type,
+        bank=bank,
+        opening_balance=0,
+        archive_balance=0,
+    )
+    test_checking_account.parent_account = parent
+    test_checking_account.save()
+    test_reminder.next_date = TODAY + timedelta(days=10)
+    test_reminder.save()
+    update_reminder_cache(test_reminder.id)
+    start, end = TODAY, TODAY + timedelta(days=HORIZON_DAYS)
+    before = get_forecast_series(parent.id, start, end).points(start, end)
+
+    test_reminder.amount = 250
+    test_reminder.save()
+    update_reminder_cache(test_reminder.id)
+
+    after = get_forecast_series(parent.id, start, end).points(start, end)
+    assert after != before
+    assert [balance for _, balance in after] == _register_balances(parent.id, start, end)
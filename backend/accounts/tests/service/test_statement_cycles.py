@@ -0,0 +1,172 @@
+"""
+Statement cycle tests.
+
+The card closes on the 15th and is due on the 15th of the following month.
+With today on 2026-06-20 the forecast anchor is 2026-05-15: that cycle's due
+date has passed, so it is closed, and the cycles from 2026-06-15 on are open.
+"""
+import calendar
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from accounts.models import Account, StatementCycle
+from accounts.services.statement_cycles import sync_statement_cycles
+from transactions.models import Transaction
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+TODAY = date(2026, 6, 20)
+THROUGH = date(2026, 8, 31)
+
+
+@pytest.fixture
+def card(test_credit_card_account):
+    # Creating the account synced its cycles against the real date
+    StatementCycle.objects.filter(account=test_credit_card_account).delete()
+    test_credit_card_account.refresh_from_db()
+    return test_credit_card_account
+
+
+@pytest.fixture
+def spend(card, test_pending_transaction_status, test_expense_transaction_type):
+    def create(day, amount):
+        return Transaction.objects.create(
+            transaction_date=day,
+            total_amount=Decimal(amount),
+            status=test_pending_transaction_status,
+            description="Card spend",
+            transaction_type=test_expense_transaction_type,
+            source_account=card,
+        )
+
+    create(date(2026, 3, 20), "-100.00")
+    create(date(2026, 5, 20), "-40.00")
+    create(date(2026, 6, 18), "-10.00")
+    return create
+
+
+def _stored(card):
+    return {
+        cycle.statement_start: cycle
+        for cycle in StatementCycle.objects.filter(account=card)
+    }
+
+
+def test_first_sync_backfills_history_and_returns_the_forecast_cycles(card, spend):
+    cycles = sync_statement_cycles(card, THROUGH, TODAY)
+
+    assert [cycle.statement_start for cycle in cycles] == [
+        date(2026, 5, 15), date(2026, 6, 15), date(2026, 7, 15), date(2026, 8, 15),
+    ]
+    stored = _stored(card)
+    assert sorted(stored) == [
+        date(2026, 3, 15), date(2026, 4, 15),
+        date(2026, 5, 15), date(2026, 6, 15), date(2026, 7, 15), date(2026, 8, 15),
+    ]
+    assert [stored[start].closed for start in sorted(stored)] == [True, True, True, False, False, False]
+    assert stored[date(2026, 3, 15)].debits == Decimal("-100.00")
+    assert stored[date(2026, 5, 15)].statement_due == date(2026, 6, 15)
+    assert stored[date(2026, 5, 15)].statement_pay_day == date(2026, 6, 15)
+    # Opening plus archive balance is 611.10
+    assert stored[date(2026, 5, 15)].closing_balance == Decimal("471.10")
+    assert stored[date(2026, 6, 15)].debits == Decimal("-10.00")
+    assert stored[date(2026, 8, 15)].closing_balance == Decimal("461.10")
+
+
+def test_writes_update_open_cycles_but_never_closed_ones(card, spend):
+    sync_statement_cycles(card, THROUGH, TODAY)
+    spend(date(2026, 5, 25), "-25.00")
+    spend(date(2026, 6, 30), "-5.00")
+
+    sync_statement_cycles(card, THROUGH, TODAY)
+
+    stored = _stored(card)
+    assert stored[date(2026, 5, 15)].debits == Decimal("-40.00")
+    assert stored[date(2026, 5, 15)].closing_balance == Decimal("471.10")
+    assert stored[date(2026, 6, 15)].debits == Decimal("-15.00")
+    assert stored[date(2026, 6, 15)].closing_balance == Decimal("431.10")
+
+
+def test_cycle_closes_once_its_due_date_passes(card, spend):
+    sync_statement_cycles(card, THROUGH, TODAY)
+
+    cycles = sync_statement_cycles(card, THROUGH, date(2026, 7, 20))
+
+    assert cycles[0].statement_start == date(2026, 6, 15)
+    assert cycles[0].closed
+    assert _stored(card)[date(2026, 6, 15)].closed
+
+
+def test_changed_settings_replace_open_cycles_and_keep_closed_ones(card, spend):
+    sync_statement_cycles(card, THROUGH, TODAY)
+    Account.objects.filter(id=card.id).update(statement_day=20, due_day=10, pay_day=10)
+    card.refresh_from_db()
+
+    cycles = sync_statement_cycles(card, THROUGH, TODAY)
+
+    assert [cycle.statement_start for cycle in cycles] == [
+        date(2026, 5, 20), date(2026, 6, 20), date(2026, 7, 20), date(2026, 8, 20),
+    ]
+    assert cycles[0].statement_due == date(2026, 7, 10)
+    assert not any(
+        cycle.statement_start.day == 15 and not cycle.closed
+        for cycle in _stored(card).values()
+    )
+    assert _stored(card)[date(2026, 5, 15)].debits == Decimal("-40.00")
+
+
+def test_sync_queries_do_not_grow_with_the_cycles(card, spend, django_assert_max_num_queries):
+    sync_statement_cycles(card, THROUGH, TODAY)
+
+    with django_assert_max_num_queries(6):
+        sync_statement_cycles(card, date(2027, 6, 20), TODAY)
+    with django_assert_max_num_queries(6):
+        sync_statement_cycles(card, date(2027, 6, 20), TODAY)
+
+
+def test_concurrent_backfill_does_not_conflict(card, spend, monkeypatch):
+    bulk_create = StatementCycle.objects.bulk_create
+    raced = []
+
+    def racing_bulk_create(objs, **kwargs):
+        # Another sync stores the same cycles between this one's read and write
+        if not raced:
+            raced.append(True)
+            sync_statement_cycles(card, THROUGH, TODAY)
+        return bulk_create(objs, **kwargs)
+
+    monkeypatch.setattr(StatementCycle.objects, "bulk_create", racing_bulk_create)
+    cycles = sync_statement_cycles(card, THROUGH, TODAY)
+
+    assert [cycle.statement_start for cycle in cycles] == [
+        date(2026, 5, 15), date(2026, 6, 15), date(2026, 7, 15), date(2026, 8, 15),
+    ]
+    assert sorted(_stored(card)) == [
+        date(2026, 3, 15), date(2026, 4, 15),
+        date(2026, 5, 15), date(2026, 6, 15), date(2026, 7, 15), date(2026, 8, 15),
+    ]
+
+
+@pytest.mark.parametrize("statement_day", [29, 30, 31])
+def test_month_end_statement_days_do_not_drift(card, spend, statement_day):
+    Account.objects.filter(id=card.id).update(statement_day=statement_day, due_day=statement_day)
+    card.refresh_from_db()
+    spend(date(2026, 1, 5), "-20.00")
+
+    cycles = sync_statement_cycles(card, date(2026, 12, 31), date(2026, 4, 10))
+
+    anchor = date(2026, 3, statement_day)
+    assert cycles[0].statement_start == anchor
+    stored = sorted(_stored(card).values(), key=lambda cycle: cycle.statement_start)
+    assert stored[0].statement_start < date(2026, 1, 5)
+    for cycle, following in zip(stored, stored[1:]):
+        assert cycle.statement_end == following.statement_start
+    for cycle in stored:
+        month_end = calendar.monthrange(cycle.statement_start.year, cycle.statement_start.month)[1]
+        assert cycle.statement_start.day == min(statement_day, month_end)
+        assert cycle.closed == (cycle.statement_start < anchor)
+        assert cycle.statement_due.day == min(
+            statement_day,
+            calendar.monthrange(cycle.statement_due.year, cycle.statement_due.month)[1],
+        )
@@ -0,0 +1,5 @@
+from ninja import Router
+from administration.api.views.dashboard import dashboard_router
+
+router = Router()
+router.add_router("/", dashboard_router)
@@ -0,0 +1,18 @@
+from ninja import Schema
+from typing import List
+from accounts.api.schemas.account import AccountOut, FavoriteBalanceSummary
+from planning.api.schemas.retirement import ForecastOut
+from tags.api.schemas.graph_by_tags import PieGraphItem
+
+
+class DashboardGraphOut(Schema):
+    widget_id: int
+    graph_name: str
+    items: List[PieGraphItem]
+
+
+class DashboardOut(Schema):
+    accounts: List[AccountOut]
+    favorite_balances: List[FavoriteBalanceSummary]
+    graphs: List[DashboardGraphOut]
+    retirement: ForecastOut
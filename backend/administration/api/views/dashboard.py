@@ -0,0 +1,51 @@
+from ninja import Router
+from ninja.decorators import decorate_view
+from ninja.errors import HttpError
+from administration.api.schemas.dashboard import DashboardOut
+from administration.services import aget_dashboard
+from core.aio import request_user
+from core.cache import versions
+from core.etag import conditional
+import logging
+
+api_logger = logging.getLogger("api")
+error_logger = logging.getLogger("error")
+
+dashboard_router = Router(tags=["Dashboard"])
+
+
+@dashboard_router.get("/", response=DashboardOut)
+@decorate_view(
+    conditional(
+        versions.REFERENCE,
+        "accounts",
+        "transactions",
+        "tag_graph",
+        versions.model("accounts"),
+        versions.model("administration.option"),
+        versions.model("administration.userdashboardconfig"),
+    )
+)
+async def get_dashboard(request):
+    """
+    The function `get_dashboard` returns the active accounts, favorite
+    balances, graph widgets and retirement forecast of the dashboard in one
+    response, computing them concurrently.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        DashboardOut: the dashboard data
+    """
+    try:
+        user = await request_user(request)
+        result = await aget_dashboard(
+            user if isinstance(getattr(user, "pk", None), int) else None
+        )
+        api_logger.debug("Dashboard retrieved")
+        return result
+    except Exception as e:
+        api_logger.error("Dashboard not retrieved")
+        error_logger.exception(f"{str(e)}")
+        raise HttpError(500, f"Record retrieval error: {str(e)}")
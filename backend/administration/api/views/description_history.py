@@ -2,6 +2,7 @@ from ninja import Router
 from ninja.errors import HttpError
 from administration.models import DescriptionHistory
 from administration.api.schemas.description_history import DescriptionHistoryOut
+from administration.services.typeahead import suggest_descriptions
 from typing import List
 import logging
 
@@ -36,3 +37,30 @@ def list_description_histories(request):
         api_logger.error("Description Histories not retrieved")
         error_logger.exception(f"{str(e)}")
         raise HttpError(500, "Record retrieval error")
+
+
+@description_history_router.get("/typeahead", response=List[DescriptionHistoryOut])
+def typeahead_description_histories(request, q: str = "", limit: int = 10):
+    """
+    The function `typeahead_description_histories` retrieves the description
+    histories starting with the typed text, with their last used tag.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        q (str): The typed prefix, matched case-insensitively.
+        limit (int): The maximum number of suggestions (at most 50).
+
+    Returns:
+        List[DescriptionHistoryOut]: the matching description histories,
+            ordered alphabetically
+    """
+
+    try:
+        suggestions = suggest_descriptions(q, limit)
+        api_logger.debug("Description History suggestions retrieved")
+        return suggestions
+    except Exception as e:
+        # Log other types of exceptions
+        api_logger.error("Description History suggestions not retrieved")
+        error_logger.exception(f"{str(e)}")
+        raise HttpError(500, "Record retrieval error")
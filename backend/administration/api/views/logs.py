@@ -1,6 +1,4 @@
 import io
-import math
-import re
 import zipfile
 from typing import Optional
 
@@ -12,6 +10,7 @@ from ninja.errors import HttpError
 
 from administration.api.dependencies.auth import FullAccessAuth
 from administration.api.schemas.logs import LogPageOut
+from administration.services.log_reader import read_log_page
 
 error_logger = logging.getLogger("error")
 api_logger = logging.getLogger("api")
@@ -21,38 +20,6 @@ logs_router = Router(tags=["Logs"])
 VALID_LOG_TYPES = {"api", "error", "task"}
 VALID_LEVELS = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
 
-# Matches the start of a new log entry: [timestamp] LEVEL ...
-_LOG_LINE_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d+)\] (\w+) (.*)")
-
-
-def _parse_log_file(log_type: str) -> list:
-    log_path = settings.LOG_DIR / f"{log_type}.log"
-    if not log_path.exists():
-        return []
-
-    entries = []
-    current = None
-
-    with open(log_path, "r", errors="replace") as f:
-        for line in f:
-            m = _LOG_LINE_RE.match(line)
-            if m:
-                if current:
-                    entries.append(current)
-                current = {
-                    "timestamp": m.group(1),
-                    "level": m.group(2),
-                    "message": m.group(3).rstrip(),
-                }
-            elif current:
-                # Continuation line (e.g. traceback)
-                current["message"] += "\n" + line.rstrip()
-
-    if current:
-        entries.append(current)
-
-    return entries
-
 
 @logs_router.get("", response=LogPageOut, auth=FullAccessAuth())
 def get_logs(
@@ -74,21 +41,17 @@ def get_logs(
             raise HttpError(400, f"Invalid level(s): {', '.join(sorted(invalid))}. Choose from: {', '.join(sorted(VALID_LEVELS))}")
 
     try:
-        entries = _parse_log_file(log_type)
-        # Newest first
-        entries = list(reversed(entries))
-
-        if selected_levels:
-            entries = [e for e in entries if e["level"] in selected_levels]
-        if search:
-            search_lower = search.lower()
-            entries = [e for e in entries if search_lower in e["message"].lower()]
-
-        total = len(entries)
-        pages = max(1, math.ceil(total / page_size))
-        page = max(1, min(page, pages))
-        start = (page - 1) * page_size
-        page_entries = entries[start : start + page_size]
+        result = read_log_page(
+            log_type,
+            page=page,
+            page_size=page_size,
+            levels=selected_levels,
+            search=search,
+        )
+        total = result["total"]
+        page = result["page"]
+        pages = result["pages"]
+        page_entries = result["entries"]
 
         api_logger.info(f"Logs retrieved : type={log_type} page={page} total={total}")
         return {
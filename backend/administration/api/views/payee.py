@@ -3,6 +3,7 @@ from django.db import IntegrityError
 from ninja.errors import HttpError
 from administration.models import Payee
 from administration.api.schemas.payee import PayeeIn, PayeeOut
+from administration.services.typeahead import suggest_payees
 from django.shortcuts import get_object_or_404
 from django.http import Http404
 from typing import List
@@ -156,6 +157,32 @@ def list_payees(request):
         raise HttpError(500, "Record retrieval error")
 
 
+@payee_router.get("/typeahead", response=List[PayeeOut])
+def typeahead_payees(request, q: str = "", limit: int = 10):
+    """
+    The function `typeahead_payees` retrieves the payees whose name starts
+    with the typed text.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        q (str): The typed prefix, matched case-insensitively.
+        limit (int): The maximum number of suggestions (at most 50).
+
+    Returns:
+        List[PayeeOut]: the matching payees, ordered by payee name
+    """
+
+    try:
+        suggestions = suggest_payees(q, limit)
+        api_logger.debug("Payee suggestions retrieved")
+        return suggestions
+    except Exception as e:
+        # Log other types of exceptions
+        api_logger.error("Payee suggestions not retrieved")
+        error_logger.exception(f"{str(e)}")
+        raise HttpError(500, "Record retrieval error")
+
+
 @payee_router.delete("/delete/{payee_id}", auth=FullAccessAuth())
 def delete_payee(request, payee_id: int):
     """
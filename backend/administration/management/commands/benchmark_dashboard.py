@@ -0,0 +1,69 @@
+import time
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.api.schemas.account import AccountQuery
+from accounts.models import Account
+from accounts.services import favorite_balance_summaries, list_accounts_with_financials
+from administration.services import aget_dashboard
+from core.aio import concurrency
+from planning.services import get_retirement_forecast
+from tags.services.tag_graph import _get_user_graph_widgets, get_graph_new_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the dashboard's accounts, favorite balances, graph widgets and "
+        "retirement forecast built one after another, as the separate sync "
+        "endpoints do, against the concurrent async dashboard, and report "
+        "p50/p95 latency"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="Dashboard user (defaults to the first user)")
+        parser.add_argument("--requests", type=int, default=30, help="Timed requests per path")
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("id")
+        user = users.filter(username=options["username"]).first() if options["username"] else users.first()
+        if user is None:
+            raise CommandError("A user is required")
+        requests = max(options["requests"], 1)
+
+        def serial():
+            list_accounts_with_financials(AccountQuery(), user=user)
+            favorite_balance_summaries(user)
+            for widget in _get_user_graph_widgets(user):
+                get_graph_new_data(widget["widget_id"], user)
+            get_retirement_forecast()
+
+        def concurrent():
+            async_to_sync(aget_dashboard)(user)
+
+        self.stdout.write(
+            f"{Account.objects.filter(active=True).count()} active accounts, "
+            f"{requests} requests per path, concurrency {concurrency()}"
+        )
+        self.stdout.write(f"{'path':<12} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+        for label, fn in [("serial", serial), ("concurrent", concurrent)]:
+            fn()  # warm the reference tables and connections
+            p50, p95, worst = _percentiles(_timings(requests, fn))
+            self.stdout.write(f"{label:<12} {p50:>10.1f} {p95:>10.1f} {worst:>10.1f}")
+
+
+def _timings(requests, fn):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def _percentiles(timings):
+    def at(fraction):
+        return timings[min(int(round(fraction * (len(timings) - 1))), len(timings) - 1)]
+
+    return at(0.5), at(0.95), timings[-1]
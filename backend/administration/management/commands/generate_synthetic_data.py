@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from administration.services.synthetic_household import (
+    HouseholdSpec,
+    generate_household,
+    household_summary,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a reproducible synthetic household (checking, credit cards, "
+        "a savings parent with children, interest-bearing savings, years of "
+        "multi-tag transactions, reminders with exclusions, budgets and "
+        "reports) for benchmarking"
+    )
+
+    def add_arguments(self, parser):
+        defaults = HouseholdSpec()
+        parser.add_argument("--accounts", type=int, default=defaults.accounts, help="Accounts (at least 6)")
+        parser.add_argument("--years", type=int, default=defaults.years, help="Years of history")
+        parser.add_argument(
+            "--transactions-per-month",
+            type=int,
+            default=defaults.transactions_per_month,
+            help="Expenses per month across the spending accounts, besides paychecks and transfers",
+        )
+        parser.add_argument("--reminders", type=int, default=defaults.reminders, help="Reminders")
+        parser.add_argument("--budgets", type=int, default=defaults.budgets, help="Budgets")
+        parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed")
+        parser.add_argument(
+            "--prefix",
+            default=defaults.prefix,
+            help="Prefix of the generated names, and the household user's name",
+        )
+
+    def handle(self, *args, **options):
+        spec = HouseholdSpec(
+            accounts=options["accounts"],
+            years=options["years"],
+            transactions_per_month=options["transactions_per_month"],
+            reminders=options["reminders"],
+            budgets=options["budgets"],
+            seed=options["seed"],
+            prefix=options["prefix"],
+        )
+        start = time.perf_counter()
+        try:
+            household = generate_household(spec)
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - start
+
+        summary = ", ".join(f"{count} {name}" for name, count in household_summary(household).items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {summary} for user '{household.user.username}' in {elapsed:.1f}s"
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 16:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0026_pushsubscription'),
+        ('tags', '0004_tags_slug_data'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='descriptionhistory',
+            index=models.Index(fields=['description_normalized'], name='deschistory_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -299,3 +299,12 @@ class DescriptionHistory(models.Model):
 
     class Meta:
         verbose_name_plural = "Description histories"
+        indexes = [
+            # Lets PostgreSQL serve prefix LIKE lookups for the typeahead;
+            # opclasses are ignored on other databases.
+            models.Index(
+                fields=["description_normalized"],
+                name="deschistory_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
@@ -1 +1,2 @@
 from administration.services.message import get_message_list as get_message_list
+from administration.services.dashboard import aget_dashboard as aget_dashboard
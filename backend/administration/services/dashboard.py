@@ -0,0 +1,40 @@
+from functools import partial
+from accounts.api.schemas.account import AccountQuery
+from accounts.mappers import domain_account_to_schema
+from accounts.services import (
+    afavorite_balance_summaries,
+    alist_accounts_with_financials,
+)
+from administration.api.schemas.dashboard import DashboardGraphOut, DashboardOut
+from core.aio import gather_limited
+from planning.mappers import domain_retirement_forecast_to_schema
+from planning.services import aget_retirement_forecast
+from tags.services.tag_graph import aget_graph_widgets_data
+
+
+async def aget_dashboard(user=None) -> DashboardOut:
+    """
+    Build the dashboard for user: active accounts, favorite balances, graph
+    widgets and the retirement forecast. The four parts, and the per-account
+    and per-widget work inside them, run concurrently within one async read
+    bound.
+    """
+    accounts, favorites, graphs, retirement = await gather_limited([
+        partial(alist_accounts_with_financials, AccountQuery(), user=user),
+        partial(afavorite_balance_summaries, user),
+        partial(aget_graph_widgets_data, user),
+        aget_retirement_forecast,
+    ])
+    return DashboardOut(
+        accounts=[domain_account_to_schema(account) for account in accounts],
+        favorite_balances=favorites,
+        graphs=[
+            DashboardGraphOut(
+                widget_id=widget["widget_id"],
+                graph_name=widget["graph_name"],
+                items=items,
+            )
+            for widget, items in graphs
+        ],
+        retirement=domain_retirement_forecast_to_schema(retirement),
+    )
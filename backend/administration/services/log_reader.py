@@ -0,0 +1,278 @@
+"""
+Newest-first reader for the application log files.
+
+Each log file (the live file plus its rotated backups) gets an offset index:
+the byte position and level of every entry start, found by scanning the
+memory-mapped file backwards for ``\\n[timestamp] LEVEL`` headers. Indexes are
+kept per file and reused until the file's size or mtime changes; a file that
+only grew is extended from where the previous scan stopped instead of being
+rescanned. Pages are then cut by index arithmetic and only the entries on the
+page are read and decoded, so paging through a large log uses memory bounded
+by the index and the page size rather than the file size.
+"""
+import mmap
+import os
+import re
+import threading
+from array import array
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+# Matches the start of a new log entry: [timestamp] LEVEL ...
+_ENTRY_RE = re.compile(rb"\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d+)\] (\w+) ")
+# Longest header the regex can match, with room for long level names.
+_HEADER_PEEK = 96
+_ROTATED_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+_level_names: List[str] = []
+_level_codes: dict = {}
+_indexes: dict = {}
+# Reentrant: extending an index under it registers new level names.
+_lock = threading.RLock()
+
+
+def _level_code(name: str) -> int:
+    code = _level_codes.get(name)
+    if code is None:
+        with _lock:
+            code = _level_codes.setdefault(name, len(_level_names))
+            if code == len(_level_names):
+                _level_names.append(name)
+    return code
+
+
+class LogIndex:
+    """Entry start offsets and level codes for one log file, oldest first."""
+
+    def __init__(self, path: Path, stat: os.stat_result):
+        self.path = path
+        self.inode = stat.st_ino
+        self.size = 0
+        self.mtime = stat.st_mtime
+        # Offset just past the last complete line scanned so far.
+        self.scanned = 0
+        self.starts = array("Q")
+        self.levels = array("B")
+
+    def __len__(self):
+        return len(self.starts)
+
+    def extend(self, mm, stat: os.stat_result):
+        """Indexes entries that start in the bytes appended since the last scan."""
+        new_starts = []
+        # Only complete lines are scanned, so a header still being written is
+        # picked up by the next extension rather than lost.
+        limit = mm.rfind(b"\n", 0, stat.st_size) + 1
+        end = limit
+        # Start one byte early so a header right at the old end still sees its
+        # preceding newline.
+        floor = max(self.scanned - 1, 0)
+        while True:
+            position = mm.rfind(b"\n[", floor, end)
+            if position < 0:
+                break
+            self._match(mm, position + 1, new_starts)
+            end = position
+        if self.scanned == 0 and limit and mm[:1] == b"[":
+            self._match(mm, 0, new_starts)
+        for start, level in reversed(new_starts):
+            self.starts.append(start)
+            self.levels.append(level)
+        self.scanned = max(self.scanned, limit)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+
+    @staticmethod
+    def _match(mm, start: int, found: list):
+        match = _ENTRY_RE.match(mm[start : start + _HEADER_PEEK])
+        if match:
+            found.append((start, _level_code(match.group(2).decode("ascii", "replace"))))
+
+    def entry_bounds(self, i: int) -> Tuple[int, int]:
+        end = self.starts[i + 1] if i + 1 < len(self.starts) else self.size
+        return self.starts[i], end
+
+
+def _open_map(path: Path):
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _get_index(path: Path) -> Optional[LogIndex]:
+    # The check and the extension run under the lock: two requests that both
+    # saw the file grow would otherwise append the same entries twice.
+    with _lock:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        index = _indexes.get(path)
+        if index is not None and (index.size, index.mtime) == (stat.st_size, stat.st_mtime):
+            return index
+        if index is None or index.inode != stat.st_ino or stat.st_size < index.size:
+            # New, replaced by rotation, or truncated: scan from scratch.
+            index = LogIndex(path, stat)
+        if stat.st_size:
+            mm = _open_map(path)
+            try:
+                index.extend(mm, stat)
+            finally:
+                mm.close()
+        else:
+            index.size, index.mtime = 0, stat.st_mtime
+        _indexes[path] = index
+        return index
+
+
+def log_files(log_type: str) -> List[Path]:
+    """Returns the live log file followed by its rotated backups, newest first."""
+    log_dir = Path(settings.LOG_DIR)
+    base = f"{log_type}.log"
+    numbered, dated = [], []
+    for path in log_dir.glob(f"{base}.*"):
+        suffix = path.name[len(base) + 1 :]
+        if not path.is_file():
+            continue
+        if suffix.isdigit():
+            numbered.append((int(suffix), path))
+        elif _ROTATED_DATE_RE.match(suffix):
+            dated.append((suffix, path))
+    live = log_dir / base
+    return (
+        ([live] if live.exists() else [])
+        # RotatingFileHandler: .1 is the newest backup.
+        + [path for _, path in sorted(numbered)]
+        # TimedRotatingFileHandler: the latest date is the newest backup.
+        + [path for _, path in sorted(dated, reverse=True)]
+    )
+
+
+def _forget_missing(log_type: str, paths: List[Path]):
+    prefix = f"{log_type}.log"
+    current = set(paths)
+    with _lock:
+        for path in [p for p in _indexes if p.name.startswith(prefix)]:
+            if path not in current:
+                del _indexes[path]
+
+
+def _decode_entry(raw: bytes) -> dict:
+    match = _ENTRY_RE.match(raw)
+    lines = raw[match.end() :].decode("utf-8", errors="replace").split("\n")
+    # The entry's own trailing newline leaves one empty line behind.
+    if len(lines) > 1 and lines[-1] == "":
+        lines.pop()
+    return {
+        "timestamp": match.group(1).decode("ascii"),
+        "level": match.group(2).decode("ascii", "replace"),
+        "message": "\n".join(line.rstrip() for line in lines),
+    }
+
+
+def _iter_newest_first(
+    indexes: List[LogIndex], level_codes: Optional[Set[int]]
+) -> Iterator[Tuple[LogIndex, int]]:
+    for index in indexes:
+        levels = index.levels
+        for i in range(len(index) - 1, -1, -1):
+            if level_codes is None or levels[i] in level_codes:
+                yield index, i
+
+
+def read_log_page(
+    log_type: str,
+    page: int = 1,
+    page_size: int = 100,
+    levels: Optional[Set[str]] = None,
+    search: Optional[str] = None,
+) -> dict:
+    """
+    Returns one newest-first page of log entries, optionally filtered to the
+    given levels and to messages containing search (case-insensitive).
+
+    Returns:
+        dict: entries, total, page and pages, with page clamped to the last
+            page as the log viewer expects.
+    """
+    page_size = max(1, page_size)
+    paths = log_files(log_type)
+    _forget_missing(log_type, paths)
+    indexes = [index for index in map(_get_index, paths) if index]
+    level_codes = None
+    if levels:
+        level_codes = {_level_codes[name] for name in levels if name in _level_codes}
+
+    maps = {}
+
+    def read(index: LogIndex, i: int) -> dict:
+        mm = maps.get(index.path)
+        if mm is None:
+            mm = maps[index.path] = _open_map(index.path)
+        start, end = index.entry_bounds(i)
+        return _decode_entry(mm[start:end])
+
+    try:
+        if not search:
+            if level_codes is None:
+                total = sum(len(index) for index in indexes)
+            else:
+                total = sum(
+                    index.levels.count(code)
+                    for index in indexes
+                    for code in level_codes
+                )
+            pages = max(1, -(-total // page_size))
+            page = max(1, min(page, pages))
+            first = (page - 1) * page_size
+            if level_codes is None:
+                selected = _slice_unfiltered(indexes, first, page_size)
+            else:
+                selected = islice(
+                    _iter_newest_first(indexes, level_codes), first, first + page_size
+                )
+            entries = [read(index, i) for index, i in selected]
+            return {"entries": entries, "total": total, "page": page, "pages": pages}
+
+        # Searching has to look at every entry's text, but only the requested
+        # page and the current trailing page are kept while counting.
+        needle = search.lower()
+        requested = max(1, page)
+        first = (requested - 1) * page_size
+        window, trailing = [], []
+        total = 0
+        for index, i in _iter_newest_first(indexes, level_codes):
+            entry = read(index, i)
+            if needle not in entry["message"].lower():
+                continue
+            if total % page_size == 0:
+                trailing = []
+            trailing.append(entry)
+            if first <= total < first + page_size:
+                window.append(entry)
+            total += 1
+        pages = max(1, -(-total // page_size))
+        page = max(1, min(requested, pages))
+        entries = window if page == requested else trailing
+        return {"entries": entries, "total": total, "page": page, "pages": pages}
+    finally:
+        for mm in maps.values():
+            mm.close()
+
+
+def _slice_unfiltered(indexes: List[LogIndex], first: int, count: int):
+    selected = []
+    for index in indexes:
+        size = len(index)
+        if first >= size:
+            first -= size
+            continue
+        # Newest-first position p in this file is entry size - 1 - p.
+        for position in range(first, min(size, first + count - len(selected))):
+            selected.append((index, size - 1 - position))
+        first = 0
+        if len(selected) == count:
+            break
+    return selected
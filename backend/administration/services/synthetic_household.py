@@ -0,0 +1,443 @@
+"""
+Reproducible synthetic household for measuring the hot paths at scale.
+
+`generate_household` builds a household from a seed: a checking account that
+funds credit cards computing payments and interest, a savings parent with
+child accounts sharing an interest child, standalone interest-bearing savings
+and further checking accounts. It adds `years` of history with expenses
+split over one to three tags, paychecks, savings transfers and card
+payments, plus reminders with exclusions, budgets, report configs and
+dashboard favorites. The same seed and spec give the same household, laid
+out relative to today.
+
+Rows are bulk inserted, so the per-row signal receivers do not fire. The
+reminder and forecast caches of the new accounts are rebuilt once at the
+end. Amounts are multiples of 0.25, so sums stay exact on SQLite, which
+stores decimals as floats.
+"""
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from dateutil.relativedelta import relativedelta
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction as db_transaction
+
+from accounts.models import Account, AccountFavorite, AccountType, Bank
+from administration.models import Option
+from planning.models import Budget
+from reminders.models import Reminder, ReminderExclusion, Repeat
+from reminders.signals import deferred_reminder_refresh
+from reports.models import ReportConfig, ReportConfigTag
+from tags.models import Tag
+from transactions.models import (
+    Transaction,
+    TransactionDetail,
+    TransactionStatus,
+    TransactionType,
+)
+from transactions.tasks import (
+    rebuild_reminder_caches,
+    update_cc_forecast_cache,
+    update_interest_forecast_cache,
+)
+from utils.dates import get_todays_date_timezone_adjusted
+
+# System rows the household refers to by slug, loaded when missing.
+SYSTEM_FIXTURES = [
+    "account_types",
+    "tag_types",
+    "maintags",
+    "subtags",
+    "tags",
+    "transaction_statuses",
+    "transaction_types",
+    "repeats",
+    "graph_types",
+    "options",
+]
+
+BULK_BATCH_SIZE = 2000
+
+
+@dataclass
+class HouseholdSpec:
+    accounts: int = 12
+    years: int = 3
+    transactions_per_month: int = 120
+    reminders: int = 24
+    budgets: int = 6
+    seed: int = 1
+    prefix: str = "Synthetic"
+
+
+@dataclass
+class Household:
+    user: User
+    checking_ids: List[int] = field(default_factory=list)
+    credit_card_ids: List[int] = field(default_factory=list)
+    savings_ids: List[int] = field(default_factory=list)
+    parent_id: int = 0
+    child_ids: List[int] = field(default_factory=list)
+    reminder_ids: List[int] = field(default_factory=list)
+    report_ids: List[int] = field(default_factory=list)
+    transactions: int = 0
+    details: int = 0
+
+    @property
+    def account_ids(self) -> List[int]:
+        return [
+            *self.checking_ids,
+            *self.credit_card_ids,
+            *self.savings_ids,
+            self.parent_id,
+            *self.child_ids,
+        ]
+
+
+def _quarters(rng: random.Random, low: int, high: int) -> Decimal:
+    """A random amount between low and high dollars, in steps of 0.25."""
+    return Decimal(rng.randint(low * 4, high * 4)) / 4
+
+
+def _split(rng: random.Random, amount: Decimal, parts: int) -> List[Decimal]:
+    """Splits amount into parts multiples of 0.25 that sum to it."""
+    quarters = int(amount * 4)
+    if parts <= 1 or quarters < parts:
+        return [amount]
+    cuts = sorted(rng.sample(range(1, quarters), parts - 1))
+    bounds = [0, *cuts, quarters]
+    return [Decimal(b - a) / 4 for a, b in zip(bounds, bounds[1:])]
+
+
+def _ensure_system_rows():
+    if not TransactionStatus.objects.exists() or not Repeat.objects.exists():
+        for fixture in SYSTEM_FIXTURES:
+            call_command("loaddata", fixture, verbosity=0)
+
+
+class _Builder:
+    def __init__(self, spec: HouseholdSpec, today: date):
+        self.spec = spec
+        self.today = today
+        self.rng = random.Random(spec.seed)
+        self.types = {t.slug: t for t in AccountType.objects.all()}
+        self.statuses = {s.slug: s for s in TransactionStatus.objects.all()}
+        self.transaction_types = {t.slug: t for t in TransactionType.objects.all()}
+        self.repeats = {r.slug: r for r in Repeat.objects.all()}
+        tags = Tag.objects.select_related("tag_type")
+        self.tags = {t.slug: t for t in tags}
+        self.expense_tags = [
+            t for t in tags
+            if t.tag_type.slug == "expense"
+            and t.slug not in ("credit-card", "interest-charged", "debt")
+        ]
+        self.rows: List[Transaction] = []
+        self.row_details: List[List[TransactionDetail]] = []
+
+    def account(self, name, slug, **fields) -> Account:
+        defaults = {
+            "opening_balance": _quarters(self.rng, 500, 5000),
+            "open_date": self.today - relativedelta(years=self.spec.years, days=1),
+            "statement_cycle_length": 1,
+            "statement_cycle_period": "m",
+        }
+        defaults.update(fields)
+        return Account.objects.create(
+            account_name=f"{self.spec.prefix} {name}",
+            account_type=self.types[slug],
+            bank=self.bank,
+            **defaults,
+        )
+
+    def status(self, day: date) -> TransactionStatus:
+        if day > self.today - timedelta(days=10):
+            return self.statuses["pending"]
+        return self.statuses["cleared"]
+
+    def add(self, day, amount, type_slug, source, description, tags, destination=None):
+        """Queues a transaction; tags is a list of (tag, amount) pairs."""
+        transaction_type = self.transaction_types[type_slug]
+        self.rows.append(
+            Transaction(
+                transaction_date=day,
+                total_amount=amount,
+                status=self.status(day),
+                description=description,
+                edit_date=day,
+                add_date=day,
+                transaction_type=transaction_type,
+                source_account=source,
+                destination_account=destination,
+            )
+        )
+        # A tag without an amount takes the whole transaction.
+        self.row_details.append([
+            TransactionDetail(
+                detail_amt=abs(amount if tag_amount is None else tag_amount)
+                * (1 if type_slug == "income" else -1),
+                tag=tag,
+                full_toggle=tag_amount is None,
+            )
+            for tag, tag_amount in tags
+        ])
+
+    def flush(self) -> int:
+        created = Transaction.objects.bulk_create(self.rows, batch_size=BULK_BATCH_SIZE)
+        details = []
+        for transaction, transaction_details in zip(created, self.row_details):
+            for detail in transaction_details:
+                detail.transaction = transaction
+                details.append(detail)
+        TransactionDetail.objects.bulk_create(details, batch_size=BULK_BATCH_SIZE)
+        self.rows, self.row_details = [], []
+        return len(details)
+
+
+def _months(start: date, end: date):
+    month = start.replace(day=1)
+    while month <= end:
+        yield month
+        month += relativedelta(months=1)
+
+
+def _day_in(month: date, day: int) -> date:
+    return month + timedelta(days=min(day, 28) - 1)
+
+
+def generate_household(spec: HouseholdSpec) -> Household:
+    """
+    Creates the household described by spec.
+
+    Raises:
+        ValueError: If spec asks for fewer than 6 accounts, or accounts with
+            spec.prefix already exist.
+    """
+    if spec.accounts < 6:
+        raise ValueError("A household needs at least 6 accounts")
+    if Account.objects.filter(account_name__startswith=f"{spec.prefix} ").exists():
+        raise ValueError(f"Accounts named '{spec.prefix} ...' already exist")
+
+    _ensure_system_rows()
+    today = get_todays_date_timezone_adjusted()
+    build = _Builder(spec, today)
+    rng = build.rng
+
+    with db_transaction.atomic(), deferred_reminder_refresh():
+        user, _ = User.objects.get_or_create(username=spec.prefix.lower())
+        household = Household(user=user)
+        build.bank, _ = Bank.objects.get_or_create(bank_name=f"{spec.prefix} Bank")
+
+        # Account layout: one funding checking account, a quarter credit
+        # cards, a savings parent with three children, a sixth standalone
+        # savings and the rest checking.
+        cards = max(spec.accounts // 4, 1)
+        savings = max(spec.accounts // 6, 1)
+        extra_checking = spec.accounts - 1 - cards - 4 - savings
+        main = build.account("Checking", "checking", opening_balance=Decimal(8000))
+        household.checking_ids.append(main.id)
+        checking = [main]
+        for n in range(max(extra_checking, 0)):
+            account = build.account(f"Checking {n + 2}", "checking")
+            checking.append(account)
+            household.checking_ids.append(account.id)
+        credit_cards = []
+        for n in range(cards):
+            card = build.account(
+                f"Card {n + 1}",
+                "credit-card",
+                opening_balance=Decimal(0),
+                annual_rate=_quarters(rng, 18, 27),
+                credit_limit=Decimal(10000),
+                funding_account=main,
+                calculate_payments=True,
+                calculate_interest=True,
+                payment_strategy="F",
+                minimum_payment_amount=Decimal(35),
+                statement_day=rng.randint(1, 28),
+                due_day=rng.randint(1, 28),
+            )
+            credit_cards.append(card)
+            household.credit_card_ids.append(card.id)
+        parent = build.account("Savings Group", "savings", opening_balance=Decimal(0))
+        children = [
+            build.account(f"Savings Group {name}", "savings", parent_account=parent)
+            for name in ("Emergency", "Travel", "House")
+        ]
+        parent.interest_child_account = children[0]
+        parent.calculate_interest = True
+        parent.annual_rate = Decimal("4.25")
+        parent.interest_deposit_day = 1
+        parent.save()
+        household.parent_id = parent.id
+        household.child_ids = [child.id for child in children]
+        standalone = [
+            build.account(
+                f"Savings {n + 1}",
+                "savings",
+                calculate_interest=True,
+                annual_rate=_quarters(rng, 1, 5),
+                interest_deposit_day=1,
+            )
+            for n in range(savings)
+        ]
+        household.savings_ids = [account.id for account in standalone]
+
+        # Budgeted categories see spending early every month.
+        budget_tags = [
+            rng.sample(build.expense_tags, rng.randint(1, 3)) for _ in range(spec.budgets)
+        ]
+        budgeted = list({tag.id: tag for tags in budget_tags for tag in tags}.values())
+
+        # History, oldest month first.
+        start = today - relativedelta(years=spec.years)
+        spenders = checking + credit_cards
+        for month in _months(start, today + timedelta(days=20)):
+            for day in (1, 15):
+                build.add(
+                    _day_in(month, day), _quarters(rng, 2400, 2600), "income", main,
+                    "Paycheck", [(build.tags["income--paycheck"], None)],
+                )
+            for child in children:
+                amount = _quarters(rng, 50, 300)
+                build.add(
+                    _day_in(month, 2), -amount, "transfer", main, f"To {child.account_name}",
+                    [(build.tags["transfer"], amount)], destination=child,
+                )
+            for account in standalone:
+                amount = _quarters(rng, 50, 200)
+                build.add(
+                    _day_in(month, 3), -amount, "transfer", main, f"To {account.account_name}",
+                    [(build.tags["transfer"], amount)], destination=account,
+                )
+            for card in credit_cards:
+                amount = _quarters(rng, 200, 900)
+                build.add(
+                    _day_in(month, card.due_day), -amount, "transfer", main,
+                    f"{card.account_name} payment", [(build.tags["credit-card"], amount)],
+                    destination=card,
+                )
+            for tag in budgeted:
+                amount = _quarters(rng, 10, 150)
+                build.add(
+                    _day_in(month, rng.randint(1, 5)), -amount, "expense", rng.choice(spenders),
+                    f"{tag.slug.replace('-', ' ').title()} purchase", [(tag, amount)],
+                )
+            for _ in range(spec.transactions_per_month):
+                account = rng.choice(spenders)
+                amount = _quarters(rng, 3, 250)
+                parts = _split(rng, amount, rng.choice((1, 1, 2, 3)))
+                tags = rng.sample(build.expense_tags, len(parts))
+                build.add(
+                    _day_in(month, rng.randint(1, 28)), -amount, "expense", account,
+                    f"{tags[0].slug.replace('-', ' ').title()} purchase",
+                    list(zip(tags, parts)),
+                )
+            household.transactions += len(build.rows)
+            household.details += build.flush()
+
+        # Reminders: monthly bills, biweekly paychecks and savings transfers,
+        # each with a skipped occurrence.
+        schedule = [
+            ("every-month", "expense"),
+            ("every-2-weeks", "income"),
+            ("every-month", "transfer"),
+            ("every-week", "expense"),
+        ]
+        for n in range(spec.reminders):
+            repeat_slug, type_slug = schedule[n % len(schedule)]
+            destination = None
+            if type_slug == "income":
+                source, tag = main, build.tags["income--paycheck"]
+            elif type_slug == "transfer":
+                source, tag = main, build.tags["transfer"]
+                destination = rng.choice(children + standalone)
+            else:
+                source, tag = rng.choice(spenders), rng.choice(build.expense_tags)
+            start_date = today + timedelta(days=rng.randint(1, 28))
+            reminder = Reminder.objects.create(
+                tag=tag,
+                amount=_quarters(rng, 10, 400),
+                reminder_source_account=source,
+                reminder_destination_account=destination,
+                description=f"{spec.prefix} reminder {n + 1}",
+                transaction_type=build.transaction_types[type_slug],
+                start_date=start_date,
+                next_date=start_date,
+                end_date=today + relativedelta(years=2),
+                repeat=build.repeats[repeat_slug],
+            )
+            ReminderExclusion.objects.create(
+                reminder=reminder,
+                exclude_date=start_date + relativedelta(months=rng.randint(1, 6)),
+            )
+            household.reminder_ids.append(reminder.id)
+
+        repeat = build.repeats["every-month"]
+        for n, tags in enumerate(budget_tags):
+            Budget.objects.create(
+                tag_ids=json.dumps([tag.id for tag in tags]),
+                name=f"{spec.prefix} budget {n + 1}",
+                amount=_quarters(rng, 100, 800),
+                repeat=repeat,
+                start_day=today.replace(day=1),
+                next_start=today.replace(day=1) + relativedelta(months=1),
+            )
+
+        reports = [
+            ReportConfig.objects.create(
+                name=f"{spec.prefix} spending by tag",
+                report_type="TOTALS",
+                date_range_type="TRAILING_12",
+                group_by="TAG",
+                show_transactions=True,
+                created_by=user,
+            ),
+            ReportConfig.objects.create(
+                name=f"{spec.prefix} year over year",
+                report_type="COMPARISON",
+                date_range_type="THIS_YEAR",
+                group_by="MONTH",
+                created_by=user,
+            ),
+        ]
+        for report in reports:
+            report.accounts.set(spenders)
+            ReportConfigTag.objects.bulk_create(
+                ReportConfigTag(report=report, tag=tag)
+                for tag in rng.sample(build.expense_tags, 6)
+            )
+        household.report_ids = [report.id for report in reports]
+
+        for account in (main, *credit_cards[:2], parent):
+            AccountFavorite.objects.get_or_create(user=user, account=account)
+        option = Option.objects.first()
+        if option is not None:
+            option.retirement_accounts = json.dumps([parent.id, *household.savings_ids])
+            option.save()
+
+    rebuild_household_caches(household)
+    return household
+
+
+def rebuild_household_caches(household: Household):
+    """Rebuilds the reminder and forecast caches of the household's accounts."""
+    rebuild_reminder_caches(household.reminder_ids)
+    for account_id in household.credit_card_ids:
+        update_cc_forecast_cache(account_id)
+    for account_id in [household.parent_id, *household.savings_ids]:
+        update_interest_forecast_cache(account_id)
+
+
+def household_summary(household: Household) -> Dict[str, int]:
+    return {
+        "accounts": len(household.account_ids),
+        "transactions": household.transactions,
+        "details": household.details,
+        "reminders": len(household.reminder_ids),
+        "reports": len(household.report_ids),
+    }
@@ -0,0 +1,72 @@
+"""
+Server-side prefix search for the description and payee autocompletes.
+
+Matches are read in index order and cut at the requested limit, so the cost
+of a lookup depends on the number of suggestions returned rather than on the
+size of the table. On PostgreSQL the `startswith` LIKE is served by the
+varchar_pattern_ops index on description_normalized. SQLite's LIKE is
+case-insensitive and ESCAPE'd, so it cannot use an index at all; there the
+prefix is also expressed as a range over the column, which the unique index
+answers directly.
+"""
+from typing import List
+from django.db import connection
+from django.db.models import QuerySet
+from administration.api.schemas.description_history import DescriptionHistoryOut
+from administration.api.schemas.payee import PayeeOut
+from administration.models import DescriptionHistory, Payee
+from core.cache import reference
+
+MAX_SUGGESTIONS = 50
+
+# Sorts after every other code point, bounding the range of strings that
+# start with the prefix.
+_PREFIX_END = "\U0010ffff"
+
+
+def _prefix_filter(qs: QuerySet, field: str, prefix: str) -> QuerySet:
+    qs = qs.filter(**{f"{field}__startswith": prefix})
+    if connection.vendor == "sqlite":
+        qs = qs.filter(
+            **{f"{field}__gte": prefix, f"{field}__lt": prefix + _PREFIX_END}
+        )
+    return qs
+
+
+def _clamp(limit: int) -> int:
+    return max(1, min(limit, MAX_SUGGESTIONS))
+
+
+def suggest_descriptions(prefix: str, limit: int = 10) -> List[DescriptionHistoryOut]:
+    """
+    Returns up to limit description histories starting with prefix
+    (case-insensitive), alphabetically, each with its last used tag.
+    """
+    qs = DescriptionHistory.objects.all()
+    prefix = prefix.strip().lower()
+    if prefix:
+        qs = _prefix_filter(qs, "description_normalized", prefix)
+    rows = qs.order_by("description_normalized").values_list(
+        "id", "description_normalized", "description_pretty", "tag_id"
+    )[: _clamp(limit)]
+    return [
+        DescriptionHistoryOut(
+            id=history_id,
+            description_pretty=pretty or normalized,
+            tag=reference.tag_out(tag_id),
+        )
+        for history_id, normalized, pretty, tag_id in rows
+    ]
+
+
+def suggest_payees(prefix: str, limit: int = 10) -> List[PayeeOut]:
+    """
+    Returns up to limit payees whose name starts with prefix
+    (case-insensitive), alphabetically.
+    """
+    qs = Payee.objects.all()
+    prefix = prefix.strip()
+    if prefix:
+        qs = qs.filter(payee_name__istartswith=prefix)
+    rows = qs.order_by("payee_name").values_list("id", "payee_name")[: _clamp(limit)]
+    return [PayeeOut(id=payee_id, payee_name=name) for payee_id, name in rows]
@@ -0,0 +1,56 @@
+import pytest
+from asgiref.sync import async_to_sync
+from ninja.testing import TestAsyncClient
+
+from accounts.models import AccountFavorite
+from backend.api import api
+
+pytestmark = [pytest.mark.api, pytest.mark.django_db]
+
+AUTH = {"Authorization": "Bearer test-api-key"}
+
+
+def _dashboard(user, etag=None):
+    headers = dict(AUTH)
+    if etag:
+        headers["If-None-Match"] = etag
+
+    async def get():
+        return await TestAsyncClient(api).get(
+            "/administration/dashboard/", headers=headers, user=user
+        )
+
+    return async_to_sync(get)()
+
+
+def test_dashboard_matches_the_separate_endpoints(
+    api_client, full_access_user, test_checking_account, test_savings_account, test_tag
+):
+    AccountFavorite.objects.create(user=full_access_user, account=test_checking_account)
+
+    response = _dashboard(full_access_user)
+
+    assert response.status_code == 200
+    data = response.json()
+    accounts = api_client.get("/accounts/list", headers=AUTH, user=full_access_user).json()
+    favorites = api_client.get("/accounts/favorite-balances", headers=AUTH, user=full_access_user).json()
+    retirement = api_client.get("/planning/retirement/get", headers=AUTH).json()
+    assert data["accounts"] == accounts
+    assert data["favorite_balances"] == favorites
+    assert data["retirement"] == retirement
+    assert [graph["widget_id"] for graph in data["graphs"]] == [1, 2, 3]
+    for graph in data["graphs"]:
+        items = api_client.get(
+            f"/tags/graph-by-tags/new?widget_id={graph['widget_id']}", headers=AUTH, user=full_access_user
+        ).json()
+        assert graph["items"] == items
+
+
+def test_unchanged_dashboard_is_not_modified(full_access_user, test_checking_account):
+    # The first load creates the user's default dashboard config.
+    _dashboard(full_access_user)
+    etag = _dashboard(full_access_user)["ETag"]
+
+    response = _dashboard(full_access_user, etag)
+
+    assert response.status_code == 304
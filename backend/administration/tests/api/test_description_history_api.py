@@ -85,3 +85,42 @@ def test_list_description_histories_includes_tag_field(api_client):
     assert len(data) == 1
     assert "tag" in data[0]
     assert data[0]["tag"] is None
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+def test_typeahead_description_histories_matches_prefix(api_client, test_tag):
+    for pretty in ["Walmart", "Walgreens", "Wawa", "Costco", "wal"]:
+        DescriptionHistory.objects.create(
+            description_normalized=pretty.lower(),
+            description_pretty=pretty,
+            tag=test_tag if pretty == "Walgreens" else None,
+        )
+
+    response = api_client.get(
+        "/administration/description-histories/typeahead?q=WAL&limit=2",
+        headers=AUTH,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["description_pretty"] for item in data] == ["wal", "Walgreens"]
+    assert data[1]["tag"]["id"] == test_tag.id
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+def test_typeahead_description_histories_escapes_wildcards(api_client):
+    DescriptionHistory.objects.create(
+        description_normalized="50% off", description_pretty="50% Off"
+    )
+    DescriptionHistory.objects.create(
+        description_normalized="500 club", description_pretty="500 Club"
+    )
+
+    response = api_client.get(
+        "/administration/description-histories/typeahead?q=50%25",
+        headers=AUTH,
+    )
+
+    assert [item["description_pretty"] for item in response.json()] == ["50% Off"]
@@ -82,3 +82,18 @@ def test_delete_payee(api_client, test_payee):
 
     from administration.models import Payee
     assert not Payee.objects.filter(id=test_payee.id).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+def test_typeahead_payees(api_client):
+    from administration.models import Payee
+    for name in ["Acme Corp", "acme labs", "Beta LLC"]:
+        Payee.objects.create(payee_name=name)
+
+    response = api_client.get(
+        "/administration/payees/typeahead?q=ACME", headers=AUTH
+    )
+
+    assert response.status_code == 200
+    assert [p["payee_name"] for p in response.json()] == ["Acme Corp", "acme labs"]
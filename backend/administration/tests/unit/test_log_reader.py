@@ -0,0 +1,184 @@
+import os
+import re
+import threading
+import time
+import tracemalloc
+import pytest
+from administration.services import log_reader
+
+LINE_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d+)\] (\w+) (.*)")
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+
+def _reference_entries(text: str) -> list:
+    """The whole-file parse the reader replaces, newest first."""
+    entries, current = [], None
+    for line in text.splitlines(keepends=True):
+        m = LINE_RE.match(line)
+        if m:
+            if current:
+                entries.append(current)
+            current = {"timestamp": m.group(1), "level": m.group(2), "message": m.group(3).rstrip()}
+        elif current:
+            current["message"] += "\n" + line.rstrip()
+    if current:
+        entries.append(current)
+    return list(reversed(entries))
+
+
+def _entry(n: int, traceback: bool = False) -> str:
+    text = f"[2026-10-01 12:00:{n % 60:02d},{n:03d}] {LEVELS[n % 4]} message number {n}\n"
+    if traceback:
+        text += "Traceback (most recent call last):\n  File \"x.py\", line 1\n\nValueError: [bad]\n"
+    return text
+
+
+@pytest.fixture
+def log_dir(tmp_path, settings):
+    settings.LOG_DIR = tmp_path
+    log_reader._indexes.clear()
+    yield tmp_path
+    log_reader._indexes.clear()
+
+
+@pytest.mark.unit
+def test_pages_match_whole_file_parse(log_dir):
+    text = "orphan continuation\n" + "".join(_entry(n, n % 7 == 0) for n in range(250))
+    (log_dir / "error.log").write_text(text)
+    expected = _reference_entries(text)
+
+    for page in (1, 2, 3):
+        result = log_reader.read_log_page("error", page=page, page_size=100)
+        assert result["entries"] == expected[(page - 1) * 100 : page * 100]
+        assert result["total"] == 250
+        assert result["pages"] == 3
+
+
+@pytest.mark.unit
+def test_level_and_search_filters_match_whole_file_parse(log_dir):
+    text = "".join(_entry(n, n % 5 == 0) for n in range(300))
+    (log_dir / "error.log").write_text(text)
+    expected = _reference_entries(text)
+
+    result = log_reader.read_log_page("error", page=2, page_size=20, levels={"ERROR", "INFO"})
+    filtered = [e for e in expected if e["level"] in {"ERROR", "INFO"}]
+    assert result["total"] == len(filtered)
+    assert result["entries"] == filtered[20:40]
+
+    result = log_reader.read_log_page("error", page=1, page_size=10, search="VALUEERROR")
+    searched = [e for e in expected if "valueerror" in e["message"].lower()]
+    assert result["total"] == len(searched)
+    assert result["entries"] == searched[:10]
+
+
+@pytest.mark.unit
+def test_page_past_end_is_clamped(log_dir):
+    (log_dir / "error.log").write_text("".join(_entry(n) for n in range(25)))
+
+    result = log_reader.read_log_page("error", page=9, page_size=10, search="message")
+    assert (result["page"], result["pages"], len(result["entries"])) == (3, 3, 5)
+    result = log_reader.read_log_page("error", page=9, page_size=10)
+    assert (result["page"], len(result["entries"])) == (3, 5)
+
+
+@pytest.mark.unit
+def test_rotated_files_follow_live_file_newest_first(log_dir):
+    (log_dir / "error.log").write_text(_entry(3))
+    (log_dir / "error.log.2026-09-30").write_text(_entry(2))
+    (log_dir / "error.log.2026-09-29").write_text(_entry(1))
+    (log_dir / "api.log.1").write_text(_entry(9))
+
+    result = log_reader.read_log_page("error")
+    assert [e["message"] for e in result["entries"]] == [
+        "message number 3",
+        "message number 2",
+        "message number 1",
+    ]
+
+
+@pytest.mark.unit
+def test_appended_entries_extend_index(log_dir):
+    path = log_dir / "task.log"
+    path.write_text("".join(_entry(n) for n in range(10)))
+    log_reader.read_log_page("task")
+    index = log_reader._indexes[path]
+
+    with open(path, "a") as f:
+        f.write("continued line\n" + _entry(10) + "[2026-10-01 12:00")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    result = log_reader.read_log_page("task", page_size=2)
+
+    assert log_reader._indexes[path] is index
+    assert result["total"] == 11
+    assert result["entries"][0]["message"] == "message number 10\n[2026-10-01 12:00"
+    assert result["entries"][1]["message"] == "message number 9\ncontinued line"
+
+
+@pytest.mark.unit
+def test_concurrent_reads_after_growth_extend_index_once(log_dir, monkeypatch):
+    path = log_dir / "task.log"
+    path.write_text("".join(_entry(n) for n in range(10)))
+    log_reader.read_log_page("task")
+    with open(path, "a") as f:
+        f.write("".join(_entry(n) for n in range(10, 50)))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    match = log_reader.LogIndex._match
+
+    def slow_match(mm, start, found):
+        # Widens the window between the stat check and the end of the scan
+        time.sleep(0.001)
+        match(mm, start, found)
+
+    monkeypatch.setattr(log_reader.LogIndex, "_match", staticmethod(slow_match))
+    barrier = threading.Barrier(4)
+    totals = []
+
+    def read():
+        barrier.wait()
+        totals.append(log_reader.read_log_page("task")["total"])
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    starts = list(log_reader._indexes[path].starts)
+    assert len(starts) == len(set(starts)) == 50
+    assert totals == [50] * 4
+
+
+@pytest.mark.unit
+def test_rotation_rebuilds_index(log_dir):
+    path = log_dir / "api.log"
+    path.write_text("".join(_entry(n) for n in range(10)))
+    log_reader.read_log_page("api")
+    path.rename(log_dir / "api.log.1")
+    path.write_text(_entry(42))
+
+    result = log_reader.read_log_page("api", page_size=1)
+    assert result["total"] == 11
+    assert result["entries"][0]["message"] == "message number 42"
+
+
+@pytest.mark.unit
+def test_paging_large_log_is_bounded_in_memory(log_dir):
+    path = log_dir / "error.log"
+    with open(path, "w") as f:
+        for n in range(40_000):
+            f.write(_entry(n, n % 10 == 0))
+    size = path.stat().st_size
+
+    log_reader.read_log_page("error")
+    tracemalloc.start()
+    try:
+        for page in (1, 200, 399):
+            log_reader.read_log_page("error", page=page, page_size=100)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < size / 20
@@ -3,6 +3,7 @@ from ninja.openapi.docs import Redoc
 from administration.api.dependencies.auth import SessionAuth
 from administration.api.dependencies.version import get_version
 from administration.api.routers.auth import auth_router
+from backend.renderers import ORJSONRenderer
 
 # Import routers from apps
 from accounts.api.routers.account_type import account_type_router
@@ -49,9 +50,11 @@ from administration.api.routers.backup import backup_router
 from administration.api.routers.logs import router as logs_router
 from reports.api.routers.report import report_router
 from administration.api.routers.dashboard_config import router as dashboard_config_router
+from administration.api.routers.dashboard import router as dashboard_router
 
 api = NinjaAPI(
     auth=SessionAuth(),
+    renderer=ORJSONRenderer(),
     docs=Redoc(settings={
         "theme": {
             "colors": {
@@ -105,4 +108,5 @@ api.add_router("/administration/backups", backup_router)
 api.add_router("/administration/logs", logs_router)
 api.add_router("/reports", report_router)
 api.add_router("/administration/dashboard-config", dashboard_config_router)
+api.add_router("/administration/dashboard", dashboard_router)
 api.add_router("/auth", auth_router)
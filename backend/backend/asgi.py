@@ -6,6 +6,7 @@ from django.core.asgi import get_asgi_application  # noqa: E402
 from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
 from channels.auth import AuthMiddlewareStack  # noqa: E402
 from core.routing import websocket_urlpatterns  # noqa: E402
+from core.cache import reference  # noqa: E402
 
 application = ProtocolTypeRouter(
     {
@@ -15,3 +16,5 @@ application = ProtocolTypeRouter(
         ),
     }
 )
+
+reference.warm()
@@ -0,0 +1,25 @@
+"""
+Compact JSON rendering for the API.
+
+orjson serializes the dicts, lists, strings and numbers of a response body in
+native code. Decimals and dates are handed back to Ninja's encoder so amounts
+stay strings and timestamps keep Django's format, and the output is the same
+JSON the default renderer produced, without the whitespace.
+"""
+from typing import Any
+
+import orjson
+from django.http import HttpRequest
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+_fallback = NinjaJSONEncoder().default
+
+OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+
+    def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
+        return orjson.dumps(data, default=_fallback, option=OPTIONS)
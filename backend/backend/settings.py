@@ -74,6 +74,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.cache.memo.MemoMiddleware",
 ]
 
 ROOT_URLCONF = "backend.urls"
@@ -426,3 +427,32 @@ CACHES = {
 
 
 CACHE_TTL = 60 * 60  # 1 hour default
+
+# Per-worker copy of the status/type/tag/account lookup tables, kept coherent
+# across workers through the channel layer (see core/cache/reference.py).
+REFERENCE_CACHE_TTL = 60 * 5
+REFERENCE_CACHE_LISTEN = True
+
+# Per-worker LRU in front of the shared cache for the account-scoped reads
+# (registers, balances, financials), kept coherent across workers through the
+# channel layer (see core/cache/store.py). 0 entries disables it. Hit ratios
+# are logged every NEAR_CACHE_REPORT_INTERVAL seconds.
+NEAR_CACHE_SIZE = int(os.environ.get("NEAR_CACHE_SIZE", 500))
+NEAR_CACHE_TTL = 5
+NEAR_CACHE_LISTEN = True
+NEAR_CACHE_REPORT_INTERVAL = 60 * 5
+
+# Seconds the previous balances and financials stay servable after an
+# invalidation, to requests that arrive while another one recomputes them
+# (see core.cache.helpers.cached). 0 makes them wait for the fresh value.
+CACHE_STALE_TTL = int(os.environ.get("CACHE_STALE_TTL", 0))
+
+# Seconds WebSocket invalidations are accumulated per group before one
+# coalesced message is sent (see core/broadcast.py). 0 sends immediately.
+BROADCAST_BATCH_WINDOW = 0.25
+
+# Independent reads an async view fans out (per-account financials, graph
+# widgets) run at most this many at once in worker threads, each on its own
+# database connection (see core/aio.py). An in-memory SQLite database runs
+# them one at a time.
+ASYNC_READ_CONCURRENCY = int(os.environ.get("ASYNC_READ_CONCURRENCY", 4))
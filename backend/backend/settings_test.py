@@ -24,6 +24,13 @@ CACHES = {
     }
 }
 
+REFERENCE_CACHE_LISTEN = False
+
+NEAR_CACHE_SIZE = 0
+NEAR_CACHE_LISTEN = False
+
+BROADCAST_BATCH_WINDOW = 0
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -24,28 +24,18 @@ import os
 
 @pytest.fixture(autouse=True)
 def clear_cache_between_tests():
-    """Clear locmem cache before each test.
+    """Clear locmem cache and the reference tables before each test.
 
     SQLite in-memory DB reuses IDs after transaction rollbacks, so tests can
     hit stale cache entries from a previous test that used the same account ID.
     """
     from django.core.cache import cache
+    from core.cache import reference
     cache.clear()
+    reference.clear()
     yield
     cache.clear()
-
-
-@pytest.fixture(autouse=True)
-def patch_delete_pattern():
-    with patch("core.cache.helpers.delete_pattern", return_value=None), \
-         patch("backend.utils.cache.delete_pattern", return_value=None), \
-         patch("accounts.signals.delete_pattern", return_value=None), \
-         patch("reminders.signals.delete_pattern", return_value=None), \
-         patch("transactions.signals.delete_pattern", return_value=None), \
-         patch("transactions.api.views.transaction.delete_pattern", return_value=None), \
-         patch("transactions.services.forecast_conversion.delete_pattern", return_value=None), \
-         patch("transactions.tasks.delete_pattern", return_value=None):
-        yield
+    reference.clear()
 
 
 def current_date():
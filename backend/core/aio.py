@@ -0,0 +1,74 @@
+"""
+Bounded fan-out of synchronous read services from async views.
+
+The read services are written against the synchronous ORM and the memo and
+reference caches, so async views call them through `run_sync` rather than
+re-implementing them on the async ORM. Inside `gather_limited`, up to
+ASYNC_READ_CONCURRENCY `run_sync` calls run at once, each in a worker thread
+on its own database connection that is closed when the call returns. Nested
+gathers share the outermost one's bound, so a composite endpoint cannot
+multiply it. An in-memory SQLite database exists only on the connection that
+created it, so there every call runs in the request's sync thread.
+"""
+import asyncio
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, connections
+
+_limiter: ContextVar[Optional[asyncio.Semaphore]] = ContextVar(
+    "async_read_limiter", default=None
+)
+
+
+def concurrency() -> int:
+    if connection.vendor == "sqlite" and connection.is_in_memory_db():
+        return 1
+    return max(getattr(settings, "ASYNC_READ_CONCURRENCY", 4), 1)
+
+
+def _closing(fn: Callable) -> Callable:
+    def call(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            # Worker threads are pooled; do not leave their connections open.
+            connections.close_all()
+
+    return call
+
+
+async def request_user(request):
+    """request.user, resolved without touching the lazy object on the event loop."""
+    auser = getattr(request, "auser", None)
+    return await auser() if auser else getattr(request, "user", None)
+
+
+async def run_sync(fn: Callable, *args, **kwargs):
+    """Runs fn(*args, **kwargs) off the event loop, within the active bound."""
+    if concurrency() == 1:
+        call = sync_to_async(fn)
+    else:
+        call = sync_to_async(_closing(fn), thread_sensitive=False)
+    limiter = _limiter.get()
+    if limiter is None:
+        return await call(*args, **kwargs)
+    async with limiter:
+        return await call(*args, **kwargs)
+
+
+async def gather_limited(calls: Iterable[Callable[[], Awaitable]]) -> List:
+    """
+    Awaits every call concurrently and returns their results in order. The
+    first exception propagates. `run_sync` calls made inside share one bound
+    of `concurrency()`, or the enclosing gather's bound when nested.
+    """
+    if _limiter.get() is not None:
+        return await asyncio.gather(*(call() for call in calls))
+    token = _limiter.set(asyncio.Semaphore(concurrency()))
+    try:
+        return await asyncio.gather(*(call() for call in calls))
+    finally:
+        _limiter.reset(token)
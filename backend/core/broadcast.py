@@ -1,18 +1,127 @@
+"""
+WebSocket cache-invalidation fan-out.
+
+Signal handlers and tasks call `broadcast_invalidate` once per write, which
+during a bulk import means thousands of identical messages. Calls are instead
+accumulated per group for `BROADCAST_BATCH_WINDOW` seconds and sent as a
+single `sync.invalidate` message carrying the union of the keys. When every
+call for a key names the affected accounts, the message also lists them under
+`accounts` so clients can skip refetching views of other accounts; a key
+broadcast without account ids invalidates every view of it.
+
+The data version counters behind the read endpoints' ETags are bumped
+immediately, not batched, so a refetch prompted by the message never gets a
+304 for the data it was told about.
+"""
+import atexit
+import logging
+import threading
+
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
-import logging
+from django.conf import settings
+
+from core.cache import versions
 
 error_logger = logging.getLogger("error")
 
+# All accounts: the key is not scoped to particular account ids.
+ALL_ACCOUNTS = None
+
 
-def broadcast_invalidate(keys: list, group: str = "global"):
+def _merge(pending: dict, keys, account_ids):
+    scoped = set(account_ids) if account_ids else ALL_ACCOUNTS
+    for key in keys:
+        if scoped is ALL_ACCOUNTS or pending.get(key, ()) is ALL_ACCOUNTS:
+            pending[key] = ALL_ACCOUNTS
+        else:
+            pending.setdefault(key, set()).update(scoped)
+
+
+def _message(pending: dict) -> dict:
+    message = {"type": "sync.invalidate", "keys": sorted(pending)}
+    accounts = {
+        key: sorted(ids)
+        for key, ids in pending.items()
+        if ids is not ALL_ACCOUNTS
+    }
+    if accounts:
+        message["accounts"] = accounts
+    return message
+
+
+def _send(group: str, message: dict):
     channel_layer = get_channel_layer()
     if channel_layer is None:
         return
     try:
-        async_to_sync(channel_layer.group_send)(
-            group,
-            {"type": "sync.invalidate", "keys": keys},
-        )
+        async_to_sync(channel_layer.group_send)(group, message)
     except Exception as e:
         error_logger.warning(f"WebSocket broadcast failed: {e}")
+
+
+class InvalidationBatcher:
+    """Coalesces invalidations per group and flushes them after a window."""
+
+    def __init__(self, window: float):
+        self.window = window
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, group: str, keys, account_ids=None):
+        with self._lock:
+            _merge(self._pending.setdefault(group, {}), keys, account_ids)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        for group, keys in pending.items():
+            _send(group, _message(keys))
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def _get_batcher() -> InvalidationBatcher:
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = InvalidationBatcher(
+                    getattr(settings, "BROADCAST_BATCH_WINDOW", 0.25)
+                )
+                atexit.register(_batcher.flush)
+    return _batcher
+
+
+def broadcast_invalidate(keys: list, group: str = "global", account_ids=None):
+    """
+    Tells connected clients in group to refetch keys, optionally only for
+    views of account_ids and their parent accounts. Batched unless
+    BROADCAST_BATCH_WINDOW is 0.
+    """
+    # A parent account's views show its children's data
+    account_ids = sorted(versions.with_parents(account_ids or []))
+    versions.bump(*keys)
+    versions.bump_accounts(account_ids)
+    if getattr(settings, "BROADCAST_BATCH_WINDOW", 0.25) <= 0:
+        pending = {}
+        _merge(pending, keys, account_ids)
+        _send(group, _message(pending))
+        return
+    _get_batcher().add(group, keys, account_ids)
+
+
+def flush_broadcasts():
+    """Sends any batched invalidations immediately."""
+    if _batcher is not None:
+        _batcher.flush()
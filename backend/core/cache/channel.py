@@ -0,0 +1,71 @@
+"""
+Channel-layer notifications between the workers' in-process caches
+(core.cache.reference tables, the core.cache.store near tier).
+
+`publish` sends a message to a group. `start_listener` runs a daemon thread
+that hands each message of the group to a callback, and calls
+`on_disconnect` whenever the connection drops, because messages published
+in the meantime are lost.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable
+
+from asgiref.sync import async_to_sync
+
+error_logger = logging.getLogger("error")
+
+
+def publish(group: str, message: dict):
+    from channels.layers import get_channel_layer
+
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(group, message)
+    except Exception as e:
+        error_logger.warning(f"Cache notification to {group} failed: {e}")
+
+
+def start_listener(
+    group: str,
+    handle: Callable[[dict], None],
+    on_disconnect: Callable[[], None],
+) -> threading.Thread:
+    thread = threading.Thread(
+        target=_listen,
+        args=(group, handle, on_disconnect),
+        name=f"{group}-listener",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _listen(group, handle, on_disconnect):
+    from channels.layers import DEFAULT_CHANNEL_LAYER, channel_layers
+
+    async def run(layer):
+        channel = await layer.new_channel(prefix=group)
+        while True:
+            # Re-joining keeps the membership from reaching group_expiry.
+            await layer.group_add(group, channel)
+            try:
+                message = await asyncio.wait_for(layer.receive(channel), timeout=3600)
+            except asyncio.TimeoutError:
+                continue
+            handle(message)
+
+    while True:
+        try:
+            # A private layer instance: the shared one belongs to the ASGI
+            # event loop and refuses receive() from a second loop.
+            asyncio.run(run(channel_layers.make_backend(DEFAULT_CHANNEL_LAYER)))
+        except Exception as e:
+            error_logger.warning(f"{group} listener restarting: {e}")
+        # Anything published while disconnected was missed.
+        on_disconnect()
+        time.sleep(5)
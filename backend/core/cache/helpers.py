@@ -1,23 +1,26 @@
-from django.core.cache import cache
-from django_redis import get_redis_connection
+import functools
 
+from django.conf import settings
 
-def cached(key_fn, ttl=300):
+from core.cache import memo, store
+
+
+def cached(key_fn, ttl=300, stale_ttl=None):
     """
     key_fn: either a string (static) or a function that receives (*args, **kwargs) and returns a string
+
+    Misses are recomputed once across concurrent callers (see
+    core.cache.store.get_or_compute). stale_ttl keeps the previous value that
+    long after an invalidation, for callers that arrive during a recompute;
+    None takes CACHE_STALE_TTL from settings, 0 disables it.
     """
 
     def decorator(fn):
+        @functools.wraps(fn)
         def wrapper(*args, **kwargs):
             key = key_fn(*args, **kwargs) if callable(key_fn) else key_fn
-
-            cached_value = cache.get(key)
-            if cached_value is not None:
-                return cached_value
-
-            value = fn(*args, **kwargs)
-            cache.set(key, value, ttl)
-            return value
+            stale = getattr(settings, "CACHE_STALE_TTL", 0) if stale_ttl is None else stale_ttl
+            return store.get_or_compute(key, lambda: fn(*args, **kwargs), ttl, stale)
 
         return wrapper
 
@@ -26,9 +29,8 @@ def cached(key_fn, ttl=300):
 
 def delete_pattern(pattern: str):
     """
-    Safely delete all Redis keys matching a wildcard pattern.
-    Uses SCAN to avoid blocking Redis.
+    Delete every cached entry whose key starts with pattern (a key prefix from
+    core.cache.keys), through the configured cache store.
     """
-    conn = get_redis_connection("default")
-    for key in conn.scan_iter(f"*{pattern}*"):
-        conn.delete(key)
+    memo.clear()
+    store.invalidate(pattern)
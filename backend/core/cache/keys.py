@@ -14,6 +14,18 @@ def account_combined_transactions(account_id: int) -> str:
     return f"account:{account_id}:transactions:combined"
 
 
+def account_register(account_id: int) -> str:
+    return f"{account_combined_transactions(account_id)}:register"
+
+
+def account_projected_balance(account_id: int, end_date) -> str:
+    return f"{account_combined_transactions(account_id)}:projected:{end_date.isoformat()}"
+
+
+def account_forecast_series(account_id: int) -> str:
+    return f"{account_combined_transactions(account_id)}:series"
+
+
 def account_pending_balance(account_id: int) -> str:
     return f"account:{account_id}:balance:pending"
 
@@ -36,3 +48,15 @@ def account_all_balances(account_id: int) -> str:
 
 def account_all_transactions(account_id: int) -> str:
     return f"account:{account_id}:transactions"
+
+
+def report_result(fingerprint: str) -> str:
+    return f"report:{fingerprint}:result"
+
+
+def report_partial(fingerprint: str) -> str:
+    return f"report:partial:{fingerprint}"
+
+
+def data_version(name: str) -> str:
+    return f"version:{name}"
@@ -0,0 +1,139 @@
+"""
+Request-scoped memoization.
+
+A single API request or task run often resolves the same account several
+times over (parent checks, `Account.objects.get`, balance and financials cache
+reads) as it fans out through services. Functions decorated with `memoize`
+remember their results in a scope held in a context variable, so repeated
+calls with the same arguments inside one request or task are answered from
+memory. Outside a scope the decorator is a plain pass-through.
+
+`MemoMiddleware` opens a scope per HTTP request and the django-q receivers in
+transactions.signals open one per task. Any model save or delete, and every
+`delete_pattern` cache sweep, empties the active scope so a request that
+writes and then reads never sees its own stale lookups.
+"""
+import functools
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.db.models.signals import post_delete, post_save
+
+db_logger = logging.getLogger("db")
+
+
+class MemoScope:
+    """Memoized values for one request or task, with per-namespace counters."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.values = {}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def clear(self):
+        self.values.clear()
+
+    def summary(self) -> str:
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        return ", ".join(
+            f"{namespace} {self.hits[namespace]}/{self.hits[namespace] + self.misses[namespace]}"
+            for namespace in namespaces
+        )
+
+
+_scope: ContextVar[Optional[MemoScope]] = ContextVar("memo_scope", default=None)
+
+
+def current_scope() -> Optional[MemoScope]:
+    return _scope.get()
+
+
+def begin_scope(name: str):
+    """
+    Opens a scope and returns the token to pass to `end_scope`, or None when a
+    scope is already active (the outer scope is reused).
+    """
+    if _scope.get() is not None:
+        return None
+    return _scope.set(MemoScope(name))
+
+
+def end_scope(token):
+    if token is None:
+        return
+    scope = _scope.get()
+    _scope.reset(token)
+    if scope is not None and scope.hits:
+        db_logger.debug(f"Memo hits for {scope.name}: {scope.summary()}")
+
+
+@contextmanager
+def memo_scope(name: str = "scope"):
+    token = begin_scope(name)
+    try:
+        yield _scope.get()
+    finally:
+        end_scope(token)
+
+
+def clear():
+    """Empties the active scope, if any."""
+    scope = _scope.get()
+    if scope is not None:
+        scope.clear()
+
+
+def memoize(namespace: str):
+    """
+    Remembers fn's result per argument tuple within the active scope.
+    Exceptions are not remembered, and calls with unhashable arguments pass
+    straight through.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            scope = _scope.get()
+            if scope is None:
+                return fn(*args, **kwargs)
+            key = (namespace, args, tuple(sorted(kwargs.items())))
+            try:
+                value = scope.values[key]
+            except KeyError:
+                pass
+            except TypeError:
+                return fn(*args, **kwargs)
+            else:
+                scope.hits[namespace] += 1
+                return value
+            scope.misses[namespace] += 1
+            value = fn(*args, **kwargs)
+            scope.values[key] = value
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+class MemoMiddleware:
+    """Opens a memo scope for the duration of each request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with memo_scope(f"{request.method} {request.path}"):
+            return self.get_response(request)
+
+
+def _clear_on_write(sender, **kwargs):
+    clear()
+
+
+post_save.connect(_clear_on_write, dispatch_uid="core.cache.memo.post_save")
+post_delete.connect(_clear_on_write, dispatch_uid="core.cache.memo.post_delete")
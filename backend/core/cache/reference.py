@@ -0,0 +1,255 @@
+"""
+In-process read-through cache of the small reference tables that hot paths
+resolve over and over: transaction status/type slugs, tag display names,
+account names and parent accounts, plus the serialized status/type/tag rows that cached registers
+reference by id.
+
+Each table is loaded with a single query on first use and kept in module
+memory. Writes to the underlying models call `invalidate()` (from the app
+signal handlers), which clears the local copy and, once the surrounding
+database transaction commits, publishes the table names on the channel layer
+so every other API and qcluster worker drops its copy as well. A TTL bounds
+staleness if a notification is ever missed.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction as db_transaction
+
+from core.cache import channel, versions
+
+error_logger = logging.getLogger("error")
+
+GROUP = "reference_cache"
+
+STATUS = "status"
+TYPE = "type"
+TAG = "tag"
+ACCOUNT = "account"
+ACCOUNT_PARENT = "account_parent"
+STATUS_ROW = "status_row"
+TYPE_ROW = "type_row"
+TAG_ROW = "tag_row"
+TABLES = (STATUS, TYPE, TAG, ACCOUNT, ACCOUNT_PARENT, STATUS_ROW, TYPE_ROW, TAG_ROW)
+
+_tables = {}
+_loaded_at = {}
+_lock = threading.Lock()
+_listener = None
+
+
+def _load_statuses():
+    from transactions.models import TransactionStatus
+
+    return dict(TransactionStatus.objects.values_list("slug", "id"))
+
+
+def _load_types():
+    from transactions.models import TransactionType
+
+    return dict(TransactionType.objects.values_list("slug", "id"))
+
+
+def _load_tags():
+    from tags.models import Tag
+
+    rows = Tag.objects.values_list("id", "parent__tag_name", "child__tag_name")
+    return {
+        tag_id: f"{parent} / {child}" if child else parent
+        for tag_id, parent, child in rows
+    }
+
+
+def _load_accounts():
+    from accounts.models import Account
+
+    return dict(Account.objects.values_list("id", "account_name"))
+
+
+def _load_account_parents():
+    from accounts.models import Account
+
+    return dict(Account.objects.values_list("id", "parent_account_id"))
+
+
+def _load_status_rows():
+    from transactions.models import TransactionStatus
+    from transactions.api.schemas.transaction_status import TransactionStatusOut
+
+    return {
+        status.id: TransactionStatusOut.from_orm(status)
+        for status in TransactionStatus.objects.all()
+    }
+
+
+def _load_type_rows():
+    from transactions.models import TransactionType
+    from transactions.api.schemas.transaction_type import TransactionTypeOut
+
+    return {
+        transaction_type.id: TransactionTypeOut.from_orm(transaction_type)
+        for transaction_type in TransactionType.objects.all()
+    }
+
+
+def _load_tag_rows():
+    from tags.models import Tag
+    from tags.api.schemas.tag import TagOut
+
+    tags = Tag.objects.select_related(
+        "parent",
+        "parent__tag_type",
+        "child",
+        "child__tag_type",
+        "tag_type",
+    )
+    return {tag.id: TagOut.from_orm(tag) for tag in tags}
+
+
+_LOADERS = {
+    STATUS: _load_statuses,
+    TYPE: _load_types,
+    TAG: _load_tags,
+    ACCOUNT: _load_accounts,
+    ACCOUNT_PARENT: _load_account_parents,
+    STATUS_ROW: _load_status_rows,
+    TYPE_ROW: _load_type_rows,
+    TAG_ROW: _load_tag_rows,
+}
+
+
+def _table(name: str, reload: bool = False) -> dict:
+    ttl = getattr(settings, "REFERENCE_CACHE_TTL", 300)
+    data = _tables.get(name)
+    if (
+        reload
+        or data is None
+        or time.monotonic() - _loaded_at.get(name, 0) > ttl
+    ):
+        _ensure_listener()
+        data = _LOADERS[name]()
+        with _lock:
+            _tables[name] = data
+            _loaded_at[name] = time.monotonic()
+    return data
+
+
+def _lookup(name: str, key):
+    data = _table(name)
+    if key not in data:
+        # The row may have been created by another worker before its
+        # notification reached us; reload once before giving up.
+        data = _table(name, reload=True)
+    return data.get(key)
+
+
+def status_id(slug: str) -> int:
+    """Returns the TransactionStatus id for slug, raising DoesNotExist if absent."""
+    value = _lookup(STATUS, slug)
+    if value is None:
+        from transactions.models import TransactionStatus
+
+        raise TransactionStatus.DoesNotExist(f"No transaction status '{slug}'")
+    return value
+
+
+def type_id(slug: str) -> int:
+    """Returns the TransactionType id for slug, raising DoesNotExist if absent."""
+    value = _lookup(TYPE, slug)
+    if value is None:
+        from transactions.models import TransactionType
+
+        raise TransactionType.DoesNotExist(f"No transaction type '{slug}'")
+    return value
+
+
+def tag_display_name(tag_id):
+    """Returns 'parent / child' (or just 'parent') for tag_id, or None."""
+    if tag_id is None:
+        return None
+    return _lookup(TAG, tag_id)
+
+
+def account_name(account_id, default: str = "Unknown Account") -> str:
+    if account_id is None:
+        return default
+    return _lookup(ACCOUNT, account_id) or default
+
+
+def parent_account_id(account_id):
+    """Returns the parent account id of account_id, or None."""
+    if account_id is None:
+        return None
+    return _lookup(ACCOUNT_PARENT, account_id)
+
+
+def status_out(status_id):
+    """Returns the shared TransactionStatusOut for status_id, or None."""
+    if status_id is None:
+        return None
+    return _lookup(STATUS_ROW, status_id)
+
+
+def type_out(type_id):
+    """Returns the shared TransactionTypeOut for type_id, or None."""
+    if type_id is None:
+        return None
+    return _lookup(TYPE_ROW, type_id)
+
+
+def tag_out(tag_id):
+    """Returns the shared TagOut for tag_id, or None."""
+    if tag_id is None:
+        return None
+    return _lookup(TAG_ROW, tag_id)
+
+
+def warm():
+    """Loads every table. Safe to call before the database is ready."""
+    try:
+        for name in TABLES:
+            _table(name, reload=True)
+    except Exception as e:
+        error_logger.warning(f"Reference cache warm-up skipped: {e}")
+
+
+def clear(*names):
+    """Drops the local copy of the named tables (all tables when none given)."""
+    with _lock:
+        for name in names or TABLES:
+            _tables.pop(name, None)
+            _loaded_at.pop(name, None)
+
+
+def invalidate(*names):
+    """
+    Drops the named tables locally now, and in every other worker once the
+    current database transaction commits. Responses that show reference
+    values get a new ETag.
+    """
+    clear(*names)
+    versions.bump(versions.REFERENCE)
+    db_transaction.on_commit(lambda: _publish(names or TABLES))
+
+
+def _publish(names):
+    # Clear again after commit: a concurrent reader may have reloaded the
+    # pre-commit rows in the meantime.
+    clear(*names)
+    if getattr(settings, "REFERENCE_CACHE_LISTEN", False):
+        channel.publish(GROUP, {"type": "reference.invalidate", "tables": list(names)})
+
+
+def _ensure_listener():
+    global _listener
+    if _listener is not None or not getattr(settings, "REFERENCE_CACHE_LISTEN", False):
+        return
+    with _lock:
+        if _listener is None:
+            _listener = channel.start_listener(
+                GROUP,
+                lambda message: clear(*(message.get("tables") or TABLES)),
+                clear,
+            )
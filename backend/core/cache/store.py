@@ -0,0 +1,427 @@
+"""
+Cache store behind the account-scoped caches: transaction querysets, balances,
+financials, registers, projected balances and forecast series.
+
+Keys are colon-separated paths (see core.cache.keys), and any prefix of a key
+works as a tag. `invalidate("account:5:")` drops every entry of account 5;
+`invalidate("account:5:balance")` drops only its balances. Two stores
+implement this:
+
+- `RedisStore` for django-redis backends. It SCANs for keys under the tag
+  and deletes them in batches, so every worker's writes are found. django-redis
+  answers get_many with a single MGET.
+- `LocalStore` for every other backend, such as the local memory cache the
+  tests run on. It keeps an index of the keys written through it, in the same
+  process. That suits process-local caches only.
+
+With NEAR_CACHE_SIZE > 0, a `TieredStore` puts a per-worker LRU (the near
+tier) in front of either store. It holds up to that many values for
+NEAR_CACHE_TTL seconds, so repeated reads skip the round-trip and the
+unpickling. Callers must treat the values they get back as read-only, since
+they are shared. `invalidate` and `delete` clear the near tier at once. After
+the surrounding database transaction commits, they publish the tags on the
+channel layer so every other worker clears its near tier as well. The TTL
+bounds staleness if a notification is ever missed. Hit ratios per tier, and
+the far-tier time the near hits saved, are logged every
+NEAR_CACHE_REPORT_INTERVAL seconds; `stats()` returns them.
+
+`get_or_compute` recomputes a missing value once, however many requests
+miss it together. The first one takes a short lock key (`cache.add`, SET NX
+on Redis) and computes; the others wait for its result. With a stale TTL, the
+computed value is also kept under a stale key outside the tag namespace. That
+copy survives invalidation, and waiters are answered from it at once instead
+of waiting.
+
+Writes that should be invalidated by tag must go through this module, not
+straight to `django.core.cache.cache`. The store is picked from
+CACHES["default"] on first use.
+"""
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction as db_transaction
+
+from core.cache import channel
+
+db_logger = logging.getLogger("db")
+
+SCAN_BATCH = 500
+
+# Seconds a recompute may hold its lock, and how often waiters poll for the
+# result. A waiter that sees neither the value nor the lock computes itself.
+LOCK_TIMEOUT = 10
+LOCK_POLL = 0.02
+
+GROUP = "cache_store"
+
+
+class CacheStore(ABC):
+    """get/set/get_many/set_many/delete on a Django cache plus `invalidate(tag)`."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, key: str, default=None):
+        return self.backend.get(key, default)
+
+    def get_many(self, keys: Iterable[str]) -> Dict:
+        return self.backend.get_many(list(keys))
+
+    def set(self, key: str, value, timeout=DEFAULT_TIMEOUT):
+        self.backend.set(key, value, timeout)
+        self._track([key])
+
+    def set_many(self, values: Dict, timeout=DEFAULT_TIMEOUT):
+        self.backend.set_many(values, timeout)
+        self._track(values)
+
+    def delete(self, key: str):
+        self.backend.delete(key)
+
+    @abstractmethod
+    def invalidate(self, tag: str):
+        """Deletes every entry whose key starts with tag."""
+
+    def _track(self, keys: Iterable[str]):
+        pass
+
+
+class RedisStore(CacheStore):
+    def _connection(self):
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    def invalidate(self, tag: str):
+        conn = self._connection()
+        batch = []
+        for key in conn.scan_iter(match=f"{self.backend.make_key(tag)}*", count=SCAN_BATCH):
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH:
+                conn.delete(*batch)
+                batch = []
+        if batch:
+            conn.delete(*batch)
+
+
+class LocalStore(CacheStore):
+    def __init__(self, backend):
+        super().__init__(backend)
+        # Ordered key index; a dict because this module defines `set`.
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def _track(self, keys: Iterable[str]):
+        with self._lock:
+            self._keys.update(dict.fromkeys(keys))
+
+    def delete(self, key: str):
+        super().delete(key)
+        with self._lock:
+            self._keys.pop(key, None)
+
+    def invalidate(self, tag: str):
+        with self._lock:
+            matched = [key for key in self._keys if key.startswith(tag)]
+            for key in matched:
+                del self._keys[key]
+        if matched:
+            self.backend.delete_many(matched)
+
+
+class NearCache:
+    """A bounded LRU of values that expire ttl seconds after they are stored."""
+
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Returns (hit, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, tag: str):
+        """Drops every value whose key starts with tag."""
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(tag)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TieredStore(CacheStore):
+    """A NearCache in front of another store."""
+
+    def __init__(self, far: CacheStore, near: NearCache, report_interval: float = 0):
+        super().__init__(far.backend)
+        self.far = far
+        self.near = near
+        self.report_interval = report_interval
+        self._counts = dict.fromkeys(("near_hits", "far_hits", "misses"), 0)
+        self._far_seconds = 0.0
+        self._far_reads = 0
+        self._reported_at = time.monotonic()
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        hit, value = self.near.get(key)
+        if hit:
+            self._count(near_hits=1)
+            return value
+        start = time.perf_counter()
+        value = self.far.get(key)
+        self._count_far(time.perf_counter() - start, far_hits=int(value is not None), misses=int(value is None))
+        if value is None:
+            return default
+        self.near.put(key, value)
+        return value
+
+    def get_many(self, keys: Iterable[str]) -> Dict:
+        found, missing = {}, []
+        for key in keys:
+            hit, value = self.near.get(key)
+            if hit:
+                found[key] = value
+            else:
+                missing.append(key)
+        self._count(near_hits=len(found))
+        if missing:
+            start = time.perf_counter()
+            values = self.far.get_many(missing)
+            self._count_far(
+                time.perf_counter() - start,
+                far_hits=len(values),
+                misses=len(missing) - len(values),
+            )
+            for key, value in values.items():
+                self.near.put(key, value)
+            found.update(values)
+        return found
+
+    def set(self, key: str, value, timeout=DEFAULT_TIMEOUT):
+        self.far.set(key, value, timeout)
+        self.near.put(key, value)
+
+    def set_many(self, values: Dict, timeout=DEFAULT_TIMEOUT):
+        self.far.set_many(values, timeout)
+        for key, value in values.items():
+            self.near.put(key, value)
+
+    def delete(self, key: str):
+        self.far.delete(key)
+        self._discard_everywhere(key)
+
+    def invalidate(self, tag: str):
+        self.far.invalidate(tag)
+        self._discard_everywhere(tag)
+
+    def _discard_everywhere(self, tag: str):
+        self.near.discard(tag)
+        db_transaction.on_commit(lambda: self._publish(tag))
+
+    def _publish(self, tag: str):
+        # Discard again after commit: a concurrent reader may have stored
+        # pre-commit values in the meantime.
+        self.near.discard(tag)
+        if getattr(settings, "NEAR_CACHE_LISTEN", False):
+            channel.publish(GROUP, {"type": "cache_store.invalidate", "tags": [tag]})
+
+    def _count(self, **counts):
+        with self._stats_lock:
+            for name, count in counts.items():
+                self._counts[name] += count
+        self._maybe_report()
+
+    def _count_far(self, seconds: float, **counts):
+        with self._stats_lock:
+            self._far_seconds += seconds
+            self._far_reads += 1
+        self._count(**counts)
+
+    def stats(self) -> dict:
+        """Hits per tier, hit ratios and the far-tier time near hits saved."""
+        with self._stats_lock:
+            near_hits, far_hits, misses = (
+                self._counts["near_hits"], self._counts["far_hits"], self._counts["misses"]
+            )
+            far_read_ms = self._far_seconds * 1000 / self._far_reads if self._far_reads else 0.0
+        reads = near_hits + far_hits + misses
+        return {
+            "reads": reads,
+            "near_hits": near_hits,
+            "near_hit_ratio": near_hits / reads if reads else 0.0,
+            "far_hits": far_hits,
+            "far_hit_ratio": far_hits / (far_hits + misses) if far_hits + misses else 0.0,
+            "far_read_ms": far_read_ms,
+            "saved_ms": near_hits * far_read_ms,
+            "near_entries": len(self.near),
+        }
+
+    def _maybe_report(self):
+        if not self.report_interval or time.monotonic() - self._reported_at < self.report_interval:
+            return
+        self._reported_at = time.monotonic()
+        stats = self.stats()
+        db_logger.info(
+            f"Cache store: {stats['reads']} reads, near {stats['near_hit_ratio']:.0%}, "
+            f"far {stats['far_hit_ratio']:.0%}, far read {stats['far_read_ms']:.2f} ms, "
+            f"saved {stats['saved_ms']:.0f} ms, {stats['near_entries']} near entries"
+        )
+
+
+_store: Optional[CacheStore] = None
+_store_lock = threading.Lock()
+_listener = None
+
+
+def _build() -> CacheStore:
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    far = RedisStore(cache) if backend.startswith("django_redis.") else LocalStore(cache)
+    size = getattr(settings, "NEAR_CACHE_SIZE", 0)
+    if not size:
+        return far
+    _ensure_listener()
+    return TieredStore(
+        far,
+        NearCache(size, getattr(settings, "NEAR_CACHE_TTL", 5)),
+        getattr(settings, "NEAR_CACHE_REPORT_INTERVAL", 300),
+    )
+
+
+def _discard_near(message: dict):
+    tiered = _store
+    if isinstance(tiered, TieredStore):
+        for tag in message.get("tags") or []:
+            tiered.near.discard(tag)
+
+
+def _clear_near():
+    tiered = _store
+    if isinstance(tiered, TieredStore):
+        tiered.near.clear()
+
+
+def _ensure_listener():
+    global _listener
+    if _listener is None and getattr(settings, "NEAR_CACHE_LISTEN", False):
+        _listener = channel.start_listener(GROUP, _discard_near, _clear_near)
+
+
+def current() -> CacheStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _build()
+    return _store
+
+
+def reset():
+    """Drops the store so the next call rebuilds it from settings."""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+def stats() -> Optional[dict]:
+    """The near tier's counters, or None when it is disabled."""
+    tiered = current()
+    return tiered.stats() if isinstance(tiered, TieredStore) else None
+
+
+def lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+def stale_key(key: str) -> str:
+    return f"stale:{key}"
+
+
+def get_or_compute(key: str, compute, timeout=DEFAULT_TIMEOUT, stale_ttl: int = 0):
+    """
+    Returns the cached value of key, or computes, stores and returns it,
+    computing at most once across concurrent misses. compute returning None
+    is not stored. With stale_ttl, a miss that another request is already
+    computing returns the previous value if one is kept.
+    """
+    target = current()
+    value = target.get(key)
+    if value is not None:
+        return value
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        if target.backend.add(lock_key(key), 1, LOCK_TIMEOUT):
+            try:
+                value = compute()
+                if value is not None:
+                    target.set(key, value, timeout)
+                    if stale_ttl:
+                        target.backend.set(stale_key(key), value, stale_ttl)
+                return value
+            finally:
+                target.backend.delete(lock_key(key))
+        if stale_ttl:
+            value = target.backend.get(stale_key(key))
+            if value is not None:
+                return value
+        while target.backend.get(lock_key(key)) is not None and time.monotonic() < deadline:
+            time.sleep(LOCK_POLL)
+        value = target.get(key)
+        if value is not None:
+            return value
+        if time.monotonic() >= deadline:
+            return compute()
+
+
+def get(key: str, default=None):
+    return current().get(key, default)
+
+
+def get_many(keys: Iterable[str]) -> Dict:
+    return current().get_many(keys)
+
+
+def set(key: str, value, timeout=DEFAULT_TIMEOUT):
+    current().set(key, value, timeout)
+
+
+def set_many(values: Dict, timeout=DEFAULT_TIMEOUT):
+    current().set_many(values, timeout)
+
+
+def delete(key: str):
+    current().delete(key)
+
+
+def invalidate(tag: str):
+    current().invalidate(tag)
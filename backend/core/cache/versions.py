@@ -0,0 +1,125 @@
+"""
+Data version counters behind conditional GETs.
+
+Read endpoints answer `If-None-Match` from a hash of the counters their
+response depends on (see core.etag), so the counters must move whenever that
+data can change:
+
+- `broadcast_invalidate` bumps one counter per invalidated key ("accounts",
+  "transactions", "tag_graph", ...) and one per affected account, plus the
+  parent of each affected child account since parent registers and balances
+  roll their children up.
+- `reference.invalidate` bumps "reference" (tag, status, type and account
+  names shown inside responses).
+- Saves and deletes of the models in TRACKED_MODELS bump `model:<label>`, for
+  settings that reach responses without a broadcast (options, dashboard
+  widgets, paychecks, favorites, attachments).
+- Transaction writes bump `month:<yyyy-mm>` of the transaction's month (see
+  reports.signals), for the report partials cached per month.
+
+Counters live in the shared cache without expiry. One that is missing (never
+bumped, evicted or flushed) is seeded from the clock, so a counter can never
+return to a value an earlier ETag was built from.
+"""
+import logging
+import time
+from typing import Dict, Iterable
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from core.cache.keys import data_version
+
+error_logger = logging.getLogger("error")
+
+REFERENCE = "reference"
+
+# App labels or app.model labels whose writes bump a `model:` counter.
+TRACKED_MODELS = (
+    "accounts",
+    "administration.option",
+    "administration.userdashboardconfig",
+    "planning",
+    "transactions.paycheck",
+    "transactions.transactionimage",
+)
+
+
+def account(account_id) -> str:
+    """The counter name of one account's register, balances and forecast."""
+    return f"account:{int(account_id)}"
+
+
+def model(label: str) -> str:
+    return f"model:{label}"
+
+
+def month(day) -> str:
+    """The counter name of the transactions dated in day's month."""
+    return f"month:{str(day)[:7]}"
+
+
+def _seed() -> int:
+    return time.time_ns()
+
+
+def _bump(name: str):
+    key = data_version(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, _seed(), None):
+            cache.incr(key)
+
+
+def bump(*names):
+    """Advances the named counters. Failures are logged, never raised."""
+    try:
+        for name in names:
+            _bump(name)
+    except Exception as e:
+        error_logger.warning(f"Data version bump failed for {names}: {e}")
+
+
+def with_parents(account_ids: Iterable) -> set:
+    """account_ids together with their parent accounts."""
+    from core.cache import reference
+
+    ids = {account_id for account_id in account_ids if account_id}
+    try:
+        parents = {reference.parent_account_id(account_id) for account_id in ids}
+    except Exception as e:
+        error_logger.warning(f"Parent lookup for data versions failed: {e}")
+        parents = set()
+    return ids | parents - {None}
+
+
+def bump_accounts(account_ids: Iterable):
+    """Advances the counters of account_ids and of their parent accounts."""
+    bump(*(account(account_id) for account_id in sorted(with_parents(account_ids))))
+
+
+def current(names: Iterable[str]) -> Dict[str, int]:
+    """The counters for names, seeding any that are missing."""
+    keys = {data_version(name): name for name in names}
+    values = cache.get_many(list(keys))
+    missing = [key for key in keys if key not in values]
+    if missing:
+        seed = _seed()
+        for key in missing:
+            cache.add(key, seed, None)
+        values.update(cache.get_many(missing))
+    return {name: values.get(key) for key, name in keys.items()}
+
+
+def _bump_on_write(sender, **kwargs):
+    meta = getattr(sender, "_meta", None)
+    if meta is None:
+        return
+    for label in (meta.app_label, meta.label_lower):
+        if label in TRACKED_MODELS:
+            bump(model(label))
+
+
+post_save.connect(_bump_on_write, dispatch_uid="core.cache.versions.post_save")
+post_delete.connect(_bump_on_write, dispatch_uid="core.cache.versions.post_delete")
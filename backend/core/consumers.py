@@ -22,7 +22,12 @@ class SyncConsumer(AsyncWebsocketConsumer):
         pass
 
     async def sync_invalidate(self, event):
-        await self.send(text_data=json.dumps({
+        # "accounts" maps a key to the only account ids whose views need to
+        # refetch it; keys missing from the map invalidate every view.
+        message = {
             "type": "invalidate",
             "keys": event["keys"],
-        }))
+        }
+        if event.get("accounts"):
+            message["accounts"] = event["accounts"]
+        await self.send(text_data=json.dumps(message))
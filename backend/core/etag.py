@@ -0,0 +1,123 @@
+"""
+Conditional GETs for read endpoints.
+
+`conditional` wraps a ninja operation (through `decorate_view`) so that an
+authenticated GET is answered with 304 Not Modified when its If-None-Match
+carries the current ETag, before the view parses parameters or touches a
+queryset. The ETag hashes the request path and query string, the user,
+today's date (registers and forecasts move with the calendar) and the data
+version counters the endpoint names, so it changes whenever any of those do.
+See core.cache.versions for what bumps the counters.
+
+    @router.get("/get/{account_id}", response=AccountOut)
+    @decorate_view(conditional(versions.REFERENCE, scope=account_scope("account_id")))
+    def get_account(request, account_id: int):
+        ...
+"""
+import asyncio
+import functools
+import hashlib
+from typing import Callable, Iterable, List, Optional
+
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from core.aio import request_user
+from core.cache import versions
+from utils.dates import get_todays_date_timezone_adjusted
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def account_scope(param: str) -> Callable:
+    """
+    Scope of endpoints whose data belongs to one account, named by the path
+    or query parameter param.
+    """
+
+    def scope(request, params) -> List[str]:
+        return [versions.account(params.get(param, request.GET.get(param)))]
+
+    return scope
+
+
+def make_etag(request, names: Iterable[str], user=None) -> str:
+    counters = versions.current(names)
+    parts = [
+        request.path,
+        request.GET.urlencode(),
+        str(getattr(user, "pk", "")),
+        get_todays_date_timezone_adjusted().isoformat(),
+        *(f"{name}={counters[name]}" for name in sorted(counters)),
+    ]
+    digest = hashlib.sha1("\n".join(parts).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def _matches(request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    # Weak comparison: the W/ prefix is ignored on both sides.
+    wanted = etag.removeprefix("W/")
+    return any(
+        tag == "*" or tag.removeprefix("W/") == wanted for tag in parse_etags(header)
+    )
+
+
+def conditional(*names: str, scope: Optional[Callable] = None) -> Callable:
+    """
+    View decorator adding ETag / 304 handling to sync and async operations.
+
+    Args:
+        names (str): Data version counters the response depends on.
+        scope (callable): Optional (request, path_params) -> counter names,
+            for counters that depend on the request. May raise TypeError or
+            ValueError for malformed parameters, in which case the request is
+            passed through for the view to reject.
+    """
+
+    def current_etag(request, kw, user) -> Optional[str]:
+        """The request's ETag, or None when it is not handled conditionally."""
+        if request.method not in ("GET", "HEAD") or not getattr(
+            user, "is_authenticated", False
+        ):
+            return None
+        try:
+            scoped = scope(request, kw) if scope else []
+        except (TypeError, ValueError):
+            return None
+        return make_etag(request, [*names, *scoped], user)
+
+    def tagged(response, etag):
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            response["Cache-Control"] = CACHE_CONTROL
+        return response
+
+    def decorator(run):
+        if asyncio.iscoroutinefunction(run):
+
+            @functools.wraps(run)
+            async def async_wrapper(request, **kw):
+                etag = current_etag(request, kw, await request_user(request))
+                if etag is None:
+                    return await run(request, **kw)
+                if _matches(request, etag):
+                    return tagged(HttpResponseNotModified(), etag)
+                return tagged(await run(request, **kw), etag)
+
+            return async_wrapper
+
+        @functools.wraps(run)
+        def wrapper(request, **kw):
+            etag = current_etag(request, kw, getattr(request, "user", None))
+            if etag is None:
+                return run(request, **kw)
+            if _matches(request, etag):
+                return tagged(HttpResponseNotModified(), etag)
+            return tagged(run(request, **kw), etag)
+
+        return wrapper
+
+    return decorator
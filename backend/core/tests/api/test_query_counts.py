@@ -0,0 +1,104 @@
+"""
+Query-count regression guard for the hot read endpoints.
+
+Each call is made cold (shared cache and reference tables cleared) against a
+synthetic household at two sizes that share the same accounts, reminders,
+budgets and reports but differ several times over in transaction history. A
+call whose query count grows with the history runs per-row queries (an N+1)
+somewhere on its path. Calls that page or cap their rows would hide such
+queries behind the cap, so every call also has a recorded ceiling; lower it
+when a change removes queries.
+"""
+from contextlib import contextmanager
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction as db_transaction
+from django.test.utils import CaptureQueriesContext
+
+from administration.services.synthetic_household import HouseholdSpec, generate_household
+from core.cache import reference
+from reports.models import ReportConfig
+
+pytestmark = [pytest.mark.api, pytest.mark.django_db]
+
+AUTH = {"Authorization": "Bearer test-api-key"}
+
+# Queries of each call for the 8-account household, at most.
+CEILINGS = {
+    "register": 16,
+    "register.card": 16,
+    "register.parent": 16,
+    "upcoming": 6,
+    "accounts": 113,
+    "planning.graph.expense": 58,
+    "planning.graph.pay": 18,
+    "graph.new": 45,
+    "graph.get": 42,
+    "budgets": 23,
+    "report.run": 10,
+}
+
+SMALL = HouseholdSpec(accounts=8, years=1, transactions_per_month=8, reminders=8, budgets=3)
+LARGE = HouseholdSpec(accounts=8, years=2, transactions_per_month=40, reminders=8, budgets=3)
+
+
+def _calls(household):
+    """(name, path, body) of the guarded calls; calls with a body are POSTs."""
+    report = ReportConfig.objects.filter(id__in=household.report_ids).order_by("id").first()
+    run = {
+        "report_type": report.report_type,
+        "date_range_type": report.date_range_type,
+        "group_by": report.group_by,
+        "show_transactions": True,
+        "account_ids": list(report.accounts.values_list("id", flat=True)),
+        "tag_selections": [{"tag_id": s.tag_id} for s in report.tag_selections.all()],
+    }
+    checking = household.checking_ids[0]
+    return [
+        ("register", f"/transactions/list?view_type=1&account={checking}&maxdays=14", None),
+        ("register.card", f"/transactions/list?view_type=1&account={household.credit_card_ids[0]}&maxdays=14", None),
+        ("register.parent", f"/transactions/list?view_type=1&account={household.parent_id}&maxdays=14", None),
+        ("upcoming", "/transactions/list?view_type=2", None),
+        ("accounts", "/accounts/list", None),
+        ("planning.graph.expense", "/planning/graph/list?graph_type=expense", None),
+        ("planning.graph.pay", "/planning/graph/list?graph_type=pay", None),
+        ("graph.new", "/tags/graph-by-tags/new?widget_id=1", None),
+        ("graph.get", "/tags/graph-by-tags/get?widget_id=1", None),
+        ("budgets", "/planning/budget/list", None),
+        ("report.run", "/reports/run", run),
+    ]
+
+
+@contextmanager
+def _household(spec):
+    with db_transaction.atomic():
+        yield generate_household(spec)
+        db_transaction.set_rollback(True)
+
+
+def _query_counts(api_client, household):
+    counts = {}
+    for name, path, body in _calls(household):
+        cache.clear()
+        reference.clear()
+        with CaptureQueriesContext(connection) as queries:
+            if body is None:
+                response = api_client.get(path, headers=AUTH, user=household.user)
+            else:
+                response = api_client.post(path, json=body, headers=AUTH, user=household.user)
+        assert response.status_code == 200, f"{name}: {response.status_code}"
+        counts[name] = len(queries)
+    return counts
+
+
+def test_query_counts_do_not_grow_with_history(api_client):
+    with _household(SMALL) as household:
+        small = _query_counts(api_client, household)
+    with _household(LARGE) as household:
+        large = _query_counts(api_client, household)
+
+    grown = {name: (small[name], large[name]) for name in small if large[name] > small[name]}
+    assert not grown, f"Query counts grew with the history (small, large): {grown}"
+    over = {name: (count, CEILINGS[name]) for name, count in large.items() if count > CEILINGS[name]}
+    assert not over, f"Query counts above their ceilings (count, ceiling): {over}"
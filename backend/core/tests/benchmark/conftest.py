@@ -0,0 +1,153 @@
+"""
+Benchmark suite over a synthetic household.
+
+The benchmark tests are deselected by default (see pytest.ini). Run them with
+
+    python -m pytest -m benchmark
+
+`bench(name, fn)` times fn BENCHMARK_REPEAT times (default 5) and records the
+best and median wall time and the query count of a run. At the end of the
+session the results go to BENCHMARK_JSON, or .benchmarks/<commit>.json, and
+are printed. With BENCHMARK_BASELINE=<earlier results file> the summary shows
+the change against that run, so two commits compare by running the suite on
+each.
+
+The household is generated once per module (see
+administration.services.synthetic_household) and rolled back afterwards.
+BENCHMARK_ACCOUNTS, BENCHMARK_YEARS and BENCHMARK_TRANSACTIONS_PER_MONTH size
+it.
+"""
+import json
+import os
+import statistics
+import subprocess
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from django.db import connection, transaction as db_transaction
+from django.test.utils import CaptureQueriesContext
+
+from administration.services.synthetic_household import (
+    HouseholdSpec,
+    generate_household,
+    household_summary,
+)
+
+RESULTS = {}
+DATASET = {}
+
+
+def _spec() -> HouseholdSpec:
+    return HouseholdSpec(
+        accounts=int(os.environ.get("BENCHMARK_ACCOUNTS", 10)),
+        years=int(os.environ.get("BENCHMARK_YEARS", 2)),
+        transactions_per_month=int(os.environ.get("BENCHMARK_TRANSACTIONS_PER_MONTH", 120)),
+        prefix="Benchmark",
+    )
+
+
+@pytest.fixture(scope="module")
+def household(django_db_setup, django_db_blocker):
+    with ExitStack() as stack:
+        stack.enter_context(django_db_blocker.unblock())
+        stack.enter_context(db_transaction.atomic())
+        spec = _spec()
+        household = generate_household(spec)
+        DATASET.update(seed=spec.seed, years=spec.years, **household_summary(household))
+        yield household
+        db_transaction.set_rollback(True)
+
+
+@pytest.fixture
+def bench():
+    """
+    bench(name, fn, setup=None, rollback=False) -> fn's last result.
+
+    setup runs before every timed call (e.g. to clear caches for a cold run).
+    With rollback, each call runs in a transaction that is rolled back.
+    """
+
+    def run(name, fn, setup=None, rollback=False):
+        repeat = max(int(os.environ.get("BENCHMARK_REPEAT", 5)), 1)
+        timings, result = [], None
+        for _ in range(repeat):
+            if setup:
+                setup()
+            with ExitStack() as stack:
+                if rollback:
+                    stack.enter_context(db_transaction.atomic())
+                queries = stack.enter_context(CaptureQueriesContext(connection))
+                start = time.perf_counter()
+                result = fn()
+                timings.append((time.perf_counter() - start) * 1000)
+                if rollback:
+                    db_transaction.set_rollback(True)
+        RESULTS[name] = {
+            "best_ms": round(min(timings), 2),
+            "median_ms": round(statistics.median(timings), 2),
+            "queries": len(queries),
+            "runs": repeat,
+        }
+        return result
+
+    return run
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _output_path(commit: str) -> Path:
+    if os.environ.get("BENCHMARK_JSON"):
+        return Path(os.environ["BENCHMARK_JSON"])
+    return Path(".benchmarks") / f"{commit}.json"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not RESULTS:
+        return
+    commit = _commit()
+    path = _output_path(commit)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "database": connection.vendor,
+        "dataset": DATASET,
+        "results": dict(sorted(RESULTS.items())),
+    }, indent=2))
+    session.config._benchmark_output = path
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not RESULTS:
+        return
+    baseline = {}
+    if os.environ.get("BENCHMARK_BASELINE"):
+        baseline = json.loads(Path(os.environ["BENCHMARK_BASELINE"]).read_text())["results"]
+    write = terminalreporter.write_line
+    terminalreporter.section("benchmarks")
+    write(f"{'name':<40} {'best ms':>10} {'median ms':>10} {'queries':>8} {'vs baseline':>12}")
+    for name, result in sorted(RESULTS.items()):
+        change = ""
+        before = baseline.get(name)
+        if before and before["best_ms"]:
+            change = f"{(result['best_ms'] / before['best_ms'] - 1) * 100:+.0f}%"
+            if result["queries"] != before["queries"]:
+                change += f" q{result['queries'] - before['queries']:+d}"
+        write(
+            f"{name:<40} {result['best_ms']:>10.1f} {result['median_ms']:>10.1f} "
+            f"{result['queries']:>8} {change:>12}"
+        )
+    output = getattr(terminalreporter.config, "_benchmark_output", None)
+    if output:
+        write(f"results written to {output}")
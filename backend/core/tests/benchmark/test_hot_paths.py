@@ -0,0 +1,191 @@
+"""
+Timings of the hot paths over the synthetic household: registers, the account
+list, forecast rebuilds, reports, graph widgets, the dashboard, imports and
+exports. Cold runs clear the shared cache and reference tables first.
+"""
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+
+from accounts.api.schemas.account import AccountQuery
+from accounts.services import list_accounts_with_financials
+from administration.services import aget_dashboard
+from core.cache import reference, store
+from imports.api.schemas.import_file import (
+    MappingDefinition,
+    TransactionImportSchema,
+    TransactionImportTagSchema,
+)
+from imports.services.import_file import process_file_import
+from reports.models import ReportConfig
+from reports.services.execution import run_report
+from tags.services.tag_graph import _get_user_graph_widgets, get_graph_new_data
+from transactions.models import Transaction
+from transactions.services.transactions_and_balances import (
+    get_account_transactions_and_balances,
+)
+from transactions.tasks import (
+    finish_imports,
+    rebuild_reminder_caches,
+    update_cc_forecast_cache,
+    update_interest_forecast_cache,
+)
+from utils.dates import get_todays_date_timezone_adjusted
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+IMPORT_LINES = 500
+
+
+def cold():
+    cache.clear()
+    reference.clear()
+
+
+def _register(account_id, forecast=False):
+    end = get_todays_date_timezone_adjusted() + timedelta(days=14)
+    return lambda: get_account_transactions_and_balances(end, account_id, False, forecast)
+
+
+def test_registers(household, bench):
+    checking = household.checking_ids[0]
+    rows, _ = bench("register.checking.cold", _register(checking), setup=cold)
+    bench("register.checking.warm", _register(checking))
+    bench("register.checking.forecast", _register(checking, forecast=True), setup=cold)
+    bench("register.credit_card.forecast", _register(household.credit_card_ids[0], True), setup=cold)
+    bench("register.parent.cold", _register(household.parent_id), setup=cold)
+
+    assert rows
+
+
+def test_account_list(household, bench):
+    accounts = bench(
+        "accounts.list.cold",
+        lambda: list_accounts_with_financials(AccountQuery(), user=household.user),
+        setup=cold,
+    )
+    bench("accounts.list.warm", lambda: list_accounts_with_financials(AccountQuery(), user=household.user))
+
+    assert len(accounts) == len(household.account_ids)
+
+
+def test_near_tier(household, bench, settings):
+    settings.NEAR_CACHE_SIZE = 500
+    store.reset()
+    try:
+        checking = household.checking_ids[0]
+        bench("register.checking.warm.near", _register(checking))
+        bench(
+            "accounts.list.warm.near",
+            lambda: list_accounts_with_financials(AccountQuery(), user=household.user),
+        )
+        stats = store.stats()
+    finally:
+        store.reset()
+
+    assert stats["near_hits"]
+
+
+def test_forecast_rebuilds(household, bench):
+    bench("forecast.reminders", lambda: rebuild_reminder_caches(household.reminder_ids))
+    bench("forecast.credit_card", lambda: update_cc_forecast_cache(household.credit_card_ids[0]))
+    bench("forecast.interest.group", lambda: update_interest_forecast_cache(household.parent_id))
+    bench("forecast.interest.standalone", lambda: update_interest_forecast_cache(household.savings_ids[0]))
+
+
+def _report(config):
+    return lambda: run_report(
+        report_type=config.report_type,
+        date_range_type=config.date_range_type,
+        group_by=config.group_by,
+        date_from=config.date_from,
+        date_to=config.date_to,
+        account_ids=list(config.accounts.values_list("id", flat=True)),
+        tag_selections=[
+            {"tag_id": s.tag_id, "sub_tag_id": s.sub_tag_id, "main_tag_id": s.main_tag_id}
+            for s in config.tag_selections.all()
+        ],
+        show_transactions=config.show_transactions,
+        show_subtotal=config.show_subtotal,
+        include_pending=config.include_pending,
+    )
+
+
+def test_reports(household, bench):
+    for config in ReportConfig.objects.filter(id__in=household.report_ids).order_by("id"):
+        name = config.report_type.lower()
+        result = bench(f"report.{name}.cold", _report(config), setup=cold)
+        bench(f"report.{name}.warm", _report(config))
+
+        assert result
+
+
+def test_graphs_and_dashboard(household, bench):
+    for widget in _get_user_graph_widgets(household.user):
+        bench(
+            f"graph.widget{widget['widget_id']}.cold",
+            lambda: get_graph_new_data(widget["widget_id"], household.user),
+            setup=cold,
+        )
+    dashboard = bench("dashboard.cold", lambda: async_to_sync(aget_dashboard)(household.user), setup=cold)
+
+    assert dashboard.accounts
+
+
+def test_import(household, bench, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    account_id = household.checking_ids[0]
+    tag_id = Transaction.objects.filter(source_account_id=account_id).values_list(
+        "transactiondetail__tag_id", flat=True
+    ).first()
+    today = get_todays_date_timezone_adjusted()
+    payload = MappingDefinition(
+        transaction_types=[],
+        transaction_statuses=[],
+        accounts=[],
+        tags=[],
+        transactions=[
+            TransactionImportSchema(
+                line_id=n,
+                transactionDate=today - timedelta(days=n % 60),
+                transactionTypeID=1,
+                transactionStatusID=2,
+                amount="12.50",
+                description=f"Imported {n}",
+                sourceAccountID=account_id,
+                tags=[TransactionImportTagSchema(tag_id=tag_id, tag_name="Imported", tag_amount="12.50")],
+                memo="",
+                errors=[],
+            )
+            for n in range(IMPORT_LINES)
+        ],
+    )
+    csv = "TransactionDate,Amount\n" + "".join(f"{today},12.50\n" for _ in range(IMPORT_LINES))
+
+    def import_file():
+        process_file_import(
+            SimpleUploadedFile("import.csv", csv.encode(), content_type="text/csv"),
+            payload,
+            in_worker=False,
+        )
+        finish_imports()
+        return Transaction.objects.filter(description__startswith="Imported").count()
+
+    imported = bench(f"import.{IMPORT_LINES}_lines", import_file, rollback=True)
+
+    assert imported == IMPORT_LINES
+
+
+def test_export(household, bench, tmp_path):
+    output = tmp_path / "export.json.gz"
+    bench(
+        "export.user_data",
+        lambda: call_command("export_user_data", output=str(output), stdout=StringIO()),
+    )
+
+    assert output.stat().st_size
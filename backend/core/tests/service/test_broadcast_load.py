@@ -0,0 +1,87 @@
+"""
+Load test: 50 connected SyncConsumers while a 5,000-row import saves
+transactions one by one. Every save fires the transaction post_save broadcast;
+each consumer must receive a single coalesced invalidation for the burst.
+"""
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import channel_layers
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+
+from core import broadcast
+from core.consumers import SyncConsumer
+from transactions.models import Transaction
+
+CONSUMERS = 50
+ROWS = 5000
+
+
+@pytest.fixture
+def in_memory_layer(settings, monkeypatch):
+    settings.CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+    # A long window: the burst is flushed explicitly once the import ends so
+    # the messages are delivered on the test's event loop.
+    settings.BROADCAST_BATCH_WINDOW = 60
+    monkeypatch.setattr(broadcast, "_batcher", None)
+    channel_layers.backends.clear()
+    yield
+    broadcast.flush_broadcasts()
+    channel_layers.backends.clear()
+
+
+@pytest.mark.django_db
+@pytest.mark.service
+def test_import_burst_sends_one_message_per_consumer(
+    in_memory_layer,
+    test_checking_account,
+    test_savings_account,
+    test_pending_transaction_status,
+    test_expense_transaction_type,
+):
+    user = User.objects.create(username="sync-load")
+    accounts = [test_checking_account.id, test_savings_account.id]
+
+    def import_rows():
+        for row in range(ROWS):
+            Transaction.objects.create(
+                total_amount=Decimal("-1.00"),
+                status=test_pending_transaction_status,
+                description=f"Imported {row}",
+                transaction_type=test_expense_transaction_type,
+                source_account_id=accounts[row % 2],
+            )
+
+    async def scenario():
+        communicators = []
+        for _ in range(CONSUMERS):
+            communicator = WebsocketCommunicator(SyncConsumer.as_asgi(), "/ws/sync/")
+            communicator.scope["user"] = user
+            connected, _ = await communicator.connect()
+            assert connected
+            communicators.append(communicator)
+
+        await sync_to_async(import_rows)()
+        await sync_to_async(broadcast.flush_broadcasts)()
+
+        received = []
+        for communicator in communicators:
+            received.append(await communicator.receive_json_from(timeout=5))
+            assert await communicator.receive_nothing(timeout=0.05)
+            await communicator.disconnect()
+        return received
+
+    with patch("transactions.signals.async_task"):
+        received = async_to_sync(scenario)()
+
+    assert len(received) == CONSUMERS
+    message = received[0]
+    assert all(other == message for other in received)
+    assert message["type"] == "invalidate"
+    assert "transactions" in message["keys"]
+    assert message["accounts"]["transactions"] == sorted(accounts)
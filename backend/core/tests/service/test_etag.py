@@ -0,0 +1,101 @@
+"""
+Conditional GET tests: read endpoints answer a current If-None-Match with 304
+before any database work, and the ETag moves with the data version counters
+bumped by the existing signal handlers.
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from transactions.models import Transaction
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+AUTH = {"Authorization": "Bearer test-api-key"}
+
+
+def _register(account):
+    return f"/transactions/list?view_type=1&account={account.id}&maxdays=14&forecast=false&page=1&page_size=60"
+
+
+def _get(api_client, user, url, etag=None):
+    headers = dict(AUTH)
+    if etag:
+        headers["If-None-Match"] = etag
+    return api_client.get(url, headers=headers, user=user)
+
+
+@pytest.fixture
+def add(test_pending_transaction_status, test_expense_transaction_type):
+    def add(account, amount="-10.00"):
+        return Transaction.objects.create(
+            transaction_date=date.today(),
+            total_amount=Decimal(amount),
+            status=test_pending_transaction_status,
+            transaction_type=test_expense_transaction_type,
+            source_account=account,
+            description="Coffee",
+        )
+    return add
+
+
+def test_unchanged_list_is_not_modified_without_queries(api_client, full_access_user, test_checking_account):
+    first = _get(api_client, full_access_user, "/accounts/list")
+    assert first.status_code == 200
+    etag = first["ETag"]
+
+    with CaptureQueriesContext(connection) as queries:
+        second = _get(api_client, full_access_user, "/accounts/list", etag)
+
+    assert second.status_code == 304
+    assert second["ETag"] == etag
+    assert len(queries) == 0
+
+
+def test_register_etag_is_scoped_to_its_account(
+    api_client, full_access_user, test_checking_account, test_savings_account, add
+):
+    checking = _get(api_client, full_access_user, _register(test_checking_account))["ETag"]
+    savings = _get(api_client, full_access_user, _register(test_savings_account))["ETag"]
+
+    add(test_checking_account)
+
+    assert _get(api_client, full_access_user, _register(test_checking_account), checking).status_code == 200
+    assert _get(api_client, full_access_user, _register(test_savings_account), savings).status_code == 304
+
+
+def test_child_write_changes_parent_etag(
+    api_client, full_access_user, test_checking_account, test_savings_account, add
+):
+    test_savings_account.parent_account = test_checking_account
+    test_savings_account.save()
+    url = f"/accounts/get/{test_checking_account.id}"
+    etag = _get(api_client, full_access_user, url)["ETag"]
+
+    add(test_savings_account)
+
+    assert _get(api_client, full_access_user, url, etag).status_code == 200
+
+
+def test_reference_change_refreshes_etags(
+    api_client, full_access_user, test_checking_account, test_tag
+):
+    url = _register(test_checking_account)
+    etag = _get(api_client, full_access_user, url)["ETag"]
+
+    test_tag.parent.tag_name = "Renamed"
+    test_tag.parent.save()
+
+    assert _get(api_client, full_access_user, url, etag).status_code == 200
+
+
+def test_anonymous_requests_are_passed_through(api_client, full_access_user, test_checking_account):
+    etag = _get(api_client, full_access_user, "/accounts/list")["ETag"]
+
+    response = api_client.get("/accounts/list", headers={**AUTH, "If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
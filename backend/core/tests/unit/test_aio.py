@@ -0,0 +1,56 @@
+import threading
+import time
+import pytest
+from functools import partial
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+
+from core import aio
+
+
+def _tracker():
+    state = {"running": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def work(value):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.02)
+        with lock:
+            state["running"] -= 1
+        return value
+
+    return state, work
+
+
+@pytest.mark.unit
+def test_calls_overlap_up_to_the_bound_and_keep_order():
+    state, work = _tracker()
+
+    with patch("core.aio.concurrency", return_value=3):
+        results = async_to_sync(aio.gather_limited)(
+            partial(aio.run_sync, work, n) for n in range(9)
+        )
+
+    assert results == list(range(9))
+    assert state["peak"] == 3
+
+
+@pytest.mark.unit
+def test_nested_gathers_share_the_outer_bound():
+    state, work = _tracker()
+
+    async def part(start):
+        return await aio.gather_limited(
+            partial(aio.run_sync, work, n) for n in range(start, start + 4)
+        )
+
+    with patch("core.aio.concurrency", return_value=2):
+        results = async_to_sync(aio.gather_limited)(
+            partial(part, start) for start in (0, 4, 8)
+        )
+
+    assert results == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+    assert state["peak"] == 2
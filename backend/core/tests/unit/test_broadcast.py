@@ -0,0 +1,116 @@
+import time
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+from accounts.models import Account
+from core import broadcast
+from transactions.models import Transaction
+
+
+@pytest.mark.unit
+def test_batcher_coalesces_keys_and_accounts():
+    batcher = broadcast.InvalidationBatcher(window=60)
+    with patch("core.broadcast._send") as send:
+        batcher.add("global", ["transactions", "accounts"], [1])
+        batcher.add("global", ["transactions"], [2])
+        batcher.add("global", ["transactions"], [1])
+        batcher.flush()
+
+    send.assert_called_once_with(
+        "global",
+        {
+            "type": "sync.invalidate",
+            "keys": ["accounts", "transactions"],
+            "accounts": {"accounts": [1], "transactions": [1, 2]},
+        },
+    )
+
+
+@pytest.mark.unit
+def test_unscoped_call_widens_key_to_all_accounts():
+    batcher = broadcast.InvalidationBatcher(window=60)
+    with patch("core.broadcast._send") as send:
+        batcher.add("global", ["accounts"], [1])
+        batcher.add("global", ["accounts"])
+        batcher.add("global", ["accounts"], [2])
+        batcher.flush()
+
+    send.assert_called_once_with(
+        "global", {"type": "sync.invalidate", "keys": ["accounts"]}
+    )
+
+
+@pytest.mark.unit
+def test_groups_are_sent_separately():
+    batcher = broadcast.InvalidationBatcher(window=60)
+    with patch("core.broadcast._send") as send:
+        batcher.add("global", ["accounts"])
+        batcher.add("user_1", ["messages"])
+        batcher.flush()
+
+    assert sorted(call.args[0] for call in send.call_args_list) == ["global", "user_1"]
+
+
+@pytest.mark.unit
+def test_window_flushes_once():
+    batcher = broadcast.InvalidationBatcher(window=0.05)
+    with patch("core.broadcast._send") as send:
+        for _ in range(100):
+            batcher.add("global", ["transactions"], [3])
+        deadline = time.monotonic() + 2
+        while not send.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+
+    assert send.call_count == 1
+
+
+@pytest.mark.unit
+def test_zero_window_sends_immediately(settings):
+    settings.BROADCAST_BATCH_WINDOW = 0
+    with patch("core.broadcast._send") as send:
+        broadcast.broadcast_invalidate(["accounts"], account_ids=[None, 4])
+
+    send.assert_called_once_with(
+        "global",
+        {"type": "sync.invalidate", "keys": ["accounts"], "accounts": {"accounts": [4]}},
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_child_account_message_lists_the_parent(
+    settings,
+    django_capture_on_commit_callbacks,
+    bank,
+    checking_account_type,
+    test_checking_account,
+    test_cleared_transaction_status,
+    test_expense_transaction_type,
+):
+    settings.BROADCAST_BATCH_WINDOW = 0
+    parent = Account.objects.create(
+        account_name="Parent",
+        account_type=checking_account_type,
+        bank=bank,
+        opening_balance=0,
+        archive_balance=0,
+    )
+    test_checking_account.parent_account = parent
+    test_checking_account.save()
+
+    with patch("core.broadcast._send") as send, \
+            django_capture_on_commit_callbacks(execute=True):
+        Transaction.objects.create(
+            total_amount=Decimal("-40.00"),
+            status=test_cleared_transaction_status,
+            description="Child spend",
+            transaction_type=test_expense_transaction_type,
+            source_account=test_checking_account,
+        )
+
+    messages = [call.args[1] for call in send.call_args_list]
+    assert any(
+        message.get("accounts", {}).get("transactions") == sorted([test_checking_account.id, parent.id])
+        for message in messages
+    )
@@ -0,0 +1,237 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+from core.cache import store
+from core.cache.helpers import cached
+from core.cache.store import CacheStore, LocalStore, NearCache, RedisStore, TieredStore
+
+pytestmark = pytest.mark.unit
+
+
+def test_store_without_invalidate_cannot_be_created():
+    class PartialStore(CacheStore):
+        pass
+
+    with pytest.raises(TypeError):
+        PartialStore(cache)
+
+
+def test_local_store_invalidates_by_key_prefix():
+    local = LocalStore(cache)
+    local.set("account:1:balance:cleared", 10)
+    local.set("account:1:transactions:combined:register", b"blob")
+    local.set_many({"account:11:balance:cleared": 11, "account:2:balance:cleared": 2})
+
+    local.invalidate("account:1:balance")
+    assert local.get("account:1:balance:cleared") is None
+    assert local.get("account:1:transactions:combined:register") == b"blob"
+
+    local.invalidate("account:1:")
+    assert local.get("account:1:transactions:combined:register") is None
+    assert local.get_many(["account:11:balance:cleared", "account:2:balance:cleared"]) == {
+        "account:11:balance:cleared": 11,
+        "account:2:balance:cleared": 2,
+    }
+
+
+def test_local_store_forgets_deleted_keys():
+    local = LocalStore(cache)
+    local.set("account:1:financials:None", "financials")
+    local.delete("account:1:financials:None")
+    cache.set("account:1:financials:None", "written around the store")
+
+    local.invalidate("account:1:")
+
+    assert cache.get("account:1:financials:None") == "written around the store"
+
+
+class FakeRedis:
+    def __init__(self, keys):
+        self.keys = set(keys)
+        self.deletes = []
+
+    def scan_iter(self, match, count):
+        prefix = match.rstrip("*")
+        return iter(sorted(key for key in self.keys if key.startswith(prefix)))
+
+    def delete(self, *keys):
+        self.deletes.append(keys)
+        self.keys.difference_update(keys)
+
+
+def test_redis_store_scans_the_prefixed_key_and_deletes_in_batches():
+    prefix = cache.make_key("account:1:")
+    other = cache.make_key("account:11:balance:cleared")
+    conn = FakeRedis([f"{prefix}n{i}" for i in range(store.SCAN_BATCH + 3)] + [other])
+    redis = RedisStore(cache)
+
+    with patch.object(RedisStore, "_connection", return_value=conn):
+        redis.invalidate("account:1:")
+
+    assert conn.keys == {other}
+    assert [len(keys) for keys in conn.deletes] == [store.SCAN_BATCH, 3]
+
+
+def test_store_follows_the_configured_backend(settings):
+    store.reset()
+    try:
+        assert isinstance(store.current(), LocalStore)
+        settings.CACHES = {"default": {"BACKEND": "django_redis.cache.RedisCache"}}
+        store.reset()
+        assert isinstance(store.current(), RedisStore)
+        settings.NEAR_CACHE_SIZE = 10
+        store.reset()
+        assert isinstance(store.current().far, RedisStore)
+    finally:
+        store.reset()
+
+
+def test_near_cache_evicts_least_recently_used_and_expired(monkeypatch):
+    near = NearCache(size=2, ttl=5)
+    now = [100.0]
+    monkeypatch.setattr("core.cache.store.time.monotonic", lambda: now[0])
+    near.put("a", 1)
+    near.put("b", 2)
+    assert near.get("a") == (True, 1)
+    near.put("c", 3)
+    assert near.get("b") == (False, None)
+    assert near.get("a") == (True, 1)
+
+    now[0] += 6
+    assert near.get("c") == (False, None)
+    assert len(near) == 1
+
+
+def _tiered():
+    return TieredStore(LocalStore(cache), NearCache(size=10, ttl=60))
+
+
+def test_tiered_store_answers_repeat_reads_from_the_near_tier():
+    tiered = _tiered()
+    cache.set("account:1:balance:cleared", 10)
+
+    with patch.object(LocalStore, "get", wraps=tiered.far.get) as far_get:
+        assert tiered.get("account:1:balance:cleared") == 10
+        assert tiered.get("account:1:balance:cleared") == 10
+        assert tiered.get_many(["account:1:balance:cleared", "account:2:balance:cleared"]) == {
+            "account:1:balance:cleared": 10,
+        }
+        assert tiered.get("account:3:balance:cleared", "default") == "default"
+
+    assert far_get.call_count == 2
+    stats = tiered.stats()
+    assert (stats["reads"], stats["near_hits"], stats["far_hits"]) == (5, 2, 1)
+    assert stats["near_hit_ratio"] == pytest.approx(2 / 5)
+    assert stats["far_hit_ratio"] == pytest.approx(1 / 3)
+    assert stats["saved_ms"] == pytest.approx(2 * stats["far_read_ms"])
+
+
+@pytest.mark.django_db
+def test_tiered_store_invalidation_clears_both_tiers_and_notifies_workers(
+    settings, django_capture_on_commit_callbacks
+):
+    settings.NEAR_CACHE_LISTEN = True
+    tiered = _tiered()
+    tiered.set("account:1:balance:cleared", 10)
+    tiered.set("account:2:balance:cleared", 20)
+
+    with patch("core.cache.store.channel.publish") as publish, \
+            django_capture_on_commit_callbacks(execute=True):
+        tiered.invalidate("account:1:")
+        publish.assert_not_called()
+
+    assert tiered.near.get("account:1:balance:cleared") == (False, None)
+    assert cache.get("account:1:balance:cleared") is None
+    assert tiered.get("account:2:balance:cleared") == 20
+    publish.assert_called_once_with(
+        store.GROUP, {"type": "cache_store.invalidate", "tags": ["account:1:"]}
+    )
+
+
+def test_invalidation_message_clears_this_workers_near_tier(settings):
+    settings.NEAR_CACHE_SIZE = 10
+    store.reset()
+    try:
+        store.set("account:1:balance:cleared", 10)
+        cache.delete("account:1:balance:cleared")
+        assert store.get("account:1:balance:cleared") == 10
+
+        store._discard_near({"type": "cache_store.invalidate", "tags": ["account:1:"]})
+
+        assert store.get("account:1:balance:cleared") is None
+    finally:
+        store.reset()
+
+
+def _burst(fn, callers=50):
+    start = threading.Barrier(callers)
+
+    def call():
+        start.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        return list(pool.map(lambda _: call(), range(callers)))
+
+
+def test_get_or_compute_computes_once_for_concurrent_misses():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return "register"
+
+    results = _burst(lambda: store.get_or_compute("account:1:register", compute, 60))
+
+    assert results == ["register"] * 50
+    assert len(calls) == 1
+    assert cache.get(store.lock_key("account:1:register")) is None
+
+
+def test_get_or_compute_serves_the_stale_value_during_a_recompute():
+    assert store.get_or_compute("account:1:financials", lambda: "old", 60, stale_ttl=60) == "old"
+    store.invalidate("account:1:")
+    cache.add(store.lock_key("account:1:financials"), 1, 60)
+
+    assert store.get_or_compute("account:1:financials", lambda: "new", 60, stale_ttl=60) == "old"
+    cache.delete(store.lock_key("account:1:financials"))
+    assert store.get_or_compute("account:1:financials", lambda: "new", 60, stale_ttl=60) == "new"
+
+
+def test_get_or_compute_waiter_takes_over_when_the_computation_fails(monkeypatch):
+    monkeypatch.setattr(store, "LOCK_POLL", 0.001)
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("database went away")
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        holder = pool.submit(store.get_or_compute, "account:1:register", failing, 60)
+        started.wait()
+        assert store.get_or_compute("account:1:register", lambda: "rebuilt", 60) == "rebuilt"
+        with pytest.raises(RuntimeError):
+            holder.result()
+
+
+def test_cached_decorator_caches_through_the_store():
+    calls = []
+
+    @cached(lambda account_id: f"account:{account_id}:balance:cleared", ttl=60)
+    def balance(account_id):
+        calls.append(account_id)
+        return 0
+
+    assert balance(1) == 0
+    assert balance(1) == 0
+    store.invalidate("account:1:")
+    assert balance(1) == 0
+    assert calls == [1, 1]
@@ -0,0 +1,69 @@
+import pytest
+from transactions.models import TransactionStatus
+from core.cache import reference
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_status_id_resolves_slug(test_pending_transaction_status):
+    assert reference.status_id("pending") == test_pending_transaction_status.id
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_status_id_missing_slug_raises():
+    with pytest.raises(TransactionStatus.DoesNotExist):
+        reference.status_id("does-not-exist")
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_new_status_is_visible_after_save(test_pending_transaction_status):
+    reference.status_id("pending")
+    cleared = TransactionStatus.objects.create(transaction_status="Cleared")
+    assert reference.status_id("cleared") == cleared.id
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_lookups_are_served_from_memory(
+    django_assert_num_queries, test_tag, test_checking_account
+):
+    reference.warm()
+    with django_assert_num_queries(0):
+        assert reference.tag_display_name(test_tag.id) == "Main Test / Sub Test"
+        assert (
+            reference.account_name(test_checking_account.id)
+            == "Test Checking Account"
+        )
+        assert reference.account_name(None) == "Unknown Account"
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_tag_rename_invalidates_display_name(test_tag, test_main_tag):
+    assert reference.tag_display_name(test_tag.id) == "Main Test / Sub Test"
+    test_main_tag.tag_name = "Renamed"
+    test_main_tag.save()
+    assert reference.tag_display_name(test_tag.id) == "Renamed / Sub Test"
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_account_rename_invalidates_account_name(test_checking_account):
+    assert reference.account_name(test_checking_account.id) == "Test Checking Account"
+    test_checking_account.account_name = "Everyday Checking"
+    test_checking_account.save()
+    assert reference.account_name(test_checking_account.id) == "Everyday Checking"
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_unrelated_account_save_keeps_table(
+    django_assert_num_queries, test_checking_account
+):
+    reference.account_name(test_checking_account.id)
+    test_checking_account.statement_balance = 1
+    test_checking_account.save()
+    with django_assert_num_queries(0):
+        reference.account_name(test_checking_account.id)
@@ -0,0 +1,108 @@
+import pytest
+from core.cache import memo
+from accounts.lookups import get_account, has_child_accounts
+from accounts.services import get_account_financials
+
+
+@pytest.mark.unit
+def test_memoize_passes_through_without_scope():
+    calls = []
+
+    @memo.memoize("probe")
+    def probe(value):
+        calls.append(value)
+        return value
+
+    probe(1)
+    probe(1)
+    assert calls == [1, 1]
+
+
+@pytest.mark.unit
+def test_memoize_counts_hits_within_scope():
+    calls = []
+
+    @memo.memoize("probe")
+    def probe(value):
+        calls.append(value)
+        return value * 2
+
+    with memo.memo_scope("test") as scope:
+        assert probe(2) == 4
+        assert probe(2) == 4
+        assert probe(3) == 6
+    assert calls == [2, 3]
+    assert scope.hits["probe"] == 1
+    assert scope.misses["probe"] == 2
+    assert memo.current_scope() is None
+
+
+@pytest.mark.unit
+def test_nested_scope_reuses_outer():
+    with memo.memo_scope("outer") as outer:
+        with memo.memo_scope("inner") as inner:
+            assert inner is outer
+        assert memo.current_scope() is outer
+
+
+@pytest.mark.unit
+def test_exceptions_are_not_memoized():
+    calls = []
+
+    @memo.memoize("probe")
+    def probe():
+        calls.append(1)
+        raise ValueError()
+
+    with memo.memo_scope():
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                probe()
+    assert len(calls) == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_account_lookups_hit_database_once(
+    django_assert_num_queries, test_checking_account
+):
+    with memo.memo_scope():
+        with django_assert_num_queries(2):
+            for _ in range(3):
+                get_account(test_checking_account.id)
+                has_child_accounts(test_checking_account.id)
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_model_save_clears_scope(test_checking_account):
+    with memo.memo_scope():
+        get_account(test_checking_account.id)
+        test_checking_account.account_name = "Renamed"
+        test_checking_account.save()
+        assert get_account(test_checking_account.id).account_name == "Renamed"
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_financials_are_memoized(test_checking_account):
+    with memo.memo_scope() as scope:
+        first = get_account_financials(test_checking_account.id)
+        second = get_account_financials(test_checking_account.id)
+    assert first is second
+    assert scope.hits["account_financials"] == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+def test_middleware_scope_ends_with_request(rf):
+    seen = []
+
+    def view(request):
+        seen.append(memo.current_scope())
+        return "response"
+
+    response = memo.MemoMiddleware(view)(rf.get("/api/v1/accounts/list"))
+    assert response == "response"
+    assert seen[0] is not None and seen[0].name == "GET /api/v1/accounts/list"
+    assert memo.current_scope() is None
@@ -65,3 +65,14 @@ class MappingDefinition(Schema):
     accounts: List[AccountMappingSchema]
     tags: List[TagMappingSchema]
     transactions: List[TransactionImportSchema]
+
+
+# The class FileImportStatusOut is a schema for polling the progress of a file import.
+class FileImportStatusOut(Schema):
+    id: int
+    staged: bool
+    staged_lines: int
+    total_lines: int
+    processed: bool
+    successful: Optional[bool] = None
+    errors: int
@@ -1,7 +1,9 @@
 from ninja import Router, File
 from ninja.files import UploadedFile
 from ninja.errors import HttpError
-from imports.api.schemas.import_file import MappingDefinition
+from django.shortcuts import get_object_or_404
+from imports.api.schemas.import_file import FileImportStatusOut, MappingDefinition
+from imports.models import FileImport
 from imports.services import process_file_import
 import logging
 from administration.api.dependencies.auth import FullAccessAuth
@@ -28,7 +30,8 @@ def import_file(
         import_file (File): the import file to upload in csv format
 
     Returns:
-        id: the created file import id
+        id: the created file import id. Large payloads are staged by the
+            worker; poll `/{id}` until staged is true.
     """
     try:
         file_import_id = process_file_import(import_file, payload)
@@ -38,3 +41,19 @@ def import_file(
         task_logger.error("File import failed")
         error_logger.exception(f"{str(e)}")
         raise HttpError(500, "File import error")
+
+
+@import_file_router.get("/{file_import_id}", response=FileImportStatusOut)
+def get_file_import_status(request, file_import_id: int):
+    """
+    The function `get_file_import_status` reports how far a file import has
+    been staged and processed.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        file_import_id (int): the id of the file import
+
+    Returns:
+        FileImportStatusOut: the staging and processing progress
+    """
+    return get_object_or_404(FileImport, id=file_import_id)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-19 17:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0002_alter_transactionimport_memo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileimport',
+            name='staged',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='fileimport',
+            name='staged_lines',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='fileimport',
+            name='total_lines',
+            field=models.IntegerField(default=0),
+        ),
+    ]
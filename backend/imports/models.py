@@ -23,12 +23,18 @@ class FileImport(models.Model):
     - processed (BooleanField): True if this file has been processed.
     - successful (BooleanField): True if the import was successful.
     - errors (IntegerField): Number of errors encountered during import.
+    - staged (BooleanField): True once every import line has been stored.
+    - staged_lines (IntegerField): Import lines stored so far.
+    - total_lines (IntegerField): Import lines in the uploaded payload.
     """
 
     import_file = models.FileField(upload_to=import_file_name)
     processed = models.BooleanField(default=False)
     successful = models.BooleanField(null=True, blank=True, default=None)
     errors = models.IntegerField(default=0)
+    staged = models.BooleanField(default=True)
+    staged_lines = models.IntegerField(default=0)
+    total_lines = models.IntegerField(default=0)
 
     def delete(self, *args, **kwargs):
         # Delete the associated file when the instance is deleted
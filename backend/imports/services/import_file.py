@@ -1,3 +1,21 @@
+"""
+Staging of uploaded import files.
+
+An upload arrives with its mapping definition and a preview of every line. The
+mappings and lines are stored with bulk inserts, STAGING_CHUNK_SIZE lines at a
+time, and each chunk's tags and errors are attached to the line ids the insert
+returned. Small payloads are staged inside the request in one transaction.
+Payloads of WORKER_STAGING_THRESHOLD lines or more are handed to the worker,
+which commits chunk by chunk and advances the FileImport's staged_lines so the
+upload can be polled. The import stays unstaged (and is skipped by
+finish_imports) until its last line is stored.
+"""
+from typing import Optional
+
+from django.db import connection, transaction as db_transaction
+from django.db.models import F
+from django_q.tasks import async_task
+
 from administration.models import Message
 from imports.models import (
     FileImport,
@@ -11,36 +29,49 @@ from imports.models import (
 )
 from utils.dates import get_todays_date_timezone_adjusted
 
+STAGING_CHUNK_SIZE = 1000
+WORKER_STAGING_THRESHOLD = 2000
 
-def process_file_import(import_file, payload) -> int:
-    imported_file = FileImport.objects.create(import_file=import_file)
 
-    for type_mapping in payload.transaction_types:
-        TypeMapping.objects.create(
+def _stage_mappings(imported_file, payload):
+    TypeMapping.objects.bulk_create(
+        TypeMapping(
             file_type=type_mapping.file_type,
             type_id=type_mapping.type_id,
             file_import=imported_file,
         )
-    for status_mapping in payload.transaction_statuses:
-        StatusMapping.objects.create(
+        for type_mapping in payload.transaction_types
+    )
+    StatusMapping.objects.bulk_create(
+        StatusMapping(
             file_status=status_mapping.file_status,
             status_id=status_mapping.status_id,
             file_import=imported_file,
         )
-    for account_mapping in payload.accounts:
-        AccountMapping.objects.create(
+        for status_mapping in payload.transaction_statuses
+    )
+    AccountMapping.objects.bulk_create(
+        AccountMapping(
             file_account=account_mapping.file_account,
             account_id=account_mapping.account_id,
             file_import=imported_file,
         )
-    for tag_mapping in payload.tags:
-        TagMapping.objects.create(
+        for account_mapping in payload.accounts
+    )
+    TagMapping.objects.bulk_create(
+        TagMapping(
             file_tag=tag_mapping.file_tag,
             tag_id=tag_mapping.tag_id,
             file_import=imported_file,
         )
-    for transaction in payload.transactions:
-        created_transaction = TransactionImport.objects.create(
+        for tag_mapping in payload.tags
+    )
+
+
+def _stage_lines(imported_file, transactions):
+    """Stores one chunk of import lines with their tags and errors."""
+    lines = TransactionImport.objects.bulk_create(
+        TransactionImport(
             line_id=transaction.line_id,
             transaction_date=transaction.transactionDate,
             transaction_type_id=transaction.transactionTypeID,
@@ -52,23 +83,111 @@ def process_file_import(import_file, payload) -> int:
             memo=transaction.memo,
             file_import=imported_file,
         )
-        for tag in transaction.tags:
-            TransactionImportTag.objects.create(
-                tag_id=tag.tag_id,
-                tag_name=tag.tag_name,
-                tag_amount=tag.tag_amount,
-                transaction_import=created_transaction,
-            )
-        for error in transaction.errors:
-            TransactionImportError.objects.create(
-                text=error.text,
-                status=error.status,
-                transaction_import=created_transaction,
-            )
+        for transaction in transactions
+    )
+    if not connection.features.can_return_rows_from_bulk_insert:
+        # Backends that cannot return the new ids are matched up by line id.
+        ids = dict(
+            TransactionImport.objects.filter(
+                file_import=imported_file,
+                line_id__in=[line.line_id for line in lines],
+            ).values_list("line_id", "id")
+        )
+        for line in lines:
+            line.id = ids[line.line_id]
 
+    TransactionImportTag.objects.bulk_create(
+        TransactionImportTag(
+            tag_id=tag.tag_id,
+            tag_name=tag.tag_name,
+            tag_amount=tag.tag_amount,
+            transaction_import_id=line.id,
+        )
+        for transaction, line in zip(transactions, lines)
+        for tag in transaction.tags
+    )
+    TransactionImportError.objects.bulk_create(
+        TransactionImportError(
+            text=error.text,
+            status=error.status,
+            transaction_import_id=line.id,
+        )
+        for transaction, line in zip(transactions, lines)
+        for error in transaction.errors
+    )
+
+
+def _chunks(items):
+    for start in range(0, len(items), STAGING_CHUNK_SIZE):
+        yield items[start:start + STAGING_CHUNK_SIZE]
+
+
+def _import_started(imported_file):
     Message.objects.create(
         message_date=get_todays_date_timezone_adjusted(True),
         message=f"File import ID #{imported_file.id} started",
         unread=True,
     )
+
+
+def stage_file_import(imported_file, payload, track_progress: bool = False):
+    """
+    Stores the mappings and lines of payload against imported_file.
+
+    Without track_progress everything is written in one transaction. With it,
+    each chunk commits on its own and advances staged_lines, and the import
+    is marked staged after the last chunk.
+    """
+    if not track_progress:
+        with db_transaction.atomic():
+            _stage_mappings(imported_file, payload)
+            for chunk in _chunks(payload.transactions):
+                _stage_lines(imported_file, chunk)
+            FileImport.objects.filter(id=imported_file.id).update(
+                staged=True, staged_lines=len(payload.transactions)
+            )
+        _import_started(imported_file)
+        return
+
+    with db_transaction.atomic():
+        _stage_mappings(imported_file, payload)
+    for chunk in _chunks(payload.transactions):
+        with db_transaction.atomic():
+            _stage_lines(imported_file, chunk)
+            FileImport.objects.filter(id=imported_file.id).update(
+                staged_lines=F("staged_lines") + len(chunk)
+            )
+    FileImport.objects.filter(id=imported_file.id).update(staged=True)
+    _import_started(imported_file)
+
+
+def process_file_import(import_file, payload, in_worker: Optional[bool] = None) -> int:
+    """
+    Saves an uploaded import file and stages its mapping definition.
+
+    Args:
+        import_file (File): The uploaded csv file.
+        payload (MappingDefinition): Mappings and previewed lines.
+        in_worker (bool): Stage in the worker instead of the request. Defaults
+            to doing so for payloads of WORKER_STAGING_THRESHOLD lines or more.
+
+    Returns:
+        int: The id of the created FileImport.
+    """
+    if in_worker is None:
+        in_worker = len(payload.transactions) >= WORKER_STAGING_THRESHOLD
+    with db_transaction.atomic():
+        imported_file = FileImport.objects.create(
+            import_file=import_file,
+            staged=False,
+            total_lines=len(payload.transactions),
+        )
+        if not in_worker:
+            stage_file_import(imported_file, payload)
+    if in_worker:
+        async_task(
+            "transactions.tasks.stage_file_import",
+            imported_file.id,
+            payload.model_dump(mode="json"),
+        )
     return imported_file.id
@@ -0,0 +1,143 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from imports.api.schemas.import_file import (
+    MappingDefinition,
+    TransactionImportErrorSchema,
+    TransactionImportSchema,
+    TransactionImportTagSchema,
+    TypeMappingSchema,
+)
+from imports.models import (
+    FileImport,
+    TransactionImport,
+    TransactionImportError,
+    TransactionImportTag,
+)
+from imports.services.import_file import process_file_import
+from transactions.models import TransactionDetail
+from transactions.tasks import finish_imports, stage_file_import
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+AUTH = {"Authorization": "Bearer test-api-key"}
+
+
+@pytest.fixture(autouse=True)
+def media(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def csv_file():
+    return SimpleUploadedFile("lines.csv", b"id,amount,date\n", content_type="text/csv")
+
+
+def _payload(lines):
+    return MappingDefinition(
+        transaction_types=[TypeMappingSchema(file_type="Expense", type_id=1)],
+        transaction_statuses=[],
+        accounts=[],
+        tags=[],
+        transactions=[
+            TransactionImportSchema(
+                line_id=n,
+                transactionDate=date(2026, 1, 15),
+                transactionTypeID=1,
+                transactionStatusID=1,
+                amount="10.00",
+                description=f"Line {n}",
+                sourceAccountID=1,
+                tags=[TransactionImportTagSchema(tag_id=n, tag_name=f"Tag {n}", tag_amount="10.00")],
+                memo="",
+                errors=[TransactionImportErrorSchema(text=f"Error {n}", status=1)] if n % 2 else [],
+            )
+            for n in range(lines)
+        ],
+    )
+
+
+@patch("imports.services.import_file.STAGING_CHUNK_SIZE", 4)
+def test_tags_and_errors_follow_their_lines_across_chunks(csv_file):
+    file_import_id = process_file_import(csv_file, _payload(10))
+
+    lines = TransactionImport.objects.filter(file_import_id=file_import_id)
+    assert lines.count() == 10
+    for tag in TransactionImportTag.objects.select_related("transaction_import"):
+        assert tag.tag_id == tag.transaction_import.line_id
+    for error in TransactionImportError.objects.select_related("transaction_import"):
+        assert error.text == f"Error {error.transaction_import.line_id}"
+    assert TransactionImportError.objects.count() == 5
+    assert FileImport.objects.get(id=file_import_id).staged
+
+
+def test_lines_are_inserted_in_batches(csv_file):
+    with CaptureQueriesContext(connection) as queries:
+        process_file_import(csv_file, _payload(600))
+
+    # Three rows per line were one insert each; now only the backend's
+    # bulk insert batch size splits them.
+    assert len(queries) < 40
+
+
+@patch("imports.services.import_file.STAGING_CHUNK_SIZE", 3)
+def test_worker_staging_reports_progress(csv_file, api_client):
+    with patch("imports.services.import_file.async_task") as queued:
+        file_import_id = process_file_import(csv_file, _payload(7), in_worker=True)
+
+    status = api_client.get(f"/file-imports/{file_import_id}", headers=AUTH).json()
+    assert (status["staged"], status["staged_lines"], status["total_lines"]) == (False, 0, 7)
+    finish_imports()
+    assert not FileImport.objects.get(id=file_import_id).processed
+
+    stage_file_import(*queued.call_args.args[1:])
+
+    status = api_client.get(f"/file-imports/{file_import_id}", headers=AUTH).json()
+    assert (status["staged"], status["staged_lines"]) == (True, 7)
+    assert TransactionImportTag.objects.filter(
+        transaction_import__file_import_id=file_import_id
+    ).count() == 7
+
+
+def test_staged_lines_become_transactions_with_their_tags(
+    test_checking_account,
+    test_tag,
+    test_expense_transaction_type,
+    test_income_transaction_type,
+    test_pending_transaction_status,
+):
+    payload = MappingDefinition(
+        transaction_types=[],
+        transaction_statuses=[],
+        accounts=[],
+        tags=[],
+        transactions=[
+            TransactionImportSchema(
+                line_id=n,
+                transactionDate=date(2026, 1, 15),
+                transactionTypeID=test_expense_transaction_type.id,
+                transactionStatusID=test_pending_transaction_status.id,
+                amount="10.00",
+                description=f"Line {n}",
+                sourceAccountID=test_checking_account.id,
+                tags=[TransactionImportTagSchema(tag_id=test_tag.id, tag_name="Tag", tag_amount="10.00")],
+                memo="",
+                errors=[],
+            )
+            for n in range(3)
+        ],
+    )
+    rows = SimpleUploadedFile("lines.csv", b"id\n0\n1\n2\n", content_type="text/csv")
+    file_import_id = process_file_import(rows, payload, in_worker=False)
+
+    finish_imports()
+
+    assert FileImport.objects.get(id=file_import_id).successful
+    details = TransactionDetail.objects.filter(transaction__description__startswith="Line ")
+    assert sorted(d.detail_amt for d in details) == [Decimal("-10.00")] * 3
+    assert {d.tag_id for d in details} == {test_tag.id}
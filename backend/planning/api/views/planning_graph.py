@@ -1,4 +1,5 @@
 from ninja import Router
+from ninja.decorators import decorate_view
 from ninja.errors import HttpError
 from planning.api.schemas.planning_graph import (
     PlanningGraphList,
@@ -21,6 +22,8 @@ import os
 from django.utils import timezone
 from accounts.api.schemas.forecast import DatasetObject, GraphData
 from administration.models import Option
+from core.cache import versions
+from core.etag import conditional
 from transactions.models import Paycheck
 from tags.models import Tag
 import json
@@ -35,6 +38,14 @@ planning_graph_router = Router(tags=["Planning Graphs"])
 
 
 @planning_graph_router.get("/list", response=List[PlanningGraphList])
+@decorate_view(
+    conditional(
+        versions.REFERENCE,
+        "transactions",
+        versions.model("administration.option"),
+        versions.model("transactions.paycheck"),
+    )
+)
 def list_graph_totals(request, graph_type: str):
     """
     The function `list_graph_totals` retrieves transactions for pay or expenses,
@@ -1,7 +1,8 @@
 from ninja import Router
 from ninja.errors import HttpError
 from typing import List
-from planning.api.schemas.retirement import DatasetObject, ForecastOut, RetirementTransactionOut
+from planning.api.schemas.retirement import ForecastOut, RetirementTransactionOut
+from planning.mappers import domain_retirement_forecast_to_schema
 from planning.services import get_retirement_forecast
 from planning.services.retirement import get_retirement_transactions
 import logging
@@ -15,24 +16,9 @@ retirement_router = Router(tags=["Retirement"])
 @retirement_router.get("/get", response=ForecastOut)
 def get_forecast(request):
     try:
-        domain = get_retirement_forecast()
-        datasets = [
-            DatasetObject(
-                borderColor=ds.borderColor,
-                backgroundColor=ds.backgroundColor,
-                tension=ds.tension,
-                data=ds.data,
-                pointStyle=ds.pointStyle,
-                radius=ds.radius,
-                hitRadius=ds.hitRadius,
-                hoverRadius=ds.hoverRadius,
-                label=ds.label,
-                fill=ds.fill,
-            )
-            for ds in domain.datasets
-        ]
+        result = domain_retirement_forecast_to_schema(get_retirement_forecast())
         api_logger.debug("Forecast retrieved")
-        return ForecastOut(labels=domain.labels, datasets=datasets)
+        return result
     except Exception as e:
         api_logger.error("Forecast not retrieved")
         error_logger.exception(f"{str(e)}")
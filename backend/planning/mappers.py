@@ -0,0 +1,23 @@
+from planning.dto import DomainForecast
+from planning.api.schemas.retirement import DatasetObject, ForecastOut
+
+
+def domain_retirement_forecast_to_schema(forecast: DomainForecast) -> ForecastOut:
+    return ForecastOut(
+        labels=forecast.labels,
+        datasets=[
+            DatasetObject(
+                borderColor=ds.borderColor,
+                backgroundColor=ds.backgroundColor,
+                tension=ds.tension,
+                data=ds.data,
+                pointStyle=ds.pointStyle,
+                radius=ds.radius,
+                hitRadius=ds.hitRadius,
+                hoverRadius=ds.hoverRadius,
+                label=ds.label,
+                fill=ds.fill,
+            )
+            for ds in forecast.datasets
+        ],
+    )
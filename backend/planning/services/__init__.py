@@ -1,3 +1,4 @@
 from planning.services.retirement import get_retirement_forecast as get_retirement_forecast
+from planning.services.retirement import aget_retirement_forecast as aget_retirement_forecast
 from planning.services.retirement import get_retirement_transactions as get_retirement_transactions
 from planning.services.budget import calculate_repeat_window as calculate_repeat_window
@@ -0,0 +1,361 @@
+"""
+Detection of recurring transactions (subscriptions, bills, paychecks) that
+have no reminder yet.
+
+Transactions are grouped by normalized description (trimmed, lowercased).
+A group is recurring when the average gap between its transactions matches a
+weekly, fortnightly, monthly or yearly period, no single gap strays from that
+average by more than the period's tolerance, no amount strays more than 20%
+from the average amount, and the last transaction is recent enough that the
+pattern is still running.
+
+The per-group statistics are computed with NumPy over one array sorted by
+(group, date), so a scan costs a few vectorized passes regardless of the
+number of groups. Only the groups that pass are checked against reminders and
+ignored detections and get their suggested tag and account.
+
+Runs are incremental: after a full scan, only the groups that gained, lost
+or changed transactions since the previous run, and the detections that have
+gone stale, are re-evaluated.
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.db.models import Count, Q
+from django.db.models.functions import Lower, Trim
+
+from planning.models import DetectedRecurring
+from reminders.models import Reminder, Repeat
+from transactions.models import Transaction, TransactionDetail, TransactionStatus
+
+STATE_KEY = "recurring_detection:state"
+WINDOW_DAYS = 400
+# Deleted transactions, deleted reminders and un-ignored detections are not
+# tracked between runs; a periodic full scan picks them up.
+FULL_SCAN_DAYS = 28
+# Past this many changed groups a full scan is as cheap as filtering by key.
+MAX_INCREMENTAL_KEYS = 2000
+DETECTED_STATUSES = ("cleared", "reconciled", "archived")
+# (period_days, tolerance_days, min_occurrences), tried in order.
+TARGET_PERIODS = ((7, 5, 3), (14, 5, 3), (30, 5, 3), (365, 14, 2))
+MAX_AMOUNT_DEVIATION = 0.20
+
+
+def normalize_description(description: str) -> str:
+    return description.strip().lower()
+
+
+class ReminderIndex:
+    """
+    Answers "does this description overlap an existing reminder?", i.e. is
+    either one a substring of the other, without comparing against every
+    reminder: reminder descriptions are joined into one string for the
+    description-in-reminder test and bucketed by length so the
+    reminder-in-description test only looks up the description's substrings
+    of those lengths.
+    """
+
+    def __init__(self, descriptions: Iterable[str]):
+        normalized = {normalize_description(d) for d in descriptions if d}
+        normalized.discard("")
+        self._exact = normalized
+        self._joined = "\x00".join(sorted(normalized))
+        self._lengths = sorted({len(d) for d in normalized})
+
+    def overlaps(self, description: str) -> bool:
+        if description in self._exact or description in self._joined:
+            return True
+        for length in self._lengths:
+            if length > len(description):
+                break
+            for start in range(len(description) - length + 1):
+                if description[start : start + length] in self._exact:
+                    return True
+        return False
+
+
+@dataclass
+class _Candidate:
+    key: str
+    description: str
+    target: int
+    last_date: date
+    recent_amount: float
+    transaction_ids: List[int]
+    account_ids: List[Optional[int]]
+
+
+def _status_ids() -> List[int]:
+    return list(
+        TransactionStatus.objects.filter(slug__in=DETECTED_STATUSES).values_list(
+            "id", flat=True
+        )
+    )
+
+
+def _window_transactions(window_start: date, status_ids: List[int]):
+    return (
+        Transaction.objects.filter(
+            transaction_date__gte=window_start, status_id__in=status_ids
+        )
+        .exclude(description__isnull=True)
+        .exclude(description="")
+        .annotate(key=Lower(Trim("description")))
+    )
+
+
+def find_candidates(rows: list, today: date) -> List[_Candidate]:
+    """
+    Returns the groups in rows that look recurring.
+
+    Args:
+        rows (list): (key, description, transaction_date, total_amount,
+            source_account_id, id) tuples. Same-day transactions of a group
+            keep their order in rows.
+        today (date): The date staleness is measured from.
+    """
+    if not rows:
+        return []
+    keys, descriptions, dates, amounts, account_ids, ids = zip(*rows)
+    unique_keys, codes = np.unique(np.array(keys, dtype=object), return_inverse=True)
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(rows))
+    order = np.lexsort((ordinals, codes))
+    codes = codes[order]
+    ordinals = ordinals[order]
+    amounts = np.abs(np.array([float(a) for a in amounts], dtype=np.float64)[order])
+
+    group_count = len(unique_keys)
+    counts = np.bincount(codes, minlength=group_count)
+    ends = np.cumsum(counts) - 1
+    starts = ends - counts + 1
+
+    # Gaps between consecutive transactions of the same group.
+    gaps = np.diff(ordinals).astype(np.float64)
+    same_group = codes[1:] == codes[:-1]
+    gap_groups = codes[1:][same_group]
+    gaps = gaps[same_group]
+    gap_counts = counts - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_gap = np.bincount(gap_groups, weights=gaps, minlength=group_count) / gap_counts
+
+    # First matching period per group, as (target, tolerance, min occurrences).
+    target = np.zeros(group_count, dtype=np.int64)
+    tolerance = np.zeros(group_count, dtype=np.int64)
+    min_occurrences = np.zeros(group_count, dtype=np.int64)
+    unmatched = gap_counts > 0
+    for period, period_tolerance, period_min in TARGET_PERIODS:
+        hit = unmatched & (np.abs(avg_gap - period) <= period_tolerance)
+        target[hit], tolerance[hit], min_occurrences[hit] = (
+            period, period_tolerance, period_min,
+        )
+        unmatched &= ~hit
+
+    irregular_gap = np.abs(gaps - avg_gap[gap_groups]) > tolerance[gap_groups]
+    irregular_gaps = np.bincount(
+        gap_groups, weights=irregular_gap, minlength=group_count
+    )
+
+    avg_amount = np.bincount(codes, weights=amounts, minlength=group_count) / counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        off_amount = np.abs(amounts - avg_amount[codes]) / avg_amount[codes]
+    off_amounts = np.bincount(
+        codes, weights=off_amount > MAX_AMOUNT_DEVIATION, minlength=group_count
+    )
+
+    recurring = (
+        (target > 0)
+        & (counts >= 2)
+        & (counts >= min_occurrences)
+        & (irregular_gaps == 0)
+        & (avg_amount != 0)
+        & (off_amounts == 0)
+        & (today.toordinal() - ordinals[ends] <= target + tolerance)
+    )
+
+    candidates = []
+    for group in np.flatnonzero(recurring):
+        members = order[starts[group] : ends[group] + 1]
+        candidates.append(
+            _Candidate(
+                key=unique_keys[group],
+                # The first variant by (description, date), as the scan sorts.
+                description=min(descriptions[i] for i in members).strip(),
+                target=int(target[group]),
+                last_date=date.fromordinal(int(ordinals[ends[group]])),
+                recent_amount=float(amounts[ends[group]]),
+                transaction_ids=[ids[i] for i in members],
+                account_ids=[account_ids[i] for i in members],
+            )
+        )
+    return candidates
+
+
+def _suggested_tags(keys: Set[str], window_start: date, status_ids: List[int]) -> Dict[str, int]:
+    """Returns the most used detail tag per group key, in one grouped query."""
+    if not keys:
+        return {}
+    rows = (
+        TransactionDetail.objects.filter(
+            transaction__transaction_date__gte=window_start,
+            transaction__status_id__in=status_ids,
+            tag_id__isnull=False,
+        )
+        .annotate(key=Lower(Trim("transaction__description")))
+        .filter(key__in=keys)
+        .values("key", "tag_id")
+        .annotate(n=Count("id"))
+        .order_by("key", "-n", "tag_id")
+    )
+    best = {}
+    for row in rows:
+        best.setdefault(row["key"], row["tag_id"])
+    return best
+
+
+def _repeats_by_days() -> Dict[int, Repeat]:
+    repeats = {}
+    for repeat in Repeat.objects.all():
+        total_days = repeat.days + repeat.weeks * 7 + repeat.months * 30 + repeat.years * 365
+        if total_days > 0:
+            repeats[total_days] = repeat
+    return repeats
+
+
+def _dirty_keys(since: date, today: date, window_start: date) -> Set[str]:
+    """
+    Group keys that may have changed since the last run: groups with
+    transactions added, edited or aged out of the window since then, and
+    detections that reference deleted transactions or whose estimated next
+    date has arrived.
+    """
+    dirty = set(
+        Transaction.objects.filter(
+            Q(transaction_date__gte=window_start)
+            & (Q(add_date__gte=since) | Q(edit_date__gte=since))
+            | Q(
+                transaction_date__gte=since - timedelta(days=WINDOW_DAYS),
+                transaction_date__lt=window_start,
+            )
+        )
+        .annotate(key=Lower(Trim("description")))
+        .values_list("key", flat=True)
+        .distinct()
+    )
+    detections = list(
+        DetectedRecurring.objects.filter(is_ignored=False).values_list(
+            "description", "transaction_ids", "next_estimated_date"
+        )
+    )
+    referenced = {i for _, ids, _ in detections for i in ids}
+    existing = set(
+        Transaction.objects.filter(id__in=referenced).values_list("id", flat=True)
+    )
+    for description, ids, next_date in detections:
+        if next_date <= today or not existing.issuperset(ids):
+            dirty.add(normalize_description(description))
+    return dirty
+
+
+def detect_recurring(today: Optional[date] = None, full: bool = False) -> List[DetectedRecurring]:
+    """
+    Refreshes the DetectedRecurring suggestions.
+
+    Args:
+        today (date): The scan date, defaults to today.
+        full (bool): Re-evaluate every group instead of only those changed
+            since the previous run. The first run is always full.
+
+    Returns:
+        List[DetectedRecurring]: The detections created for descriptions that
+            were not already suggested.
+    """
+    today = today or date.today()
+    window_start = today - timedelta(days=WINDOW_DAYS)
+    status_ids = _status_ids()
+    state = cache.get(STATE_KEY) or {}
+    since = None
+    if not full and state.get("last_full"):
+        if (today - date.fromisoformat(state["last_full"])).days < FULL_SCAN_DAYS:
+            since = date.fromisoformat(state["last_run"])
+
+    transactions = _window_transactions(window_start, status_ids)
+    if since is not None:
+        dirty = _dirty_keys(since, today, window_start)
+        if len(dirty) > MAX_INCREMENTAL_KEYS:
+            since = None
+        else:
+            transactions = transactions.filter(key__in=dirty)
+
+    rows = list(
+        transactions.order_by("description", "transaction_date").values_list(
+            "key", "description", "transaction_date", "total_amount",
+            "source_account_id", "id",
+        )
+    )
+    candidates = find_candidates(rows, today)
+
+    reminders = ReminderIndex(Reminder.objects.values_list("description", flat=True))
+    ignored = {
+        normalize_description(d)
+        for d in DetectedRecurring.objects.filter(is_ignored=True).values_list(
+            "description", flat=True
+        )
+    }
+    candidates = [
+        c for c in candidates
+        if c.key not in ignored and not reminders.overlaps(c.key)
+    ]
+    tags = _suggested_tags({c.key for c in candidates}, window_start, status_ids)
+    repeats = _repeats_by_days()
+
+    detections = []
+    for candidate in candidates:
+        accounts = Counter(a for a in candidate.account_ids if a is not None)
+        detections.append(
+            DetectedRecurring(
+                description=candidate.description,
+                estimated_amount=Decimal(str(round(candidate.recent_amount, 2))),
+                repeat=repeats.get(candidate.target),
+                next_estimated_date=candidate.last_date + timedelta(days=candidate.target),
+                transaction_ids=candidate.transaction_ids,
+                suggested_tag_id=tags.get(candidate.key),
+                suggested_account_id=accounts.most_common(1)[0][0] if accounts else None,
+            )
+        )
+
+    with db_transaction.atomic():
+        current = DetectedRecurring.objects.filter(is_ignored=False)
+        previous = defaultdict(list)
+        for detection_id, description in current.values_list("id", "description"):
+            previous[normalize_description(description)].append(detection_id)
+        if since is None:
+            current.delete()
+        else:
+            # Unchanged detections stay unless they now overlap a reminder
+            # or were ignored under another spelling.
+            replaced = [
+                i
+                for key, ids in previous.items()
+                if key in dirty or key in ignored or reminders.overlaps(key)
+                for i in ids
+            ]
+            DetectedRecurring.objects.filter(id__in=replaced).delete()
+        DetectedRecurring.objects.bulk_create(detections)
+    cache.set(
+        STATE_KEY,
+        {
+            "last_run": today.isoformat(),
+            "last_full": today.isoformat() if since is None else state["last_full"],
+        },
+        None,
+    )
+
+    return [
+        d for d in detections if normalize_description(d.description) not in previous
+    ]
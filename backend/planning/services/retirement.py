@@ -1,7 +1,9 @@
 import ast
 from datetime import date, datetime
+from functools import partial
 from administration.models import Option
 from accounts.models import Account
+from core.aio import gather_limited, run_sync
 from transactions.services import get_account_transactions_and_balances
 from utils.dates import (
     get_dates_in_range,
@@ -39,9 +41,8 @@ def _get_retirement_account_ids() -> list:
         return []
 
 
-def get_retirement_forecast() -> DomainForecast:
-    retirement_array = _get_retirement_account_ids()
-
+def _forecast_window():
+    """Labels, start and end date of the retirement forecast (this calendar year)."""
     today = get_todays_date_timezone_adjusted()
     jan_1st = date(today.year, 1, 1)
     dec_31st = date(today.year, 12, 31)
@@ -51,21 +52,44 @@ def get_retirement_forecast() -> DomainForecast:
     labels = get_dates_in_range(start_interval, end_interval)
     start_date = get_forecast_start_date(start_interval)
     end_date = get_forecast_end_date(end_interval)
+    return labels, start_date, end_date
+
+
+def _account_info(account_id, start_date, end_date) -> dict:
+    account_obj = Account.objects.get(id=account_id)
+    transactions_list, previous_balance = get_account_transactions_and_balances(
+        end_date, account_id, True, True, start_date, False
+    )
+    return {
+        "id": account_id,
+        "name": account_obj.account_name,
+        "transactions": transactions_list,
+        "previous_balance": previous_balance,
+        "data": [],
+    }
+
+
+def get_retirement_forecast() -> DomainForecast:
+    labels, start_date, end_date = _forecast_window()
+    account_info = [
+        _account_info(account_id, start_date, end_date)
+        for account_id in _get_retirement_account_ids()
+    ]
+    return _build_forecast(labels, account_info)
+
+
+async def aget_retirement_forecast() -> DomainForecast:
+    """Async get_retirement_forecast: the account registers are built concurrently."""
+    labels, start_date, end_date = _forecast_window()
+    retirement_array = await run_sync(_get_retirement_account_ids)
+    account_info = await gather_limited(
+        partial(run_sync, _account_info, account_id, start_date, end_date)
+        for account_id in retirement_array
+    )
+    return _build_forecast(labels, account_info)
 
-    account_info = []
-    for account_id in retirement_array:
-        account_obj = Account.objects.get(id=account_id)
-        transactions_list, previous_balance = get_account_transactions_and_balances(
-            end_date, account_id, True, True, start_date, False
-        )
-        account_info.append({
-            "id": account_id,
-            "name": account_obj.account_name,
-            "transactions": transactions_list,
-            "previous_balance": previous_balance,
-            "data": [],
-        })
 
+def _build_forecast(labels, account_info) -> DomainForecast:
     totals = []
     for label_date in labels:
         parsed_date = datetime.strptime(label_date, "%b %d, %y")
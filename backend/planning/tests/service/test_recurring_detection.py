@@ -0,0 +1,191 @@
+"""
+Recurring-pattern detection tests.
+
+A full scan must flag exactly the groups the original per-group loop did, and
+an incremental run after new transactions must leave the same detections as a
+full scan would.
+"""
+import random
+import pytest
+from collections import defaultdict
+from datetime import date, timedelta
+
+from planning.models import DetectedRecurring
+from planning.services.recurring_detection import (
+    ReminderIndex,
+    TARGET_PERIODS,
+    detect_recurring,
+)
+from reminders.models import Reminder
+from transactions.models import Transaction, TransactionDetail
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+TODAY = date(2026, 6, 1)
+
+
+def _reference_keys(rows, today):
+    """The group keys the original loop accepted, before reminder filtering."""
+    groups = defaultdict(list)
+    for description, day, amount in rows:
+        if day < today - timedelta(days=400):
+            continue
+        groups[description.strip().lower()].append((day, abs(float(amount))))
+    accepted = set()
+    for key, group in groups.items():
+        group.sort()
+        if len(group) < 2:
+            continue
+        dates = [d for d, _ in group]
+        amounts = [a for _, a in group]
+        intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
+        avg_interval = sum(intervals) / len(intervals)
+        match = next(
+            ((p, tol, m) for p, tol, m in TARGET_PERIODS if abs(avg_interval - p) <= tol),
+            None,
+        )
+        if match is None:
+            continue
+        target, tolerance, min_occurrences = match
+        if len(group) < min_occurrences:
+            continue
+        if any(abs(iv - avg_interval) > tolerance for iv in intervals):
+            continue
+        avg_amount = sum(amounts) / len(amounts)
+        if avg_amount == 0 or any(abs(a - avg_amount) / avg_amount > 0.20 for a in amounts):
+            continue
+        if (today - dates[-1]).days > target + tolerance:
+            continue
+        accepted.add(key)
+    return accepted
+
+
+@pytest.fixture
+def cleared(test_cleared_transaction_status):
+    return test_cleared_transaction_status
+
+
+@pytest.fixture
+def make_rows(cleared, test_expense_transaction_type, test_checking_account):
+    def make(rows):
+        Transaction.objects.bulk_create(
+            Transaction(
+                description=description,
+                transaction_date=day,
+                total_amount=amount,
+                status=cleared,
+                transaction_type=test_expense_transaction_type,
+                source_account=test_checking_account,
+                add_date=TODAY - timedelta(days=30),
+                edit_date=TODAY - timedelta(days=30),
+            )
+            for description, day, amount in rows
+        )
+    return make
+
+
+def _series(description, period, count, amount, end=TODAY, jitter=0, rng=None):
+    rows = []
+    for i in range(count):
+        offset = rng.randint(-jitter, jitter) if jitter else 0
+        rows.append((description, end - timedelta(days=period * i + offset), amount))
+    return rows
+
+
+def test_full_scan_matches_original_loop(make_rows):
+    rng = random.Random(7)
+    rows = []
+    for n in range(120):
+        period = rng.choice([7, 14, 30, 365, 3, 60])
+        count = rng.randint(1, 8)
+        amount = rng.choice([9.99, 15, 100, 0, -45.5])
+        end = TODAY - timedelta(days=rng.randint(0, 50))
+        description = rng.choice([f"Vendor {n}", f"  VENDOR {n} "])
+        rows += _series(description, period, count, amount, end, jitter=rng.randint(0, 6), rng=rng)
+        if rng.random() < 0.2:
+            rows.append((description, end - timedelta(days=3), amount * 3))
+    make_rows(rows)
+
+    detect_recurring(today=TODAY, full=True)
+
+    detected = {d.description.lower() for d in DetectedRecurring.objects.all()}
+    assert detected == _reference_keys(rows, TODAY)
+    assert detected
+
+
+def test_detection_fields_and_grouped_tag(make_rows, test_tag, django_assert_max_num_queries):
+    make_rows(_series("Streaming", 30, 4, 15.99))
+    for transaction in Transaction.objects.all():
+        TransactionDetail.objects.create(transaction=transaction, detail_amt=15.99, tag=test_tag)
+
+    with django_assert_max_num_queries(11):
+        detect_recurring(today=TODAY, full=True)
+
+    detection = DetectedRecurring.objects.get()
+    assert detection.description == "Streaming"
+    assert str(detection.estimated_amount) == "15.99"
+    assert detection.next_estimated_date == TODAY + timedelta(days=30)
+    assert detection.suggested_tag_id == test_tag.id
+    assert len(detection.transaction_ids) == 4
+
+
+def test_reminder_overlap_excludes_group(make_rows, test_reminder):
+    test_reminder.description = "Gym"
+    test_reminder.save()
+    make_rows(_series("Gym Membership", 30, 4, 40) + _series("Rent", 30, 4, 1200))
+
+    detect_recurring(today=TODAY, full=True)
+
+    assert list(DetectedRecurring.objects.values_list("description", flat=True)) == ["Rent"]
+
+
+def test_incremental_run_matches_full_scan(make_rows, cleared, test_checking_account):
+    make_rows(
+        _series("Rent", 30, 4, 1200, end=TODAY - timedelta(days=7))
+        + _series("Coffee", 7, 2, 4, end=TODAY - timedelta(days=7))
+    )
+    first = detect_recurring(today=TODAY - timedelta(days=7), full=True)
+    assert [d.description for d in first] == ["Rent"]
+    rent_id = DetectedRecurring.objects.get().id
+
+    # One more coffee makes it weekly; Rent is untouched and kept as is.
+    Transaction.objects.create(
+        description="coffee",
+        transaction_date=TODAY,
+        total_amount=4,
+        status=cleared,
+        source_account=test_checking_account,
+        add_date=TODAY,
+        edit_date=TODAY,
+    )
+    new = detect_recurring(today=TODAY)
+
+    assert [d.description for d in new] == ["Coffee"]
+    incremental = set(DetectedRecurring.objects.values_list("description", flat=True))
+    assert DetectedRecurring.objects.filter(id=rent_id).exists()
+    detect_recurring(today=TODAY, full=True)
+    assert incremental == set(DetectedRecurring.objects.values_list("description", flat=True))
+
+
+def test_reminder_index_matches_substring_tests():
+    reminders = ["Netflix", "Car Payment", "gym", "x"]
+    index = ReminderIndex(reminders)
+    for description in ["netflix premium", "car", "the gym", "monthly", "payment car", "y", "xbox"]:
+        expected = any(
+            description in r.lower() or r.lower() in description for r in reminders
+        )
+        assert index.overlaps(description) == expected, description
+
+
+def test_ignored_description_is_not_redetected(make_rows):
+    make_rows(_series("Rent", 30, 4, 1200))
+    DetectedRecurring.objects.create(
+        description="rent",
+        estimated_amount=1200,
+        next_estimated_date=TODAY,
+        is_ignored=True,
+    )
+
+    assert detect_recurring(today=TODAY, full=True) == []
+    assert not DetectedRecurring.objects.filter(is_ignored=False).exists()
+    assert not Reminder.objects.exists()
@@ -0,0 +1,144 @@
+"""
+Daily conversion of due reminders.
+
+Every reminder whose next date has arrived gets its auto-add transaction for
+today (unless today is excluded) and moves to its next non-excluded date, or
+is deleted once that date passes its end date. The work is done in a fixed
+number of statements however many reminders are due: exclusions are read
+once into a set per reminder, the transactions are created in one bulk call,
+and the new dates are written with one bulk update. The per-row reminder and
+transaction receivers are skipped; the caller rebuilds the reminder caches
+and refreshes the touched accounts once each.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Set
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction as db_transaction
+
+from core.cache import reference
+from reminders.models import Reminder, ReminderExclusion, Repeat
+from reminders.signals import deferred_reminder_refresh
+from tags.api.dependencies.custom_tag import CustomTag
+from transactions.api.dependencies.create_transactions import create_transactions
+from transactions.api.dependencies.full_transaction import FullTransaction
+from transactions.signals import deferred_refresh
+
+
+@dataclass
+class ConversionResult:
+    created: int = 0
+    rescheduled_ids: List[int] = field(default_factory=list)
+    deleted: int = 0
+    account_ids: Set[int] = field(default_factory=set)
+
+
+def _exclusions_by_reminder(reminder_ids: List[int], today: date) -> Dict[int, Set[date]]:
+    exclusions = defaultdict(set)
+    rows = ReminderExclusion.objects.filter(
+        reminder_id__in=reminder_ids, exclude_date__gte=today
+    ).values_list("reminder_id", "exclude_date")
+    for reminder_id, exclude_date in rows:
+        exclusions[reminder_id].add(exclude_date)
+    return exclusions
+
+
+def next_reminder_date(today: date, repeat: Repeat, excluded: Set[date]) -> date:
+    """
+    Returns the first date after today, stepping by repeat, that is not
+    excluded. A repeat with no interval stays on today.
+    """
+    if not (repeat.days or repeat.weeks or repeat.months or repeat.years):
+        return today
+    next_date = today
+    while True:
+        next_date += relativedelta(days=repeat.days)
+        next_date += relativedelta(weeks=repeat.weeks)
+        next_date += relativedelta(months=repeat.months)
+        next_date += relativedelta(years=repeat.years)
+        if next_date not in excluded:
+            return next_date
+
+
+def _auto_add_transaction(reminder: Reminder, today: date, pending_status_id: int) -> FullTransaction:
+    return FullTransaction(
+        transaction_date=today,
+        total_amount=reminder.amount,
+        status_id=pending_status_id,
+        memo=reminder.memo,
+        description=reminder.description,
+        edit_date=today,
+        add_date=today,
+        transaction_type_id=reminder.transaction_type_id,
+        paycheck_id=None,
+        source_account_id=reminder.reminder_source_account_id,
+        destination_account_id=reminder.reminder_destination_account_id,
+        tags=[
+            CustomTag(
+                tag_name=reminder.tag.tag_name,
+                tag_amount=reminder.amount,
+                tag_id=reminder.tag_id,
+                tag_full_toggle=True,
+            )
+        ],
+        checkNumber=None,
+    )
+
+
+def convert_due_reminders(today: date) -> ConversionResult:
+    """
+    Adds today's transactions of the due auto-add reminders and moves every
+    due reminder to its next date.
+
+    Args:
+        today (date): The local date of the run.
+
+    Returns:
+        ConversionResult: The number of transactions created and reminders
+            deleted, the ids of the rescheduled reminders, and the accounts
+            whose reminders or transactions changed.
+    """
+    result = ConversionResult()
+    reminders = list(
+        Reminder.objects.filter(next_date__lte=today)
+        .select_related("repeat", "tag__parent", "tag__child")
+        .order_by("id")
+    )
+    if not reminders:
+        return result
+    exclusions = _exclusions_by_reminder([r.id for r in reminders], today)
+    pending_status_id = reference.status_id("pending")
+
+    transactions = []
+    rescheduled = []
+    ended_ids = []
+    for reminder in reminders:
+        excluded = exclusions.get(reminder.id, set())
+        if reminder.auto_add and today not in excluded:
+            transactions.append(
+                _auto_add_transaction(reminder, today, pending_status_id)
+            )
+        next_date = next_reminder_date(today, reminder.repeat, excluded)
+        if reminder.end_date is None or next_date <= reminder.end_date:
+            reminder.next_date = next_date
+            reminder.start_date = next_date
+            rescheduled.append(reminder)
+        else:
+            ended_ids.append(reminder.id)
+        result.account_ids.add(reminder.reminder_source_account_id)
+        if reminder.reminder_destination_account_id is not None:
+            result.account_ids.add(reminder.reminder_destination_account_id)
+
+    with db_transaction.atomic(), deferred_refresh(), deferred_reminder_refresh():
+        if transactions:
+            create_transactions(transactions)
+        Reminder.objects.bulk_update(rescheduled, ["next_date", "start_date"])
+        if ended_ids:
+            Reminder.objects.filter(id__in=ended_ids).delete()
+
+    result.created = len(transactions)
+    result.rescheduled_ids = [r.id for r in rescheduled]
+    result.deleted = len(ended_ids)
+    return result
@@ -1,3 +1,5 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from reminders.models import Reminder
@@ -12,35 +14,63 @@ from core.cache.keys import (
     account_reminder_transactions,
 )
 from core.broadcast import broadcast_invalidate
+from core.cache import reference
 
-_REMINDER_BROADCAST_KEYS = ["reminders", "accounts", "account_forecast", "tag_graph"]
+REMINDER_BROADCAST_KEYS = ["reminders", "accounts", "account_forecast", "tag_graph"]
+
+
+# Set while reminders are saved or deleted in bulk; the caller rebuilds their
+# caches and refreshes the touched accounts once afterwards.
+_refresh_deferred: ContextVar[bool] = ContextVar(
+    "reminder_refresh_deferred", default=False
+)
+
+
+@contextmanager
+def deferred_reminder_refresh():
+    """Skips the per-row cache rebuild and refresh of the Reminder receivers."""
+    token = _refresh_deferred.set(True)
+    try:
+        yield
+    finally:
+        _refresh_deferred.reset(token)
+
+
+def _clear_reminder_caches(account_id):
+    delete_pattern(account_reminder_transactions(account_id))
+    delete_pattern(account_combined_transactions(account_id))
+    # A parent account's register and forecast series roll up its children's
+    # reminder rows
+    parent_id = reference.parent_account_id(account_id)
+    if parent_id is not None:
+        delete_pattern(account_reminder_transactions(parent_id))
+        delete_pattern(account_combined_transactions(parent_id))
 
 
 @receiver(post_save, sender=Reminder)
 def update_and_invalidate_cache_on_save(sender, instance, **kwargs):
+    if _refresh_deferred.get():
+        return
     async_task("transactions.tasks.update_reminder_cache", instance.id)
-    delete_pattern(
-        account_reminder_transactions(instance.reminder_source_account.id)
-    )
-    delete_pattern(
-        account_combined_transactions(instance.reminder_source_account.id)
+    _clear_reminder_caches(instance.reminder_source_account_id)
+    if instance.reminder_destination_account_id is not None:
+        _clear_reminder_caches(instance.reminder_destination_account_id)
+    broadcast_invalidate(
+        REMINDER_BROADCAST_KEYS,
+        account_ids=[
+            instance.reminder_source_account_id,
+            instance.reminder_destination_account_id,
+        ],
     )
-    if instance.reminder_destination_account is not None:
-        delete_pattern(
-            account_reminder_transactions(instance.reminder_destination_account.id)
-        )
-        delete_pattern(
-            account_combined_transactions(instance.reminder_destination_account.id)
-        )
-    broadcast_invalidate(_REMINDER_BROADCAST_KEYS)
 
 
 @receiver(post_delete, sender=Reminder)
 def update_and_invalidate_cache_on_delete(sender, instance, **kwargs):
     ReminderCacheTransaction.objects.filter(reminder=instance).delete()
+    if _refresh_deferred.get():
+        return
     source = instance.reminder_source_account
-    delete_pattern(account_reminder_transactions(source.id))
-    delete_pattern(account_combined_transactions(source.id))
+    _clear_reminder_caches(source.id)
     # If source is a CC account, its funding account holds the payment forecast —
     # clear that cache too so it doesn't serve stale payment entries.
     if source.funding_account_id:
@@ -55,8 +85,7 @@ def update_and_invalidate_cache_on_delete(sender, instance, **kwargs):
     )
     if instance.reminder_destination_account is not None:
         dest = instance.reminder_destination_account
-        delete_pattern(account_reminder_transactions(dest.id))
-        delete_pattern(account_combined_transactions(dest.id))
+        _clear_reminder_caches(dest.id)
         if dest.funding_account_id:
             delete_pattern(account_all(dest.funding_account_id))
         async_task(
@@ -67,4 +96,10 @@ def update_and_invalidate_cache_on_delete(sender, instance, **kwargs):
             "transactions.tasks.update_interest_forecast_cache",
             dest.id,
         )
-    broadcast_invalidate(_REMINDER_BROADCAST_KEYS)
+    broadcast_invalidate(
+        REMINDER_BROADCAST_KEYS,
+        account_ids=[
+            instance.reminder_source_account_id,
+            instance.reminder_destination_account_id,
+        ],
+    )
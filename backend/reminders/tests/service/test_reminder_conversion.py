@@ -0,0 +1,111 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from reminders.models import Reminder, ReminderExclusion, Repeat
+from reminders.services.conversion import convert_due_reminders
+from transactions.models import ReminderCacheTransaction, Transaction, TransactionDetail
+from transactions.tasks import convert_reminder
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+TODAY = date(2026, 3, 15)
+
+
+@pytest.fixture(autouse=True)
+def queued():
+    with patch("transactions.services.bulk_mutation.async_task") as task, \
+         patch("reminders.signals.async_task"), \
+         patch("transactions.signals.async_task"):
+        yield task
+
+
+@pytest.fixture
+def monthly():
+    return Repeat.objects.create(repeat_name="Monthly", months=1)
+
+
+@pytest.fixture
+def make_reminder(
+    test_tag,
+    test_checking_account,
+    test_expense_transaction_type,
+    test_pending_transaction_status,
+    test_income_transaction_type,
+    monthly,
+):
+    def make(description="Rent", auto_add=True, end_date=None, amount=100):
+        return Reminder.objects.create(
+            tag=test_tag,
+            amount=amount,
+            reminder_source_account=test_checking_account,
+            description=description,
+            transaction_type=test_expense_transaction_type,
+            start_date=TODAY,
+            next_date=TODAY,
+            end_date=end_date,
+            repeat=monthly,
+            auto_add=auto_add,
+        )
+    return make
+
+
+def test_converts_skips_excluded_and_ends(make_reminder, test_tag):
+    rent = make_reminder("Rent")
+    ReminderExclusion.objects.create(reminder=rent, exclude_date=date(2026, 4, 15))
+    gym = make_reminder("Gym")
+    ReminderExclusion.objects.create(reminder=gym, exclude_date=TODAY)
+    last = make_reminder("Last", auto_add=False, end_date=date(2026, 4, 1))
+
+    result = convert_due_reminders(TODAY)
+
+    assert result.created == 1
+    assert result.deleted == 1
+    assert sorted(result.rescheduled_ids) == [rent.id, gym.id]
+    created = Transaction.objects.get()
+    assert (created.description, created.transaction_date) == ("Rent", TODAY)
+    assert created.total_amount == Decimal("-100")
+    detail = TransactionDetail.objects.get()
+    assert (detail.tag_id, detail.detail_amt) == (test_tag.id, Decimal("-100"))
+    rent.refresh_from_db()
+    gym.refresh_from_db()
+    assert rent.next_date == rent.start_date == date(2026, 5, 15)
+    assert gym.next_date == date(2026, 4, 15)
+    assert not Reminder.objects.filter(id=last.id).exists()
+
+
+def test_query_count_does_not_grow_with_reminders(
+    make_reminder, django_assert_max_num_queries
+):
+    for n in range(25):
+        reminder = make_reminder(f"Bill {n}")
+        ReminderExclusion.objects.create(reminder=reminder, exclude_date=date(2026, 4, 15))
+
+    with django_assert_max_num_queries(12):
+        result = convert_due_reminders(TODAY)
+
+    assert result.created == Transaction.objects.count() == 25
+    assert TransactionDetail.objects.count() == 25
+    assert set(Reminder.objects.values_list("next_date", flat=True)) == {date(2026, 5, 15)}
+
+
+def test_task_rebuilds_caches_and_refreshes_accounts_once(
+    make_reminder, test_checking_account, queued
+):
+    reminders = [make_reminder(f"Bill {n}") for n in range(3)]
+
+    with patch("transactions.tasks.get_todays_date_timezone_adjusted", return_value=TODAY):
+        convert_reminder()
+
+    assert Transaction.objects.count() == 3
+    for reminder in reminders:
+        dates = ReminderCacheTransaction.objects.filter(reminder=reminder).values_list(
+            "transaction_date", flat=True
+        )
+        assert min(dates) == date(2026, 4, 15)
+    forecast_calls = [
+        c for c in queued.call_args_list
+        if c.args == ("transactions.tasks.update_cc_forecast_cache", test_checking_account.id)
+    ]
+    assert len(forecast_calls) == 1
@@ -1,13 +1,40 @@
+"""
+Report execution.
+
+Every report is assembled from per-month partials: for each month of the
+resolved range, the detail total of each tag and (when transactions are
+shown) the month's transaction rows with the tags they carry. Totals per tag
+or per month, comparisons and subtotals are all sums over those partials.
+
+A month is fingerprinted by a single grouped query over the details in scope
+(count, amount, tag and transaction checksums, latest edit date), together
+with the month's data version counter, which every transaction save in the
+month bumps (see reports.signals), and the reference counter, which account
+renames bump. A run costs one watermark query per period plus the tag
+lookups. Closed months are cached by their fingerprint and reused until a
+row dated in them changes; only the open month and changed months are read
+again. The assembled result is cached under a fingerprint of the parameters,
+the resolved range and every month's watermark, so an unchanged report is
+served without reading any detail rows at all, however many years it spans.
+"""
+import hashlib
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, List, Optional
 
 from dateutil.relativedelta import relativedelta
-from django.db.models import Q, Sum
+from django.core.cache import cache
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncMonth
 
+from core.cache import versions
+from core.cache.keys import report_partial, report_result
 from tags.models import MainTag, SubTag, Tag
 from transactions.models import TransactionDetail, TransactionStatus
 
+REPORT_TIMEOUT = 60 * 60
+PARTIAL_TIMEOUT = 60 * 60 * 24 * 7
+
 
 def compute_date_range(date_range_type: str, date_from=None, date_to=None):
     today = date.today()
@@ -84,7 +111,7 @@ def _build_base_qs(start: date, end: date, status_ids, account_ids):
         transaction__transaction_date__gte=start,
         transaction__transaction_date__lte=end,
         transaction__status_id__in=status_ids,
-    ).select_related("transaction", "transaction__source_account")
+    )
 
     if account_ids:
         qs = qs.filter(
@@ -94,33 +121,141 @@ def _build_base_qs(start: date, end: date, status_ids, account_ids):
     return qs
 
 
-def _sum_qs(qs) -> Decimal:
-    result = qs.aggregate(total=Sum("detail_amt"))["total"]
-    return result if result is not None else Decimal("0.00")
+def _fingerprint(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _month_watermarks(start: date, end: date, status_ids, account_ids) -> Dict[date, tuple]:
+    """
+    A change-detecting summary of each month of start..end: the sums of the
+    details in scope, from one query, and the month and reference counters.
+    """
+    rows = (
+        _build_base_qs(start, end, status_ids, account_ids)
+        .annotate(month=TruncMonth("transaction__transaction_date"))
+        .values("month")
+        .annotate(
+            details=Count("id"),
+            amount=Sum("detail_amt"),
+            tags=Sum("tag_id"),
+            transactions=Sum("transaction_id"),
+            edited=Max("transaction__edit_date"),
+        )
+        .order_by()
+    )
+    sums = {
+        row["month"]: (
+            row["details"], str(row["amount"]), row["tags"], row["transactions"], row["edited"]
+        )
+        for row in rows
+    }
+    months = [month for month, _ in _iter_months(start, end)]
+    counters = versions.current([versions.month(month) for month in months] + [versions.REFERENCE])
+    return {
+        month: (
+            sums.get(month),
+            counters[versions.month(month)],
+            counters[versions.REFERENCE],
+        )
+        for month in months
+    }
 
 
-def _build_transaction_rows(qs):
-    rows = []
-    seen_tx = set()
-    for detail in qs.select_related(
-        "transaction", "transaction__source_account"
-    ).order_by("transaction__transaction_date"):
-        tx = detail.transaction
-        if tx.id in seen_tx:
-            continue
-        seen_tx.add(tx.id)
-        account_name = (
-            tx.source_account.account_name if tx.source_account else ""
+def _compute_partials(segments, status_ids, account_ids, show_transactions) -> Dict[date, dict]:
+    """Reads the partials of the given (start, end) month segments."""
+    partials = {
+        seg_start.replace(day=1): {"totals": {}, "transactions": []}
+        for seg_start, _ in segments
+    }
+    in_segments = Q()
+    for seg_start, seg_end in segments:
+        in_segments |= Q(
+            transaction__transaction_date__gte=seg_start,
+            transaction__transaction_date__lte=seg_end,
         )
-        rows.append(
-            {
-                "id": tx.id,
-                "date": tx.transaction_date,
-                "description": tx.description,
-                "amount": tx.total_amount,
-                "account": account_name,
-            }
+    qs = _build_base_qs(
+        segments[0][0], segments[-1][1], status_ids, account_ids
+    ).filter(in_segments)
+
+    totals = (
+        qs.annotate(month=TruncMonth("transaction__transaction_date"))
+        .values("month", "tag_id")
+        .annotate(total=Sum("detail_amt"))
+        .order_by()
+    )
+    for row in totals:
+        partials[row["month"]]["totals"][row["tag_id"]] = row["total"]
+
+    if show_transactions:
+        seen = {}
+        details = qs.values_list(
+            "transaction_id",
+            "transaction__transaction_date",
+            "transaction__description",
+            "transaction__total_amount",
+            "transaction__source_account__account_name",
+            "tag_id",
+        ).order_by("transaction__transaction_date", "transaction_id")
+        for tx_id, tx_date, description, amount, account_name, tag_id in details:
+            row = seen.get(tx_id)
+            if row is None:
+                row = seen[tx_id] = {
+                    "id": tx_id,
+                    "date": tx_date,
+                    "description": description,
+                    "amount": amount,
+                    "account": account_name or "",
+                    "tag_ids": [],
+                }
+                partials[tx_date.replace(day=1)]["transactions"].append(row)
+            row["tag_ids"].append(tag_id)
+    return partials
+
+
+def _month_partials(start: date, end: date, status_ids, account_ids, show_transactions, watermarks):
+    """
+    The (month start, partial) pairs of start..end in order. Closed months
+    come from the cache when their watermark is unchanged.
+    """
+    open_month = date.today().replace(day=1)
+    segments = list(_iter_months(start, end))
+    keys = {
+        seg_start.replace(day=1): report_partial(_fingerprint(
+            seg_start, seg_end, status_ids, account_ids, show_transactions,
+            watermarks.get(seg_start.replace(day=1)),
+        ))
+        for seg_start, seg_end in segments
+        if seg_end < open_month
+    }
+    cached = cache.get_many(list(keys.values()))
+    partials = {month: cached[key] for month, key in keys.items() if key in cached}
+    stale = [s for s in segments if s[0].replace(day=1) not in partials]
+    if stale:
+        computed = _compute_partials(stale, status_ids, account_ids, show_transactions)
+        cache.set_many(
+            {keys[month]: partial for month, partial in computed.items() if month in keys},
+            timeout=PARTIAL_TIMEOUT,
         )
+        partials.update(computed)
+    return [(seg_start, partials[seg_start.replace(day=1)]) for seg_start, _ in segments]
+
+
+def _sum_partials(partials, tag_ids) -> Decimal:
+    """Detail total of tag_ids (None for every tag) across the partials."""
+    total = Decimal("0.00")
+    for _, partial in partials:
+        for tag_id, amount in partial["totals"].items():
+            if tag_ids is None or tag_id in tag_ids:
+                total += amount
+    return total
+
+
+def _partial_transactions(partials, tag_ids) -> List[dict]:
+    rows = []
+    for _, partial in partials:
+        for row in partial["transactions"]:
+            if tag_ids is None or tag_ids.intersection(row["tag_ids"]):
+                rows.append({k: v for k, v in row.items() if k != "tag_ids"})
     return rows
 
 
@@ -140,6 +275,19 @@ def _iter_months(start: date, end: date):
         current = current + relativedelta(months=1)
 
 
+def _resolve_selections(tag_selections) -> List[tuple]:
+    """(label, tag id set) for each tag selection."""
+    resolved = []
+    for sel in tag_selections:
+        ids = dict(
+            tag_id=sel.get("tag_id"),
+            sub_tag_id=sel.get("sub_tag_id"),
+            main_tag_id=sel.get("main_tag_id"),
+        )
+        resolved.append((_get_tag_label(**ids), frozenset(_resolve_tag_ids(**ids))))
+    return resolved
+
+
 def run_report(
     report_type: str,
     date_range_type: str,
@@ -155,71 +303,70 @@ def run_report(
     period2_date_to: Optional[date] = None,
 ):
     start, end = compute_date_range(date_range_type, date_from, date_to)
-    status_ids = _get_status_ids(include_pending)
+    status_ids = sorted(_get_status_ids(include_pending))
+    account_ids = sorted(account_ids or [])
+    selections = _resolve_selections(tag_selections)
+
+    periods = [(start, end)]
+    if report_type != "TOTALS":
+        if period2_date_from and period2_date_to:
+            periods.append((period2_date_from, period2_date_to))
+        else:
+            periods.append(_shift_back_one_year(start, end))
+    watermarks = [
+        _month_watermarks(p_start, p_end, status_ids, account_ids)
+        for p_start, p_end in periods
+    ]
+
+    key = report_result(_fingerprint(
+        report_type, group_by, periods, status_ids, account_ids,
+        [(label, sorted(ids)) for label, ids in selections],
+        show_transactions, show_subtotal,
+        [sorted(w.items()) for w in watermarks],
+    ))
+    result = cache.get(key)
+    if result is not None:
+        return result
 
     if report_type == "TOTALS":
-        return _run_totals(
-            start, end, status_ids, account_ids, tag_selections,
-            group_by, show_transactions, show_subtotal,
+        partials = _month_partials(
+            start, end, status_ids, account_ids, show_transactions, watermarks[0]
+        )
+        result = _run_totals(
+            start, end, partials, selections, group_by, show_transactions, show_subtotal,
         )
     else:
-        return _run_comparison(
-            start, end, status_ids, account_ids, tag_selections,
-            group_by, show_subtotal,
-            period2_date_from=period2_date_from,
-            period2_date_to=period2_date_to,
+        partials = [
+            _month_partials(p_start, p_end, status_ids, account_ids, False, w)
+            for (p_start, p_end), w in zip(periods, watermarks)
+        ]
+        result = _run_comparison(
+            periods, partials, selections, group_by, show_subtotal,
         )
+    cache.set(key, result, timeout=REPORT_TIMEOUT)
+    return result
 
 
-def _run_totals(start, end, status_ids, account_ids, tag_selections, group_by, show_transactions, show_subtotal):
-    base_qs = _build_base_qs(start, end, status_ids, account_ids)
+def _run_totals(start, end, partials, selections, group_by, show_transactions, show_subtotal):
     rows = []
 
     if group_by == "MONTH":
-        all_tag_ids = _all_tag_ids_from_selections(tag_selections)
-        if all_tag_ids is not None:
-            month_qs = base_qs.filter(tag_id__in=all_tag_ids)
-        else:
-            month_qs = base_qs
-
-        for month_start, month_end in _iter_months(start, end):
-            m_qs = month_qs.filter(
-                transaction__transaction_date__gte=month_start,
-                transaction__transaction_date__lte=month_end,
-            )
-            total = _sum_qs(m_qs)
+        all_tag_ids = _all_tag_ids_from_selections(selections)
+        for month_start, partial in partials:
+            month = [(month_start, partial)]
             row = {
                 "label": _month_label(month_start.year, month_start.month),
-                "total": total,
+                "total": _sum_partials(month, all_tag_ids),
             }
             if show_transactions:
-                row["transactions"] = _build_transaction_rows(m_qs)
+                row["transactions"] = _partial_transactions(month, all_tag_ids)
             rows.append(row)
     else:
         # group_by == TAG
-        if tag_selections:
-            for sel in tag_selections:
-                tag_ids = _resolve_tag_ids(
-                    tag_id=sel.get("tag_id"),
-                    sub_tag_id=sel.get("sub_tag_id"),
-                    main_tag_id=sel.get("main_tag_id"),
-                )
-                label = _get_tag_label(
-                    tag_id=sel.get("tag_id"),
-                    sub_tag_id=sel.get("sub_tag_id"),
-                    main_tag_id=sel.get("main_tag_id"),
-                )
-                filtered = base_qs.filter(tag_id__in=tag_ids) if tag_ids else base_qs.none()
-                total = _sum_qs(filtered)
-                row = {"label": label, "total": total}
-                if show_transactions:
-                    row["transactions"] = _build_transaction_rows(filtered)
-                rows.append(row)
-        else:
-            total = _sum_qs(base_qs)
-            row = {"label": "All Tags", "total": total}
+        for label, tag_ids in selections or [("All Tags", None)]:
+            row = {"label": label, "total": _sum_partials(partials, tag_ids)}
             if show_transactions:
-                row["transactions"] = _build_transaction_rows(base_qs)
+                row["transactions"] = _partial_transactions(partials, tag_ids)
             rows.append(row)
 
     result = {
@@ -234,62 +381,26 @@ def _run_totals(start, end, status_ids, account_ids, tag_selections, group_by, s
     return result
 
 
-def _run_comparison(start, end, status_ids, account_ids, tag_selections, group_by, show_subtotal,
-                    period2_date_from=None, period2_date_to=None):
-    if period2_date_from and period2_date_to:
-        prior_start, prior_end = period2_date_from, period2_date_to
-    else:
-        prior_start, prior_end = _shift_back_one_year(start, end)
-    base1 = _build_base_qs(start, end, status_ids, account_ids)
-    base2 = _build_base_qs(prior_start, prior_end, status_ids, account_ids)
+def _run_comparison(periods, partials, selections, group_by, show_subtotal):
+    (start, end), (prior_start, prior_end) = periods
+    current, prior = partials
     rows = []
 
     if group_by == "MONTH":
         # Overall totals only for COMPARISON + MONTH
-        all_tag_ids = _all_tag_ids_from_selections(tag_selections)
-        if all_tag_ids is not None:
-            t1 = _sum_qs(base1.filter(tag_id__in=all_tag_ids))
-            t2 = _sum_qs(base2.filter(tag_id__in=all_tag_ids))
-        else:
-            t1 = _sum_qs(base1)
-            t2 = _sum_qs(base2)
+        groups = [("Total", _all_tag_ids_from_selections(selections))]
+    else:
+        # group_by == TAG
+        groups = selections or [("All Tags", None)]
+    for label, tag_ids in groups:
+        t1 = _sum_partials(current, tag_ids)
+        t2 = _sum_partials(prior, tag_ids)
         rows.append({
-            "label": "Total",
+            "label": label,
             "period1_total": t1,
             "period2_total": t2,
             "difference": t1 - t2,
         })
-    else:
-        # group_by == TAG
-        if tag_selections:
-            for sel in tag_selections:
-                tag_ids = _resolve_tag_ids(
-                    tag_id=sel.get("tag_id"),
-                    sub_tag_id=sel.get("sub_tag_id"),
-                    main_tag_id=sel.get("main_tag_id"),
-                )
-                label = _get_tag_label(
-                    tag_id=sel.get("tag_id"),
-                    sub_tag_id=sel.get("sub_tag_id"),
-                    main_tag_id=sel.get("main_tag_id"),
-                )
-                t1 = _sum_qs(base1.filter(tag_id__in=tag_ids)) if tag_ids else Decimal("0.00")
-                t2 = _sum_qs(base2.filter(tag_id__in=tag_ids)) if tag_ids else Decimal("0.00")
-                rows.append({
-                    "label": label,
-                    "period1_total": t1,
-                    "period2_total": t2,
-                    "difference": t1 - t2,
-                })
-        else:
-            t1 = _sum_qs(base1)
-            t2 = _sum_qs(base2)
-            rows.append({
-                "label": "All Tags",
-                "period1_total": t1,
-                "period2_total": t2,
-                "difference": t1 - t2,
-            })
 
     result = {
         "report_type": "COMPARISON",
@@ -306,15 +417,8 @@ def _run_comparison(start, end, status_ids, account_ids, tag_selections, group_b
     return result
 
 
-def _all_tag_ids_from_selections(tag_selections):
-    """Return flat list of all resolved Tag IDs, or None if selections is empty (= all tags)."""
-    if not tag_selections:
+def _all_tag_ids_from_selections(selections):
+    """Return the set of all resolved Tag IDs, or None if selections is empty (= all tags)."""
+    if not selections:
         return None
-    ids = []
-    for sel in tag_selections:
-        ids.extend(_resolve_tag_ids(
-            tag_id=sel.get("tag_id"),
-            sub_tag_id=sel.get("sub_tag_id"),
-            main_tag_id=sel.get("main_tag_id"),
-        ))
-    return ids
+    return frozenset().union(*(tag_ids for _, tag_ids in selections))
@@ -0,0 +1,36 @@
+"""
+Month counters behind the cached report partials.
+
+The per-month watermark of reports.services.execution sums the details in
+scope, which misses writes that leave every sum unchanged: an edited
+description or total, or an amount moved between two tags. Every save of a
+transaction, and every update of a detail in place, bumps the counter of the
+transaction's month, which the watermark includes. Creations and deletions
+of details, and a transaction moved out of a month, change the detail count
+of the month they leave, so they need no counter.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import versions
+from transactions.models import Transaction, TransactionDetail
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def bump_transaction_month(sender, instance, **kwargs):
+    if instance.transaction_date:
+        versions.bump(versions.month(instance.transaction_date))
+
+
+@receiver(post_save, sender=TransactionDetail)
+def bump_detail_month(sender, instance, created, **kwargs):
+    if created:
+        return
+    transaction_date = (
+        Transaction.objects.filter(id=instance.transaction_id)
+        .values_list("transaction_date", flat=True)
+        .first()
+    )
+    if transaction_date:
+        versions.bump(versions.month(transaction_date))
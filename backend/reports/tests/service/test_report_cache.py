@@ -0,0 +1,158 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reports.services.execution import run_report
+from tags.models import Tag
+from transactions.models import Transaction, TransactionDetail
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def add(test_checking_account, test_cleared_transaction_status, test_expense_transaction_type, test_tag):
+    def add(tx_date, amount):
+        transaction = Transaction.objects.create(
+            source_account=test_checking_account,
+            status=test_cleared_transaction_status,
+            transaction_type=test_expense_transaction_type,
+            transaction_date=tx_date,
+            total_amount=amount,
+            description=f"tx {tx_date}",
+        )
+        TransactionDetail.objects.create(transaction=transaction, detail_amt=amount, tag=test_tag)
+        return transaction
+    return add
+
+
+def _monthly(years, show_transactions=True):
+    return run_report(
+        report_type="TOTALS",
+        date_range_type="CUSTOM",
+        group_by="MONTH",
+        date_from=date(TODAY.year - years, 1, 1),
+        date_to=TODAY,
+        account_ids=[],
+        tag_selections=[],
+        show_transactions=show_transactions,
+        show_subtotal=True,
+        include_pending=False,
+    )
+
+
+def _history(add, years):
+    for year in range(TODAY.year - years, TODAY.year):
+        for month in (2, 7, 11):
+            add(date(year, month, 10), Decimal("12.50"))
+    add(TODAY, Decimal("3.00"))
+
+
+def test_unchanged_report_is_served_without_reading_details(add):
+    _history(add, 3)
+    first = _monthly(3)
+
+    with CaptureQueriesContext(connection) as queries:
+        second = _monthly(3)
+
+    assert second == first
+    assert len(queries) == 2  # statuses and the month watermarks
+
+
+def test_only_changed_months_are_recomputed(add):
+    _history(add, 3)
+    _monthly(3)
+    add(TODAY, Decimal("4.00"))
+    old = add(date(TODAY.year - 2, 7, 20), Decimal("1.00"))
+
+    incremental = _monthly(3)
+    cache.clear()
+    full = _monthly(3)
+
+    assert incremental == full
+    assert incremental["subtotal"] == Decimal("12.50") * 9 + 3 + 4 + 1
+    july = next(r for r in incremental["rows"] if r["label"] == f"July {TODAY.year - 2}")
+    assert [t["id"] for t in july["transactions"]][-1] == old.id
+
+
+def test_recompute_cost_does_not_grow_with_range(add):
+    counts = []
+    for years in (2, 8):
+        _history(add, years)
+        _monthly(years)
+        add(TODAY, Decimal("1.00"))
+        with CaptureQueriesContext(connection) as queries:
+            _monthly(years)
+        counts.append(len(queries))
+        cache.clear()
+
+    assert counts[0] == counts[1]
+
+
+def test_comparison_uses_both_periods(add):
+    _history(add, 2)
+    kwargs = dict(
+        report_type="COMPARISON", date_range_type="CUSTOM", group_by="TAG",
+        date_from=date(TODAY.year - 1, 1, 1), date_to=date(TODAY.year - 1, 12, 31),
+        account_ids=[], tag_selections=[], show_transactions=False,
+        show_subtotal=True, include_pending=False,
+    )
+    run_report(**kwargs)
+    add(date(TODAY.year - 2, 3, 1), Decimal("5.00"))
+
+    result = run_report(**kwargs)
+
+    assert result["rows"][0]["period1_total"] == Decimal("37.50")
+    assert result["rows"][0]["period2_total"] == Decimal("42.50")
+
+
+def _tag_total(tag):
+    return run_report(
+        report_type="TOTALS",
+        date_range_type="CUSTOM",
+        group_by="MONTH",
+        date_from=date(TODAY.year - 1, 1, 1),
+        date_to=TODAY,
+        account_ids=[],
+        tag_selections=[{"tag_id": tag.id}],
+        show_transactions=False,
+        show_subtotal=True,
+        include_pending=False,
+    )["subtotal"]
+
+
+def test_same_day_split_edit_in_closed_month_changes_the_result(
+    add, test_tag, test_main_tag, tag_type_expense
+):
+    other = Tag.objects.create(parent=test_main_tag, tag_type=tag_type_expense)
+    transaction = add(date(TODAY.year - 1, 3, 10), Decimal("-15.00"))
+    TransactionDetail.objects.create(transaction=transaction, detail_amt=Decimal("-5.00"), tag=other)
+    assert _tag_total(test_tag) == Decimal("-15.00")
+
+    # Moves $10 between the tags: every sum of the month stays the same
+    for detail in TransactionDetail.objects.filter(transaction=transaction):
+        detail.detail_amt = Decimal("-5.00") if detail.tag_id == test_tag.id else Decimal("-15.00")
+        detail.save()
+
+    assert _tag_total(test_tag) == Decimal("-5.00")
+    assert _tag_total(other) == Decimal("-15.00")
+
+
+def test_description_and_account_name_edits_in_closed_month_change_the_result(
+    add, test_checking_account
+):
+    transaction = add(date(TODAY.year - 1, 3, 10), Decimal("12.50"))
+    _monthly(1)
+
+    transaction.description = "Renamed"
+    transaction.save()
+    test_checking_account.account_name = "Renamed account"
+    test_checking_account.save()
+
+    march = next(r for r in _monthly(1)["rows"] if r["label"] == f"March {TODAY.year - 1}")
+    assert march["transactions"][0]["description"] == "Renamed"
+    assert march["transactions"][0]["account"] == "Renamed account"
@@ -1,8 +1,11 @@
 from ninja import Router
+from ninja.decorators import decorate_view
 from ninja.errors import HttpError
 from tags.api.schemas.graph_by_tags import GraphOut, PieGraphItem
 from tags.services.tag_graph import get_graph_new_data, get_graph_data
 from typing import List
+from core.cache import versions
+from core.etag import conditional
 import logging
 
 api_logger = logging.getLogger("api")
@@ -10,8 +13,16 @@ error_logger = logging.getLogger("error")
 
 graph_by_tags_router = Router(tags=["Graph By Tags"])
 
+GRAPH_VERSIONS = (
+    versions.REFERENCE,
+    "transactions",
+    "tag_graph",
+    versions.model("administration.userdashboardconfig"),
+)
+
 
 @graph_by_tags_router.get("/new", response=List[PieGraphItem])
+@decorate_view(conditional(*GRAPH_VERSIONS))
 def get_graph_new(request, widget_id: int):
     """
     The function `get_graph_new` retrieves graph data for tags for widget id.
@@ -34,6 +45,7 @@ def get_graph_new(request, widget_id: int):
 
 
 @graph_by_tags_router.get("/get", response=GraphOut)
+@decorate_view(conditional(*GRAPH_VERSIONS))
 def get_graph(request, widget_id: int):
     """
     The function `get_graph` retrieves graph data for tags for widget id.
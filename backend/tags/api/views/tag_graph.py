@@ -1,4 +1,5 @@
 from ninja import Router
+from ninja.decorators import decorate_view
 from ninja.errors import HttpError
 from transactions.models import TransactionDetail
 from tags.api.schemas.tag_graph import TagGraphOut
@@ -10,6 +11,8 @@ from transactions.api.dependencies.get_transactions_by_tag import (
     get_transactions_by_tag,
 )
 from datetime import date
+from core.cache import versions
+from core.etag import conditional
 import logging
 
 api_logger = logging.getLogger("api")
@@ -21,6 +24,7 @@ tag_graph_router = Router(tags=["Tag Graphs"])
 
 
 @tag_graph_router.get("/list", response=TagGraphOut)
+@decorate_view(conditional(versions.REFERENCE, "transactions", "tag_graph"))
 def list_transactions_bytag(request, tag: int):
     """
     The function `list_transactions_bytag` retrieves transactions for a tag id,
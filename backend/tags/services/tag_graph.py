@@ -1,6 +1,7 @@
 import json
 import os
 import random
+from functools import partial
 from typing import List, Tuple
 
 import pytz
@@ -8,6 +9,7 @@ from dateutil.relativedelta import relativedelta
 from django.db.models import Count, F, Sum
 from django.utils import timezone
 
+from core.aio import gather_limited, run_sync
 from administration.models import UserDashboardConfig, DEFAULT_GRAPH_WIDGETS, DEFAULT_DASHBOARD_LAYOUT
 from tags.api.schemas.graph_by_tags import GraphDataset, GraphOut, PieGraphItem
 from tags.models import Tag
@@ -287,3 +289,16 @@ def get_graph_data(widget_id: int, user) -> GraphOut:
     graph_object = GraphOut(labels=labels, datasets=[dataset])
     service_logger.debug(f"Graph data retrieved : {widget_id}")
     return graph_object
+
+
+async def aget_graph_widgets_data(user) -> List[Tuple[dict, List[PieGraphItem]]]:
+    """
+    The pie graph items of every graph widget configured for user, paired
+    with the widget config. Widgets are computed concurrently.
+    """
+    graph_widgets = await run_sync(_get_user_graph_widgets, user)
+    items = await gather_limited(
+        partial(run_sync, get_graph_new_data, widget["widget_id"], user)
+        for widget in graph_widgets
+    )
+    return list(zip(graph_widgets, items))
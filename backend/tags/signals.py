@@ -0,0 +1,20 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from tags.models import Tag, MainTag, SubTag, TagType
+from core.cache import reference
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=MainTag)
+@receiver(post_save, sender=SubTag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=MainTag)
+@receiver(post_delete, sender=SubTag)
+@receiver(post_save, sender=TagType)
+@receiver(post_delete, sender=TagType)
+def invalidate_tag_names(sender, instance, **kwargs):
+    """
+    Tag display names and serialized tag rows are built from the main tag,
+    sub tag and tag type rows, so any change to them drops both tag tables.
+    """
+    reference.invalidate(reference.TAG, reference.TAG_ROW)
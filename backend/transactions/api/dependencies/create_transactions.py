@@ -3,13 +3,13 @@ from transactions.api.dependencies.full_transaction import FullTransaction
 from transactions.models import (
     Transaction,
     TransactionDetail,
-    TransactionType,
     ReminderCacheTransaction,
     ReminderCacheTransactionDetail,
     ForecastCacheTransaction,
     ForecastCacheTransactionDetail,
 )
 from django.db import transaction
+from core.cache import reference
 import logging
 
 api_logger = logging.getLogger("api")
@@ -34,7 +34,7 @@ def create_transactions(
     # Initiate variables...
     max_bulk = 1000  # Chunk size for bulk record creations
     bulk_lower_limit = 10  # Lower limit to process as bulk_create
-    income_type_id = TransactionType.objects.values_list("id", flat=True).get(slug="income")
+    income_type_id = reference.type_id("income")
 
     # Define how to break up records into chunks
     def chunk_list(lst, chunk_size):
@@ -258,7 +258,7 @@ def create_transactions(
                 tag_id = trans_detail["tag_id"]
                 full_toggle = trans_detail["full_toggle"]
                 detail = None
-                if transaction_type == "transactions":
+                if transaction_type == "transaction":
                     detail = TransactionDetail(
                         transaction_id=created_transactions[
                             transaction_index
@@ -2,6 +2,7 @@ from datetime import date
 from typing import List, Optional, Tuple
 from transactions.api.schemas.transaction import TransactionOut
 from accounts.models import Account
+from accounts.lookups import get_account, has_child_accounts
 from transactions.models import (
     Transaction,
     ReminderCacheTransaction,
@@ -14,6 +15,7 @@ from transactions.api.dependencies.transaction_utilities import (
     sort_transaction_list,
     add_balances_to_transaction_list,
     annotate_transaction_display_info,
+    add_account_names_to_transactions,
     annotate_transaction_total,
     add_tags_to_transactions,
     sort_transactions,
@@ -21,9 +23,12 @@ from transactions.api.dependencies.transaction_utilities import (
 )
 from decimal import Decimal
 from django.db.models import Q
-from django.core.cache import cache
-from core.cache.keys import account_combined_transactions
-from transactions.services.transactions_and_balances import get_parent_account_transactions_and_balances
+from transactions.services.transactions_and_balances import (
+    build_account_register,
+    get_parent_account_transactions_and_balances,
+)
+from transactions.services.register_cache import get_cached_register
+from transactions.services.transaction_rows import transaction_outs
 
 
 def get_transactions_by_account(
@@ -47,20 +52,22 @@ def get_transactions_by_account(
         transactions: List of transaction objects
     """
     # Delegate to the parent-account handler when this account has children
-    if Account.objects.filter(parent_account_id=account_id).exists():
+    if has_child_accounts(account_id):
         return get_parent_account_transactions_and_balances(
             end_date, account_id, totals_only, forecast, start_date
         )
 
     # Forecast results depend on async task completion — skip cache to ensure freshness.
     # Non-forecast results are safe to cache since they only change via mutations which
-    # clear the cache immediately.
-    use_cache = not forecast
-    key = f"{account_combined_transactions(account_id)}:{end_date}:{totals_only}:{forecast}:{start_date}:{cleared_only}"
-    if use_cache:
-        data = cache.get(key)
-        if data:
-            return data
+    # clear the cache immediately; every window is sliced from the account's single
+    # cached register.
+    if not forecast:
+        return get_cached_register(
+            account_id,
+            end_date,
+            totals_only,
+            lambda: build_account_register(None, account_id, False),
+        )
 
     # Setup variables
     today = get_todays_date_timezone_adjusted()
@@ -70,7 +77,7 @@ def get_transactions_by_account(
 
     # Check if account exists.  Return an empty list if not.
     try:
-        account = Account.objects.get(id=account_id)
+        account = get_account(account_id)
     except Account.DoesNotExist:
         return [], Decimal(0.00)
 
@@ -98,13 +105,9 @@ def get_transactions_by_account(
 
     # If not totals only, annotate transactions with pretty information
     if not totals_only:
-        all_transactions = annotate_transaction_display_info(all_transactions)
-        reminder_transactions = annotate_transaction_display_info(
-            reminder_transactions
-        )
-        forecast_transactions = annotate_transaction_display_info(
-            forecast_transactions
-        )
+        all_transactions = annotate_transaction_display_info(all_transactions, account_names=False)
+        reminder_transactions = annotate_transaction_display_info(reminder_transactions, account_names=False)
+        forecast_transactions = annotate_transaction_display_info(forecast_transactions, account_names=False)
 
     # Annotate pretty totals
     all_transactions = annotate_transaction_total(all_transactions, account_id)
@@ -151,28 +154,21 @@ def get_transactions_by_account(
             pending_transactions, "t"
         )
 
+    # Resolve account names in Python rather than per-row subqueries
+    if not totals_only:
+        for rows in (
+            cleared_transactions,
+            pending_transactions,
+            reminder_transactions,
+            forecast_transactions,
+        ):
+            add_account_names_to_transactions(rows)
+
     # Create lists ot TransactionOut objects
-    cleared_transactions_list = [
-        TransactionOut.from_orm(obj) for obj in cleared_transactions
-    ]
-    pending_transactions_list = [
-        TransactionOut.from_orm(obj) for obj in pending_transactions
-    ]
-    reminder_transactions_list = [
-        TransactionOut.from_orm(obj).model_copy(
-            update={"id": -obj.id, "simulated": True}
-        )
-        for obj in reminder_transactions
-    ]
-    forecast_transactions_list = [
-        TransactionOut.from_orm(obj) for obj in forecast_transactions
-    ]
-    forecast_transactions_list = [
-        TransactionOut.from_orm(obj).model_copy(
-            update={"id": -obj.id - 10000, "simulated": True}
-        )
-        for obj in forecast_transactions
-    ]
+    cleared_transactions_list = transaction_outs(cleared_transactions)
+    pending_transactions_list = transaction_outs(pending_transactions)
+    reminder_transactions_list = transaction_outs(reminder_transactions, "r")
+    forecast_transactions_list = transaction_outs(forecast_transactions, "f")
 
     # Combine lists to be sorted
     transactions_to_be_sorted = (
@@ -232,8 +228,4 @@ def get_transactions_by_account(
                 previous_balance = previous_transactions[-1].balance
         my_tuple = (filtered_transactions, previous_balance)
         return my_tuple
-    else:
-        my_tuple = (transactions, Decimal(0.00))
-        if use_cache:
-            cache.set(key, my_tuple, timeout=60 * 60)
-        return my_tuple
+    return (transactions, Decimal(0.00))
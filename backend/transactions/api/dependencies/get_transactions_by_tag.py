@@ -1,22 +1,16 @@
 from typing import List
 from datetime import date
 from transactions.api.schemas.transaction import TransactionOut
-from transactions.models import Transaction, TransactionDetail
+from transactions.models import Transaction
 from transactions.api.dependencies.transaction_utilities import (
     annotate_transaction_display_info,
     annotate_transaction_total,
     sort_transactions,
     sort_transaction_list,
     add_tag_totals,
+    add_tags_to_transactions,
 )
-from django.db.models import (
-    Case,
-    When,
-    Value,
-    F,
-    CharField,
-)
-from django.db.models.functions import Concat
+from transactions.services.transaction_rows import transaction_outs
 
 
 def get_transactions_by_tag(
@@ -47,7 +41,7 @@ def get_transactions_by_tag(
     transactions = Transaction.objects.filter(
         add_date__range=[start_date, end_date],
         transactiondetail__tag_id__in=tags,
-    ).order_by("-add_date", "-id")
+    ).select_related("paycheck").order_by("-add_date", "-id")
 
     # Annotate transactions details
     if not totals_only:
@@ -60,26 +54,24 @@ def get_transactions_by_tag(
     cleared_transactions = transactions.exclude(status_id__in=[1, 4])
 
     # Sort Cleared Transactions
-    cleared_transactions = sort_transactions(cleared_transactions, True)
-
-    # Create List of Cleared Transactions
-    cleared_transactions_list = [
-        TransactionOut.from_orm(obj) for obj in cleared_transactions
-    ]
-
-    # Add tag totals to Cleared transactions
-    cleared_transactions_list = add_tag_totals(cleared_transactions_list, tags)
+    cleared_transactions = list(sort_transactions(cleared_transactions, True))
 
     # Filter for Pending transactions
-    pending_transactions = transactions.exclude(status_id__in=[2, 3, 4])
+    pending_transactions = list(transactions.exclude(status_id__in=[2, 3, 4]))
 
-    # Create list of Pending TransactionOut objects
-    pending_transactions_list = [
-        TransactionOut.from_orm(obj) for obj in pending_transactions
-    ]
+    # Add tags to transactions, for all rows at once
+    if not totals_only:
+        add_tags_to_transactions(cleared_transactions + pending_transactions)
 
-    # Add tag totals to Pending transactions
-    pending_transactions_list = add_tag_totals(pending_transactions_list, tags)
+    # Create list of Cleared TransactionOut objects, with tag totals
+    cleared_transactions_list = add_tag_totals(
+        transaction_outs(cleared_transactions), tags
+    )
+
+    # Create list of Pending TransactionOut objects, with tag totals
+    pending_transactions_list = add_tag_totals(
+        transaction_outs(pending_transactions), tags
+    )
 
     # Sort Pending Transactions
     pending_transactions_list = sort_transaction_list(pending_transactions_list)
@@ -89,31 +81,6 @@ def get_transactions_by_tag(
         cleared_transactions_list + pending_transactions_list
     )
 
-    # Add tags to transactions
-    if not totals_only:
-        for transaction in sorted_transactions_list:
-            transaction_details = TransactionDetail.objects.filter(
-                transaction_id=transaction.id
-            )
-            details = list(transaction_details)
-            tag_list = list(
-                transaction_details.annotate(
-                    parent_tag=F("tag__parent__tag_name"),
-                    child_tag=F("tag__child__tag_name"),
-                    tag_name_combined=Case(
-                        When(child_tag__isnull=True, then=F("parent_tag")),
-                        default=Concat(
-                            F("parent_tag"), Value(" / "), F("child_tag")
-                        ),
-                        output_field=CharField(),
-                    ),
-                )
-                .exclude(tag_name_combined__isnull=True)
-                .values_list("tag_name_combined", flat=True)
-            )
-            transaction.tags = tag_list
-            transaction.details = details
-
     if cleared_only:
         return cleared_transactions_list
     else:
@@ -27,10 +27,12 @@ from django.db.models.functions import Abs
 from decimal import Decimal
 from typing import List, Optional
 from transactions.api.schemas.transaction import TransactionOut
+from core.cache import reference
 
 
 def annotate_transaction_display_info(
     transactions: QuerySet[Transaction],
+    account_names: bool = True,
 ) -> QuerySet[Transaction]:
     """
     `annotate_transaction_display_info` annotates a given transaction queryset
@@ -38,6 +40,9 @@ def annotate_transaction_display_info(
 
     Args:
         transactions (QuerySet[Transaction]): A queryset of Transaction objects.
+        account_names (bool): Annotate account names with subqueries. Callers
+            that materialize the rows can pass False and use
+            `add_account_names_to_transactions` instead.
 
     Returns:
         (QuerySet[Transaction]): An annotated queryset of Transaction objects.
@@ -46,6 +51,9 @@ def annotate_transaction_display_info(
     if not isinstance(transactions, QuerySet):
         raise TypeError("Expected a QuerySet")
 
+    if not account_names:
+        return _annotate_attachment_count(transactions)
+
     # Subqueries
     source_account_name = Account.objects.filter(
         id=OuterRef("source_account_id")
@@ -79,6 +87,10 @@ def annotate_transaction_display_info(
             output_field=CharField(),
         )
     )
+    return _annotate_attachment_count(all_transactions)
+
+
+def _annotate_attachment_count(transactions: QuerySet) -> QuerySet:
     if transactions.model is Transaction:
         image_subquery = (
             TransactionImage.objects.filter(transaction=OuterRef("pk"))
@@ -86,16 +98,38 @@ def annotate_transaction_display_info(
             .annotate(c=Count("id"))
             .values("c")
         )
-        all_transactions = all_transactions.annotate(
+        return transactions.annotate(
             attachment_count=Coalesce(
                 Subquery(image_subquery), Value(0, output_field=IntegerField())
             )
         )
-    else:
-        all_transactions = all_transactions.annotate(
-            attachment_count=Value(0, output_field=IntegerField())
+    return transactions.annotate(
+        attachment_count=Value(0, output_field=IntegerField())
+    )
+
+
+def add_account_names_to_transactions(transactions):
+    """
+    Sets source_name, destination_name and pretty_account on already-loaded
+    transactions from the in-process account name table, the list counterpart
+    of the subqueries in `annotate_transaction_display_info`. Expects
+    transaction_type to be select_related.
+    """
+    for transaction in transactions:
+        transaction.source_name = reference.account_name(
+            transaction.source_account_id
         )
-    return all_transactions
+        transaction.destination_name = reference.account_name(
+            transaction.destination_account_id
+        )
+        transaction_type = transaction.transaction_type
+        if transaction_type and transaction_type.slug == "transfer":
+            transaction.pretty_account = (
+                f"{transaction.source_name} => {transaction.destination_name}"
+            )
+        else:
+            transaction.pretty_account = transaction.source_name
+    return transactions
 
 
 def annotate_transaction_total(
@@ -288,17 +322,6 @@ def add_tags_to_transactions(
             "tag__child__tag_type",
             "tag__tag_type",
         )
-        .annotate(
-            parent_tag=F("tag__parent__tag_name"),
-            child_tag=F("tag__child__tag_name"),
-            tag_name_combined=Case(
-                When(child_tag__isnull=True, then=F("parent_tag")),
-                default=Concat(
-                    F("parent_tag"), Value(" / "), F("child_tag")
-                ),
-                output_field=CharField(),
-            ),
-        )
     )
 
     details_by_txn: dict = {}
@@ -306,8 +329,9 @@ def add_tags_to_transactions(
     for detail in all_details:
         tid = detail.transaction_id
         details_by_txn.setdefault(tid, []).append(detail)
-        if detail.tag_name_combined:
-            tags_by_txn.setdefault(tid, []).append(detail.tag_name_combined)
+        tag_name = reference.tag_display_name(detail.tag_id)
+        if tag_name:
+            tags_by_txn.setdefault(tid, []).append(tag_name)
 
     for transaction in transaction_list:
         transaction.tags = tags_by_txn.get(transaction.id, [])
@@ -426,24 +450,28 @@ def add_tag_totals(
     transactions: List[TransactionOut], tags: List[int]
 ) -> List[TransactionOut]:
     """
-    The function `add_balances_to_transaction_list` adds balances
-    to a list of transactions and returns the list
+    The function `add_tag_totals` sets each transaction's tag_total to the sum
+    of its details for tags, summed for all transactions in one query.
 
     Args:
         transactions (List): A list of transactions to update.
-        start_balance (Decimal): The starting balance.
+        tags (List[int]): The tag ids to total.
 
     Returns:
-        transactions: List of transactions with balances
+        transactions: List of transactions with tag totals
     """
-    for transaction in transactions:
-        transaction_details = TransactionDetail.objects.filter(
-            transaction_id=transaction.id
+    if not transactions:
+        return transactions
+    totals = dict(
+        TransactionDetail.objects.filter(
+            transaction_id__in={transaction.id for transaction in transactions},
+            tag_id__in=tags,
         )
-        transaction_details = transaction_details.filter(tag_id__in=tags)
-        tag_sum = 0
-        for detail in transaction_details:
-            tag_sum += detail.detail_amt
-        transaction.tag_total = tag_sum
+        .values("transaction_id")
+        .annotate(total=Sum("detail_amt"))
+        .values_list("transaction_id", "total")
+    )
+    for transaction in transactions:
+        transaction.tag_total = totals.get(transaction.id, 0)
 
     return transactions
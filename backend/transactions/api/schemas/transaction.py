@@ -89,6 +89,31 @@ class TransactionOut(Schema):
     model_config = ConfigDict(from_attributes=True)
 
 
+# The class TransactionSlimOut is a compact TransactionOut: status, type and
+# paycheck as ids and no details, for clients that resolve them locally.
+class TransactionSlimOut(Schema):
+    id: int
+    transaction_date: date
+    total_amount: AmountDecimal
+    status_id: Optional[int] = None
+    memo: Optional[str] = None
+    description: str
+    edit_date: date
+    add_date: date
+    transaction_type_id: Optional[int] = None
+    paycheck_id: Optional[int] = None
+    balance: Optional[AmountDecimal] = None
+    pretty_account: Optional[str] = None
+    tags: Optional[List[Optional[str]]] = []
+    pretty_total: Optional[AmountDecimal] = None
+    source_account_id: Optional[int] = None
+    destination_account_id: Optional[int] = None
+    checkNumber: Optional[int] = None
+    reminder_id: Optional[int] = None
+    simulated: Optional[bool] = False
+    attachment_count: Optional[int] = 0
+
+
 from transactions.api.schemas.transaction_detail import (  # noqa: E402
     TransactionDetailOut,  # noqa: E402
 )  # noqa: E402
@@ -114,6 +139,14 @@ class PaginatedTransactions(Schema):
     model_config = ConfigDict(from_attributes=True)
 
 
+# The class PaginatedSlimTransactions is a schema for paginated slim transactions.
+class PaginatedSlimTransactions(Schema):
+    transactions: List[TransactionSlimOut]
+    current_page: int
+    total_pages: int
+    total_records: int
+
+
 class TransactionQuery(Schema):
     view_type: Optional[int] = 2
     account: Optional[int] = None
@@ -128,3 +161,4 @@ class TransactionQuery(Schema):
     tag_id: Optional[int] = None
     date_from: Optional[date] = None
     date_to: Optional[date] = None
+    slim: Optional[bool] = False
@@ -7,5 +7,10 @@ class TransactionImageOut(Schema):
     id: int
     url: Optional[str] = None
     filename: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    thumbnail_width: Optional[int] = None
+    thumbnail_height: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
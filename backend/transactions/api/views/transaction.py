@@ -1,14 +1,15 @@
 from ninja import Router, Query
+from ninja.decorators import decorate_view
 from ninja.errors import HttpError
-from transactions.models import Transaction, TransactionDetail, TransactionStatus
+from transactions.models import Transaction
 from accounts.models import Account
-from tags.models import Tag
 from transactions.api.schemas.transaction import (
     TransactionIn,
     TransactionBatchIn,
     TransactionList,
     TransactionOut,
     PaginatedTransactions,
+    PaginatedSlimTransactions,
     MultiTranscationDate,
     TransactionQuery,
     ForecastTransactionList,
@@ -32,6 +33,8 @@ from transactions.services.transaction import (
     create_transactions_service,
     update_transaction_service,
 )
+from transactions.services.transaction_rows import slim_transaction, transaction_outs
+from transactions.api.dependencies.transaction_utilities import add_tags_to_transactions
 from transactions.services.forecast_conversion import (
     convert_forecast_transaction,
     ForecastTransactionNotFound,
@@ -42,14 +45,19 @@ from utils.dates import (
 )
 from transactions.api.dependencies.sort_transactions import sort_transactions
 from datetime import timedelta
+from typing import Union
 from django.core.paginator import Paginator
 from transactions.api.dependencies.get_transactions_by_account import (
     get_transactions_by_account,
 )
-from core.cache.helpers import delete_pattern
-from core.cache.keys import (
-    account_all,
+from transactions.services.bulk_mutation import (
+    invalidate_accounts,
+    toggle_cleared,
+    set_transaction_date,
+    delete_transactions,
 )
+from core.cache import reference, versions
+from core.etag import conditional
 import logging
 from administration.api.dependencies.auth import FullAccessAuth
 
@@ -61,16 +69,16 @@ task_logger = logging.getLogger("task")
 transaction_router = Router(tags=["Transactions"])
 
 
+def _list_scope(request, params):
+    # An account register only moves with its own account's version.
+    if request.GET.get("view_type") == "1":
+        return [versions.account(request.GET.get("account"))]
+    return ["transactions", "reminders"]
+
+
 def _invalidate_accounts(*account_ids):
     """Invalidate cache for each account and its parent (if any)."""
-    parent_ids = set(
-        Account.objects.filter(id__in=account_ids, parent_account_id__isnull=False)
-        .values_list('parent_account_id', flat=True)
-    )
-    for account_id in account_ids:
-        delete_pattern(account_all(account_id))
-    for parent_id in parent_ids:
-        delete_pattern(account_all(parent_id))
+    invalidate_accounts(account_ids)
 
 
 def _assert_not_parent(*account_ids):
@@ -177,18 +185,7 @@ def multiedit_transactions(request, payload: MultiTranscationDate):
         HttpError: Raises an HTTP error if there's an exception during processing.
     """
     try:
-        edit_date = get_todays_date_timezone_adjusted()
-        transactions = Transaction.objects.filter(id__in=payload.transaction_ids)
-
-        account_ids = set()
-        for t in transactions:
-            account_ids.add(t.source_account_id)
-            if t.destination_account_id:
-                account_ids.add(t.destination_account_id)
-
-        transactions.update(transaction_date=payload.new_date, edit_date=edit_date)
-
-        _invalidate_accounts(*account_ids)
+        set_transaction_date(payload.transaction_ids, payload.new_date)
 
         api_logger.info(f"Transaction dates updated: #{payload.transaction_ids}")
 
@@ -217,37 +214,8 @@ def clear_transaction(request, payload: TransactionList):
         HttpError: Raises an HTTP error if there's an exception during processing.
     """
     try:
-        # Fetch all relevant transactions at once
-        transactions = Transaction.objects.filter(id__in=payload.transactions)
-
-        # Prepare a list to hold transactions that need to be updated
-        transactions_to_update = []
-        accounts_effected = []
-
-        pending_id = TransactionStatus.objects.values_list('id', flat=True).get(slug='pending')
-        cleared_id = TransactionStatus.objects.values_list('id', flat=True).get(slug='cleared')
-        for transaction in transactions:
-            accounts_effected.append(transaction.source_account.id)
-            if transaction.destination_account:
-                accounts_effected.append(transaction.destination_account.id)
-            if transaction.status_id == cleared_id:
-                transaction.status_id = pending_id
-            elif transaction.status_id == pending_id:
-                transaction.status_id = cleared_id
-
-            transaction.edit_date = get_todays_date_timezone_adjusted()
-            transactions_to_update.append(transaction)
-
-            # Log the transaction
-            api_logger.info(f"Transaction cleared: #{transaction.id}")
-
-        # Perform a bulk update on the modified transactions
-        if transactions_to_update:
-            Transaction.objects.bulk_update(
-                transactions_to_update, ["status_id", "edit_date"]
-            )
-        unique_accounts = list(set(accounts_effected))
-        _invalidate_accounts(*unique_accounts)
+        toggle_cleared(payload.transactions)
+        api_logger.info(f"Transactions cleared: #{payload.transactions}")
         return {"success": True}
     except Exception as e:
         # Log other types of exceptions
@@ -308,9 +276,7 @@ def delete_transaction(request, payload: TransactionList):
     """
 
     try:
-        transactions = list(Transaction.objects.filter(id__in=payload.transactions))
-        for t in transactions:
-            t.delete()
+        delete_transactions(payload.transactions)
         for transaction in payload.transactions:
             api_logger.info(f"Transaction deleted : #{transaction}")
         return {"success": True}
@@ -405,7 +371,14 @@ def update_transaction(request, transaction_id: int, payload: TransactionIn):
         raise HttpError(500, f"Record update error: {str(e)}")
 
 
-@transaction_router.get("/list", response=PaginatedTransactions)
+@transaction_router.get(
+    "/list", response=Union[PaginatedTransactions, PaginatedSlimTransactions]
+)
+@decorate_view(
+    conditional(
+        versions.REFERENCE, versions.model("transactions.transactionimage"), scope=_list_scope
+    )
+)
 def list_transactions(request, query: TransactionQuery = Query(...)):
     """
     The function `list_transactions` retrieves a list of transactions,
@@ -423,6 +396,8 @@ def list_transactions(request, query: TransactionQuery = Query(...)):
         maxdays (int): Optional days in the past if not a forecast, days in the future
             if a forecast, default is 14.
         forecast (bool): Optional boolean wether this request is a forecast or not.
+        slim (bool): Optional, for view_type 1 return rows with status, type and
+            paycheck ids instead of nested objects, and no details.
 
     Returns:
         TransactionOut: a list of transaction objects
@@ -463,19 +438,11 @@ def list_transactions(request, query: TransactionQuery = Query(...)):
                     if t.transaction_type and t.transaction_type.id == query.transaction_type_id
                 ]
             if query.tag_id:
-                try:
-                    tag = Tag.objects.select_related("parent", "child").get(id=query.tag_id)
-                    tag_display = (
-                        f"{tag.parent.tag_name} / {tag.child.tag_name}"
-                        if tag.child
-                        else tag.parent.tag_name
-                    )
-                    all_transactions_list = [
-                        t for t in all_transactions_list
-                        if tag_display in (t.tags or [])
-                    ]
-                except Tag.DoesNotExist:
-                    all_transactions_list = []
+                tag_display = reference.tag_display_name(query.tag_id)
+                all_transactions_list = [
+                    t for t in all_transactions_list
+                    if tag_display and tag_display in (t.tags or [])
+                ]
             if query.date_from:
                 all_transactions_list = [
                     t for t in all_transactions_list
@@ -511,6 +478,13 @@ def list_transactions(request, query: TransactionQuery = Query(...)):
             else:
                 qs = all_transactions_list
             total_records = len(all_transactions_list)
+            if query.slim:
+                return PaginatedSlimTransactions(
+                    transactions=[slim_transaction(t) for t in qs],
+                    current_page=query.page,
+                    total_pages=total_pages,
+                    total_records=total_records,
+                )
             paginated_obj = PaginatedTransactions(
                 transactions=qs,
                 current_page=query.page,
@@ -549,7 +523,7 @@ def list_transactions(request, query: TransactionQuery = Query(...)):
                 )
 
             # Set order of transactions
-            qs = sort_transactions(qs)
+            qs = sort_transactions(qs).select_related("paycheck")
             # Return only 10 records for upcoming transactions
             if query.view_type == 2:
                 qs = qs[:10]
@@ -603,30 +577,8 @@ def list_transactions(request, query: TransactionQuery = Query(...)):
                 )
             )
 
-            # Add tags
-            for transaction in qs:
-                transaction_details = TransactionDetail.objects.filter(
-                    transaction_id=transaction.id
-                )
-                details = list(transaction_details)
-                tags = list(
-                    transaction_details.annotate(
-                        parent_tag=F("tag__parent__tag_name"),
-                        child_tag=F("tag__child__tag_name"),
-                        tag_name_combined=Case(
-                            When(child_tag__isnull=True, then=F("parent_tag")),
-                            default=Concat(
-                                F("parent_tag"), Value(" / "), F("child_tag")
-                            ),
-                            output_field=CharField(),
-                        ),
-                    )
-                    .exclude(tag_name_combined__isnull=True)
-                    .values_list("tag_name_combined", flat=True)
-                )
-                transaction.tags = tags
-                transaction.details = details
-            query = list(qs)
+            # Add tags, for all rows at once
+            query = transaction_outs(add_tags_to_transactions(qs))
             paginated_obj = PaginatedTransactions(
                 transactions=query,
                 current_page=1,
@@ -9,6 +9,7 @@ import logging
 from administration.api.dependencies.auth import FullAccessAuth
 from transactions.models import Transaction, TransactionImage
 from transactions.api.schemas.transaction_image import TransactionImageOut
+from transactions.services.attachments import store_transaction_image
 
 api_logger = logging.getLogger("api")
 error_logger = logging.getLogger("error")
@@ -22,7 +23,9 @@ transaction_image_router = Router(tags=["Transaction Attachments"])
 )
 def list_transaction_images(request, transaction_id: int):
     try:
-        images = TransactionImage.objects.filter(transaction_id=transaction_id)
+        images = TransactionImage.objects.filter(
+            transaction_id=transaction_id
+        ).order_by("id")
         api_logger.debug(f"Attachments listed for transaction #{transaction_id}")
         return images
     except Exception as e:
@@ -42,7 +45,7 @@ def upload_transaction_image(
 ):
     try:
         transaction = get_object_or_404(Transaction, id=transaction_id)
-        image = TransactionImage.objects.create(transaction=transaction, image=file)
+        image = store_transaction_image(transaction, file)
         api_logger.info(f"Attachment uploaded for transaction #{transaction_id}")
         return image
     except Http404:
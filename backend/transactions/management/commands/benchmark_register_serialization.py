@@ -0,0 +1,143 @@
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from ninja.renderers import JSONRenderer
+
+from backend.renderers import ORJSONRenderer
+from tags.models import Tag
+from transactions.api.schemas.transaction import (
+    PaginatedSlimTransactions,
+    PaginatedTransactions,
+    TransactionOut,
+)
+from transactions.models import (
+    ReminderCacheTransaction,
+    ReminderCacheTransactionDetail,
+    Transaction,
+    TransactionDetail,
+    TransactionStatus,
+    TransactionType,
+)
+from transactions.services.transaction_rows import slim_transaction, transaction_outs
+
+
+class Command(BaseCommand):
+    help = (
+        "Time building and rendering a register of synthetic rows: validated "
+        "TransactionOut rows and the default JSON renderer against constructed "
+        "rows, the orjson renderer and slim rows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000, help="Register rows to build")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Timing repetitions per step (best run is reported)",
+        )
+
+    def handle(self, *args, **options):
+        status = TransactionStatus.objects.first()
+        transaction_type = TransactionType.objects.first()
+        if status is None or transaction_type is None:
+            raise CommandError("At least one transaction status and type are required")
+        tag = Tag.objects.select_related("parent", "child", "tag_type").first()
+        rows = max(options["rows"], 1)
+        repeat = max(options["repeat"], 1)
+
+        # Every fourth row is a reminder projection, shown with a negated id.
+        real = _synthetic_rows(Transaction, rows - rows // 4, status, transaction_type, tag)
+        simulated = _synthetic_rows(ReminderCacheTransaction, rows // 4, status, transaction_type, tag)
+
+        def legacy_rows():
+            return [TransactionOut.from_orm(obj) for obj in real] + [
+                TransactionOut.from_orm(obj).model_copy(update={"id": -obj.id, "simulated": True})
+                for obj in simulated
+            ]
+
+        def constructed_rows():
+            return transaction_outs(real) + transaction_outs(simulated, "r")
+
+        built, legacy_ms = _best(repeat, legacy_rows)
+        built, construct_ms = _best(repeat, constructed_rows)
+
+        def page(transactions, schema=PaginatedTransactions):
+            return schema(
+                transactions=transactions, current_page=1, total_pages=1, total_records=len(transactions)
+            ).model_dump()
+
+        body, dump_ms = _best(repeat, lambda: page(built))
+        default_json, default_ms = _best(repeat, lambda: JSONRenderer().render(None, body, response_status=200))
+        compact_json, orjson_ms = _best(repeat, lambda: ORJSONRenderer().render(None, body, response_status=200))
+        slim_body, slim_dump_ms = _best(
+            repeat, lambda: page([slim_transaction(t) for t in built], PaginatedSlimTransactions)
+        )
+        slim_json, slim_ms = _best(repeat, lambda: ORJSONRenderer().render(None, slim_body, response_status=200))
+
+        self.stdout.write(f"{rows} rows, best of {repeat}")
+        self.stdout.write(f"{'step':<34} {'ms':>10} {'bytes':>12}")
+        for label, ms, size in [
+            ("build: from_orm + model_copy", legacy_ms, None),
+            ("build: constructed", construct_ms, None),
+            ("model_dump", dump_ms, None),
+            ("render: default JSON", default_ms, len(default_json)),
+            ("render: orjson", orjson_ms, len(compact_json)),
+            ("slim: convert + model_dump", slim_dump_ms, None),
+            ("slim: render orjson", slim_ms, len(slim_json)),
+        ]:
+            self.stdout.write(f"{label:<34} {ms:>10.1f} {'' if size is None else size:>12}")
+
+
+def _synthetic_rows(model, count, status, transaction_type, tag):
+    """Unsaved, annotated rows shaped like the ones a register queryset yields."""
+    rows = []
+    balance = Decimal("1000.00")
+    start = date(2020, 1, 1)
+    extra = {"reminder_id": 1} if model is ReminderCacheTransaction else {}
+    detail_model = (
+        ReminderCacheTransactionDetail if model is ReminderCacheTransaction else TransactionDetail
+    )
+    for n in range(1, count + 1):
+        amount = Decimal(n % 500) + Decimal("0.25")
+        columns = dict(
+            id=n,
+            transaction_date=start + timedelta(days=n % 2000),
+            total_amount=amount,
+            status=status,
+            transaction_type=transaction_type,
+            description=f"Synthetic row {n}",
+            memo="",
+            source_account_id=1,
+            **extra,
+        )
+        row = model(**columns)
+        balance -= amount
+        row.pretty_total = -amount
+        row.balance = balance
+        row.pretty_account = "Checking"
+        row.tags = []
+        row.details = []
+        if tag is not None:
+            row.tags = [tag.tag_name]
+            row.details = [
+                # Details are fetched with their own, unannotated transaction.
+                detail_model(
+                    id=n, transaction=model(**columns), detail_amt=amount, tag=tag, full_toggle=True
+                )
+            ]
+        rows.append(row)
+    return rows
+
+
+def _best(repeat, fn):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from transactions.models import TransactionImage
+from transactions.services.attachments import (
+    deduplicate,
+    ensure_content_hash,
+    generate_thumbnail,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Hash, deduplicate and generate thumbnails for transaction attachments "
+        "stored before the thumbnail pipeline existed"
+    )
+
+    def handle(self, *args, **options):
+        images = TransactionImage.objects.filter(
+            Q(content_hash="") | Q(thumbnail="")
+        ).order_by("id")
+        merged = thumbnails = missing = unpreviewable = 0
+        for image in images.iterator():
+            # An earlier row in this run may already have shared its
+            # thumbnail with this one.
+            image.refresh_from_db()
+            if not ensure_content_hash(image):
+                missing += 1
+                continue
+            merged += deduplicate(image)
+            if generate_thumbnail(image):
+                thumbnails += 1
+            else:
+                unpreviewable += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{thumbnails} with thumbnails, {merged} duplicates merged, "
+                f"{unpreviewable} not previewable, {missing} missing files"
+            )
+        )
@@ -0,0 +1,67 @@
+import pickle
+import time
+
+from django.core.management.base import BaseCommand
+from accounts.models import Account
+from transactions.services.register_cache import decode_register, encode_register
+from transactions.services.transactions_and_balances import (
+    build_account_register,
+    build_parent_account_register,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the cached size and (de)serialization time of each account's "
+        "register as pickled TransactionOut lists and in the compact format"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timing repetitions per account (best run is reported)",
+        )
+
+    def handle(self, *args, **options):
+        repeat = max(options["repeat"], 1)
+        self.stdout.write(
+            f"{'account':>8} {'rows':>6} {'pickle B':>10} {'compact B':>10} "
+            f"{'pickle ms':>10} {'unpickle ms':>12} {'encode ms':>10} {'decode ms':>10}"
+        )
+        totals = [0, 0]
+        for account in Account.objects.all().order_by("id"):
+            if account.child_accounts.exists():
+                register = build_parent_account_register(None, account.id, False)
+            else:
+                register = build_account_register(None, account.id, False)
+            if register is None:
+                continue
+            cleared, open_transactions, _ = register
+            legacy = (cleared + open_transactions, 0)
+
+            pickled, pickle_ms = _best(repeat, lambda: pickle.dumps(legacy))
+            _, unpickle_ms = _best(repeat, lambda: pickle.loads(pickled))
+            blob, encode_ms = _best(repeat, lambda: encode_register(*register))
+            _, decode_ms = _best(repeat, lambda: decode_register(blob, None))
+
+            totals[0] += len(pickled)
+            totals[1] += len(blob)
+            self.stdout.write(
+                f"{account.id:>8} {len(legacy[0]):>6} {len(pickled):>10} "
+                f"{len(blob):>10} {pickle_ms:>10.2f} {unpickle_ms:>12.2f} "
+                f"{encode_ms:>10.2f} {decode_ms:>10.2f}"
+            )
+        self.stdout.write(f"Total bytes: pickle {totals[0]}, compact {totals[1]}")
+
+
+def _best(repeat, fn):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
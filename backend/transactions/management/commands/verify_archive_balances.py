@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from transactions.services.archive import verify_archive_balances
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare each account's archive balance with a full recompute from "
+        "its archived transactions"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Overwrite mismatched archive balances with the recomputed ones",
+        )
+
+    def handle(self, *args, **options):
+        mismatches = verify_archive_balances(repair=options["repair"])
+        for account_id, (stored, recomputed) in sorted(mismatches.items()):
+            self.stdout.write(
+                f"Account {account_id}: stored {stored}, recomputed {recomputed}"
+            )
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All archive balances match"))
+        elif options["repair"]:
+            self.stdout.write(self.style.SUCCESS(f"{len(mismatches)} repaired"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(mismatches)} mismatched"))
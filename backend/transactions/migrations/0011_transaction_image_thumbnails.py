@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-19 16:54
+
+import transactions.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0010_transaction_types_slug_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transactionimage',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='transactionimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='transactionimage',
+            name='thumbnail',
+            field=models.FileField(blank=True, default='', upload_to=transactions.models.transaction_thumbnail_name),
+        ),
+        migrations.AddField(
+            model_name='transactionimage',
+            name='thumbnail_height',
+            field=models.PositiveIntegerField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='transactionimage',
+            name='thumbnail_width',
+            field=models.PositiveIntegerField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='transactionimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, default=None, null=True),
+        ),
+    ]
@@ -21,6 +21,10 @@ def transaction_image_name(instance, filename):
     return f"tran_images/{timestamp}-{filename}"
 
 
+def transaction_thumbnail_name(instance, filename):
+    return f"tran_images/thumbs/{filename}"
+
+
 def current_date():
     today = timezone.now()
     tz_timezone = pytz.timezone(os.environ.get("TIMEZONE"))
@@ -183,17 +187,42 @@ class TransactionImage(models.Model):
     Model representing a transaction image.
 
     Fields:
-    - image (FileField): The uploaded file.
+    - image (FileField): The uploaded file. Identical uploads share one file.
     - transaction (ForeignKey): A reference to the Transaction model.
+    - content_hash (CharField): SHA-256 of the uploaded file, used to
+    deduplicate identical uploads.
+    - thumbnail (FileField): Downscaled, EXIF-free preview generated in the
+    background; empty until generated or when the file is not an image.
+    - width, height (PositiveIntegerField): Dimensions of the original image.
+    - thumbnail_width, thumbnail_height (PositiveIntegerField): Dimensions of
+    the thumbnail.
     """
 
     image = models.FileField(upload_to=transaction_image_name)
     transaction = models.ForeignKey(Transaction, on_delete=models.CASCADE)
+    content_hash = models.CharField(
+        max_length=64, blank=True, default="", db_index=True
+    )
+    thumbnail = models.FileField(
+        upload_to=transaction_thumbnail_name, blank=True, default=""
+    )
+    width = models.PositiveIntegerField(null=True, blank=True, default=None)
+    height = models.PositiveIntegerField(null=True, blank=True, default=None)
+    thumbnail_width = models.PositiveIntegerField(
+        null=True, blank=True, default=None
+    )
+    thumbnail_height = models.PositiveIntegerField(
+        null=True, blank=True, default=None
+    )
 
     @property
     def url(self):
         return self.image.url if self.image else None
 
+    @property
+    def thumbnail_url(self):
+        return self.thumbnail.url if self.thumbnail else None
+
     @property
     def filename(self):
         return os.path.basename(self.image.name) if self.image else None
@@ -0,0 +1,130 @@
+"""
+Archiving of old transactions into each account's archive_balance.
+
+An account's archive_balance is the signed sum of its archived transactions,
+seen from the account: income adds, expenses subtract, and a transfer
+subtracts from its source and adds to its destination. Source and
+destination sides are summed separately so a transfer is never conflated
+between its two accounts.
+
+The nightly run only sums the rows it is about to archive and adds that delta
+to the affected accounts in one UPDATE, so its cost follows the number of
+newly archived rows rather than the whole archive. The account save
+receivers are not involved; touched accounts are refreshed once afterwards.
+Editing an archived transaction is not reflected in the running balance;
+verify_archive_balances recomputes every balance from scratch to catch and
+repair such drift.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Tuple
+
+from django.db import transaction as db_transaction
+from django.db.models import Case, DecimalField, F, QuerySet, Sum, Value, When
+from django.db.models.functions import Abs, Coalesce
+
+from accounts.models import Account
+from core.cache import reference
+from transactions.models import Transaction
+from transactions.services.bulk_mutation import refresh_accounts
+
+_AMOUNT = DecimalField(max_digits=12, decimal_places=2)
+
+
+def _signed_amount(transfer_sign: int) -> Case:
+    amount = Abs(F("total_amount"))
+    return Case(
+        When(transaction_type__slug="income", then=amount),
+        When(transaction_type__slug="expense", then=-amount),
+        When(
+            transaction_type__slug="transfer",
+            then=amount if transfer_sign > 0 else -amount,
+        ),
+        default=Value(Decimal(0)),
+        output_field=_AMOUNT,
+    )
+
+
+def signed_totals(transactions: QuerySet) -> Dict[int, Decimal]:
+    """
+    Returns account id -> signed sum of transactions for that account, with
+    one grouped query per side (source and destination).
+    """
+    totals = defaultdict(Decimal)
+    for field, transfer_sign in (
+        ("source_account_id", -1),
+        ("destination_account_id", 1),
+    ):
+        rows = (
+            transactions.filter(**{f"{field}__isnull": False})
+            .values(field)
+            .annotate(total=Sum(_signed_amount(transfer_sign)))
+            .order_by()
+            .values_list(field, "total")
+        )
+        for account_id, total in rows:
+            totals[account_id] += total or Decimal(0)
+    return dict(totals)
+
+
+def _apply(balances: Dict[int, Decimal], relative: bool):
+    """Writes balances (or adds them, when relative) in one UPDATE."""
+    if not balances:
+        return
+    base = Coalesce(F("archive_balance"), Value(Decimal(0)), output_field=_AMOUNT)
+    value = Case(
+        *(When(id=account_id, then=Value(amount)) for account_id, amount in balances.items()),
+        output_field=_AMOUNT,
+    )
+    Account.objects.filter(id__in=list(balances)).update(
+        archive_balance=base + value if relative else value
+    )
+
+
+def archive_through(cutoff_date: date) -> Dict[int, Decimal]:
+    """
+    Archives every transaction dated on or before cutoff_date that is not
+    archived yet and adds its amount to its accounts' archive_balance.
+
+    Returns:
+        dict: account id -> amount added, for the accounts that changed.
+    """
+    archived_status_id = reference.status_id("archived")
+    with db_transaction.atomic():
+        newly_archived = Transaction.objects.filter(
+            transaction_date__lte=cutoff_date
+        ).exclude(status_id=archived_status_id)
+        deltas = signed_totals(newly_archived)
+        newly_archived.update(status_id=archived_status_id)
+        _apply(deltas, relative=True)
+    if deltas:
+        refresh_accounts(deltas)
+    return deltas
+
+
+def verify_archive_balances(repair: bool = False) -> Dict[int, Tuple[Decimal, Decimal]]:
+    """
+    Recomputes every account's archive_balance from its archived transactions
+    and compares it with the stored value.
+
+    Args:
+        repair (bool): Overwrite the mismatched balances with the recomputed
+            ones.
+
+    Returns:
+        dict: account id -> (stored, recomputed) for the mismatched accounts.
+    """
+    expected = signed_totals(
+        Transaction.objects.filter(status_id=reference.status_id("archived"))
+    )
+    mismatches = {}
+    for account_id, stored in Account.objects.values_list("id", "archive_balance"):
+        stored = stored if stored is not None else Decimal(0)
+        recomputed = expected.get(account_id, Decimal(0))
+        if stored != recomputed:
+            mismatches[account_id] = (stored, recomputed)
+    if repair and mismatches:
+        _apply({i: recomputed for i, (_, recomputed) in mismatches.items()}, relative=False)
+        refresh_accounts(mismatches)
+    return mismatches
@@ -0,0 +1,205 @@
+"""
+Storage and preview derivatives for transaction attachments.
+
+Uploads are hashed while they are read. An upload identical to an attachment
+already on the same transaction returns that attachment, and one identical to
+an attachment elsewhere reuses its stored file and thumbnail instead of
+writing another copy. Thumbnails are generated on the qcluster after the
+upload commits: the image is decoded at reduced scale where the format allows
+it, rotated upright from its EXIF orientation and re-encoded without any
+metadata, so location and camera data never reach the previews.
+"""
+import hashlib
+import logging
+import os
+from io import BytesIO
+from typing import Optional, Tuple
+
+from django.core.files.base import ContentFile
+from django.db import transaction as db_transaction
+from django_q.tasks import async_task
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from transactions.models import Transaction, TransactionImage
+
+error_logger = logging.getLogger("error")
+task_logger = logging.getLogger("task")
+
+# Longest side of a thumbnail, in pixels.
+THUMBNAIL_SIZE = 320
+THUMBNAIL_QUALITY = 80
+_EXIF_ORIENTATION = 0x0112
+# Orientations that rotate by 90 degrees, swapping width and height.
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+_THUMBNAIL_FORMAT, _THUMBNAIL_EXTENSION = (
+    ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+)
+
+
+def hash_file(file) -> str:
+    """Returns the SHA-256 hex digest of a Django File, reading it in chunks."""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def _enqueue_thumbnail(image_id: int):
+    db_transaction.on_commit(
+        lambda: async_task(
+            "transactions.tasks.generate_transaction_image_thumbnail", image_id
+        )
+    )
+
+
+def _copy_derivatives(target: TransactionImage, source: TransactionImage):
+    target.image.name = source.image.name
+    target.thumbnail.name = source.thumbnail.name
+    target.width, target.height = source.width, source.height
+    target.thumbnail_width = source.thumbnail_width
+    target.thumbnail_height = source.thumbnail_height
+
+
+def store_transaction_image(transaction: Transaction, file) -> TransactionImage:
+    """
+    Attaches an uploaded file to transaction, deduplicating by content hash,
+    and queues thumbnail generation when no thumbnail exists yet.
+
+    Returns:
+        TransactionImage: The new attachment, or the existing one when the
+            same file is already attached to this transaction.
+    """
+    content_hash = hash_file(file)
+    existing = TransactionImage.objects.filter(
+        transaction=transaction, content_hash=content_hash
+    ).first()
+    if existing is not None:
+        return existing
+
+    original = (
+        TransactionImage.objects.filter(content_hash=content_hash)
+        .order_by("id")
+        .first()
+    )
+    image = TransactionImage(transaction=transaction, content_hash=content_hash)
+    if original is not None and original.image.storage.exists(original.image.name):
+        _copy_derivatives(image, original)
+    else:
+        image.image = file
+    image.save()
+    if not image.thumbnail:
+        _enqueue_thumbnail(image.id)
+    return image
+
+
+def file_is_shared(name: str, field: str = "image") -> bool:
+    """Returns whether any attachment still references the stored file name."""
+    return bool(name) and TransactionImage.objects.filter(**{field: name}).exists()
+
+
+def _render_thumbnail(file) -> Optional[Tuple[bytes, Tuple[int, int], Tuple[int, int]]]:
+    """
+    Returns (encoded thumbnail, original size, thumbnail size), or None when
+    the file is not an image Pillow can read.
+    """
+    try:
+        with Image.open(file) as img:
+            original_size = img.size
+            if img.getexif().get(_EXIF_ORIENTATION) in _ROTATED_ORIENTATIONS:
+                original_size = original_size[::-1]
+            # JPEG can decode straight to a fraction of its size; the result
+            # is still at least twice the thumbnail for a clean downscale.
+            img.draft("RGB", (THUMBNAIL_SIZE * 2, THUMBNAIL_SIZE * 2))
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
+            keep_alpha = _THUMBNAIL_FORMAT == "WEBP" and img.has_transparency_data
+            if img.mode != ("RGBA" if keep_alpha else "RGB"):
+                img = img.convert("RGBA" if keep_alpha else "RGB")
+            buffer = BytesIO()
+            # No exif= argument: the encoded thumbnail carries no metadata.
+            img.save(buffer, _THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY)
+            return buffer.getvalue(), original_size, img.size
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        task_logger.info(f"No thumbnail for {getattr(file, 'name', file)}: {e}")
+        return None
+
+
+def ensure_content_hash(image: TransactionImage) -> bool:
+    """
+    Hashes the stored file of image if it was uploaded before hashing.
+
+    Returns:
+        bool: Whether the stored file exists.
+    """
+    if not image.image or not image.image.storage.exists(image.image.name):
+        return False
+    if not image.content_hash:
+        with image.image.open("rb") as f:
+            image.content_hash = hash_file(f)
+        image.save(update_fields=["content_hash"])
+    return True
+
+
+def generate_thumbnail(image: TransactionImage) -> bool:
+    """
+    Generates the thumbnail of image (and its content hash, for rows stored
+    before hashing), then shares it with every attachment of the same file.
+
+    Returns:
+        bool: Whether a thumbnail now exists.
+    """
+    if not ensure_content_hash(image):
+        return False
+    if image.thumbnail:
+        return True
+
+    with image.image.open("rb") as f:
+        rendered = _render_thumbnail(f)
+    if rendered is None:
+        return False
+    data, (width, height), (thumb_width, thumb_height) = rendered
+    stem = os.path.splitext(os.path.basename(image.image.name))[0]
+    image.thumbnail.save(
+        f"{stem}.{_THUMBNAIL_EXTENSION}", ContentFile(data), save=False
+    )
+    # Every row of the same stored file shares the one thumbnail.
+    TransactionImage.objects.filter(image=image.image.name).update(
+        thumbnail=image.thumbnail.name,
+        width=width,
+        height=height,
+        thumbnail_width=thumb_width,
+        thumbnail_height=thumb_height,
+    )
+    return True
+
+
+def deduplicate(image: TransactionImage) -> bool:
+    """
+    Points image at the oldest stored copy of the same content and removes
+    its own file when nothing else references it. Used to merge duplicates
+    uploaded before uploads were hashed.
+
+    Returns:
+        bool: Whether image was repointed.
+    """
+    if not image.content_hash:
+        return False
+    original = (
+        TransactionImage.objects.filter(content_hash=image.content_hash)
+        .exclude(image=image.image.name)
+        .order_by("id")
+        .first()
+    )
+    if original is None or original.id > image.id:
+        return False
+    old_image, old_thumbnail = image.image.name, image.thumbnail.name
+    _copy_derivatives(image, original)
+    image.save()
+    storage = image.image.storage
+    if not file_is_shared(old_image):
+        storage.delete(old_image)
+    if old_thumbnail and not file_is_shared(old_thumbnail, "thumbnail"):
+        storage.delete(old_thumbnail)
+    return True
@@ -0,0 +1,131 @@
+"""
+Set-based mutations for the multi-select transaction endpoints.
+
+`QuerySet.update()` skips the per-row post_save receivers, and deleting row by
+row runs them once per transaction, so these helpers apply the change in a few
+statements and then refresh each touched account exactly once: one cache
+invalidation per account and parent account, one credit-card forecast rebuild
+per account, one interest forecast rebuild per interest group and a single
+WebSocket broadcast.
+"""
+from datetime import date
+from typing import Iterable, List, Set
+from django.db import transaction as db_transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django_q.tasks import async_task
+from accounts.models import Account
+from core.broadcast import broadcast_invalidate
+from core.cache import reference
+from core.cache.helpers import delete_pattern
+from core.cache.keys import account_all
+from transactions.models import Transaction
+from transactions.signals import TRANSACTION_BROADCAST_KEYS, deferred_refresh
+from utils.dates import get_todays_date_timezone_adjusted
+
+
+def affected_account_ids(transaction_ids: Iterable[int]) -> Set[int]:
+    """Returns the source and destination account ids of the transactions."""
+    account_ids = set()
+    rows = Transaction.objects.filter(id__in=list(transaction_ids)).values_list(
+        "source_account_id", "destination_account_id"
+    )
+    for source_id, destination_id in rows:
+        account_ids.add(source_id)
+        account_ids.add(destination_id)
+    account_ids.discard(None)
+    return account_ids
+
+
+def invalidate_accounts(account_ids: Iterable[int]) -> dict:
+    """
+    Deletes the cached data of each account and of its parent account.
+
+    Returns:
+        dict: account id -> parent account id for the accounts that have one.
+    """
+    account_ids = {account_id for account_id in account_ids if account_id}
+    parents = dict(
+        Account.objects.filter(
+            id__in=account_ids, parent_account_id__isnull=False
+        ).values_list("id", "parent_account_id")
+    )
+    for account_id in account_ids | set(parents.values()):
+        delete_pattern(account_all(account_id))
+    return parents
+
+
+def refresh_accounts(account_ids: Iterable[int]):
+    """
+    Invalidates and rebuilds the forecasts of the given accounts once each,
+    then broadcasts a single invalidation for them.
+    """
+    account_ids = {account_id for account_id in account_ids if account_id}
+    if not account_ids:
+        return
+    parents = invalidate_accounts(account_ids)
+    for account_id in sorted(account_ids):
+        async_task("transactions.tasks.update_cc_forecast_cache", account_id)
+    # A child's interest forecast is computed for its whole parent group.
+    for account_id in sorted({parents.get(i, i) for i in account_ids}):
+        async_task("transactions.tasks.update_interest_forecast_cache", account_id)
+    broadcast_invalidate(
+        TRANSACTION_BROADCAST_KEYS,
+        account_ids=sorted(account_ids | set(parents.values())),
+    )
+
+
+def toggle_cleared(transaction_ids: List[int]) -> Set[int]:
+    """
+    Swaps pending and cleared status on the transactions and stamps today's
+    edit date. Transactions in any other status only get the edit date.
+
+    Returns:
+        set: The ids of the accounts touched.
+    """
+    pending_id = reference.status_id("pending")
+    cleared_id = reference.status_id("cleared")
+    with db_transaction.atomic():
+        account_ids = affected_account_ids(transaction_ids)
+        Transaction.objects.filter(id__in=transaction_ids).update(
+            status_id=Case(
+                When(status_id=cleared_id, then=Value(pending_id)),
+                When(status_id=pending_id, then=Value(cleared_id)),
+                default=F("status_id"),
+                output_field=IntegerField(),
+            ),
+            edit_date=get_todays_date_timezone_adjusted(),
+        )
+    refresh_accounts(account_ids)
+    return account_ids
+
+
+def set_transaction_date(transaction_ids: List[int], new_date: date) -> Set[int]:
+    """
+    Moves the transactions to new_date and stamps today's edit date.
+
+    Returns:
+        set: The ids of the accounts touched.
+    """
+    with db_transaction.atomic():
+        account_ids = affected_account_ids(transaction_ids)
+        Transaction.objects.filter(id__in=transaction_ids).update(
+            transaction_date=new_date,
+            edit_date=get_todays_date_timezone_adjusted(),
+        )
+    refresh_accounts(account_ids)
+    return account_ids
+
+
+def delete_transactions(transaction_ids: List[int]) -> Set[int]:
+    """
+    Deletes the transactions with their details and attachments. Attachment
+    files are still removed by their post_delete receiver.
+
+    Returns:
+        set: The ids of the accounts touched.
+    """
+    with db_transaction.atomic(), deferred_refresh():
+        account_ids = affected_account_ids(transaction_ids)
+        Transaction.objects.filter(id__in=transaction_ids).delete()
+    refresh_accounts(account_ids)
+    return account_ids
@@ -166,5 +166,6 @@ def convert_forecast_transaction(forecast_id: int) -> None:
         if account_id:
             delete_pattern(account_all(account_id))
     broadcast_invalidate(
-        ["accounts", "account_forecast", "tag_graph", "transactions"]
+        ["accounts", "account_forecast", "tag_graph", "transactions"],
+        account_ids=account_ids,
     )
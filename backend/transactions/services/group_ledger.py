@@ -0,0 +1,112 @@
+"""
+Balances of an account group: a parent's children seen as one account, or a
+standalone account seen as a group of one.
+
+The group is loaded once (one query for a parent's children) and every
+balance question is answered from the same scope: rows touching any member,
+not archived, with transfers between two members dropped because they net
+to zero for the group. Each row is signed from the group's side by
+annotate_transaction_total_for_parent. The combined register and the interest
+forecast both read the group through this class, so they agree on which rows
+count and how.
+
+Reminder projections are read in one query and bucketed in memory, so summing
+them per forecast period costs no further queries however many members or
+periods there are.
+"""
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from itertools import accumulate
+from typing import List, Optional, Type
+
+from django.db.models import Model, Q, QuerySet, Sum
+
+from accounts.models import Account
+from transactions.api.dependencies.transaction_utilities import (
+    annotate_transaction_total_for_parent,
+)
+from transactions.models import ReminderCacheTransaction, Transaction
+
+
+@dataclass
+class PeriodSums:
+    """Running totals of dated amounts, for O(log n) sums over date ranges."""
+
+    dates: List[date] = field(default_factory=list)
+    prefix: List[Decimal] = field(default_factory=lambda: [Decimal(0)])
+
+    @classmethod
+    def from_rows(cls, rows) -> "PeriodSums":
+        rows = sorted(rows, key=lambda row: row[0])
+        return cls(
+            dates=[day for day, _ in rows],
+            prefix=list(accumulate((amount or Decimal(0) for _, amount in rows), initial=Decimal(0))),
+        )
+
+    def between(self, start: date, end: date) -> Decimal:
+        """Sum of the amounts dated after start, up to and including end."""
+        return (
+            self.prefix[bisect_right(self.dates, end)]
+            - self.prefix[bisect_right(self.dates, start)]
+        )
+
+
+@dataclass
+class GroupLedger:
+    account_ids: List[int]
+    opening_balance: Decimal
+    archive_balance: Decimal
+
+    @classmethod
+    def from_accounts(cls, accounts: List[Account]) -> "GroupLedger":
+        return cls(
+            account_ids=[a.id for a in accounts],
+            opening_balance=sum((Decimal(a.opening_balance or 0) for a in accounts), Decimal(0)),
+            archive_balance=sum((Decimal(a.archive_balance or 0) for a in accounts), Decimal(0)),
+        )
+
+    @classmethod
+    def for_parent(cls, parent_id: int) -> Optional["GroupLedger"]:
+        """Returns the ledger of parent_id's children, or None if it has none."""
+        children = list(
+            Account.objects.filter(parent_account_id=parent_id).only(
+                "id", "opening_balance", "archive_balance"
+            )
+        )
+        return cls.from_accounts(children) if children else None
+
+    @property
+    def base_balance(self) -> Decimal:
+        return self.opening_balance + self.archive_balance
+
+    def scope(self, model: Type[Model] = Transaction) -> QuerySet:
+        """
+        Rows of model (Transaction or one of its cache tables) that count for
+        the group, annotated with their signed pretty_total.
+        """
+        ids = self.account_ids
+        qs = (
+            model.objects.filter(Q(source_account_id__in=ids) | Q(destination_account_id__in=ids))
+            .exclude(status__slug="archived")
+            .exclude(
+                transaction_type__slug="transfer",
+                source_account_id__in=ids,
+                destination_account_id__in=ids,
+            )
+        )
+        return annotate_transaction_total_for_parent(qs, ids)
+
+    def balance(self) -> Decimal:
+        """The group's current balance, including pending transactions."""
+        total = self.scope(Transaction).aggregate(sum=Sum("pretty_total"))["sum"]
+        return self.base_balance + (total or Decimal(0))
+
+    def reminder_sums(self) -> PeriodSums:
+        """The group's projected reminder amounts, for summing by period."""
+        return PeriodSums.from_rows(
+            self.scope(ReminderCacheTransaction)
+            .order_by()
+            .values_list("transaction_date", "pretty_total")
+        )
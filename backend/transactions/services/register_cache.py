@@ -0,0 +1,314 @@
+"""
+Compact cached form of an account register.
+
+A register is the full, unbounded list an account's transaction views are cut
+from: the cleared rows in ledger order followed by the pending, reminder and
+forecast rows in display order. Rather than pickling `TransactionOut` objects
+(with their nested status, type, tag and detail objects) once per requested
+window, one entry per account is stored as parallel columns of ids, date
+ordinals and integer cents, msgpack-encoded and zlib-compressed. Statuses,
+types, tags and account names are kept as ids and resolved from the in-process
+reference tables when the entry is decoded, and balances are recomputed for
+whichever `end_date` the caller asks for.
+"""
+import zlib
+from datetime import date
+from decimal import Decimal
+from typing import Callable, List, Optional, Tuple
+
+import msgpack
+
+from core.cache import reference, store
+from core.cache.keys import account_register
+from transactions.api.schemas.paycheck import PaycheckOut
+from transactions.api.schemas.transaction import TransactionOut
+from transactions.api.schemas.transaction_detail import TransactionDetailOut
+
+FORMAT_VERSION = 1
+COMPRESSION_LEVEL = 1
+REGISTER_TIMEOUT = 60 * 60
+
+# Row columns, in the order each row tuple is written.
+ROW_COLUMNS = (
+    "id",
+    "simulated",
+    "transaction_date",
+    "total_amount",
+    "pretty_total",
+    "status_id",
+    "transaction_type_id",
+    "memo",
+    "description",
+    "edit_date",
+    "add_date",
+    "paycheck_id",
+    "source_account_id",
+    "destination_account_id",
+    "checkNumber",
+    "reminder_id",
+    "attachment_count",
+)
+
+# Detail columns, one entry per TransactionDetail across all rows. Row i owns
+# details detail_offsets[i]:detail_offsets[i + 1].
+DETAIL_COLUMNS = ("detail_id", "detail_amt", "tag_id", "full_toggle")
+
+
+def _cents(value: Optional[Decimal]) -> Optional[int]:
+    if value is None:
+        return None
+    return int(value * 100)
+
+
+def _decimal(cents: Optional[int]) -> Optional[Decimal]:
+    if cents is None:
+        return None
+    return Decimal(cents).scaleb(-2)
+
+
+def _ordinal(value: Optional[date]) -> Optional[int]:
+    return value.toordinal() if value else None
+
+
+def _date(ordinal: Optional[int]) -> Optional[date]:
+    return date.fromordinal(ordinal) if ordinal else None
+
+
+def encode_register(
+    cleared: List[TransactionOut],
+    open_transactions: List[TransactionOut],
+    base_balance: Decimal,
+) -> bytes:
+    """
+    Packs a full register into its compact cached form.
+
+    Args:
+        cleared (List[TransactionOut]): Cleared rows in ledger order.
+        open_transactions (List[TransactionOut]): Pending, reminder and
+            forecast rows in display order.
+        base_balance (Decimal): Opening plus archive balance of the account.
+
+    Returns:
+        bytes: The encoded register.
+    """
+    columns = {name: [] for name in ROW_COLUMNS + DETAIL_COLUMNS}
+    detail_offsets = [0]
+    paychecks = {}
+
+    for transaction in list(cleared) + list(open_transactions):
+        paycheck = transaction.paycheck
+        if paycheck is not None and paycheck.id not in paychecks:
+            paychecks[paycheck.id] = paycheck.model_dump(mode="json")
+        row = (
+            transaction.id,
+            bool(transaction.simulated),
+            _ordinal(transaction.transaction_date),
+            _cents(transaction.total_amount),
+            _cents(transaction.pretty_total),
+            transaction.status.id if transaction.status else None,
+            transaction.transaction_type.id if transaction.transaction_type else None,
+            transaction.memo,
+            transaction.description,
+            _ordinal(transaction.edit_date),
+            _ordinal(transaction.add_date),
+            paycheck.id if paycheck else None,
+            transaction.source_account_id,
+            transaction.destination_account_id,
+            transaction.checkNumber,
+            transaction.reminder_id,
+            transaction.attachment_count or 0,
+        )
+        for name, value in zip(ROW_COLUMNS, row):
+            columns[name].append(value)
+        for detail in transaction.details or []:
+            columns["detail_id"].append(detail.id)
+            columns["detail_amt"].append(_cents(detail.detail_amt))
+            columns["tag_id"].append(detail.tag.id)
+            columns["full_toggle"].append(detail.full_toggle)
+        detail_offsets.append(len(columns["detail_id"]))
+
+    entry = {
+        "version": FORMAT_VERSION,
+        "base_balance": _cents(base_balance),
+        "detail_offsets": detail_offsets,
+        "paychecks": paychecks,
+        **columns,
+    }
+    return zlib.compress(
+        msgpack.packb(entry, use_bin_type=True), COMPRESSION_LEVEL
+    )
+
+
+def _unpack(blob: bytes) -> Optional[dict]:
+    try:
+        entry = msgpack.unpackb(
+            zlib.decompress(blob), raw=False, strict_map_key=False
+        )
+    except (zlib.error, ValueError, msgpack.UnpackException):
+        return None
+    if entry.get("version") != FORMAT_VERSION:
+        return None
+    return entry
+
+
+def _nested_id(display_id: int, simulated: bool, reminder_id) -> int:
+    # Reverse the display id offsets applied when the register was built.
+    if not simulated:
+        return display_id
+    if reminder_id is not None:
+        return -display_id
+    return -display_id - 10000
+
+
+def decode_register(
+    blob: bytes,
+    end_date: Optional[date],
+    totals_only: bool = False,
+) -> Optional[List[TransactionOut]]:
+    """
+    Unpacks an encoded register and slices it to rows dated before end_date,
+    recomputing running balances for the slice.
+
+    Args:
+        blob (bytes): A register produced by `encode_register`.
+        end_date (date): Exclusive upper bound, or None for every row.
+        totals_only (bool): Skip tags, details and display names.
+
+    Returns:
+        List[TransactionOut]: The sliced register, or None when the blob is
+            unreadable or was written by a different format version.
+    """
+    entry = _unpack(blob)
+    if entry is None:
+        return None
+
+    end_ordinal = end_date.toordinal() if end_date else None
+    offsets = entry["detail_offsets"]
+    paychecks = {
+        paycheck_id: PaycheckOut.model_validate(data)
+        for paycheck_id, data in entry["paychecks"].items()
+    }
+    columns = [entry[name] for name in ROW_COLUMNS]
+    # Open rows follow the cleared rows, so one running total starting from
+    # the base balance reproduces both the cleared ledger balances and the
+    # open rows' balances on top of the last cleared one.
+    running = _decimal(entry["base_balance"])
+
+    transactions = []
+    for index, row in enumerate(zip(*columns)):
+        fields = dict(zip(ROW_COLUMNS, row))
+        if end_ordinal is not None and fields["transaction_date"] >= end_ordinal:
+            continue
+        pretty_total = _decimal(fields["pretty_total"])
+        running += pretty_total
+        status = reference.status_out(fields.pop("status_id"))
+        transaction_type = reference.type_out(fields.pop("transaction_type_id"))
+        paycheck = paychecks.get(fields.pop("paycheck_id"))
+        simulated = fields.pop("simulated")
+        attachment_count = fields.pop("attachment_count")
+        fields.update(
+            transaction_date=_date(fields["transaction_date"]),
+            total_amount=_decimal(fields["total_amount"]),
+            pretty_total=pretty_total,
+            edit_date=_date(fields["edit_date"]),
+            add_date=_date(fields["add_date"]),
+            status=status,
+            transaction_type=transaction_type,
+            paycheck=paycheck,
+        )
+        if totals_only:
+            transactions.append(
+                TransactionOut.model_construct(
+                    **fields, balance=running, simulated=simulated
+                )
+            )
+            continue
+
+        # The detail's own transaction mirrors the raw model row: real id,
+        # no display annotations.
+        nested = TransactionOut.model_construct(
+            **{
+                **fields,
+                "id": _nested_id(fields["id"], simulated, fields["reminder_id"]),
+                "pretty_total": None,
+            }
+        )
+        details = []
+        tags = []
+        for position in range(offsets[index], offsets[index + 1]):
+            tag_id = entry["tag_id"][position]
+            details.append(
+                TransactionDetailOut.model_construct(
+                    id=entry["detail_id"][position],
+                    transaction=nested,
+                    detail_amt=_decimal(entry["detail_amt"][position]),
+                    tag=reference.tag_out(tag_id),
+                    full_toggle=entry["full_toggle"][position],
+                )
+            )
+            tag_name = reference.tag_display_name(tag_id)
+            if tag_name:
+                tags.append(tag_name)
+
+        source_name = reference.account_name(fields["source_account_id"])
+        if transaction_type and transaction_type.slug == "transfer":
+            destination_name = reference.account_name(
+                fields["destination_account_id"]
+            )
+            pretty_account = f"{source_name} => {destination_name}"
+        else:
+            pretty_account = source_name
+
+        transactions.append(
+            TransactionOut.model_construct(
+                **fields,
+                balance=running,
+                pretty_account=pretty_account,
+                tags=tags,
+                details=details,
+                simulated=simulated,
+                attachment_count=attachment_count,
+            )
+        )
+
+    return transactions
+
+
+def get_cached_register(
+    account_id: int,
+    end_date: Optional[date],
+    totals_only: bool,
+    build: Callable[[], Optional[Tuple[list, list, Decimal]]],
+) -> Tuple[List[TransactionOut], Decimal]:
+    """
+    Returns the account's register sliced to end_date, building and caching
+    the full register with `build` on a miss.
+
+    Args:
+        account_id (int): The account the register belongs to.
+        end_date (date): Exclusive upper bound of the slice.
+        totals_only (bool): Skip tags, details and display names.
+        build (Callable): Returns (cleared, open_transactions, base_balance)
+            for the unbounded register, or None if the account is missing.
+
+    Returns:
+        Tuple[List[TransactionOut], Decimal]: The slice and a zero previous
+            balance, matching the non-forecast result shape.
+    """
+    key = account_register(account_id)
+    blob = store.get_or_compute(key, lambda: _encode_built(build), REGISTER_TIMEOUT)
+    transactions = decode_register(blob, end_date, totals_only) if blob else None
+    if transactions is None and blob is not None:
+        # Written in another format version; rebuild over it.
+        blob = _encode_built(build)
+        if blob is not None:
+            store.set(key, blob, timeout=REGISTER_TIMEOUT)
+            transactions = decode_register(blob, end_date, totals_only)
+    if transactions is None:
+        return [], Decimal(0.00)
+    return (transactions, Decimal(0.00))
+
+
+def _encode_built(build) -> Optional[bytes]:
+    register = build()
+    return encode_register(*register) if register is not None else None
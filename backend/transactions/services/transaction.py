@@ -24,18 +24,20 @@ def upsert_description_history(
         description (str): The transaction description.
         tag_id (Optional[int]): The tag id to associate, or None.
     """
-    try:
-        existing = DescriptionHistory.objects.get(
-            description_normalized=description.lower()
-        )
-        existing.tag_id = tag_id
-        existing.save()
-    except DescriptionHistory.DoesNotExist:
-        DescriptionHistory.objects.create(
-            description_normalized=description.lower(),
-            description_pretty=description,
-            tag_id=tag_id,
-        )
+    # One INSERT ... ON CONFLICT statement; an existing entry keeps its
+    # pretty form and only takes the new tag.
+    DescriptionHistory.objects.bulk_create(
+        [
+            DescriptionHistory(
+                description_normalized=description.lower(),
+                description_pretty=description,
+                tag_id=tag_id,
+            )
+        ],
+        update_conflicts=True,
+        unique_fields=["description_normalized"],
+        update_fields=["tag"],
+    )
 
 
 def build_full_transaction(payload: TransactionIn) -> FullTransaction:
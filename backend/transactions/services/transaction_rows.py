@@ -0,0 +1,126 @@
+"""
+Register rows built from trusted queryset values.
+
+`TransactionOut.from_orm` validates every field of every row, then validates a
+full nested TransactionOut again for each detail, and the simulated rows were
+validated a second time by `model_copy(update=...)`. The rows of a register
+come straight from annotated querysets whose values the database has already
+typed, so they are constructed here without validation: statuses, types and
+tags are the shared reference objects, and simulated rows get their display
+id and flag in the same pass. The result matches what the compact register
+cache decodes, detail for detail.
+"""
+from typing import List, Optional
+
+from core.cache import reference
+from transactions.api.schemas.paycheck import PaycheckOut
+from transactions.api.schemas.transaction import (
+    TransactionOut,
+    TransactionSlimOut,
+)
+from transactions.api.schemas.transaction_detail import TransactionDetailOut
+
+# Model columns copied onto each row as they are.
+ROW_FIELDS = (
+    "transaction_date",
+    "total_amount",
+    "memo",
+    "description",
+    "edit_date",
+    "add_date",
+    "source_account_id",
+    "destination_account_id",
+    "checkNumber",
+)
+
+
+def transaction_out(
+    obj, display_id: Optional[int] = None, simulated: bool = False
+) -> TransactionOut:
+    """
+    Builds the TransactionOut of an annotated Transaction, ReminderCacheTransaction
+    or ForecastCacheTransaction row.
+
+    Args:
+        obj (Model): The queryset row, with any display annotations.
+        display_id (int): The id shown for the row, defaults to its pk.
+        simulated (bool): True for reminder and forecast rows.
+
+    Returns:
+        TransactionOut: The row, unvalidated.
+    """
+    fields = {name: getattr(obj, name, None) for name in ROW_FIELDS}
+    paycheck = obj.paycheck if getattr(obj, "paycheck_id", None) else None
+    fields.update(
+        status=reference.status_out(obj.status_id),
+        transaction_type=reference.type_out(obj.transaction_type_id),
+        paycheck=PaycheckOut.model_validate(paycheck) if paycheck else None,
+        reminder_id=getattr(obj, "reminder_id", None),
+    )
+    details = getattr(obj, "details", None) or []
+    if details:
+        # A detail's own transaction mirrors the raw model row.
+        nested = TransactionOut.model_construct(**fields, id=obj.id)
+        details = [
+            TransactionDetailOut.model_construct(
+                id=detail.id,
+                transaction=nested,
+                detail_amt=detail.detail_amt,
+                tag=reference.tag_out(detail.tag_id),
+                full_toggle=detail.full_toggle,
+            )
+            for detail in details
+        ]
+    return TransactionOut.model_construct(
+        **fields,
+        id=obj.id if display_id is None else display_id,
+        balance=getattr(obj, "balance", None),
+        pretty_account=getattr(obj, "pretty_account", None),
+        tags=getattr(obj, "tags", None) or [],
+        details=details,
+        pretty_total=getattr(obj, "pretty_total", None),
+        tag_total=getattr(obj, "tag_total", None),
+        simulated=simulated,
+        attachment_count=getattr(obj, "attachment_count", None) or 0,
+    )
+
+
+def transaction_outs(rows, kind: str = "t") -> List[TransactionOut]:
+    """
+    TransactionOut rows of a queryset or list. kind is "t" for transactions,
+    "r" for reminder rows (shown as -id) and "f" for forecast rows (shown as
+    -id - 10000), matching the detail types of add_tags_to_transactions.
+    """
+    if kind == "r":
+        return [transaction_out(obj, -obj.id, True) for obj in rows]
+    if kind == "f":
+        return [transaction_out(obj, -obj.id - 10000, True) for obj in rows]
+    return [transaction_out(obj) for obj in rows]
+
+
+def slim_transaction(transaction: TransactionOut) -> TransactionSlimOut:
+    """The row with ids in place of its nested status, type, paycheck and details."""
+    return TransactionSlimOut.model_construct(
+        id=transaction.id,
+        transaction_date=transaction.transaction_date,
+        total_amount=transaction.total_amount,
+        status_id=transaction.status.id if transaction.status else None,
+        memo=transaction.memo,
+        description=transaction.description,
+        edit_date=transaction.edit_date,
+        add_date=transaction.add_date,
+        transaction_type_id=(
+            transaction.transaction_type.id if transaction.transaction_type else None
+        ),
+        paycheck_id=transaction.paycheck.id if transaction.paycheck else None,
+        balance=transaction.balance,
+        pretty_account=transaction.pretty_account,
+        tags=transaction.tags,
+        pretty_total=transaction.pretty_total,
+        source_account_id=transaction.source_account_id,
+        destination_account_id=transaction.destination_account_id,
+        checkNumber=transaction.checkNumber,
+        reminder_id=transaction.reminder_id,
+        simulated=transaction.simulated,
+        attachment_count=transaction.attachment_count,
+    )
@@ -2,6 +2,9 @@ from datetime import date
 from typing import List, Optional, Tuple
 from transactions.api.schemas.transaction import TransactionOut
 from accounts.models import Account
+from accounts.lookups import get_account, has_child_accounts
+from core.cache.helpers import cached
+from core.cache.memo import memoize
 from transactions.models import (
     Transaction,
     ReminderCacheTransaction,
@@ -14,18 +17,20 @@ from transactions.api.dependencies.transaction_utilities import (
     sort_transaction_list,
     add_balances_to_transaction_list,
     annotate_transaction_display_info,
+    add_account_names_to_transactions,
     annotate_transaction_total,
-    annotate_transaction_total_for_parent,
     add_tags_to_transactions,
     sort_transactions,
     annotate_transaction_balance,
 )
 from decimal import Decimal
 from django.db.models import Q, Case, When, Sum, F, DecimalField
-from django.core.cache import cache
+from core.cache import store
 from django.db.models.functions import Abs
+from transactions.services.group_ledger import GroupLedger
+from transactions.services.register_cache import get_cached_register
+from transactions.services.transaction_rows import transaction_outs
 from core.cache.keys import (
-    account_combined_transactions,
     account_forecast_transactions,
     account_reminder_transactions,
     account_cleared_balance,
@@ -53,67 +58,129 @@ def get_account_transactions_and_balances(
 
     Delegates to get_parent_account_transactions_and_balances when account_id
     belongs to a parent account. Skips the Redis cache when forecast=True so
-    simulated forecast transactions are never served stale. Simulated transaction
+    simulated forecast transactions are never served stale; otherwise the window
+    is sliced from the account's compact cached register. Simulated transaction
     IDs are negated (and offset by -10000 for forecast) to avoid colliding with
     real transaction PKs when merging lists.
     """
     # Delegate to the parent-account handler when this account has children
-    if Account.objects.filter(parent_account_id=account_id).exists():
+    if has_child_accounts(account_id):
         return get_parent_account_transactions_and_balances(
             end_date, account_id, totals_only, forecast, start_date
         )
 
     # Forecast results depend on async task completion — skip cache to ensure freshness.
-    use_cache = not forecast
-    key = f"{account_combined_transactions(account_id)}:{end_date}:{totals_only}:{forecast}:{start_date}:{cleared_only}"
-    if use_cache:
-        data = cache.get(key)
-        if data:
-            return data
+    # Every other window is sliced from the account's single cached register.
+    if not forecast:
+        return get_cached_register(
+            account_id,
+            end_date,
+            totals_only,
+            lambda: build_account_register(None, account_id, False),
+        )
 
-    # Setup variables
     today = get_todays_date_timezone_adjusted()
+    register = build_account_register(end_date, account_id, totals_only)
+    if register is None:
+        return [], Decimal(0.00)
+    cleared_transactions_list, sorted_transactions_with_balances, base_balance = (
+        register
+    )
+
+    # Add cleared and pending
+    transactions = cleared_transactions_list + sorted_transactions_with_balances
+
+    # Filter transactions for status and greater than start date, record previous balance
+    def filter_new_transactions(transactions, start_date):
+        # Filter the transactions where transaction_date is greater than today
+        return [
+            transaction
+            for transaction in transactions
+            if transaction.transaction_date
+            and transaction.transaction_date >= start_date
+        ]
+
+    def filter_previous_transactions(transactions, start_date):
+        # Filter the transactions where transaction_date is greater than today
+        return [
+            transaction
+            for transaction in transactions
+            if transaction.transaction_date
+            and transaction.transaction_date < start_date
+        ]
+
+    previous_balance = base_balance
+    if start_date:
+        start = start_date
+    else:
+        start = today
+    filtered_transactions = filter_new_transactions(transactions, start)
+    previous_transactions = filter_previous_transactions(transactions, start)
+    if previous_transactions:
+        if isinstance(
+            previous_transactions[-1],
+            dict,
+        ):
+            previous_balance = previous_transactions[-1]["balance"]
+        else:
+            previous_balance = previous_transactions[-1].balance
+    my_tuple = (filtered_transactions, previous_balance)
+    return my_tuple
+
+
+def build_account_register(
+    end_date: Optional[date],
+    account_id: int,
+    totals_only: bool,
+) -> Optional[Tuple[List[TransactionOut], List[TransactionOut], Decimal]]:
+    """
+    Builds the register for a single account from the database: cleared rows
+    with ledger balances, then pending, reminder and forecast rows sorted with
+    running balances. end_date=None builds the unbounded register.
+
+    Returns:
+        (cleared, open_transactions, base_balance), or None if the account
+        does not exist.
+    """
+    # Setup variables
     reminder_transactions_list = []
     cleared_transactions_list = []
     pending_transactions_list = []
 
-    # Check if account exists.  Return an empty list if not.
+    # Check if account exists.  Return None if not.
     try:
-        account = Account.objects.get(id=account_id)
+        account = get_account(account_id)
     except Account.DoesNotExist:
-        return [], Decimal(0.00)
+        return None
 
     # Get Account Info
     opening_balance = account.opening_balance
     archive_balance = account.archive_balance
+    before_end = Q() if end_date is None else Q(transaction_date__lt=end_date)
 
     # Get All transacitons
     all_transactions = Transaction.objects.filter(
         Q(source_account_id=account_id) | Q(destination_account_id=account_id),
-        transaction_date__lt=end_date,
+        before_end,
     ).exclude(status__slug='archived').select_related("status", "transaction_type")
 
     # Get Reminder transactions
     reminder_transactions = ReminderCacheTransaction.objects.filter(
         Q(source_account_id=account_id) | Q(destination_account_id=account_id),
-        transaction_date__lt=end_date,
+        before_end,
     ).exclude(status__slug='archived').select_related("status", "transaction_type")
 
     # Get Forecast transactions
     forecast_transactions = ForecastCacheTransaction.objects.filter(
         Q(source_account_id=account_id) | Q(destination_account_id=account_id),
-        transaction_date__lt=end_date,
+        before_end,
     ).exclude(status__slug='archived').select_related("status", "transaction_type")
 
     # If not totals only, annotate transactions with pretty information
     if not totals_only:
-        all_transactions = annotate_transaction_display_info(all_transactions)
-        reminder_transactions = annotate_transaction_display_info(
-            reminder_transactions
-        )
-        forecast_transactions = annotate_transaction_display_info(
-            forecast_transactions
-        )
+        all_transactions = annotate_transaction_display_info(all_transactions, account_names=False)
+        reminder_transactions = annotate_transaction_display_info(reminder_transactions, account_names=False)
+        forecast_transactions = annotate_transaction_display_info(forecast_transactions, account_names=False)
 
     # Annotate pretty totals
     all_transactions = annotate_transaction_total(all_transactions, account_id)
@@ -160,28 +227,21 @@ def get_account_transactions_and_balances(
             pending_transactions, "t"
         )
 
+    # Resolve account names in Python rather than per-row subqueries
+    if not totals_only:
+        for rows in (
+            cleared_transactions,
+            pending_transactions,
+            reminder_transactions,
+            forecast_transactions,
+        ):
+            add_account_names_to_transactions(rows)
+
     # Create lists of TransactionOut objects
-    cleared_transactions_list = [
-        TransactionOut.from_orm(obj) for obj in cleared_transactions
-    ]
-    pending_transactions_list = [
-        TransactionOut.from_orm(obj) for obj in pending_transactions
-    ]
-    reminder_transactions_list = [
-        TransactionOut.from_orm(obj).model_copy(
-            update={"id": -obj.id, "simulated": True}
-        )
-        for obj in reminder_transactions
-    ]
-    forecast_transactions_list = [
-        TransactionOut.from_orm(obj) for obj in forecast_transactions
-    ]
-    forecast_transactions_list = [
-        TransactionOut.from_orm(obj).model_copy(
-            update={"id": -obj.id - 10000, "simulated": True}
-        )
-        for obj in forecast_transactions
-    ]
+    cleared_transactions_list = transaction_outs(cleared_transactions)
+    pending_transactions_list = transaction_outs(pending_transactions)
+    reminder_transactions_list = transaction_outs(reminder_transactions, "r")
+    forecast_transactions_list = transaction_outs(forecast_transactions, "f")
 
     # Combine lists to be sorted
     transactions_to_be_sorted = (
@@ -198,54 +258,11 @@ def get_account_transactions_and_balances(
         sorted_transactions, cleared_balance
     )
 
-    # Add cleared and pending
-    transactions = cleared_transactions_list + sorted_transactions_with_balances
-
-    # Filter transactions for status and greater than start date, record previous balance
-    if forecast:
-
-        def filter_new_transactions(transactions, start_date):
-            # Filter the transactions where transaction_date is greater than today
-            return [
-                transaction
-                for transaction in transactions
-                if transaction.transaction_date
-                and transaction.transaction_date >= start_date
-            ]
-
-        def filter_previous_transactions(transactions, start_date):
-            # Filter the transactions where transaction_date is greater than today
-            return [
-                transaction
-                for transaction in transactions
-                if transaction.transaction_date
-                and transaction.transaction_date < start_date
-            ]
-
-        previous_balance = opening_balance + archive_balance
-        if start_date:
-            start = start_date
-        else:
-            start = today
-        filtered_transactions = filter_new_transactions(transactions, start)
-        previous_transactions = filter_previous_transactions(
-            transactions, start
-        )
-        if previous_transactions:
-            if isinstance(
-                previous_transactions[-1],
-                dict,
-            ):
-                previous_balance = previous_transactions[-1]["balance"]
-            else:
-                previous_balance = previous_transactions[-1].balance
-        my_tuple = (filtered_transactions, previous_balance)
-        return my_tuple
-    else:
-        my_tuple = (transactions, Decimal(0.00))
-        if use_cache:
-            cache.set(key, my_tuple, timeout=60 * 60)
-        return my_tuple
+    return (
+        cleared_transactions_list,
+        sorted_transactions_with_balances,
+        opening_balance + archive_balance,
+    )
 
 
 def get_parent_account_transactions_and_balances(
@@ -260,60 +277,74 @@ def get_parent_account_transactions_and_balances(
     Internal transfers between children are excluded — they net to zero in the
     combined view and don't exist at the bank statement level.
     """
-    use_cache = not forecast
-    key = f"{account_combined_transactions(account_id)}:parent:{end_date}:{totals_only}:{forecast}:{start_date}"
-    if use_cache:
-        data = cache.get(key)
-        if data:
-            return data
+    if not forecast:
+        return get_cached_register(
+            account_id,
+            end_date,
+            totals_only,
+            lambda: build_parent_account_register(None, account_id, False),
+        )
 
     today = get_todays_date_timezone_adjusted()
+    register = build_parent_account_register(end_date, account_id, totals_only)
+    if register is None:
+        return [], Decimal(0.00)
+    cleared_transactions_list, sorted_transactions_with_balances, base_balance = (
+        register
+    )
+    transactions = cleared_transactions_list + sorted_transactions_with_balances
 
-    children = Account.objects.filter(parent_account_id=account_id)
-    child_ids = list(children.values_list('id', flat=True))
+    def filter_new(txns, start):
+        return [t for t in txns if t.transaction_date and t.transaction_date >= start]
 
-    if not child_ids:
-        return [], Decimal(0.00)
+    def filter_prev(txns, start):
+        return [t for t in txns if t.transaction_date and t.transaction_date < start]
 
-    opening_balance = sum(c.opening_balance or Decimal(0) for c in children)
-    archive_balance = sum(c.archive_balance or Decimal(0) for c in children)
+    previous_balance = base_balance
+    start = start_date or today
+    filtered = filter_new(transactions, start)
+    previous = filter_prev(transactions, start)
+    if previous:
+        previous_balance = previous[-1].balance if not isinstance(previous[-1], dict) else previous[-1]["balance"]
+    return (filtered, previous_balance)
 
-    # Transfers where both sides are children cancel out in the combined view
-    internal_transfer_q = Q(
-        transaction_type__slug='transfer',
-        source_account_id__in=child_ids,
-        destination_account_id__in=child_ids,
-    )
 
-    touch_any_child = Q(source_account_id__in=child_ids) | Q(destination_account_id__in=child_ids)
+def build_parent_account_register(
+    end_date: Optional[date],
+    account_id: int,
+    totals_only: bool,
+) -> Optional[Tuple[List[TransactionOut], List[TransactionOut], Decimal]]:
+    """
+    Builds the combined register for a parent account, the counterpart of
+    build_account_register. Returns None if the account has no children.
+    """
+    ledger = GroupLedger.for_parent(account_id)
+    if ledger is None:
+        return None
 
+    opening_balance = ledger.opening_balance
+    archive_balance = ledger.archive_balance
+    before_end = Q() if end_date is None else Q(transaction_date__lt=end_date)
+
+    # The ledger's scope drops transfers between two children (they cancel
+    # out in the combined view) and signs each row from the parent's side.
     all_transactions = (
-        Transaction.objects.filter(touch_any_child, transaction_date__lt=end_date)
-        .exclude(status__slug='archived')
-        .exclude(internal_transfer_q)
+        ledger.scope(Transaction).filter(before_end)
         .select_related("status", "transaction_type")
     )
     reminder_transactions = (
-        ReminderCacheTransaction.objects.filter(touch_any_child, transaction_date__lt=end_date)
-        .exclude(status__slug='archived')
-        .exclude(internal_transfer_q)
+        ledger.scope(ReminderCacheTransaction).filter(before_end)
         .select_related("status", "transaction_type")
     )
     forecast_transactions = (
-        ForecastCacheTransaction.objects.filter(touch_any_child, transaction_date__lt=end_date)
-        .exclude(status__slug='archived')
-        .exclude(internal_transfer_q)
+        ledger.scope(ForecastCacheTransaction).filter(before_end)
         .select_related("status", "transaction_type")
     )
 
     if not totals_only:
-        all_transactions = annotate_transaction_display_info(all_transactions)
-        reminder_transactions = annotate_transaction_display_info(reminder_transactions)
-        forecast_transactions = annotate_transaction_display_info(forecast_transactions)
-
-    all_transactions = annotate_transaction_total_for_parent(all_transactions, child_ids)
-    reminder_transactions = annotate_transaction_total_for_parent(reminder_transactions, child_ids)
-    forecast_transactions = annotate_transaction_total_for_parent(forecast_transactions, child_ids)
+        all_transactions = annotate_transaction_display_info(all_transactions, account_names=False)
+        reminder_transactions = annotate_transaction_display_info(reminder_transactions, account_names=False)
+        forecast_transactions = annotate_transaction_display_info(forecast_transactions, account_names=False)
 
     if not totals_only:
         reminder_transactions = add_tags_to_transactions(reminder_transactions, "r")
@@ -336,41 +367,29 @@ def get_parent_account_transactions_and_balances(
     if not totals_only:
         pending_transactions = add_tags_to_transactions(pending_transactions, "t")
 
-    cleared_transactions_list = [TransactionOut.from_orm(obj) for obj in cleared_transactions]
-    pending_transactions_list = [TransactionOut.from_orm(obj) for obj in pending_transactions]
-    reminder_transactions_list = [
-        TransactionOut.from_orm(obj).model_copy(update={"id": -obj.id, "simulated": True})
-        for obj in reminder_transactions
-    ]
-    forecast_transactions_list = [
-        TransactionOut.from_orm(obj).model_copy(update={"id": -obj.id - 10000, "simulated": True})
-        for obj in forecast_transactions
-    ]
+    # Resolve account names in Python rather than per-row subqueries
+    if not totals_only:
+        for rows in (
+            cleared_transactions,
+            pending_transactions,
+            reminder_transactions,
+            forecast_transactions,
+        ):
+            add_account_names_to_transactions(rows)
+
+    cleared_transactions_list = transaction_outs(cleared_transactions)
+    pending_transactions_list = transaction_outs(pending_transactions)
+    reminder_transactions_list = transaction_outs(reminder_transactions, "r")
+    forecast_transactions_list = transaction_outs(forecast_transactions, "f")
 
     transactions_to_be_sorted = pending_transactions_list + reminder_transactions_list + forecast_transactions_list
     sorted_transactions = sort_transaction_list(transactions_to_be_sorted)
     sorted_transactions_with_balances = add_balances_to_transaction_list(sorted_transactions, cleared_balance)
-    transactions = cleared_transactions_list + sorted_transactions_with_balances
-
-    if forecast:
-        def filter_new(txns, start):
-            return [t for t in txns if t.transaction_date and t.transaction_date >= start]
-
-        def filter_prev(txns, start):
-            return [t for t in txns if t.transaction_date and t.transaction_date < start]
-
-        previous_balance = opening_balance + archive_balance
-        start = start_date or today
-        filtered = filter_new(transactions, start)
-        previous = filter_prev(transactions, start)
-        if previous:
-            previous_balance = previous[-1].balance if not isinstance(previous[-1], dict) else previous[-1]["balance"]
-        return (filtered, previous_balance)
-    else:
-        result = (transactions, Decimal(0.00))
-        if use_cache:
-            cache.set(key, result, timeout=60 * 60)
-        return result
+    return (
+        cleared_transactions_list,
+        sorted_transactions_with_balances,
+        opening_balance + archive_balance,
+    )
 
 
 def fetch_account_transactions(account_id: int, transactions_type: str):
@@ -398,7 +417,7 @@ def fetch_account_transactions(account_id: int, transactions_type: str):
     if transactions_type == "forecast":
         key = account_forecast_transactions(account_id)
 
-    data = cache.get(key)
+    data = store.get(key)
     if data:
         return data
 
@@ -423,22 +442,17 @@ def fetch_account_transactions(account_id: int, transactions_type: str):
             | Q(destination_account_id=account_id)
         ).exclude(status__transaction_status="Archived")
 
-    cache.set(key, transactions, timeout=60 * 60)
+    store.set(key, transactions, timeout=60 * 60)
     return transactions
 
 
+@memoize("cleared_balance")
+@cached(account_cleared_balance, ttl=60 * 60)
 def get_account_cleared_balance(account_id: int):
-    # Check Cache
-    key = account_cleared_balance(account_id)
-    data = cache.get(key)
-    if data:
-        return data
-
-    qs = Account.objects.filter(id=account_id)
-    if not qs.exists():
+    try:
+        account = get_account(account_id)
+    except Account.DoesNotExist:
         raise AccountNotFound()
-
-    account = qs.first()
     transactions = fetch_account_transactions(account_id, "transaction")
     cleared_transactions = transactions.exclude(
         status__transaction_status="Pending"
@@ -463,22 +477,16 @@ def get_account_cleared_balance(account_id: int):
         + account.archive_balance
         + account.opening_balance
     )
-    cache.set(key, cleared_balance, timeout=60 * 60)
     return cleared_balance
 
 
+@memoize("pending_balance")
+@cached(account_pending_balance, ttl=60 * 60)
 def get_account_pending_balance(account_id: int):
-    # Check Cache
-    key = account_pending_balance(account_id)
-    data = cache.get(key)
-    if data:
-        return data
-
-    qs = Account.objects.filter(id=account_id)
-    if not qs.exists():
+    try:
+        account = get_account(account_id)
+    except Account.DoesNotExist:
         raise AccountNotFound()
-
-    account = qs.first()
     today = get_todays_date_timezone_adjusted()
     transactions = fetch_account_transactions(account_id, "transaction")
     filtered_transactions = transactions.filter(transaction_date__lte=today)
@@ -502,7 +510,6 @@ def get_account_pending_balance(account_id: int):
         + account.archive_balance
         + account.opening_balance
     )
-    cache.set(key, pending_balance, timeout=60 * 60)
     return pending_balance
 
 
@@ -1,13 +1,23 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from transactions.models import Transaction, TransactionImage
+from transactions.models import (
+    Transaction,
+    TransactionImage,
+    TransactionStatus,
+    TransactionType,
+)
 from django_q.tasks import async_task
+from django_q.signals import pre_execute, post_execute_in_worker
 from core.cache.helpers import delete_pattern
 from core.cache.keys import account_all
 from core.broadcast import broadcast_invalidate
+from core.cache import memo, reference
+from transactions.services.attachments import file_is_shared
 
 
-_TRANSACTION_BROADCAST_KEYS = [
+TRANSACTION_BROADCAST_KEYS = [
     "transactions", "accounts", "account_forecast",
     "tag_graph", "tag_graph_items", "calculator",
     "expense_graph", "pay_graph", "budgets",
@@ -15,29 +25,93 @@ _TRANSACTION_BROADCAST_KEYS = [
 ]
 
 
+# Set while a bulk mutation deletes rows; the caller refreshes the touched
+# accounts once afterwards instead of once per row.
+_refresh_deferred: ContextVar[bool] = ContextVar("refresh_deferred", default=False)
+
+
+@contextmanager
+def deferred_refresh():
+    """Skips the per-row account refresh of the Transaction receivers."""
+    token = _refresh_deferred.set(True)
+    try:
+        yield
+    finally:
+        _refresh_deferred.reset(token)
+
+
 def _refresh_account(account_id):
+    # A parent account's register, balances and financials roll up its
+    # children, so they go stale with them.
+    parent_id = reference.parent_account_id(account_id)
     delete_pattern(account_all(account_id))
+    if parent_id is not None:
+        delete_pattern(account_all(parent_id))
     async_task("transactions.tasks.update_cc_forecast_cache", account_id)
     async_task("transactions.tasks.update_interest_forecast_cache", account_id)
 
 
 @receiver(post_save, sender=Transaction)
 def update_forecast_cache_on_save(sender, instance, **kwargs):
+    if _refresh_deferred.get():
+        return
     _refresh_account(instance.source_account_id)
     if instance.destination_account_id is not None:
         _refresh_account(instance.destination_account_id)
-    broadcast_invalidate(_TRANSACTION_BROADCAST_KEYS)
+    broadcast_invalidate(
+        TRANSACTION_BROADCAST_KEYS,
+        account_ids=[instance.source_account_id, instance.destination_account_id],
+    )
 
 
 @receiver(post_delete, sender=Transaction)
 def update_forecast_cache_on_delete(sender, instance, **kwargs):
+    if _refresh_deferred.get():
+        return
     _refresh_account(instance.source_account_id)
     if instance.destination_account_id is not None:
         _refresh_account(instance.destination_account_id)
-    broadcast_invalidate(_TRANSACTION_BROADCAST_KEYS)
+    broadcast_invalidate(
+        TRANSACTION_BROADCAST_KEYS,
+        account_ids=[instance.source_account_id, instance.destination_account_id],
+    )
 
 
 @receiver(post_delete, sender=TransactionImage)
 def delete_transaction_image_file(sender, instance, **kwargs):
-    if instance.image:
+    # Identical uploads share one stored file and thumbnail; only the last
+    # attachment referencing them removes them.
+    if instance.image and not file_is_shared(instance.image.name):
         instance.image.delete(save=False)
+    if instance.thumbnail and not file_is_shared(instance.thumbnail.name, "thumbnail"):
+        instance.thumbnail.delete(save=False)
+
+
+@receiver(post_save, sender=TransactionStatus)
+@receiver(post_delete, sender=TransactionStatus)
+def invalidate_status_ids(sender, instance, **kwargs):
+    reference.invalidate(reference.STATUS, reference.STATUS_ROW)
+
+
+@receiver(post_save, sender=TransactionType)
+@receiver(post_delete, sender=TransactionType)
+def invalidate_type_ids(sender, instance, **kwargs):
+    reference.invalidate(reference.TYPE, reference.TYPE_ROW)
+
+
+# Each qcluster worker runs one task at a time, so the open scope's token can
+# live at module level between the two signals.
+_task_memo_token = None
+
+
+@receiver(pre_execute)
+def open_task_memo_scope(sender, func, task, **kwargs):
+    global _task_memo_token
+    _task_memo_token = memo.begin_scope(f"task {task.get('func')}")
+
+
+@receiver(post_execute_in_worker)
+def close_task_memo_scope(sender, func, task, **kwargs):
+    global _task_memo_token
+    token, _task_memo_token = _task_memo_token, None
+    memo.end_scope(token)
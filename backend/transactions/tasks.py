@@ -11,8 +11,6 @@ from transactions.models import (
     Transaction,
     ReminderCacheTransaction,
     ForecastCacheTransaction,
-    TransactionStatus,
-    TransactionType,
 )
 from tags.api.dependencies.custom_tag import CustomTag
 from transactions.api.dependencies.create_transactions import (
@@ -32,8 +30,15 @@ from imports.models import (
     TagMapping,
     AccountMapping,
 )
-from accounts.models import Account
-from reminders.models import Reminder, Repeat, ReminderExclusion
+from accounts.models import Account, StatementCycle
+from accounts.services.forecast_series import rebuild_forecast_series
+from accounts.services.statement_cycles import (
+    cycle_totals,
+    sync_statement_cycles,
+)
+from reminders.models import Reminder, Repeat
+from reminders.services.conversion import convert_due_reminders
+from reminders.signals import REMINDER_BROADCAST_KEYS
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 from django.utils import timezone
@@ -45,18 +50,15 @@ from django.db.models import (
     Value,
     F,
     Sum,
-    Subquery,
-    OuterRef,
-    ExpressionWrapper,
     DecimalField,
     Q,
     QuerySet,
 )
-from django.db.models.functions import Coalesce, Abs
-import pytz
+from django.db.models.functions import Abs
 import os
 from utils.dates import (
     get_todays_date_timezone_adjusted,
+    increment_date,
 )
 from django.core.management import call_command
 from planning.models import Budget
@@ -64,10 +66,14 @@ import json
 from transactions.api.dependencies.get_transactions_by_tag import (
     get_transactions_by_tag,
 )
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal, ROUND_HALF_UP
 from core.cache.helpers import delete_pattern
 from core.cache.keys import account_all, account_all_transactions
+from core.cache import reference, versions
+from transactions.services.archive import archive_through, verify_archive_balances
+from transactions.services.bulk_mutation import refresh_accounts
+from transactions.services.group_ledger import GroupLedger
 from django.db import transaction as db_transaction
 import logging
 
@@ -140,86 +146,24 @@ def convert_reminder():
     The function `convert_reminder` converts auto_add reminder transactions
     that have a date of today or earlier.  Resets reminder dates to next dates.
 
+    Due reminders are converted together (see
+    reminders.services.conversion), then their caches are rebuilt and each
+    touched account is refreshed once.
     """
-
-    # Define todays date
-    today = timezone.now()
-    tz_timezone = pytz.timezone(os.environ.get("TIMEZONE"))
-    today_tz = today.astimezone(tz_timezone).date()
-    todayDate = today_tz.strftime("%Y-%m-%d")
-
-    # Get reminders that have a next date of today or earlier
-    reminders = Reminder.objects.filter(next_date__lte=todayDate)
-
-    # Add transactions and modify next date
-    if reminders and len(reminders) > 0:
-        pending_status_id = TransactionStatus.objects.values_list('id', flat=True).get(slug='pending')
-        for reminder in reminders:
-            if reminder.auto_add:
-                if not ReminderExclusion.objects.filter(
-                    reminder_id=reminder.id, exclude_date=todayDate
-                ).first():
-                    # If auto_add is True, add transaction
-                    transactions_to_create = []
-                    tags = []
-                    tag_obj = CustomTag(
-                        tag_name=reminder.tag.tag_name,
-                        tag_amount=reminder.amount,
-                        tag_id=reminder.tag.id,
-                        tag_full_toggle=True,
-                    )
-                    tags.append(tag_obj)
-                    destination_account = None
-                    if reminder.reminder_destination_account:
-                        destination_account = (
-                            reminder.reminder_destination_account.id
-                        )
-                    transaction = FullTransaction(
-                        transaction_date=todayDate,
-                        total_amount=reminder.amount,
-                        status_id=pending_status_id,
-                        memo=reminder.memo,
-                        description=reminder.description,
-                        edit_date=todayDate,
-                        add_date=todayDate,
-                        transaction_type_id=reminder.transaction_type.id,
-                        paycheck_id=None,
-                        source_account_id=reminder.reminder_source_account.id,
-                        destination_account_id=destination_account,
-                        tags=tags,
-                        checkNumber=None,
-                    )
-                    transactions_to_create.append(transaction)
-                    create_transactions(transactions_to_create)
-                    task_logger.info("Reminder transaction auto-added")
-
-            # Modify the next due and start date of the reminder
-            repeat = Repeat.objects.get(id=reminder.repeat.id)
-            nextDate = today_tz
-
-            # Loop through to find next date not excluded
-            while True:
-                nextDate += relativedelta(days=repeat.days)
-                nextDate += relativedelta(weeks=repeat.weeks)
-                nextDate += relativedelta(months=repeat.months)
-                nextDate += relativedelta(years=repeat.years)
-                if not ReminderExclusion.objects.filter(
-                    reminder_id=reminder.id, exclude_date=nextDate
-                ).first():
-                    break
-
-            # Check if the next date is not after Reminder end date, delete
-            # reminder if it is.
-            if (
-                reminder.end_date is not None and nextDate <= reminder.end_date
-            ) or reminder.end_date is None:
-                reminder.next_date = nextDate
-                reminder.start_date = nextDate
-                reminder.save()
-                task_logger.info("Reminder dates reset")
-            else:
-                reminder.delete()
-                task_logger.info("Reminder deleted: no more transactions")
+    result = convert_due_reminders(get_todays_date_timezone_adjusted())
+    if not result.account_ids:
+        return
+    if result.created:
+        task_logger.info(f"{result.created} reminder transaction(s) auto-added")
+    if result.rescheduled_ids:
+        rebuild_reminder_caches(result.rescheduled_ids)
+        task_logger.info(f"{len(result.rescheduled_ids)} reminder(s) dates reset")
+    if result.deleted:
+        task_logger.info(f"{result.deleted} reminder(s) deleted: no more transactions")
+    refresh_accounts(result.account_ids)
+    broadcast_invalidate(
+        REMINDER_BROADCAST_KEYS, account_ids=sorted(result.account_ids)
+    )
 
 
 def roll_over_budgets():
@@ -329,8 +273,8 @@ def finish_imports():
         for i in range(0, len(lst), chunk_size):
             yield lst[i : i + chunk_size]
 
-    # Check if there are any file imports
-    file_imports = FileImport.objects.filter(processed=False)
+    # Check if there are any file imports whose lines are fully staged
+    file_imports = FileImport.objects.filter(processed=False, staged=True)
 
     # If there is an import, process it
     if file_imports.exists():
@@ -388,9 +332,17 @@ def finish_imports():
                             memo = transaction_line.memo
                             description = transaction_line.description
                             typeID = transaction_line.transaction_type_id
-                            tags = TransactionImportTag.objects.filter(
-                                transaction_import=transaction_line
-                            )
+                            tags = [
+                                CustomTag(
+                                    tag_name=line_tag.tag_name,
+                                    tag_amount=line_tag.tag_amount,
+                                    tag_id=line_tag.tag_id,
+                                    tag_full_toggle=False,
+                                )
+                                for line_tag in TransactionImportTag.objects.filter(
+                                    transaction_import=transaction_line
+                                )
+                            ]
                             destinationAccountID = (
                                 transaction_line.destination_account_id
                             )
@@ -510,6 +462,26 @@ def finish_imports():
     return string_return
 
 
+def stage_file_import(file_import_id, payload):
+    """
+    Stages the lines of a large upload outside the request, chunk by chunk,
+    advancing the FileImport's staged_lines as it goes. A failed upload is
+    marked processed and unsuccessful so it is neither imported nor polled
+    forever.
+    """
+    from imports.api.schemas.import_file import MappingDefinition
+    from imports.services.import_file import stage_file_import as stage
+
+    file_import = FileImport.objects.get(id=file_import_id)
+    try:
+        stage(file_import, MappingDefinition.model_validate(payload), track_progress=True)
+        task_logger.info(f"File import ID #{file_import_id} staged")
+    except Exception as e:
+        FileImport.objects.filter(id=file_import_id).update(processed=True, successful=False)
+        task_logger.error(f"File import ID #{file_import_id} could not be staged")
+        error_logger.exception(f"{str(e)}")
+
+
 def prune_task_history():
     """
     Delete old django-q2 task history records.
@@ -529,14 +501,14 @@ def prune_task_history():
     )
 
 
-def archive_transactions():
+def archive_transactions(verify=False):
     """
-    Marks old transactions as archived and updates each account's archive_balance.
+    Marks old transactions as archived and adds them to each account's
+    archive_balance (see transactions.services.archive).
 
-    Two correlated subqueries compute the signed sum of all archived transactions
-    for each account as source and as destination separately, then combine them.
-    This avoids a single GROUP BY that would conflate the two perspectives for
-    transfer transactions.
+    Args:
+        verify (bool): Also recompute every archive_balance from scratch,
+            logging and repairing any account that drifted.
     """
     try:
         # Load archive options
@@ -550,154 +522,106 @@ def archive_transactions():
             cutoff_year = past_date.year
             cutoff_date = date(cutoff_year, 12, 31)
 
-            # Set matching transactions status to archive
-            transactions = Transaction.objects.filter(
-                transaction_date__lte=cutoff_date
-            )
-            archived_status_id = TransactionStatus.objects.values_list('id', flat=True).get(slug='archived')
-            transactions.update(status_id=archived_status_id)
+            deltas = archive_through(cutoff_date)
+            task_logger.info(f"Archive balances updated for {len(deltas)} account(s)")
+        else:
+            task_logger.debug("No auto archive")
+        if verify:
+            mismatches = verify_archive_balances(repair=True)
+            for account_id, (stored, recomputed) in mismatches.items():
+                task_logger.warning(
+                    f"Account {account_id} archive balance {stored} repaired to {recomputed}"
+                )
+        task_logger.info("Transactions successfully archived.")
+    except Exception as e:
+        task_logger.error("Transactions not archived")
+        error_logger.exception(f"{str(e)}")
+        return f"Error archiving transactions: {str(e)}"
 
-            # For each account, update archive balance with the sum of all
-            # archived transactions
 
-            # Subquery to calculate sum of pretty_total grouped by source_account_id
-            source_balance_subquery = (
-                Transaction.objects.filter(
-                    source_account_id=OuterRef("pk"),
-                    status__slug='archived',
-                )
-                .annotate(
-                    pretty_total=Case(
-                        When(
-                            transaction_type__slug='income', then=Abs(F("total_amount"))
-                        ),
-                        When(
-                            transaction_type__slug='expense', then=-Abs(F("total_amount"))
-                        ),
-                        When(
-                            transaction_type__slug='transfer',
-                            then=Case(
-                                When(
-                                    source_account_id=OuterRef("pk"),
-                                    then=-Abs(F("total_amount")),
-                                ),
-                                default=Abs(F("total_amount")),
-                                output_field=DecimalField(
-                                    max_digits=12, decimal_places=2
-                                ),
-                            ),
-                        ),
-                        default=Value(
-                            0,
-                            output_field=DecimalField(
-                                max_digits=12, decimal_places=2
-                            ),
-                        ),
-                        output_field=DecimalField(
-                            max_digits=12, decimal_places=2
-                        ),
-                    )
-                )
-                .values("source_account_id")
-                .annotate(balance=Sum("pretty_total"))
-                .values("balance")[:1]
+def _reminder_cache_transactions(reminder, today, pending_status_id):
+    """
+    Returns the FullReminderTransaction occurrences of reminder from its next
+    date up to 1 year out (or its end date), or exactly one for a zero-delta
+    Repeat.
+    """
+    max_end_date = today + relativedelta(years=1)
+    calculated_end_date = max_end_date
+    if reminder.end_date is not None and reminder.end_date <= max_end_date:
+        calculated_end_date = reminder.end_date
+
+    def occurrence(working_date):
+        tags = [
+            CustomTag(
+                tag_name=reminder.tag.tag_name,
+                tag_amount=reminder.amount,
+                tag_id=reminder.tag.id,
+                tag_full_toggle=True,
             )
+        ]
+        return FullReminderTransaction(
+            transaction_date=working_date,
+            total_amount=reminder.amount,
+            status_id=pending_status_id,
+            memo=reminder.memo,
+            description=reminder.description,
+            edit_date=today,
+            add_date=today,
+            transaction_type_id=reminder.transaction_type_id,
+            paycheck_id=None,
+            source_account_id=reminder.reminder_source_account_id,
+            destination_account_id=reminder.reminder_destination_account_id,
+            tags=tags,
+            checkNumber=None,
+            reminder_id=reminder.id,
+        )
 
-            # Subquery to calculate sum of pretty_total grouped by destination_account_id
-            destination_balance_subquery = (
-                Transaction.objects.filter(
-                    destination_account_id=OuterRef("pk"),
-                    status__slug='archived',
-                )
-                .annotate(
-                    pretty_total=Case(
-                        When(
-                            transaction_type__slug='income', then=Abs(F("total_amount"))
-                        ),
-                        When(
-                            transaction_type__slug='expense', then=-Abs(F("total_amount"))
-                        ),
-                        When(
-                            transaction_type__slug='transfer',
-                            then=Case(
-                                When(
-                                    destination_account_id=OuterRef("pk"),
-                                    then=Abs(F("total_amount")),
-                                ),
-                                default=Abs(F("total_amount")),
-                                output_field=DecimalField(
-                                    max_digits=12, decimal_places=2
-                                ),
-                            ),
-                        ),
-                        default=Value(
-                            0,
-                            output_field=DecimalField(
-                                max_digits=12, decimal_places=2
-                            ),
-                        ),
-                        output_field=DecimalField(
-                            max_digits=12, decimal_places=2
-                        ),
-                    )
-                )
-                .values("destination_account_id")
-                .annotate(balance=Sum("pretty_total"))
-                .values("balance")[:1]
+    working_date = reminder.next_date
+    delta = relativedelta(
+        days=reminder.repeat.days,
+        weeks=reminder.repeat.weeks,
+        months=reminder.repeat.months,
+        years=reminder.repeat.years,
+    )
+
+    # For no repeat, just enter next transaction
+    if delta == relativedelta():
+        return [occurrence(working_date)]
+
+    transactions_to_create = []
+    while working_date <= calculated_end_date:
+        transactions_to_create.append(occurrence(working_date))
+        prev = working_date
+        working_date += delta
+
+        if working_date == prev:
+            raise RuntimeError(
+                "working_date did not advance — infinite loop detected"
             )
+    return transactions_to_create
 
-            # Annotate the Account queryset with the combined balance
-            accounts = (
-                Account.objects.all()
-                .annotate(
-                    source_balance=Coalesce(
-                        Subquery(
-                            source_balance_subquery,
-                            output_field=DecimalField(
-                                max_digits=12, decimal_places=2
-                            ),
-                        ),
-                        Value(
-                            0,
-                            output_field=DecimalField(
-                                max_digits=12, decimal_places=2
-                            ),
-                        ),
-                    ),
-                    destination_balance=Coalesce(
-                        Subquery(
-                            destination_balance_subquery,
-                            output_field=DecimalField(
-                                max_digits=12, decimal_places=2
-                            ),
-                        ),
-                        Value(
-                            0,
-                            output_field=DecimalField(
-                                max_digits=12, decimal_places=2
-                            ),
-                        ),
-                    ),
-                )
-                .annotate(
-                    balance=ExpressionWrapper(
-                        F("source_balance") + F("destination_balance"),
-                        output_field=DecimalField(
-                            max_digits=12, decimal_places=2
-                        ),
-                    )
-                )
+
+def _refresh_forecast_series(*account_ids):
+    """
+    Writes fresh forecast chart series once an account's forecast rows change,
+    for the accounts and for their parent accounts, whose registers and series
+    roll the children's rows up.
+    """
+    try:
+        account_ids = [account_id for account_id in account_ids if account_id is not None]
+        parent_ids = [
+            parent_id
+            for parent_id in dict.fromkeys(
+                reference.parent_account_id(account_id) for account_id in account_ids
             )
-            for account in accounts:
-                account.archive_balance = account.balance
-                account.save()
-        else:
-            task_logger.debug("No auto archive")
-        task_logger.info("Transactions successfully archived.")
+            if parent_id is not None
+        ]
+        for parent_id in parent_ids:
+            delete_pattern(account_all_transactions(parent_id))
+        rebuild_forecast_series(account_ids + parent_ids)
     except Exception as e:
-        task_logger.error("Transactions not archived")
-        error_logger.exception(f"{str(e)}")
-        return f"Error archiving transactions: {str(e)}"
+        task_logger.warning("There was an error rebuilding forecast series")
+        error_logger.warning(f"{str(e)}")
 
 
 def update_reminder_cache(reminder_id):
@@ -711,103 +635,17 @@ def update_reminder_cache(reminder_id):
     source and destination accounts.
     """
     try:
-        # Set up variables
         today = get_todays_date_timezone_adjusted()
-        max_end_date = today + relativedelta(years=1)
-        calculated_end_date = max_end_date
-        transactions_to_create = []
 
         # Delete any existing cache entries for this reminder
         ReminderCacheTransaction.objects.filter(
             reminder_id=reminder_id
         ).delete()
 
-        # Get Reminder object
         reminder = Reminder.objects.get(id=reminder_id)
-
-        # Calculate Max End date
-        if reminder.end_date is not None and reminder.end_date <= max_end_date:
-            calculated_end_date = reminder.end_date
-
-        # Loop through and create cache transactions
-        working_date = reminder.next_date
-        delta = relativedelta(
-            days=reminder.repeat.days,
-            weeks=reminder.repeat.weeks,
-            months=reminder.repeat.months,
-            years=reminder.repeat.years,
+        transactions_to_create = _reminder_cache_transactions(
+            reminder, today, reference.status_id('pending')
         )
-        pending_status_id = TransactionStatus.objects.values_list('id', flat=True).get(slug='pending')
-
-        # For no repeat, just enter next transaction
-        if delta == relativedelta():
-            tags = []
-            tag_obj = CustomTag(
-                tag_name=reminder.tag.tag_name,
-                tag_amount=reminder.amount,
-                tag_id=reminder.tag.id,
-                tag_full_toggle=True,
-            )
-            tags.append(tag_obj)
-            destination_account = None
-            if reminder.reminder_destination_account:
-                destination_account = reminder.reminder_destination_account.id
-            transaction = FullReminderTransaction(
-                transaction_date=working_date,
-                total_amount=reminder.amount,
-                status_id=pending_status_id,
-                memo=reminder.memo,
-                description=reminder.description,
-                edit_date=today,
-                add_date=today,
-                transaction_type_id=reminder.transaction_type.id,
-                paycheck_id=None,
-                source_account_id=reminder.reminder_source_account.id,
-                destination_account_id=destination_account,
-                tags=tags,
-                checkNumber=None,
-                reminder_id=reminder.id,
-            )
-            transactions_to_create.append(transaction)
-        else:
-            while working_date <= calculated_end_date:
-                tags = []
-                tag_obj = CustomTag(
-                    tag_name=reminder.tag.tag_name,
-                    tag_amount=reminder.amount,
-                    tag_id=reminder.tag.id,
-                    tag_full_toggle=True,
-                )
-                tags.append(tag_obj)
-                destination_account = None
-                if reminder.reminder_destination_account:
-                    destination_account = (
-                        reminder.reminder_destination_account.id
-                    )
-                transaction = FullReminderTransaction(
-                    transaction_date=working_date,
-                    total_amount=reminder.amount,
-                    status_id=pending_status_id,
-                    memo=reminder.memo,
-                    description=reminder.description,
-                    edit_date=today,
-                    add_date=today,
-                    transaction_type_id=reminder.transaction_type.id,
-                    paycheck_id=None,
-                    source_account_id=reminder.reminder_source_account.id,
-                    destination_account_id=destination_account,
-                    tags=tags,
-                    checkNumber=None,
-                    reminder_id=reminder.id,
-                )
-                transactions_to_create.append(transaction)
-                prev = working_date
-                working_date += delta
-
-                if working_date == prev:
-                    raise RuntimeError(
-                        "working_date did not advance — infinite loop detected"
-                    )
 
         create_transactions(transactions_to_create, "reminder")
         delete_pattern(account_all_transactions(reminder.reminder_source_account.id))
@@ -815,18 +653,55 @@ def update_reminder_cache(reminder_id):
         if reminder.reminder_destination_account is not None:
             delete_pattern(account_all_transactions(reminder.reminder_destination_account.id))
             update_cc_forecast_cache(reminder.reminder_destination_account.id)
-        broadcast_invalidate(["reminders", "accounts", "account_forecast", "tag_graph"])
+        _refresh_forecast_series(
+            reminder.reminder_source_account_id,
+            reminder.reminder_destination_account_id,
+        )
+        broadcast_invalidate(
+            REMINDER_BROADCAST_KEYS,
+            account_ids=[
+                reminder.reminder_source_account_id,
+                reminder.reminder_destination_account_id,
+            ],
+        )
     except Exception as e:
         task_logger.warning("There was an error creating cache")
         error_logger.warning(f"{str(e)}")
 
 
+def rebuild_reminder_caches(reminder_ids):
+    """
+    Rebuilds the ReminderCacheTransaction entries of several reminders with one
+    delete and one bulk create. Account caches are left to the caller.
+    """
+    today = get_todays_date_timezone_adjusted()
+    pending_status_id = reference.status_id('pending')
+    reminders = Reminder.objects.filter(id__in=reminder_ids).select_related(
+        "repeat", "tag__parent", "tag__child"
+    )
+    transactions_to_create = []
+    for reminder in reminders:
+        try:
+            transactions_to_create.extend(
+                _reminder_cache_transactions(reminder, today, pending_status_id)
+            )
+        except Exception as e:
+            task_logger.warning(f"There was an error creating cache for reminder {reminder.id}")
+            error_logger.warning(f"{str(e)}")
+    with db_transaction.atomic():
+        ReminderCacheTransaction.objects.filter(
+            reminder_id__in=reminder_ids
+        ).delete()
+        create_transactions(transactions_to_create, "reminder")
+
+
 def _build_interest_transactions(
-    balance, reminder_qs_list, annual_rate, interest_deposit_day,
-    source_account_id, description_name, status, income_type_id, today, end_date
+    balance, reminder_sums, annual_rate, interest_deposit_day,
+    source_account_id, description_name, status_id, income_type_id, today, end_date
 ):
     """
     Shared monthly-compounding loop for both standalone and parent-group interest.
+    reminder_sums is the group's PeriodSums of projected reminder amounts.
     Returns a list of FullTransaction objects.
     """
     transactions_to_create = []
@@ -835,13 +710,7 @@ def _build_interest_transactions(
     while period_start < end_date:
         period_end = increment_date(period_start, 'm', 1)
 
-        for reminder_qs in reminder_qs_list:
-            balance += (
-                reminder_qs.filter(
-                    transaction_date__gt=period_start,
-                    transaction_date__lte=period_end,
-                ).aggregate(sum=Sum('pretty_total'))['sum'] or Decimal(0)
-            )
+        balance += reminder_sums.between(period_start, period_end)
 
         if balance > 0:
             interest = calculate_interest(balance, annual_rate, period_start, period_end)
@@ -857,7 +726,7 @@ def _build_interest_transactions(
                     FullTransaction(
                         transaction_date=transaction_date,
                         total_amount=interest,
-                        status_id=status.id,
+                        status_id=status_id,
                         memo="Interest",
                         description=f"({description_name} Estimated Interest)",
                         edit_date=today,
@@ -877,16 +746,39 @@ def _build_interest_transactions(
     return transactions_to_create
 
 
+def _write_interest_forecast(ledger, account, source_account_id):
+    """
+    Replaces the ForecastCacheTransactions of source_account_id with a year of
+    monthly interest on ledger's balance, at account's rate.
+    """
+    today = get_todays_date_timezone_adjusted()
+    transactions_to_create = _build_interest_transactions(
+        ledger.balance(), ledger.reminder_sums(), account.annual_rate,
+        account.interest_deposit_day, source_account_id, account.account_name,
+        reference.status_id('pending'), reference.type_id('income'),
+        today, today + relativedelta(years=1),
+    )
+    with db_transaction.atomic():
+        ForecastCacheTransaction.objects.filter(
+            Q(source_account_id=source_account_id) | Q(destination_account_id=source_account_id)
+        ).delete()
+        create_transactions(transactions_to_create, 'forecast')
+
+
 def _update_parent_group_interest_forecast(parent):
     """
     Compute interest on the combined balance of all child accounts and write
     ForecastCacheTransactions to parent.interest_child_account.
+
+    The children, their balance and their reminder projections are each read
+    once, so the rebuild runs a fixed number of queries however many
+    children the parent has.
     """
     try:
         interest_child = parent.interest_child_account
-        children = list(Account.objects.filter(parent_account_id=parent.id))
+        ledger = GroupLedger.for_parent(parent.id)
 
-        if not children or not interest_child:
+        if ledger is None or not interest_child:
             return
 
         if not parent.calculate_interest or not parent.annual_rate:
@@ -895,48 +787,14 @@ def _update_parent_group_interest_forecast(parent):
             ).delete()
             delete_pattern(account_all(interest_child.id))
             delete_pattern(account_all(parent.id))
+            versions.bump_accounts([interest_child.id, parent.id])
             return
 
-        today = get_todays_date_timezone_adjusted()
-        end_date = today + relativedelta(years=1)
-        income_type_id = TransactionType.objects.values_list('id', flat=True).get(slug='income')
-        status = TransactionStatus.objects.get(slug='pending')
-
-        # Sum balance and reminder querysets across all children.
-        # Internal transfers between children cancel out naturally when each
-        # child's annotated total is computed from its own perspective.
-        combined_balance = Decimal(0)
-        reminder_qs_list = []
-        for child in children:
-            txns = Transaction.objects.filter(
-                Q(source_account_id=child.id) | Q(destination_account_id=child.id)
-            ).exclude(status__slug='archived')
-            txns = annotate_transaction_total(txns, child.id)
-            combined_balance += (
-                Decimal(child.opening_balance or 0)
-                + Decimal(child.archive_balance or 0)
-                + (txns.aggregate(sum=Sum('pretty_total'))['sum'] or Decimal(0))
-            )
-
-            reminders = ReminderCacheTransaction.objects.filter(
-                Q(source_account_id=child.id) | Q(destination_account_id=child.id)
-            ).exclude(status__slug='archived')
-            reminders = annotate_transaction_total(reminders, child.id)
-            reminder_qs_list.append(reminders)
-
-        transactions_to_create = _build_interest_transactions(
-            combined_balance, reminder_qs_list, parent.annual_rate,
-            parent.interest_deposit_day, interest_child.id, parent.account_name,
-            status, income_type_id, today, end_date,
-        )
-
-        with db_transaction.atomic():
-            ForecastCacheTransaction.objects.filter(
-                Q(source_account_id=interest_child.id) | Q(destination_account_id=interest_child.id)
-            ).delete()
-            create_transactions(transactions_to_create, 'forecast')
+        _write_interest_forecast(ledger, parent, interest_child.id)
         delete_pattern(account_all(interest_child.id))
         delete_pattern(account_all(parent.id))
+        versions.bump_accounts([interest_child.id, parent.id])
+        _refresh_forecast_series(interest_child.id, parent.id)
     except Exception as e:
         error_logger.exception(
             f"Error calculating parent group interest forecast for parent {parent.id}: {e}"
@@ -950,7 +808,7 @@ def update_interest_forecast_cache(account_id):
 
     For child accounts under a parent: delegates to the parent group calculation.
     For parent accounts: uses combined child balance, writes to interest_child_account.
-    For standalone accounts: existing single-account behavior.
+    For standalone accounts: the same calculation over a group of one.
     """
     try:
         account = Account.objects.select_related(
@@ -972,7 +830,7 @@ def update_interest_forecast_cache(account_id):
             _update_parent_group_interest_forecast(account)
         return
 
-    # Standalone account — existing behavior
+    # Standalone account
     if account.account_type.slug not in {'savings', 'investment'}:
         return
 
@@ -984,40 +842,13 @@ def update_interest_forecast_cache(account_id):
         return
 
     try:
-        today = get_todays_date_timezone_adjusted()
-        end_date = today + relativedelta(years=1)
-        income_type_id = TransactionType.objects.values_list('id', flat=True).get(slug='income')
-        status = TransactionStatus.objects.get(slug='pending')
-
-        transactions_qs = Transaction.objects.filter(
-            Q(source_account_id=account_id) | Q(destination_account_id=account_id)
-        ).exclude(status__slug='archived')
-        transactions_qs = annotate_transaction_total(transactions_qs, account_id)
-
-        reminder_qs = ReminderCacheTransaction.objects.filter(
-            Q(source_account_id=account_id) | Q(destination_account_id=account_id)
-        ).exclude(status__slug='archived')
-        reminder_qs = annotate_transaction_total(reminder_qs, account_id)
-
-        balance = (
-            Decimal(account.opening_balance or 0)
-            + Decimal(account.archive_balance or 0)
-            + (transactions_qs.aggregate(sum=Sum('pretty_total'))['sum'] or Decimal(0))
-        )
-
-        transactions_to_create = _build_interest_transactions(
-            balance, [reminder_qs], account.annual_rate,
-            account.interest_deposit_day, account_id, account.account_name,
-            status, income_type_id, today, end_date,
-        )
-
-        with db_transaction.atomic():
-            ForecastCacheTransaction.objects.filter(
-                Q(source_account_id=account_id) | Q(destination_account_id=account_id)
-            ).delete()
-            create_transactions(transactions_to_create, 'forecast')
+        _write_interest_forecast(GroupLedger.from_accounts([account]), account, account_id)
         delete_pattern(account_all(account_id))
-        broadcast_invalidate(["accounts"])
+        _refresh_forecast_series(account_id)
+        broadcast_invalidate(
+            ["accounts", "account_forecast", "transactions"],
+            account_ids=[account_id],
+        )
     except Exception as e:
         error_logger.exception(
             f"Error calculating interest forecast for account {account_id}: {e}"
@@ -1044,6 +875,15 @@ def update_cc_forecast_cache(account_id):
     if account.account_type.slug != 'credit-card':
         return
 
+    # Keep the persisted statement cycles current whether or not payments are forecast
+    today = get_todays_date_timezone_adjusted()
+    end_date = today + relativedelta(years=1)
+    try:
+        cycles = sync_statement_cycles(account, end_date, today)
+    except Exception as e:
+        error_logger.exception(f"Error syncing statement cycles for account {account_id}: {e}")
+        return
+
     # Exit if cc calculations are turned off — clear any stale records and bail
     if not account.calculate_payments:
         ForecastCacheTransaction.objects.filter(
@@ -1068,17 +908,12 @@ def update_cc_forecast_cache(account_id):
         payment_strategy = account.payment_strategy
         payment_amount = account.payment_amount
         minimum_payment_amount = account.minimum_payment_amount
-        today = get_todays_date_timezone_adjusted()
-        end_date = today + relativedelta(years=1)
         temp_id = -10001
-        status = TransactionStatus.objects.get(slug='pending')
-        expense_type_id = TransactionType.objects.values_list('id', flat=True).get(slug='expense')
-        transfer_type_id = TransactionType.objects.values_list('id', flat=True).get(slug='transfer')
+        pending_status_id = reference.status_id('pending')
+        expense_type_id = reference.type_id('expense')
+        transfer_type_id = reference.type_id('transfer')
         interest_calculations = account.calculate_interest
         transactions_to_create = []
-        statement_day = account.statement_day
-        due_day = account.due_day
-        pay_day = account.pay_day
         non_trans_bal = account.archive_balance + account.opening_balance
 
         # Get real transactions for this account
@@ -1101,17 +936,11 @@ def update_cc_forecast_cache(account_id):
             reminder_cache_qs, account_id
         )
 
-        # Calculate statement cycles
-        statement_cycles = generate_statement_cycles(
-            statement_day,
-            due_day,
-            pay_day,
-            end_date,
-            statement_cycle_length,
-            statement_cycle_period,
+        # Add reminder totals to the persisted statement cycles
+        statement_cycles = forecast_statement_cycles(
+            cycles,
             transactions_qs,
             reminder_cache_qs,
-            account_id,
             non_trans_bal,
         )
 
@@ -1158,7 +987,7 @@ def update_cc_forecast_cache(account_id):
                         transaction = FullTransaction(
                             transaction_date=cycle["statement_end"],
                             total_amount=cycle_interest,
-                            status_id=status.id,
+                            status_id=pending_status_id,
                             memo="Interest Charge",
                             description=f"({account.account_name} Estimated Interest)",
                             edit_date=today,
@@ -1225,7 +1054,7 @@ def update_cc_forecast_cache(account_id):
                         transaction = FullTransaction(
                             transaction_date=cycle["statement_pay_day"],
                             total_amount=abs(remaining_payment),
-                            status_id=status.id,
+                            status_id=pending_status_id,
                             memo=None,
                             description=f"({account.account_name} Estimated Payment)",
                             edit_date=today,
@@ -1254,152 +1083,61 @@ def update_cc_forecast_cache(account_id):
         delete_pattern(account_all(account_id))
         if funding_account:
             delete_pattern(account_all(funding_account.id))
-        broadcast_invalidate(["accounts"])
+        _refresh_forecast_series(account_id, funding_account.id if funding_account else None)
+        broadcast_invalidate(
+            ["accounts", "account_forecast", "transactions"],
+            account_ids=[account_id, funding_account.id if funding_account else None],
+        )
     except Exception as e:
         error_logger.exception(f"Error calculating CC forecast for account {account_id}: {e}")
 
 
-def generate_statement_cycles(
-    statement_day: int,
-    due_day: int,
-    pay_day: int,
-    forecast_end_date: date,
-    statement_cycle_length: int,
-    statement_cycle_period: str,
+def forecast_statement_cycles(
+    cycles: List[StatementCycle],
     transactions: QuerySet,
     reminder_transactions: QuerySet,
-    account_id: int,
     non_trans_bal: Decimal,
 ):
     """
-    Generates one dict per statement cycle from the most-recently-closed period
-    through forecast_end_date, each containing credits, debits, due/pay dates,
-    and the running previous_balance used by update_cc_forecast_cache.
-
-    Always anchors to one_month_prior so the just-closed cycle (with its upcoming
-    payment due date) is included. Due/pay dates are pushed forward one month when
-    their day-of-month would land before the statement closes (e.g. due on the 15th
-    for a card that closes on the 18th).
-    """
-    statement_cycles = []
-    today = get_todays_date_timezone_adjusted()
-    one_month_prior = today - relativedelta(months=1)
-
-    # Always start from the most recently closed statement period so the
-    # just-closed cycle (with its upcoming payment due date) is included.
-    # Previously the if/else split caused today.day > statement_day to skip
-    # the just-closed period, and due/pay dates were incremented at the top
-    # of the loop (one month too late). Both are fixed here.
-    statement_start = one_month_prior.replace(day=statement_day)
-
-    # Anchor due/pay dates to after the first cycle's statement_end.
-    # When due_day or pay_day < statement_day, a naive +1-month formula
-    # lands before the statement closes; push forward by one more month.
-    _first_end = increment_date(statement_start, statement_cycle_period, statement_cycle_length)
-    _candidate_due = _first_end.replace(day=due_day)
-    if _candidate_due < _first_end:
-        _candidate_due += relativedelta(months=1)
-    statement_due = _candidate_due
-
-    _candidate_pay = _first_end.replace(day=pay_day)
-    if _candidate_pay < _first_end:
-        _candidate_pay += relativedelta(months=1)
-    statement_pay_day = _candidate_pay
+    Statement cycle dicts for update_cc_forecast_cache, built from the
+    persisted cycles plus the reminder totals of each.
 
+    previous_balance is set so the running balance at the end of the last
+    closed cycle matches the account's real transactions, since a closed
+    cycle's stored totals miss anything written into it after it closed.
+    """
+    closed = [index for index, cycle in enumerate(cycles) if cycle.closed]
+    if closed:
+        balance_date = cycles[closed[-1]].statement_end
+        counted = cycles[:closed[-1] + 1]
+    else:
+        balance_date = cycles[0].statement_start
+        counted = []
     previous_balance = (
-        transactions.filter(
-            transaction_date__lte=statement_start,
-        ).aggregate(
-            sum=Sum("pretty_total")
-        )["sum"]
-        or 0
-    ) + non_trans_bal
-    while statement_start <= forecast_end_date:
-        statement_end = increment_date(
-            statement_start, statement_cycle_period, statement_cycle_length
-        )
-
-        statement_transaction_credits = (
-            transactions.filter(
-                transaction_date__gt=statement_start,
-                transaction_date__lte=statement_end,
-                pretty_total__gt=0,
-            ).aggregate(sum=Sum("pretty_total"))["sum"]
+        (
+            transactions.filter(transaction_date__lte=balance_date)
+            .aggregate(sum=Sum("pretty_total"))["sum"]
             or 0
         )
-
-        statement_transaction_debits = (
-            transactions.filter(
-                transaction_date__gt=statement_start,
-                transaction_date__lte=statement_end,
-                pretty_total__lt=0,
-            ).aggregate(sum=Sum("pretty_total"))["sum"]
-            or 0
-        )
-
-        statement_reminder_credits = (
-            reminder_transactions.filter(
-                transaction_date__gt=statement_start,
-                transaction_date__lte=statement_end,
-                pretty_total__gt=0,
-            ).aggregate(sum=Sum("pretty_total"))["sum"]
-            or 0
-        )
-
-        statement_reminder_debits = (
-            reminder_transactions.filter(
-                transaction_date__gt=statement_start,
-                transaction_date__lte=statement_end,
-                pretty_total__lt=0,
-            ).aggregate(sum=Sum("pretty_total"))["sum"]
-            or 0
-        )
-        statement_credits = (
-            statement_transaction_credits + statement_reminder_credits
-        )
-        statement_debits = (
-            statement_transaction_debits + statement_reminder_debits
-        )
-        statement_cycles.append(
-            {
-                "statement_start": statement_start,
-                "statement_end": statement_end,
-                "statement_due": statement_due,
-                "statement_pay_day": statement_pay_day,
-                "statement_credits": statement_credits,
-                "statement_debits": statement_debits,
-                "previous_balance": previous_balance,
-            }
-        )
-        statement_start = statement_end
-        statement_due = increment_date(statement_due, "m", 1)
-        statement_pay_day = increment_date(statement_pay_day, "m", 1)
-    return statement_cycles
-
-
-def increment_date(incr_date: date, period: str, length: int):
-    """
-    The function `increment_date` increments a given date by the provided length
-    and period.
-
-    Args:
-        incr_date (date): The date to increment.
-        period (str): d = week, w = week, m = month, y = year.
-        length (int): Length of the period.
-
-    Returns:
-        (date): Returns the new date
-    """
-    if period == "d":
-        return incr_date + relativedelta(days=length)
-    elif period == "w":
-        return incr_date + relativedelta(weeks=length)
-    elif period == "m":
-        return incr_date + relativedelta(months=length)
-    elif period == "y":
-        return incr_date + relativedelta(years=length)
-    else:
-        raise ValueError(f"Unsupported period: {period}")
+        + non_trans_bal
+        - sum((cycle.credits + cycle.debits for cycle in counted), Decimal(0))
+    )
+    reminder_totals = cycle_totals(
+        reminder_transactions,
+        [(cycle.statement_start, cycle.statement_end) for cycle in cycles],
+    )
+    return [
+        {
+            "statement_start": cycle.statement_start,
+            "statement_end": cycle.statement_end,
+            "statement_due": cycle.statement_due,
+            "statement_pay_day": cycle.statement_pay_day,
+            "statement_credits": cycle.credits + reminder_credits,
+            "statement_debits": cycle.debits + reminder_debits,
+            "previous_balance": previous_balance,
+        }
+        for cycle, (reminder_credits, reminder_debits) in zip(cycles, reminder_totals)
+    ]
 
 
 def annotate_transaction_total(
@@ -1574,128 +1312,16 @@ def run_scheduled_reports():
         broadcast_invalidate(["report_results"])
 
 
-def detect_recurring_transactions():
-    """Scan transaction history for recurring patterns and create DetectedRecurring records."""
-    from planning.models import DetectedRecurring
-    from reminders.models import Repeat, Reminder
-    from transactions.models import Transaction, TransactionStatus, TransactionDetail
-    from django.db.models import Count as _Count
-    from collections import defaultdict, Counter
-    from datetime import timedelta
-    from decimal import Decimal as D
-
-    today = date.today()
-    window_start = today - timedelta(days=400)
-
-    status_ids = list(
-        TransactionStatus.objects.filter(slug__in=["cleared", "reconciled", "archived"])
-        .values_list("id", flat=True)
-    )
-
-    txs = list(
-        Transaction.objects.filter(
-            transaction_date__gte=window_start,
-            status_id__in=status_ids,
-        )
-        .exclude(description__isnull=True)
-        .exclude(description="")
-        .values("id", "description", "transaction_date", "total_amount", "source_account_id")
-        .order_by("description", "transaction_date")
-    )
-
-    existing_descriptions = set(Reminder.objects.values_list("description", flat=True))
-    ignored_descriptions = set(
-        DetectedRecurring.objects.filter(is_ignored=True).values_list("description", flat=True)
-    )
-
-    repeat_by_days = {}
-    for r in Repeat.objects.all():
-        total_days = r.days + r.weeks * 7 + r.months * 30 + r.years * 365
-        if total_days > 0:
-            repeat_by_days[total_days] = r
-
-    # (period_days, tolerance_days, min_occurrences)
-    TARGET_PERIODS = [(7, 5, 3), (14, 5, 3), (30, 5, 3), (365, 14, 2)]
-
-    groups = defaultdict(list)
-    for tx in txs:
-        key = tx["description"].strip().lower()
-        groups[key].append(tx)
-
-    new_detections = []
-    for key, group in groups.items():
-        description = group[0]["description"].strip()
-        desc_lower = description.lower()
-        if any(desc_lower in d.lower() or d.lower() in desc_lower for d in existing_descriptions):
-            continue
-        if key in {d.strip().lower() for d in ignored_descriptions}:
-            continue
-
-        group = sorted(group, key=lambda t: t["transaction_date"])
-        dates = [t["transaction_date"] for t in group]
-        amounts = [abs(float(t["total_amount"])) for t in group]
-
-        if len(group) < 2:
-            continue
-
-        intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
-        avg_interval = sum(intervals) / len(intervals)
-
-        match = next(
-            ((p, tol, min_occ) for p, tol, min_occ in TARGET_PERIODS if abs(avg_interval - p) <= tol),
-            None,
-        )
-        if match is None:
-            continue
-        target, tolerance, min_occurrences = match
-        if len(group) < min_occurrences:
-            continue
-        if any(abs(iv - avg_interval) > tolerance for iv in intervals):
-            continue
-
-        avg_amount = sum(amounts) / len(amounts)
-        if avg_amount == 0:
-            continue
-        if any(abs(a - avg_amount) / avg_amount > 0.20 for a in amounts):
-            continue
-        recent_amount = amounts[-1]
-
-        if (today - dates[-1]).days > target + tolerance:
-            continue
-
-        next_date = dates[-1] + timedelta(days=target)
-        repeat = repeat_by_days.get(target)
-
-        tx_ids = [t["id"] for t in group]
-        tag_row = (
-            TransactionDetail.objects.filter(transaction_id__in=tx_ids)
-            .exclude(tag_id__isnull=True)
-            .values("tag_id")
-            .annotate(n=_Count("id"))
-            .order_by("-n")
-            .first()
-        )
-        suggested_tag_id = tag_row["tag_id"] if tag_row else None
-
-        account_counts = Counter(t["source_account_id"] for t in group if t["source_account_id"] is not None)
-        suggested_account_id = account_counts.most_common(1)[0][0] if account_counts else None
-
-        new_detections.append(
-            DetectedRecurring(
-                description=description,
-                estimated_amount=D(str(round(recent_amount, 2))),
-                repeat=repeat,
-                next_estimated_date=next_date,
-                transaction_ids=[t["id"] for t in group],
-                suggested_tag_id=suggested_tag_id,
-                suggested_account_id=suggested_account_id,
-            )
-        )
-
-    DetectedRecurring.objects.filter(is_ignored=False).delete()
+def detect_recurring_transactions(full=False):
+    """
+    Scan transaction history for recurring patterns and refresh the
+    DetectedRecurring suggestions. Only groups changed since the previous run
+    are re-evaluated unless full is set; see planning.services.recurring_detection.
+    """
+    from planning.services.recurring_detection import detect_recurring
 
+    new_detections = detect_recurring(full=full)
     if new_detections:
-        DetectedRecurring.objects.bulk_create(new_detections)
         create_message(
             f"{len(new_detections)} recurring transaction pattern(s) detected. "
             "View suggestions under Planning → Detections.",
@@ -1707,6 +1333,23 @@ def detect_recurring_transactions():
     broadcast_invalidate(["detected_recurring"])
 
 
+def generate_transaction_image_thumbnail(image_id):
+    """
+    Generates the downscaled, EXIF-free preview of an uploaded attachment.
+    Queued after each upload; see transactions.services.attachments.
+    """
+    from transactions.services.attachments import generate_thumbnail
+    from transactions.models import TransactionImage
+
+    image = TransactionImage.objects.filter(id=image_id).first()
+    if image is None:
+        return
+    try:
+        if generate_thumbnail(image):
+            broadcast_invalidate(["transaction_images"])
+    except Exception as e:
+        error_logger.error(f"Thumbnail generation failed for attachment #{image_id}: {e}")
+
 # TODO: Task to look for negative dips
 # TODO: Task to look for under threshold
 # TODO: Task to update Credit Card specific information
@@ -0,0 +1,113 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+from accounts.models import Account
+from transactions.models import Transaction, TransactionStatus
+from transactions.services.archive import archive_through, verify_archive_balances
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+CUTOFF = date(2023, 12, 31)
+
+
+@pytest.fixture(autouse=True)
+def queued():
+    with patch("transactions.services.bulk_mutation.async_task") as task:
+        yield task
+
+
+@pytest.fixture
+def archived_status():
+    return TransactionStatus.objects.create(transaction_status="Archived")
+
+
+@pytest.fixture
+def ledger(
+    test_checking_account,
+    test_savings_account,
+    test_cleared_transaction_status,
+    test_expense_transaction_type,
+    test_income_transaction_type,
+    test_transfer_transaction_type,
+    archived_status,
+):
+    Account.objects.update(archive_balance=0)
+    rows = [
+        # (date, amount, type, source, destination)
+        (date(2023, 1, 5), 1000, test_income_transaction_type, test_checking_account, None),
+        (date(2023, 2, 5), 40, test_expense_transaction_type, test_checking_account, None),
+        (date(2023, 3, 5), 300, test_transfer_transaction_type, test_checking_account, test_savings_account),
+        (date(2024, 1, 5), 25, test_expense_transaction_type, test_checking_account, None),
+    ]
+    return [
+        Transaction.objects.create(
+            transaction_date=day,
+            total_amount=amount,
+            status=test_cleared_transaction_status,
+            transaction_type=transaction_type,
+            source_account=source,
+            destination_account=destination,
+        )
+        for day, amount, transaction_type, source, destination in rows
+    ]
+
+
+def _balances(*accounts):
+    return [Account.objects.get(id=a.id).archive_balance for a in accounts]
+
+
+def test_archive_adds_only_newly_archived_rows(
+    ledger, test_checking_account, test_savings_account, archived_status, queued,
+    django_assert_max_num_queries,
+):
+    with django_assert_max_num_queries(8):
+        deltas = archive_through(CUTOFF)
+
+    assert deltas == {
+        test_checking_account.id: Decimal("660"),
+        test_savings_account.id: Decimal("300"),
+    }
+    assert _balances(test_checking_account, test_savings_account) == [
+        Decimal("660"), Decimal("300"),
+    ]
+    assert Transaction.objects.filter(status=archived_status).count() == 3
+    interest_rebuilds = [
+        c for c in queued.call_args_list
+        if c.args[0] == "transactions.tasks.update_interest_forecast_cache"
+    ]
+    assert len(interest_rebuilds) == 2
+
+    # A second run over the same cutoff archives nothing new.
+    assert archive_through(CUTOFF) == {}
+    assert _balances(test_checking_account) == [Decimal("660")]
+    assert verify_archive_balances() == {}
+
+
+def test_incremental_matches_full_recompute(ledger, test_checking_account):
+    archive_through(date(2023, 2, 28))
+    archive_through(CUTOFF)
+    archive_through(date(2024, 12, 31))
+
+    assert verify_archive_balances() == {}
+    assert _balances(test_checking_account) == [Decimal("635")]
+
+
+def test_verify_reports_and_repairs_drift(ledger, test_checking_account):
+    archive_through(CUTOFF)
+    # Editing an archived row is not reflected in the running balance.
+    Transaction.objects.filter(total_amount=40).update(total_amount=50)
+
+    assert verify_archive_balances() == {
+        test_checking_account.id: (Decimal("660"), Decimal("650")),
+    }
+    out = StringIO()
+    call_command("verify_archive_balances", "--repair", stdout=out)
+
+    assert "1 repaired" in out.getvalue()
+    assert _balances(test_checking_account) == [Decimal("650")]
+    assert verify_archive_balances() == {}
@@ -0,0 +1,141 @@
+import pytest
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from transactions.models import Transaction, TransactionImage
+from transactions.services.attachments import (
+    THUMBNAIL_SIZE,
+    generate_thumbnail,
+    store_transaction_image,
+)
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+
+def _photo(size=(1200, 800), orientation=None) -> bytes:
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, "JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+def _upload(data: bytes, name="receipt.jpg"):
+    return SimpleUploadedFile(name, data, content_type="image/jpeg")
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def other_transaction(test_transaction):
+    return Transaction.objects.create(
+        status=test_transaction.status,
+        description="Other",
+        transaction_type=test_transaction.transaction_type,
+        source_account=test_transaction.source_account,
+    )
+
+
+@pytest.fixture
+def queued():
+    with patch("transactions.services.attachments.async_task") as task:
+        yield task
+
+
+def test_upload_queues_thumbnail_after_commit(
+    media, queued, test_transaction, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        image = store_transaction_image(test_transaction, _upload(_photo()))
+
+    queued.assert_called_once_with(
+        "transactions.tasks.generate_transaction_image_thumbnail", image.id
+    )
+    assert len(image.content_hash) == 64
+
+
+def test_thumbnail_is_upright_downscaled_and_metadata_free(
+    media, queued, test_transaction
+):
+    image = store_transaction_image(
+        test_transaction, _upload(_photo((1200, 800), orientation=6))
+    )
+
+    assert generate_thumbnail(image)
+    image.refresh_from_db()
+
+    # Orientation 6 is a quarter turn: the photo is really portrait.
+    assert (image.width, image.height) == (800, 1200)
+    assert max(image.thumbnail_width, image.thumbnail_height) == THUMBNAIL_SIZE
+    assert image.thumbnail_height > image.thumbnail_width
+    with Image.open(media / image.thumbnail.name) as thumb:
+        assert thumb.size == (image.thumbnail_width, image.thumbnail_height)
+        assert not thumb.getexif()
+
+
+def test_non_image_attachment_has_no_thumbnail(media, queued, test_transaction):
+    image = store_transaction_image(
+        test_transaction, _upload(b"%PDF-1.4 statement", "statement.pdf")
+    )
+
+    assert not generate_thumbnail(image)
+    image.refresh_from_db()
+    assert not image.thumbnail
+    assert image.thumbnail_url is None
+
+
+def test_identical_uploads_share_one_file(
+    media, queued, test_transaction, other_transaction
+):
+    data = _photo()
+    first = store_transaction_image(test_transaction, _upload(data))
+    generate_thumbnail(first)
+    first.refresh_from_db()
+
+    again = store_transaction_image(test_transaction, _upload(data, "copy.jpg"))
+    other = store_transaction_image(other_transaction, _upload(data))
+
+    assert again.id == first.id
+    assert other.id != first.id
+    assert other.image.name == first.image.name
+    assert other.thumbnail.name == first.thumbnail.name
+    assert len(list((media / "tran_images").glob("*.jpg"))) == 1
+
+    first.delete()
+    assert (media / other.image.name).exists()
+    assert (media / other.thumbnail.name).exists()
+    other.delete()
+    assert not (media / first.image.name).exists()
+    assert not (media / first.thumbnail.name).exists()
+
+
+def test_backfill_hashes_merges_and_generates(
+    media, test_transaction, other_transaction
+):
+    data = _photo()
+    legacy = [
+        TransactionImage.objects.create(transaction=transaction, image=_upload(data, name))
+        for transaction, name in (
+            (test_transaction, "a.jpg"),
+            (other_transaction, "b.jpg"),
+        )
+    ]
+    duplicate_path = media / legacy[1].image.name
+
+    call_command("generate_attachment_thumbnails")
+
+    first, second = (TransactionImage.objects.get(id=image.id) for image in legacy)
+    assert first.content_hash == second.content_hash != ""
+    assert second.image.name == first.image.name
+    assert not duplicate_path.exists()
+    assert first.thumbnail and second.thumbnail.name == first.thumbnail.name
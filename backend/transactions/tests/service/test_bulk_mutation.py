@@ -0,0 +1,126 @@
+import pytest
+from datetime import date
+from unittest.mock import patch
+
+from core.cache.keys import account_all
+from transactions.models import Transaction, TransactionDetail
+from transactions.services.bulk_mutation import (
+    delete_transactions,
+    set_transaction_date,
+    toggle_cleared,
+)
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_transactions(
+    test_checking_account,
+    test_savings_account,
+    test_pending_transaction_status,
+    test_cleared_transaction_status,
+    test_transfer_transaction_type,
+):
+    Transaction.objects.bulk_create(
+        Transaction(
+            transaction_date=date(2026, 1, 1),
+            total_amount=1,
+            status=(
+                test_cleared_transaction_status
+                if i % 2
+                else test_pending_transaction_status
+            ),
+            description=f"Row {i}",
+            transaction_type=test_transfer_transaction_type,
+            source_account=test_checking_account,
+            destination_account=test_savings_account,
+        )
+        for i in range(500)
+    )
+    return list(Transaction.objects.values_list("id", flat=True))
+
+
+@pytest.fixture
+def refresh_calls():
+    with patch("transactions.services.bulk_mutation.delete_pattern") as delete, \
+         patch("transactions.services.bulk_mutation.async_task") as task, \
+         patch("transactions.services.bulk_mutation.broadcast_invalidate") as broadcast, \
+         patch("transactions.signals._refresh_account") as per_row:
+        yield delete, task, broadcast, per_row
+
+
+def test_toggle_cleared_is_set_based(
+    django_assert_max_num_queries,
+    many_transactions,
+    refresh_calls,
+    test_pending_transaction_status,
+    test_cleared_transaction_status,
+):
+    before = dict(Transaction.objects.values_list("id", "status_id"))
+
+    # Status ids, account ids, the update and the parent lookup, plus the
+    # savepoint pair of the atomic block.
+    with django_assert_max_num_queries(6):
+        toggle_cleared(many_transactions)
+
+    swap = {
+        test_pending_transaction_status.id: test_cleared_transaction_status.id,
+        test_cleared_transaction_status.id: test_pending_transaction_status.id,
+    }
+    after = dict(Transaction.objects.values_list("id", "status_id"))
+    assert after == {i: swap[status] for i, status in before.items()}
+
+
+def test_refresh_runs_once_per_account_and_parent(
+    many_transactions, refresh_calls, test_checking_account, test_savings_account
+):
+    test_checking_account.parent_account = test_savings_account
+    test_checking_account.save()
+    delete, task, broadcast, _ = refresh_calls
+    delete.reset_mock()
+    task.reset_mock()
+
+    set_transaction_date(many_transactions, date(2026, 2, 1))
+
+    checking, savings = test_checking_account.id, test_savings_account.id
+    assert sorted(c.args[0] for c in delete.call_args_list) == sorted(
+        [account_all(checking), account_all(savings)]
+    )
+    assert sorted(c.args for c in task.call_args_list) == sorted([
+        ("transactions.tasks.update_cc_forecast_cache", checking),
+        ("transactions.tasks.update_cc_forecast_cache", savings),
+        # The child's group forecast is rebuilt through its parent.
+        ("transactions.tasks.update_interest_forecast_cache", savings),
+    ])
+    broadcast.assert_called_once()
+    assert broadcast.call_args.kwargs["account_ids"] == sorted([checking, savings])
+    assert not Transaction.objects.exclude(transaction_date=date(2026, 2, 1)).exists()
+
+
+def test_delete_skips_per_row_refresh(many_transactions, refresh_calls):
+    delete, task, broadcast, per_row = refresh_calls
+    TransactionDetail.objects.create(
+        transaction_id=many_transactions[0], detail_amt=1
+    )
+
+    delete_transactions(many_transactions[:100])
+
+    assert Transaction.objects.count() == 400
+    assert not TransactionDetail.objects.exists()
+    per_row.assert_not_called()
+    assert delete.call_count == 2
+    broadcast.assert_called_once()
+
+
+def test_unknown_ids_touch_nothing(
+    refresh_calls,
+    django_assert_max_num_queries,
+    test_pending_transaction_status,
+    test_cleared_transaction_status,
+):
+    delete, task, broadcast, _ = refresh_calls
+    with django_assert_max_num_queries(5):
+        toggle_cleared([999_999])
+    delete.assert_not_called()
+    task.assert_not_called()
+    broadcast.assert_not_called()
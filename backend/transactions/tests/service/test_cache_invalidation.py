@@ -0,0 +1,191 @@
+"""
+Cache invalidation tests.
+
+The account-scoped caches (transaction querysets, balances, financials,
+registers, projected balances, forecast series) go through core.cache.store,
+so the invalidation the signals run in production runs here on the local
+memory cache as well. A transaction write must drop every cached entry that
+depends on it, its parent account's included, and the next read must see the
+write. Every test runs with and without the per-worker near tier.
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+
+from accounts.models import Account
+from accounts.services import get_account_financials
+from accounts.services.forecast_series import get_forecast_series
+from core.cache import store
+from core.cache.keys import (
+    account_cleared_balance,
+    account_financials,
+    account_forecast_series,
+    account_pending_balance,
+    account_projected_balance,
+    account_real_transactions,
+    account_register,
+)
+from transactions.models import Transaction
+from transactions.services.projected_balances import get_projected_balances
+from transactions.services.transactions_and_balances import (
+    fetch_account_transactions,
+    get_account_cleared_balance,
+    get_account_pending_balance,
+    get_account_transactions_and_balances,
+)
+from utils.dates import get_todays_date_timezone_adjusted
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True, params=[0, 100], ids=["shared", "near"])
+def near_tier(request, settings):
+    settings.NEAR_CACHE_SIZE = request.param
+    store.reset()
+    yield
+    store.reset()
+
+
+def _end():
+    return get_todays_date_timezone_adjusted() + timedelta(days=30)
+
+
+def _warm(account_id):
+    """Reads every cached view of account_id and returns their keys."""
+    end = _end()
+    today = get_todays_date_timezone_adjusted()
+    fetch_account_transactions(account_id, "transaction")
+    get_account_cleared_balance(account_id)
+    get_account_pending_balance(account_id)
+    get_account_financials(account_id)
+    get_account_transactions_and_balances(end, account_id, False)
+    get_projected_balances([account_id], end)
+    get_forecast_series(account_id, today - timedelta(days=7), today + timedelta(days=7))
+    keys = [
+        account_real_transactions(account_id),
+        account_cleared_balance(account_id),
+        account_pending_balance(account_id),
+        f"{account_financials(account_id)}:None",
+        account_register(account_id),
+        account_projected_balance(account_id, end),
+        account_forecast_series(account_id),
+    ]
+    return keys
+
+
+def _cached(keys):
+    return [key for key in keys if store.get(key) is not None]
+
+
+def _register_descriptions(account_id):
+    transactions, _ = get_account_transactions_and_balances(_end(), account_id, False)
+    return {transaction.description for transaction in transactions}
+
+
+def _create(status, transaction_type, source, destination=None, amount="-40.00"):
+    return Transaction.objects.create(
+        transaction_date=get_todays_date_timezone_adjusted(),
+        total_amount=Decimal(amount),
+        status=status,
+        description="Written",
+        transaction_type=transaction_type,
+        source_account=source,
+        destination_account=destination,
+    )
+
+
+def test_transaction_save_invalidates_every_account_cache(
+    test_checking_account,
+    test_cleared_transaction_status,
+    test_expense_transaction_type,
+):
+    account_id = test_checking_account.id
+    keys = _warm(account_id)
+    assert _cached(keys) == keys
+    cleared = get_account_cleared_balance(account_id)
+
+    _create(test_cleared_transaction_status, test_expense_transaction_type, test_checking_account)
+
+    assert _cached(keys) == []
+    assert get_account_cleared_balance(account_id) == cleared - Decimal("40.00")
+    assert "Written" in _register_descriptions(account_id)
+
+
+def test_transaction_delete_invalidates_every_account_cache(
+    test_checking_account,
+    test_cleared_transaction_status,
+    test_expense_transaction_type,
+):
+    account_id = test_checking_account.id
+    transaction = _create(test_cleared_transaction_status, test_expense_transaction_type, test_checking_account)
+    keys = _warm(account_id)
+    pending = get_account_pending_balance(account_id)
+
+    transaction.delete()
+
+    assert _cached(keys) == []
+    assert get_account_pending_balance(account_id) == pending + Decimal("40.00")
+    assert "Written" not in _register_descriptions(account_id)
+
+
+def test_transfer_invalidates_both_accounts(
+    test_checking_account,
+    test_savings_account,
+    test_cleared_transaction_status,
+    test_transfer_transaction_type,
+):
+    source_keys = _warm(test_checking_account.id)
+    destination_keys = _warm(test_savings_account.id)
+
+    _create(
+        test_cleared_transaction_status,
+        test_transfer_transaction_type,
+        test_checking_account,
+        test_savings_account,
+    )
+
+    assert _cached(source_keys + destination_keys) == []
+    assert "Written" in _register_descriptions(test_savings_account.id)
+
+
+def test_child_transaction_invalidates_parent_caches(
+    bank,
+    checking_account_type,
+    test_checking_account,
+    test_cleared_transaction_status,
+    test_expense_transaction_type,
+):
+    parent = Account.objects.create(
+        account_name="Parent",
+        account_type=checking_account_type,
+        bank=bank,
+        opening_balance=0,
+        archive_balance=0,
+    )
+    test_checking_account.parent_account = parent
+    test_checking_account.save()
+    parent_keys = [
+        account_register(parent.id),
+        f"{account_financials(parent.id)}:None",
+    ]
+    get_account_transactions_and_balances(_end(), parent.id, False)
+    get_account_financials(parent.id)
+    assert _cached(parent_keys) == parent_keys
+
+    _create(test_cleared_transaction_status, test_expense_transaction_type, test_checking_account)
+
+    assert _cached(parent_keys) == []
+    assert "Written" in _register_descriptions(parent.id)
+
+
+def test_unrelated_account_caches_survive(
+    test_checking_account,
+    test_savings_account,
+    test_cleared_transaction_status,
+    test_expense_transaction_type,
+):
+    keys = _warm(test_savings_account.id)
+
+    _create(test_cleared_transaction_status, test_expense_transaction_type, test_checking_account)
+
+    assert _cached(keys) == keys
@@ -3,7 +3,8 @@ CC interest and payment forecast tests.
 
 Covers:
   - calculate_interest — pure formula tests (unit, no DB)
-  - generate_statement_cycles — cycle date generation and transaction aggregation
+  - cycle_dates, sync_statement_cycles and forecast_statement_cycles — cycle date
+    generation and transaction aggregation
   - update_cc_forecast_cache — full integration: early-return guards, all three payment
     strategies, existing-payment deduplication, zero-balance guard, cache management,
     statement_balance update
@@ -19,8 +20,16 @@ from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import patch
 
-from transactions.tasks import calculate_interest, generate_statement_cycles, update_cc_forecast_cache
-from transactions.models import Transaction, ForecastCacheTransaction, TransactionStatus, TransactionType
+from accounts.models import StatementCycle
+from accounts.services.statement_cycles import cycle_dates, forecast_anchor, sync_statement_cycles
+from transactions.tasks import calculate_interest, forecast_statement_cycles, update_cc_forecast_cache
+from transactions.models import (
+    ForecastCacheTransaction,
+    ReminderCacheTransaction,
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+)
 from transactions.api.dependencies.transaction_utilities import annotate_transaction_total
 
 # Fixed date used across all tests that need a predictable today.
@@ -219,78 +228,49 @@ def test_interest_proportional_to_days():
 
 
 # ---------------------------------------------------------------------------
-# generate_statement_cycles — cycle date and aggregation tests
+# Statement cycles — cycle date and aggregation tests
 # ---------------------------------------------------------------------------
 
-@pytest.mark.django_db
-@pytest.mark.service
-def test_cycles_generated_up_to_forecast_end_date(
-    bank, credit_card_account_type, test_checking_account,
-):
-    """generate_statement_cycles produces roughly 12 monthly cycles for a 1-year window."""
-    with patch(PATCH_TODAY, return_value=FIXED_TODAY):
-        cc = _make_cc_account(bank, credit_card_account_type, test_checking_account)
-        transactions_qs = annotate_transaction_total(
-            Transaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        from transactions.models import ReminderCacheTransaction
-        reminder_qs = annotate_transaction_total(
-            ReminderCacheTransaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        end_date = FIXED_TODAY + timedelta(days=365)
-        cycles = generate_statement_cycles(
-            statement_day=1,
-            due_day=25,
-            pay_day=25,
-            forecast_end_date=end_date,
-            statement_cycle_length=1,
-            statement_cycle_period="m",
-            transactions=transactions_qs,
-            reminder_transactions=reminder_qs,
-            account_id=cc.id,
-            non_trans_bal=Decimal("0.00"),
-        )
+def _forecast_dates(today, statement_day, due_day, pay_day, end_date):
+    """The forecast cycle dates update_cc_forecast_cache works from on today."""
+    return cycle_dates(
+        forecast_anchor(today, statement_day),
+        end_date,
+        "m",
+        1,
+        statement_day,
+        due_day,
+        pay_day,
+    )
+
+
+def _sync_cycles(cc, today, end_date):
+    """Syncs the card's statement cycles from scratch as of today."""
+    # Creating the account synced its cycles against the real date
+    StatementCycle.objects.filter(account=cc).delete()
+    return sync_statement_cycles(cc, end_date, today)
+
+
+@pytest.mark.unit
+def test_cycles_generated_up_to_forecast_end_date():
+    """The forecast covers roughly 12 monthly cycles for a 1-year window."""
+    cycles = _forecast_dates(FIXED_TODAY, 1, 25, 25, FIXED_TODAY + timedelta(days=365))
     assert len(cycles) >= 12
 
 
-@pytest.mark.django_db
-@pytest.mark.service
-def test_first_cycle_start_when_today_after_statement_day(
-    bank, credit_card_account_type, test_checking_account,
-):
+@pytest.mark.unit
+def test_first_cycle_start_when_today_after_statement_day():
     """First cycle always starts on statement_day of the prior month so the just-closed period is included."""
     # FIXED_TODAY = 2026-06-15, statement_day=1
     # one_month_prior = 2026-05-15 → statement_start = 2026-05-01
-    with patch(PATCH_TODAY, return_value=FIXED_TODAY):
-        cc = _make_cc_account(bank, credit_card_account_type, test_checking_account)
-        transactions_qs = annotate_transaction_total(
-            Transaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        from transactions.models import ReminderCacheTransaction
-        reminder_qs = annotate_transaction_total(
-            ReminderCacheTransaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        cycles = generate_statement_cycles(
-            statement_day=1,
-            due_day=25,
-            pay_day=25,
-            forecast_end_date=FIXED_TODAY + timedelta(days=60),
-            statement_cycle_length=1,
-            statement_cycle_period="m",
-            transactions=transactions_qs,
-            reminder_transactions=reminder_qs,
-            account_id=cc.id,
-            non_trans_bal=Decimal("0.00"),
-        )
-    assert cycles[0]["statement_start"] == date(2026, 5, 1)
-    assert cycles[0]["statement_end"] == date(2026, 6, 1)
+    cycles = _forecast_dates(FIXED_TODAY, 1, 25, 25, FIXED_TODAY + timedelta(days=60))
+    start, end, _, _ = cycles[0]
+    assert start == date(2026, 5, 1)
+    assert end == date(2026, 6, 1)
 
 
-@pytest.mark.django_db
-@pytest.mark.service
-def test_due_date_after_statement_end_when_due_day_less_than_statement_day(
-    bank, credit_card_account_type, test_checking_account,
-):
+@pytest.mark.unit
+def test_due_date_after_statement_end_when_due_day_less_than_statement_day():
     """When due_day < statement_day the due date must land *after* the statement closes.
 
     Example: statement_day=18, due_day=15, today=2026-05-19
@@ -299,115 +279,39 @@ def test_due_date_after_statement_end_when_due_day_less_than_statement_day(
       correct:       May 18.replace(15) < May 18 → push to June 15
     """
     today = date(2026, 5, 19)
-    with patch(PATCH_TODAY, return_value=today):
-        cc = _make_cc_account(
-            bank, credit_card_account_type, test_checking_account,
-            opening_balance=Decimal("-399.73"),
-        )
-        # Override statement_day/due_day/pay_day for this test
-        cc.statement_day = 18
-        cc.due_day = 15
-        cc.pay_day = 15
-        cc.save()
-
-        transactions_qs = annotate_transaction_total(
-            Transaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        from transactions.models import ReminderCacheTransaction
-        reminder_qs = annotate_transaction_total(
-            ReminderCacheTransaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        cycles = generate_statement_cycles(
-            statement_day=18,
-            due_day=15,
-            pay_day=15,
-            forecast_end_date=today + timedelta(days=60),
-            statement_cycle_length=1,
-            statement_cycle_period="m",
-            transactions=transactions_qs,
-            reminder_transactions=reminder_qs,
-            account_id=cc.id,
-            non_trans_bal=Decimal("0.00"),
-        )
+    cycles = _forecast_dates(today, 18, 15, 15, today + timedelta(days=60))
 
     # Cycle 0: 2026-04-18 → 2026-05-18
-    assert cycles[0]["statement_start"] == date(2026, 4, 18)
-    assert cycles[0]["statement_end"] == date(2026, 5, 18)
     # Due/pay date must be AFTER statement_end (May 18) → June 15
-    assert cycles[0]["statement_due"] == date(2026, 6, 15)
-    assert cycles[0]["statement_pay_day"] == date(2026, 6, 15)
+    assert cycles[0] == (date(2026, 4, 18), date(2026, 5, 18), date(2026, 6, 15), date(2026, 6, 15))
 
 
-@pytest.mark.django_db
-@pytest.mark.service
-def test_due_date_correct_when_due_day_after_statement_end_same_month(
-    bank, credit_card_account_type, test_checking_account,
-):
+@pytest.mark.unit
+def test_due_date_correct_when_due_day_after_statement_end_same_month():
     """When due_day > statement_day the due date stays in the same month as statement_end.
 
     Example: statement_day=1, due_day=25
       statement_end = 2026-06-01, due = June 25 (still in June, no extra month needed).
     """
-    with patch(PATCH_TODAY, return_value=FIXED_TODAY):
-        cc = _make_cc_account(bank, credit_card_account_type, test_checking_account)
-        transactions_qs = annotate_transaction_total(
-            Transaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        from transactions.models import ReminderCacheTransaction
-        reminder_qs = annotate_transaction_total(
-            ReminderCacheTransaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        cycles = generate_statement_cycles(
-            statement_day=1,
-            due_day=25,
-            pay_day=25,
-            forecast_end_date=FIXED_TODAY + timedelta(days=60),
-            statement_cycle_length=1,
-            statement_cycle_period="m",
-            transactions=transactions_qs,
-            reminder_transactions=reminder_qs,
-            account_id=cc.id,
-            non_trans_bal=Decimal("0.00"),
-        )
+    cycles = _forecast_dates(FIXED_TODAY, 1, 25, 25, FIXED_TODAY + timedelta(days=60))
 
     # Cycle 0: 2026-05-01 → 2026-06-01; due June 25 (same month as end)
-    assert cycles[0]["statement_end"] == date(2026, 6, 1)
-    assert cycles[0]["statement_due"] == date(2026, 6, 25)
-    assert cycles[0]["statement_pay_day"] == date(2026, 6, 25)
+    _, end, due, pay_day = cycles[0]
+    assert end == date(2026, 6, 1)
+    assert due == date(2026, 6, 25)
+    assert pay_day == date(2026, 6, 25)
 
 
-@pytest.mark.django_db
-@pytest.mark.service
-def test_first_cycle_start_when_today_before_statement_day(
-    bank, credit_card_account_type, test_checking_account,
-):
+@pytest.mark.unit
+def test_first_cycle_start_when_today_before_statement_day():
     """When today.day <= statement_day, first cycle starts on statement_day last month."""
     # today=2026-06-05, statement_day=15 → today.day(5) < 15
     # → statement_start = 2026-05-15
     today = date(2026, 6, 5)
-    with patch(PATCH_TODAY, return_value=today):
-        cc = _make_cc_account(bank, credit_card_account_type, test_checking_account)
-        transactions_qs = annotate_transaction_total(
-            Transaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        from transactions.models import ReminderCacheTransaction
-        reminder_qs = annotate_transaction_total(
-            ReminderCacheTransaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        cycles = generate_statement_cycles(
-            statement_day=15,
-            due_day=25,
-            pay_day=25,
-            forecast_end_date=today + timedelta(days=60),
-            statement_cycle_length=1,
-            statement_cycle_period="m",
-            transactions=transactions_qs,
-            reminder_transactions=reminder_qs,
-            account_id=cc.id,
-            non_trans_bal=Decimal("0.00"),
-        )
-    assert cycles[0]["statement_start"] == date(2026, 5, 15)
-    assert cycles[0]["statement_end"] == date(2026, 6, 15)
+    cycles = _forecast_dates(today, 15, 25, 25, today + timedelta(days=60))
+    start, end, _, _ = cycles[0]
+    assert start == date(2026, 5, 15)
+    assert end == date(2026, 6, 15)
 
 
 @pytest.mark.django_db
@@ -420,47 +324,28 @@ def test_cycle_debits_only_include_transactions_in_period(
     # Cycle 1: 2026-06-01 to 2026-07-01
     # Expense on 2026-05-31 (> May 1, <= Jun 1) → in cycle 0
     # Expense on 2026-06-15 (> Jun 1, <= Jul 1) → in cycle 1
-    with patch(PATCH_TODAY, return_value=FIXED_TODAY):
-        cc = _make_cc_account(bank, credit_card_account_type, test_checking_account)
-        Transaction.objects.create(
-            transaction_date=date(2026, 6, 15),
-            total_amount=Decimal("100.00"),
-            status=_pending_status(),
-            transaction_type=_expense_type(),
-            source_account=cc,
-        )
-        Transaction.objects.create(
-            transaction_date=date(2026, 5, 31),
-            total_amount=Decimal("50.00"),
-            status=_pending_status(),
-            transaction_type=_expense_type(),
-            source_account=cc,
-        )
+    cc = _make_cc_account(bank, credit_card_account_type, test_checking_account)
+    Transaction.objects.create(
+        transaction_date=date(2026, 6, 15),
+        total_amount=Decimal("100.00"),
+        status=_pending_status(),
+        transaction_type=_expense_type(),
+        source_account=cc,
+    )
+    Transaction.objects.create(
+        transaction_date=date(2026, 5, 31),
+        total_amount=Decimal("50.00"),
+        status=_pending_status(),
+        transaction_type=_expense_type(),
+        source_account=cc,
+    )
 
-        transactions_qs = annotate_transaction_total(
-            Transaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        from transactions.models import ReminderCacheTransaction
-        reminder_qs = annotate_transaction_total(
-            ReminderCacheTransaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        cycles = generate_statement_cycles(
-            statement_day=1,
-            due_day=25,
-            pay_day=25,
-            forecast_end_date=FIXED_TODAY + timedelta(days=60),
-            statement_cycle_length=1,
-            statement_cycle_period="m",
-            transactions=transactions_qs,
-            reminder_transactions=reminder_qs,
-            account_id=cc.id,
-            non_trans_bal=Decimal("0.00"),
-        )
+    cycles = _sync_cycles(cc, FIXED_TODAY, FIXED_TODAY + timedelta(days=60))
 
     # Cycle 0: 2026-05-01 → 2026-06-01 — May 31 expense ($50) is in it
-    assert cycles[0]["statement_debits"] == Decimal("-50.00")
+    assert cycles[0].debits == Decimal("-50.00")
     # Cycle 1: 2026-06-01 → 2026-07-01 — Jun 15 expense ($100) is in it
-    assert cycles[1]["statement_debits"] == Decimal("-100.00")
+    assert cycles[1].debits == Decimal("-100.00")
 
 
 @pytest.mark.django_db
@@ -469,37 +354,28 @@ def test_previous_balance_includes_non_trans_bal_and_prior_transactions(
     bank, credit_card_account_type, test_checking_account,
 ):
     """previous_balance = non_trans_bal + sum of transactions on or before statement_start."""
-    with patch(PATCH_TODAY, return_value=FIXED_TODAY):
-        cc = _make_cc_account(bank, credit_card_account_type, test_checking_account)
-        # Expense on 2026-04-30 — before statement_start (2026-05-01), so included in previous_balance
-        Transaction.objects.create(
-            transaction_date=date(2026, 4, 30),
-            total_amount=Decimal("75.00"),
-            status=_pending_status(),
-            transaction_type=_expense_type(),
-            source_account=cc,
-        )
+    cc = _make_cc_account(bank, credit_card_account_type, test_checking_account)
+    # Expense on 2026-04-30 — before statement_start (2026-05-01), so included in previous_balance
+    Transaction.objects.create(
+        transaction_date=date(2026, 4, 30),
+        total_amount=Decimal("75.00"),
+        status=_pending_status(),
+        transaction_type=_expense_type(),
+        source_account=cc,
+    )
 
-        transactions_qs = annotate_transaction_total(
-            Transaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        from transactions.models import ReminderCacheTransaction
-        reminder_qs = annotate_transaction_total(
-            ReminderCacheTransaction.objects.filter(source_account_id=cc.id), cc.id
-        )
-        non_trans_bal = Decimal("-50.00")
-        cycles = generate_statement_cycles(
-            statement_day=1,
-            due_day=25,
-            pay_day=25,
-            forecast_end_date=FIXED_TODAY + timedelta(days=60),
-            statement_cycle_length=1,
-            statement_cycle_period="m",
-            transactions=transactions_qs,
-            reminder_transactions=reminder_qs,
-            account_id=cc.id,
-            non_trans_bal=non_trans_bal,
-        )
+    transactions_qs = annotate_transaction_total(
+        Transaction.objects.filter(source_account_id=cc.id), cc.id
+    )
+    reminder_qs = annotate_transaction_total(
+        ReminderCacheTransaction.objects.filter(source_account_id=cc.id), cc.id
+    )
+    cycles = forecast_statement_cycles(
+        _sync_cycles(cc, FIXED_TODAY, FIXED_TODAY + timedelta(days=60)),
+        transactions_qs,
+        reminder_qs,
+        Decimal("-50.00"),
+    )
 
     # previous_balance = -50.00 (non_trans_bal) + (-75.00) (Apr 30 expense) = -125.00
     assert cycles[0]["previous_balance"] == Decimal("-125.00")
@@ -0,0 +1,133 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Account
+from transactions.models import (
+    ForecastCacheTransaction,
+    ReminderCacheTransaction,
+    Transaction,
+)
+from transactions.services.group_ledger import GroupLedger, PeriodSums
+from transactions.services.transactions_and_balances import build_parent_account_register
+from transactions.tasks import update_interest_forecast_cache
+from utils.dates import get_todays_date_timezone_adjusted
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+
+@pytest.fixture
+def types(
+    test_income_transaction_type,
+    test_expense_transaction_type,
+    test_transfer_transaction_type,
+):
+    return {
+        "income": test_income_transaction_type,
+        "expense": test_expense_transaction_type,
+        "transfer": test_transfer_transaction_type,
+    }
+
+
+@pytest.fixture
+def make_group(bank, savings_account_type, types, test_pending_transaction_status, test_reminder):
+    def make(children, name="Brokerage"):
+        parent = Account.objects.create(
+            account_name=name,
+            account_type=savings_account_type,
+            bank=bank,
+            opening_balance=0,
+            archive_balance=0,
+        )
+        members = [
+            Account.objects.create(
+                account_name=f"{name} sleeve {n}",
+                account_type=savings_account_type,
+                bank=bank,
+                opening_balance=1000,
+                archive_balance=100,
+                parent_account=parent,
+            )
+            for n in range(children)
+        ]
+        parent.interest_child_account = members[0]
+        parent.calculate_interest = True
+        parent.annual_rate = Decimal("4.00")
+        parent.save()
+        today = get_todays_date_timezone_adjusted()
+        for i, member in enumerate(members):
+            Transaction.objects.create(
+                transaction_date=today - timedelta(days=3),
+                total_amount=50,
+                status=test_pending_transaction_status,
+                transaction_type=types["expense"],
+                source_account=member,
+            )
+            ReminderCacheTransaction.objects.create(
+                transaction_date=today + timedelta(days=40 + i),
+                total_amount=200,
+                status=test_pending_transaction_status,
+                transaction_type=types["income"],
+                source_account=member,
+                reminder=test_reminder,
+            )
+        return parent, members
+    return make
+
+
+def test_internal_transfers_cancel_in_group_balance(
+    make_group, types, test_pending_transaction_status
+):
+    parent, members = make_group(2)
+    Transaction.objects.create(
+        total_amount=700,
+        status=test_pending_transaction_status,
+        transaction_type=types["transfer"],
+        source_account=members[0],
+        destination_account=members[1],
+    )
+
+    ledger = GroupLedger.for_parent(parent.id)
+
+    # 2 x (1000 opening + 100 archived - 50 expense); the transfer nets out.
+    assert ledger.balance() == Decimal("2100")
+    register = build_parent_account_register(None, parent.id, True)
+    assert register[2] == ledger.base_balance == Decimal("2200")
+
+
+def test_period_sums_match_naive_sums():
+    rows = [(date(2026, 1, d), Decimal(d)) for d in (1, 5, 5, 9, 20, 31)]
+    sums = PeriodSums.from_rows(reversed(rows))
+    for start, end in [
+        (date(2025, 12, 1), date(2026, 1, 5)),
+        (date(2026, 1, 5), date(2026, 1, 20)),
+        (date(2026, 1, 31), date(2026, 2, 28)),
+    ]:
+        assert sums.between(start, end) == sum(
+            (amount for day, amount in rows if start < day <= end), Decimal(0)
+        )
+
+
+def test_parent_rebuild_query_count_is_constant(make_group):
+    counts = []
+    for children in (2, 6):
+        parent, members = make_group(children, name=f"Group {children}")
+        with CaptureQueriesContext(connection) as queries:
+            update_interest_forecast_cache(parent.id)
+        counts.append(len(queries))
+        assert ForecastCacheTransaction.objects.filter(source_account=members[0]).count() == 12
+
+    assert counts[0] == counts[1]
+
+
+def test_reminders_raise_the_compounded_balance(make_group):
+    parent, members = make_group(3)
+    update_interest_forecast_cache(parent.id)
+    first, second = ForecastCacheTransaction.objects.filter(
+        source_account=members[0]
+    ).order_by("transaction_date")[:2]
+
+    # The second month's balance includes the three 200 reminder deposits.
+    assert second.total_amount > first.total_amount * Decimal("1.15")
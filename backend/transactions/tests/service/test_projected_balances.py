@@ -0,0 +1,118 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Account
+from transactions.models import (
+    ForecastCacheTransaction,
+    ReminderCacheTransaction,
+    Transaction,
+)
+from transactions.services.projected_balances import get_projected_balances
+from transactions.services.transactions_and_balances import (
+    get_account_cleared_balance,
+    get_account_transactions_and_balances,
+)
+from utils.dates import get_todays_date_timezone_adjusted
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+TODAY = get_todays_date_timezone_adjusted()
+END = TODAY + timedelta(days=20)
+
+
+@pytest.fixture
+def ledger(
+    test_checking_account,
+    test_savings_account,
+    test_reminder,
+    test_pending_transaction_status,
+    test_cleared_transaction_status,
+    test_income_transaction_type,
+    test_expense_transaction_type,
+    test_transfer_transaction_type,
+):
+    def add(model, days, amount, status, kind, source, destination=None, **extra):
+        model.objects.create(
+            transaction_date=TODAY + timedelta(days=days),
+            total_amount=amount,
+            status=status,
+            transaction_type=kind,
+            source_account=source,
+            destination_account=destination,
+            **extra,
+        )
+
+    checking, savings = test_checking_account, test_savings_account
+    cleared, pending = test_cleared_transaction_status, test_pending_transaction_status
+    income, expense = test_income_transaction_type, test_expense_transaction_type
+    transfer = test_transfer_transaction_type
+    add(Transaction, -30, 2500, cleared, income, checking)
+    add(Transaction, -10, -80, cleared, expense, checking)
+    add(Transaction, -5, -400, cleared, transfer, checking, savings)
+    add(Transaction, -2, -25, pending, expense, checking)
+    add(Transaction, 5, -60, pending, expense, checking)
+    add(Transaction, 40, -999, pending, expense, checking)
+    add(ReminderCacheTransaction, 10, 1200, pending, income, checking, reminder=test_reminder)
+    add(ReminderCacheTransaction, 12, -150, pending, transfer, checking, savings, reminder=test_reminder)
+    add(ReminderCacheTransaction, 60, -150, pending, transfer, checking, savings, reminder=test_reminder)
+    add(ForecastCacheTransaction, 15, 3, pending, income, savings)
+    return checking, savings
+
+
+def _register_projection(account_id):
+    transactions, previous = get_account_transactions_and_balances(
+        end_date=END, account_id=account_id, totals_only=True,
+        forecast=True, start_date=TODAY,
+    )
+    return previous + sum(t.pretty_total for t in transactions)
+
+
+def test_matches_register_and_cleared_balance(ledger):
+    balances = get_projected_balances([a.id for a in ledger], END)
+
+    for account in ledger:
+        assert balances[account.id].projected_balance == _register_projection(account.id)
+        assert balances[account.id].balance == get_account_cleared_balance(account.id)
+    assert balances[ledger[1].id].projected_balance == Decimal("611.10") + 400 + 150 + 3
+
+
+def test_parent_sums_children(ledger, bank, savings_account_type):
+    checking, savings = ledger
+    parent = Account.objects.create(
+        account_name="Household", account_type=savings_account_type, bank=bank
+    )
+    Account.objects.filter(id__in=[checking.id, savings.id]).update(parent_account=parent)
+
+    balances = get_projected_balances([parent.id, checking.id], END)
+
+    children = get_projected_balances([checking.id, savings.id], END)
+    assert balances[parent.id].projected_balance == sum(
+        b.projected_balance for b in children.values()
+    )
+    assert balances[checking.id] == children[checking.id]
+
+
+def test_query_count_does_not_grow_with_accounts(ledger, bank, savings_account_type):
+    extra = [
+        Account.objects.create(
+            account_name=f"Pot {n}", account_type=savings_account_type, bank=bank
+        ).id
+        for n in range(8)
+    ]
+    ids = [a.id for a in ledger]
+
+    cache.clear()
+    with CaptureQueriesContext(connection) as few:
+        get_projected_balances(ids, END)
+    cache.clear()
+    with CaptureQueriesContext(connection) as many:
+        get_projected_balances(ids + extra, END)
+    with CaptureQueriesContext(connection) as warm:
+        get_projected_balances(ids + extra, END)
+
+    assert len(few) == len(many) == 4
+    assert len(warm) == 1
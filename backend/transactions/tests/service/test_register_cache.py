@@ -0,0 +1,215 @@
+"""
+Compact register cache tests.
+
+Every non-forecast window is sliced from one cached register per account, so a
+slice must match what building the same window straight from the database
+returns — rows, order, balances, tags and details.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from core.cache import reference
+from core.cache.helpers import delete_pattern
+from core.cache.keys import account_all, account_register
+from transactions.models import (
+    Transaction,
+    TransactionDetail,
+    ReminderCacheTransaction,
+    ReminderCacheTransactionDetail,
+    ForecastCacheTransaction,
+)
+from transactions.services.register_cache import (
+    decode_register,
+    encode_register,
+    get_cached_register,
+)
+from transactions.services.transactions_and_balances import (
+    build_account_register,
+    get_account_transactions_and_balances,
+)
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+BASE = date(2026, 3, 1)
+BURST = 50
+WINDOWS = [BASE, BASE + timedelta(days=3), BASE + timedelta(days=8), date(2099, 1, 1)]
+
+
+@pytest.fixture
+def register_rows(
+    test_checking_account,
+    test_savings_account,
+    test_pending_transaction_status,
+    test_cleared_transaction_status,
+    test_expense_transaction_type,
+    test_transfer_transaction_type,
+    test_tag,
+    test_paycheck,
+    test_reminder,
+):
+    for offset, amount in [(-2, "-12.50"), (1, "-3.10"), (4, "250.00")]:
+        transaction = Transaction.objects.create(
+            transaction_date=BASE + timedelta(days=offset),
+            total_amount=Decimal(amount),
+            status=test_cleared_transaction_status,
+            description=f"Cleared {offset}",
+            transaction_type=test_expense_transaction_type,
+            source_account=test_checking_account,
+            paycheck=test_paycheck if offset == 4 else None,
+        )
+        TransactionDetail.objects.create(
+            transaction=transaction, detail_amt=Decimal(amount), tag=test_tag
+        )
+    Transaction.objects.create(
+        transaction_date=BASE + timedelta(days=2),
+        total_amount=Decimal("-40.00"),
+        status=test_pending_transaction_status,
+        description="Transfer out",
+        transaction_type=test_transfer_transaction_type,
+        source_account=test_checking_account,
+        destination_account=test_savings_account,
+    )
+    reminder_row = ReminderCacheTransaction.objects.create(
+        transaction_date=BASE + timedelta(days=5),
+        total_amount=Decimal("-9.99"),
+        status=test_pending_transaction_status,
+        description="Reminder",
+        transaction_type=test_expense_transaction_type,
+        source_account=test_checking_account,
+        reminder=test_reminder,
+    )
+    ReminderCacheTransactionDetail.objects.create(
+        transaction=reminder_row, detail_amt=Decimal("-9.99"), tag=test_tag
+    )
+    ForecastCacheTransaction.objects.create(
+        transaction_date=BASE + timedelta(days=6),
+        total_amount=Decimal("-1.23"),
+        status=test_pending_transaction_status,
+        description="Forecast",
+        transaction_type=test_expense_transaction_type,
+        source_account=test_checking_account,
+    )
+    return test_checking_account
+
+
+def _built(end_date, account_id, totals_only=False):
+    cleared, open_transactions, _ = build_account_register(
+        end_date, account_id, totals_only
+    )
+    return cleared + open_transactions
+
+
+@pytest.mark.parametrize("end_date", WINDOWS)
+def test_slice_matches_direct_build(register_rows, end_date):
+    account_id = register_rows.id
+    blob = encode_register(*build_account_register(None, account_id, False))
+
+    sliced = decode_register(blob, end_date)
+
+    assert [t.model_dump() for t in sliced] == [
+        t.model_dump() for t in _built(end_date, account_id)
+    ]
+
+
+def test_totals_only_slice_matches_direct_build(register_rows):
+    account_id = register_rows.id
+    blob = encode_register(*build_account_register(None, account_id, False))
+
+    sliced = decode_register(blob, WINDOWS[2], totals_only=True)
+    expected = _built(WINDOWS[2], account_id, totals_only=True)
+
+    assert [(t.id, t.balance, t.pretty_total) for t in sliced] == [
+        (t.id, t.balance, t.pretty_total) for t in expected
+    ]
+    assert all(t.details == [] and t.pretty_account is None for t in sliced)
+
+
+def test_windows_share_one_cache_entry(register_rows):
+    account_id = register_rows.id
+
+    for end_date in WINDOWS:
+        get_account_transactions_and_balances(end_date, account_id, False)
+
+    keys = [
+        key
+        for key in cache._cache
+        if f"account:{account_id}:transactions:combined" in key
+    ]
+    assert len(keys) == 1
+    assert cache.get(account_register(account_id)) is not None
+
+
+def test_cached_slice_needs_no_register_queries(
+    register_rows, django_assert_max_num_queries
+):
+    account_id = register_rows.id
+    get_account_transactions_and_balances(WINDOWS[-1], account_id, False)
+
+    # Only the parent-account check remains once the register is cached.
+    with django_assert_max_num_queries(1):
+        transactions, _ = get_account_transactions_and_balances(
+            WINDOWS[1], account_id, False
+        )
+    assert transactions
+
+
+def test_status_rename_reaches_cached_slice(
+    register_rows, test_cleared_transaction_status
+):
+    account_id = register_rows.id
+    get_account_transactions_and_balances(WINDOWS[-1], account_id, False)
+
+    test_cleared_transaction_status.transaction_status = "Posted"
+    test_cleared_transaction_status.save()
+
+    transactions, _ = get_account_transactions_and_balances(
+        WINDOWS[-1], account_id, False
+    )
+    cleared = [t for t in transactions if t.status.id == test_cleared_transaction_status.id]
+    assert cleared and all(t.status.transaction_status == "Posted" for t in cleared)
+
+
+def test_unreadable_entry_is_rebuilt(register_rows):
+    account_id = register_rows.id
+    cache.set(account_register(account_id), b"not a register")
+
+    transactions, _ = get_account_transactions_and_balances(
+        WINDOWS[-1], account_id, False
+    )
+
+    assert len(transactions) == len(_built(WINDOWS[-1], account_id))
+    assert decode_register(cache.get(account_register(account_id)), None)
+
+
+def test_concurrent_misses_build_the_register_once(register_rows):
+    account_id = register_rows.id
+    register = build_account_register(None, account_id, False)
+    reference.warm()
+    builds = []
+
+    def build():
+        builds.append(1)
+        time.sleep(0.1)
+        return register
+
+    get_cached_register(account_id, WINDOWS[-1], False, build)
+    delete_pattern(account_all(account_id))
+    builds.clear()
+    start = threading.Barrier(BURST)
+
+    def request():
+        start.wait()
+        return get_cached_register(account_id, WINDOWS[-1], False, build)
+
+    with ThreadPoolExecutor(max_workers=BURST) as pool:
+        results = list(pool.map(lambda _: request(), range(BURST)))
+
+    assert len(builds) == 1
+    assert all(len(transactions) == len(results[0][0]) for transactions, _ in results)
@@ -0,0 +1,113 @@
+"""
+Constructed register row tests.
+
+Rows built by transaction_outs skip validation, so they must dump exactly like
+the validated TransactionOut.from_orm rows they replace.
+"""
+import json
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from ninja.renderers import JSONRenderer
+
+from backend.renderers import ORJSONRenderer
+from transactions.api.schemas.transaction import PaginatedTransactions, TransactionOut
+from transactions.models import (
+    Transaction,
+    TransactionDetail,
+    ReminderCacheTransaction,
+    ReminderCacheTransactionDetail,
+    ForecastCacheTransaction,
+)
+from transactions.services.transaction_rows import transaction_outs
+from transactions.services.transactions_and_balances import build_account_register
+
+pytestmark = [pytest.mark.service, pytest.mark.django_db]
+
+AUTH = {"Authorization": "Bearer test-api-key"}
+DAY = date(2026, 3, 1)
+
+
+def _annotated(model, detail_model):
+    rows = list(model.objects.select_related("status", "transaction_type", "paycheck"))
+    for row in rows:
+        row.balance = Decimal("1.00")
+        row.pretty_total = row.total_amount
+        row.pretty_account = "Checking"
+        row.details = list(
+            detail_model.objects.select_related("transaction", "tag").filter(transaction=row)
+        )
+        row.tags = [detail.tag.tag_name for detail in row.details]
+    return rows
+
+
+@pytest.fixture
+def rows(
+    test_checking_account,
+    test_pending_transaction_status,
+    test_expense_transaction_type,
+    test_tag,
+    test_paycheck,
+    test_reminder,
+):
+    common = dict(
+        transaction_date=DAY,
+        total_amount=Decimal("-12.50"),
+        status=test_pending_transaction_status,
+        transaction_type=test_expense_transaction_type,
+        source_account=test_checking_account,
+    )
+    transaction = Transaction.objects.create(description="Real", paycheck=test_paycheck, **common)
+    TransactionDetail.objects.create(transaction=transaction, detail_amt=Decimal("-12.50"), tag=test_tag)
+    reminder_row = ReminderCacheTransaction.objects.create(description="Reminder", reminder=test_reminder, **common)
+    ReminderCacheTransactionDetail.objects.create(
+        transaction=reminder_row, detail_amt=Decimal("-12.50"), tag=test_tag
+    )
+    ForecastCacheTransaction.objects.create(description="Forecast", **common)
+    return test_checking_account
+
+
+def test_constructed_rows_match_validated_rows(rows):
+    real = _annotated(Transaction, TransactionDetail)
+    reminders = _annotated(ReminderCacheTransaction, ReminderCacheTransactionDetail)
+    forecasts = list(ForecastCacheTransaction.objects.select_related("status", "transaction_type"))
+
+    legacy = (
+        [TransactionOut.from_orm(obj) for obj in real]
+        + [TransactionOut.from_orm(obj).model_copy(update={"id": -obj.id, "simulated": True}) for obj in reminders]
+        + [
+            TransactionOut.from_orm(obj).model_copy(update={"id": -obj.id - 10000, "simulated": True})
+            for obj in forecasts
+        ]
+    )
+    constructed = transaction_outs(real) + transaction_outs(reminders, "r") + transaction_outs(forecasts, "f")
+
+    assert [t.model_dump() for t in constructed] == [t.model_dump() for t in legacy]
+
+
+def test_orjson_renderer_matches_default_renderer(rows):
+    cleared, open_transactions, _ = build_account_register(None, rows.id, False)
+    register = cleared + open_transactions
+    body = PaginatedTransactions(
+        transactions=register, current_page=1, total_pages=1, total_records=len(register)
+    ).model_dump()
+
+    default = JSONRenderer().render(None, body, response_status=200)
+    compact = ORJSONRenderer().render(None, body, response_status=200)
+
+    assert json.loads(compact) == json.loads(default)
+
+
+def test_slim_list_returns_ids(rows, api_client):
+    params = f"view_type=1&account={rows.id}&maxdays=3650&forecast=false&page=1&page_size=60"
+
+    full = api_client.get(f"/transactions/list?{params}", headers=AUTH).json()
+    slim = api_client.get(f"/transactions/list?{params}&slim=true", headers=AUTH).json()
+
+    assert [t["id"] for t in slim["transactions"]] == [t["id"] for t in full["transactions"]]
+    for full_row, slim_row in zip(full["transactions"], slim["transactions"]):
+        assert slim_row["status_id"] == full_row["status"]["id"]
+        assert slim_row["transaction_type_id"] == full_row["transaction_type"]["id"]
+        assert "details" not in slim_row and "status" not in slim_row
+        assert slim_row["balance"] == full_row["balance"]
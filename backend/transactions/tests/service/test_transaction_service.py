@@ -76,6 +76,25 @@ def test_upsert_description_history_updates_existing(test_tag):
     assert record.tag_id == test_tag.id
 
 
+@pytest.mark.django_db
+@pytest.mark.service
+def test_upsert_description_history_is_one_statement(
+    django_assert_num_queries, test_tag
+):
+    """An existing description keeps its pretty form and takes the new tag."""
+    DescriptionHistory.objects.create(
+        description_normalized="coffee shop",
+        description_pretty="Coffee Shop",
+    )
+
+    with django_assert_num_queries(1):
+        upsert_description_history("COFFEE SHOP", tag_id=test_tag.id)
+
+    record = DescriptionHistory.objects.get(description_normalized="coffee shop")
+    assert record.description_pretty == "Coffee Shop"
+    assert record.tag_id == test_tag.id
+
+
 @pytest.mark.django_db
 @pytest.mark.service
 def test_create_transaction_service_creates_transaction(
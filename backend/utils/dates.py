@@ -1,4 +1,5 @@
 from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
 from django.utils import timezone
 import pytz
 import os
@@ -116,3 +117,28 @@ def get_unformatted_dates_in_range(start_interval, end_interval):
         current_date += timedelta(days=1)
 
     return date_list
+
+
+def increment_date(incr_date: date, period: str, length: int):
+    """
+    The function `increment_date` increments a given date by the provided length
+    and period.
+
+    Args:
+        incr_date (date): The date to increment.
+        period (str): d = week, w = week, m = month, y = year.
+        length (int): Length of the period.
+
+    Returns:
+        (date): Returns the new date
+    """
+    if period == "d":
+        return incr_date + relativedelta(days=length)
+    elif period == "w":
+        return incr_date + relativedelta(weeks=length)
+    elif period == "m":
+        return incr_date + relativedelta(months=length)
+    elif period == "y":
+        return incr_date + relativedelta(years=length)
+    else:
+        raise ValueError(f"Unsupported period: {period}")
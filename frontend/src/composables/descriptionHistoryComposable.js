@@ -1,3 +1,4 @@
+import { computed, ref, toValue } from "vue";
 import { useQuery, useQueryClient } from "@tanstack/vue-query";
 import apiClient from "./apiClient";
 import { useMainStore } from "@/stores/main";
@@ -18,10 +19,13 @@ function handleApiError(error, message) {
   throw error;
 }
 
-async function getDescriptionHistoryFunction() {
+const SUGGESTION_LIMIT = 20;
+
+async function getDescriptionHistoryFunction(search) {
   try {
     const response = await apiClient.get(
-      "/administration/description-histories/list",
+      "/administration/description-histories/typeahead",
+      { params: { q: search, limit: SUGGESTION_LIMIT } },
     );
     return response.data;
   } catch (error) {
@@ -29,17 +33,23 @@ async function getDescriptionHistoryFunction() {
   }
 }
 
-export function useDescriptionHistory() {
+// Suggestions are fetched from the server for the text typed so far instead of
+// shipping the whole history; bind `search` to the combobox's search text.
+export function useDescriptionHistory(search = ref("")) {
   const queryClient = useQueryClient();
+  const prefix = computed(() => (toValue(search) ?? "").trim().toLowerCase());
   const { data: descriptionHistory, isLoading } = useQuery({
-    queryKey: ["description-history"],
-    queryFn: () => getDescriptionHistoryFunction(),
-    select: response => response,
+    queryKey: ["description-history", prefix],
+    queryFn: () => getDescriptionHistoryFunction(prefix.value),
+    // Keep the previous suggestions listed while the next prefix loads.
+    placeholderData: previousData => previousData,
+    select: response => response ?? [],
     client: queryClient,
   });
 
   return {
     isLoading,
     descriptionHistory,
+    search,
   };
 }
@@ -1,6 +1,19 @@
 import { ref, onMounted, onUnmounted } from "vue";
 import { useQueryClient } from "@tanstack/vue-query";
 
+// Queries keyed by a single account ({ account } or { account_id }) only
+// refetch when the message names that account; everything else refetches.
+function affectsQuery(queryKey, accountIds) {
+  if (!Array.isArray(accountIds)) return true;
+  const params = queryKey[1];
+  const account =
+    params && typeof params === "object"
+      ? params.account_id ?? params.account
+      : null;
+  if (account === null || account === undefined) return true;
+  return accountIds.includes(Number(account));
+}
+
 export function useRealtimeSync() {
   const queryClient = useQueryClient();
   const connected = ref(false);
@@ -23,8 +36,12 @@ export function useRealtimeSync() {
       try {
         const data = JSON.parse(event.data);
         if (data.type === "invalidate" && Array.isArray(data.keys)) {
+          const scoped = data.accounts || {};
           data.keys.forEach((key) =>
-            queryClient.invalidateQueries({ queryKey: [key] })
+            queryClient.invalidateQueries({
+              queryKey: [key],
+              predicate: (query) => affectsQuery(query.queryKey, scoped[key]),
+            })
           );
         }
       } catch {